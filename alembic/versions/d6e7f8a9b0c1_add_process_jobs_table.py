@@ -0,0 +1,86 @@
+"""Add process_jobs table for the asynchronous /v1/jobs queue.
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "d6e7f8a9b0c1"
+down_revision = "c5d6e7f8a9b0"
+branch_labels = None
+depends_on = None
+
+
+UUIDType = postgresql.UUID(as_uuid=True).with_variant(sa.String(length=36), "sqlite")
+JSONType = postgresql.JSONB().with_variant(sa.JSON(), "sqlite")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "process_jobs",
+        sa.Column("id", UUIDType, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column("status", sa.String(length=16), nullable=False, server_default="queued"),
+        sa.Column("kind", sa.String(length=32), nullable=False, server_default="process"),
+        sa.Column("request_json", JSONType, nullable=False),
+        sa.Column("note_sha256", sa.String(length=64), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="3"),
+        sa.Column(
+            "available_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column("lease_owner", sa.String(length=255), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("progress_json", JSONType, nullable=False),
+        sa.Column("result_json", JSONType, nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("status_code", sa.Integer(), nullable=True),
+        sa.Column("processing_time_ms", sa.Float(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_process_jobs_created_at", "process_jobs", ["created_at"], unique=False)
+    op.create_index("ix_process_jobs_note_sha256", "process_jobs", ["note_sha256"], unique=False)
+    op.create_index(
+        "ix_process_jobs_status_available_at",
+        "process_jobs",
+        ["status", "available_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_process_jobs_lease_expires_at", "process_jobs", ["lease_expires_at"], unique=False
+    )
+    op.create_index("ix_process_jobs_expires_at", "process_jobs", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_process_jobs_expires_at", table_name="process_jobs")
+    op.drop_index("ix_process_jobs_lease_expires_at", table_name="process_jobs")
+    op.drop_index("ix_process_jobs_status_available_at", table_name="process_jobs")
+    op.drop_index("ix_process_jobs_note_sha256", table_name="process_jobs")
+    op.drop_index("ix_process_jobs_created_at", table_name="process_jobs")
+    op.drop_table("process_jobs")
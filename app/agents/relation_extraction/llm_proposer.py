@@ -16,6 +16,7 @@ from typing import Any, Protocol, TypeVar
 from pydantic import BaseModel, Field
 
 from app.agents.aggregator.timeline_aggregator import EntityLedger, LinkProposal
+from app.infra.deadline import budget_skip_warning
 
 _TRUTHY = {"1", "true", "yes", "y", "on"}
 
@@ -137,6 +138,11 @@ def propose_relations_ml(
             metrics=metrics,
         )
 
+    deadline_warning = budget_skip_warning("relations_ml")
+    if deadline_warning:
+        metrics["skipped"] = "deadline"
+        return RelationsMLProposerResult(relations_ml=[], warnings=[deadline_warning], metrics=metrics)
+
     only_missing = _truthy_env("RELATIONS_ML_ONLY_MISSING")
     propose_nav_targets = _truthy_env("RELATIONS_ML_PROPOSE_NAV_TARGETS")
 
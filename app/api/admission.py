@@ -0,0 +1,110 @@
+"""Admission control middleware (see ``app.infra.admission``).
+
+Pipeline routes are admitted or shed before the request body is read, so an
+overloaded server answers a rejected request in microseconds instead of queueing
+it behind the backlog. Health, metrics, UI assets, UMLS suggest and other cheap
+routes are ``critical`` and pass straight through. ``ADMISSION_CONTROL=0``
+disables shedding.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infra.admission import Priority, get_admission_controller
+from app.infra.settings import get_infra_settings
+from observability.metrics import emit_metric
+
+# POST routes that run the extraction pipeline or an LLM call.
+_STANDARD_ROUTES = re.compile(
+    r"^(?:"
+    r"/api/v1/process"
+    r"|/api/v1/registry/runs"
+    r"|/api/v1/registry/[^/]+/append"
+    r"|/(?:api|v1)/registry/(?:extract|v3/run)"
+    r"|/v1/registry/run"
+    r"|/v1/coder/run"
+    r"|/qa/run"
+    r"|/report/(?:seed_from_text|transcribe_audio|clean_seed_text)"
+    r")/?$"
+)
+_BULK_ROUTES = re.compile(r"^/api/v1/(?:process/batch|process_bundle)/?$")
+
+
+def classify_request(method: str, path: str) -> Priority:
+    if method != "POST":
+        return "critical"
+    if _BULK_ROUTES.match(path):
+        return "bulk"
+    if _STANDARD_ROUTES.match(path):
+        return "standard"
+    return "critical"
+
+
+async def _reject(
+    send: Send, *, retry_after_s: int, predicted_wait_s: float, priority: str
+) -> None:
+    body = json.dumps({"detail": "Server overloaded; retry later"}).encode("utf-8")
+    admission = f"shed;class={priority};predicted_wait_s={predicted_wait_s:.1f}"
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"retry-after", str(retry_after_s).encode("ascii")),
+                (b"x-admission", admission.encode("ascii")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionControlMiddleware:
+    """Pure ASGI middleware so streamed responses stay counted until their last byte."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not get_infra_settings().admission_control:
+            await self.app(scope, receive, send)
+            return
+        priority = classify_request(scope.get("method", "GET"), scope.get("path", ""))
+        if priority == "critical":
+            await self.app(scope, receive, send)
+            return
+
+        controller = get_admission_controller()
+        decision = controller.try_admit(priority)
+        if not decision.admitted:
+            emit_metric("incr", "admission_shed_total", tags={"class": priority})
+            await _reject(
+                send,
+                retry_after_s=decision.retry_after_s,
+                predicted_wait_s=decision.predicted_wait_s,
+                priority=priority,
+            )
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def _send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = int(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            controller.release(priority, elapsed_s=time.perf_counter() - started, ok=status < 500)
+
+
+__all__ = ["AdmissionControlMiddleware", "classify_request"]
@@ -10,6 +10,7 @@ from concurrent.futures import ThreadPoolExecutor
 import httpx
 from fastapi import FastAPI
 
+from app.infra.warmup_graph import WarmupGraph, WarmupTask
 from config.startup_settings import validate_startup_env
 
 
@@ -17,6 +18,76 @@ def _env_truthy(value: str | None) -> bool:
     return str(value or "").strip().lower() in {"1", "true", "yes", "on"}
 
 
+def _bootstrap_registry_bundle() -> None:
+    from app.registry.model_bootstrap import ensure_registry_model_bundle
+
+    ensure_registry_model_bundle()
+
+
+def _warm_umls_store() -> None:
+    from config.settings import UmlsSettings
+
+    if not UmlsSettings().enable_linker:
+        return
+    from app.umls.ip_umls_store import get_ip_umls_store
+
+    # Maps the store only; the suggest index is built on the first suggest call.
+    get_ip_umls_store()
+
+
+def _warm_coding() -> None:
+    from app.api.dependencies import get_coding_service, get_kb_repo
+
+    get_kb_repo()
+    get_coding_service()
+
+
+def _warm_registry_service() -> None:
+    from app.api.dependencies import get_registry_service
+
+    # Builds the parallel-pathway orchestrator, which loads the granular NER model.
+    get_registry_service()
+
+
+def _warm_registry_ml() -> None:
+    from app.api.dependencies import get_registry_service
+
+    registry_service = get_registry_service()
+    registry_service._get_registry_ml_predictor()
+    _ = registry_service.registry_engine
+
+
+def _warm_phi_scrubber() -> None:
+    from app.api.phi_dependencies import _get_scrubber
+
+    _get_scrubber()
+
+
+def startup_warmup_tasks() -> list[WarmupTask]:
+    """The startup warmup DAG: NLP models plus the pipeline services and models.
+
+    Capabilities: ``nlp``, ``umls``, ``coding``, ``ner``, ``registry_ml`` and
+    ``phi_server``. The registry bundle bootstrap and UMLS are best-effort, as
+    before: a failed bundle download does not stop the registry ML load from a
+    bundle already on disk.
+    """
+    from app.infra.nlp_warmup import nlp_warmup_tasks
+
+    return [
+        *nlp_warmup_tasks(),
+        WarmupTask("registry_bundle", _bootstrap_registry_bundle, required=False),
+        WarmupTask("coding", _warm_coding, capabilities=("coding",)),
+        WarmupTask("registry_service", _warm_registry_service, capabilities=("ner",)),
+        WarmupTask(
+            "registry_ml",
+            _warm_registry_ml,
+            requires=("registry_bundle", "registry_service"),
+            capabilities=("registry_ml",),
+        ),
+        WarmupTask("phi_scrubber", _warm_phi_scrubber, capabilities=("phi_server",)),
+    ]
+
+
 class StartupBootstrap:
     """Encapsulate app lifespan startup and shutdown side effects."""
 
@@ -28,9 +99,6 @@ class StartupBootstrap:
         from app.infra.nlp_warmup import (
             should_skip_warmup as _should_skip_warmup,
         )
-        from app.infra.nlp_warmup import (
-            warm_heavy_resources_sync as _warm_heavy_resources_sync,
-        )
         from app.infra.settings import get_infra_settings
         from app.registry.model_runtime import verify_registry_runtime_bundle
 
@@ -42,6 +110,22 @@ class StartupBootstrap:
         self.app.state.model_error = None
         self.app.state.ready_event = asyncio.Event()
         self.app.state.cpu_executor = ThreadPoolExecutor(max_workers=settings.cpu_workers)
+        self.app.state.cpu_process_pool = None
+        if settings.cpu_executor == "process":
+            from app.api.services.cpu_tasks import init_pipeline_worker
+            from app.infra.process_pool import CpuProcessPool
+
+            self.app.state.cpu_process_pool = CpuProcessPool(
+                settings.cpu_workers,
+                initializer=init_pipeline_worker,
+                max_tasks_per_child=settings.cpu_worker_max_tasks,
+            )
+            self.app.state.cpu_process_pool.start()
+            self.logger.info(
+                "CPU process pool started (workers=%d, max_tasks_per_child=%d)",
+                settings.cpu_workers,
+                settings.cpu_worker_max_tasks,
+            )
         self.app.state.llm_sem = asyncio.Semaphore(settings.llm_concurrency)
         self.app.state.llm_http = httpx.AsyncClient(
             timeout=httpx.Timeout(
@@ -84,75 +168,121 @@ class StartupBootstrap:
             raise RuntimeError(f"Registry runtime bundle validation failed: {exc}") from exc
 
         loop = asyncio.get_running_loop()
+        self.app.state.warmup = None
 
-        def _warmup_worker() -> None:
-            try:
-                _warm_heavy_resources_sync()
-            except Exception as exc:  # noqa: BLE001
-                ok = False
-                error = f"{type(exc).__name__}: {exc}"
-                self.logger.error("Warmup failed: %s", error, exc_info=True)
-            else:
-                ok = True
-                error = None
-            self.app.state.model_ready = ok
-            self.app.state.model_error = error
-            loop.call_soon_threadsafe(self.app.state.ready_event.set)
+        if settings.skip_warmup or _should_skip_warmup():
+            self.logger.info("Skipping heavy NLP warmup (disabled via environment)")
+            self.app.state.model_ready = True
+            self.app.state.ready_event.set()
+            executor = self.app.state.cpu_executor
+            loop.run_in_executor(executor, self._best_effort, _bootstrap_registry_bundle)
+            loop.run_in_executor(executor, self._best_effort, _warm_umls_store)
+        else:
+            graph = WarmupGraph(startup_warmup_tasks(), max_workers=settings.warmup_workers)
+            self.app.state.warmup = graph
 
-        def _bootstrap_registry_models() -> None:
-            try:
-                from app.registry.model_bootstrap import ensure_registry_model_bundle
+            def _run_warmup() -> None:
+                if not graph.run():
+                    raise RuntimeError(graph.error or "warmup did not finish")
+                elapsed_ms = graph.snapshot()["elapsed_ms"] or 0.0
+                self.logger.info("Warmup finished in %.0f ms", elapsed_ms)
 
-                ensure_registry_model_bundle()
-            except Exception as exc:  # noqa: BLE001
-                self.logger.warning("Registry model bundle bootstrap skipped/failed: %s", exc)
+            def _warmup_worker() -> None:
+                try:
+                    _run_warmup()
+                except Exception as exc:  # noqa: BLE001
+                    ok = False
+                    error = f"{type(exc).__name__}: {exc}"
+                    self.logger.error("Warmup failed: %s", error)
+                else:
+                    ok = True
+                    error = None
+                self.app.state.model_ready = ok
+                self.app.state.model_error = error
+                loop.call_soon_threadsafe(self.app.state.ready_event.set)
 
-        def _warm_umls_store() -> None:
-            try:
-                from config.settings import UmlsSettings
+            if settings.background_warmup:
+                resources = len(graph.snapshot()["resources"])
+                self.logger.info("Starting background warmup (%d resources)", resources)
+                loop.run_in_executor(self.app.state.cpu_executor, _warmup_worker)
+            else:
+                self.logger.info("Running warmup before serving traffic")
+                try:
+                    await loop.run_in_executor(self.app.state.cpu_executor, _run_warmup)
+                except Exception as exc:  # noqa: BLE001
+                    ok = False
+                    error = f"{type(exc).__name__}: {exc}"
+                    self.logger.error("Warmup failed: %s", error)
+                else:
+                    ok = True
+                    error = None
+                self.app.state.model_ready = ok
+                self.app.state.model_error = error
+                self.app.state.ready_event.set()
 
-                if not UmlsSettings().enable_linker:
-                    return
-                from app.umls.ip_umls_store import get_ip_umls_store
+        self.app.state.job_workers = None
+        if settings.jobs_enabled:
+            await self._start_job_workers(settings)
 
-                _ = get_ip_umls_store()
-                self.logger.info("UMLS store warmup completed")
-            except Exception as exc:  # noqa: BLE001
-                self.logger.warning("UMLS store warmup failed: %s", exc)
+    def _best_effort(self, fn) -> None:
+        try:
+            fn()
+        except Exception as exc:  # noqa: BLE001
+            self.logger.warning("%s skipped/failed: %s", fn.__name__.lstrip("_"), exc)
 
-        if settings.skip_warmup or _should_skip_warmup():
-            self.logger.info("Skipping heavy NLP warmup (disabled via environment)")
-            self.app.state.model_ready = True
-            self.app.state.ready_event.set()
-        elif settings.background_warmup:
-            self.logger.info("Starting background warmup")
-            loop.run_in_executor(self.app.state.cpu_executor, _warmup_worker)
-        else:
-            self.logger.info("Running warmup before serving traffic")
+    async def _start_job_workers(self, settings) -> None:
+        from app.api.services.job_worker import start_job_workers
+        from app.registry_store.job_queue import get_job_queue
+
+        queue = get_job_queue()
+        explicit_autocreate = os.getenv("PROCSUITE_PHI_AUTOCREATE_TABLES")
+        should_autocreate = (
+            _env_truthy(explicit_autocreate)
+            if explicit_autocreate is not None
+            else queue.engine.dialect.name == "sqlite"
+        )
+        if should_autocreate:
             try:
-                await loop.run_in_executor(self.app.state.cpu_executor, _warm_heavy_resources_sync)
+                await asyncio.to_thread(queue.ensure_table)
             except Exception as exc:  # noqa: BLE001
-                ok = False
-                error = f"{type(exc).__name__}: {exc}"
-                self.logger.error("Warmup failed: %s", error, exc_info=True)
-            else:
-                ok = True
-                error = None
-            self.app.state.model_ready = ok
-            self.app.state.model_error = error
-            self.app.state.ready_event.set()
-
-        loop.run_in_executor(self.app.state.cpu_executor, _bootstrap_registry_models)
-        loop.run_in_executor(self.app.state.cpu_executor, _warm_umls_store)
+                self.logger.warning("Could not initialize process_jobs table: %s", exc)
+        if settings.jobs_workers <= 0:
+            self.logger.info("Jobs API enabled without in-process workers (JOBS_WORKERS=0)")
+            return
+        self.app.state.job_workers = await start_job_workers(
+            self.app,
+            queue,
+            count=settings.jobs_workers,
+            poll_interval_s=settings.jobs_poll_interval_s,
+        )
+        self.logger.info("Started %d job worker(s)", settings.jobs_workers)
 
     async def shutdown(self) -> None:
+        warmup = getattr(self.app.state, "warmup", None)
+        if warmup is not None:
+            warmup.shutdown()
+
+        job_workers = getattr(self.app.state, "job_workers", None)
+        if job_workers is not None:
+            from app.api.services.job_worker import stop_job_workers
+
+            await stop_job_workers(*job_workers)
+
         llm_http = getattr(self.app.state, "llm_http", None)
         if llm_http is not None:
             await llm_http.aclose()
 
+        from app.infra.http_transport import aclose_http_clients
+
+        await aclose_http_clients()
+
         cpu_executor = getattr(self.app.state, "cpu_executor", None)
         if cpu_executor is not None:
             cpu_executor.shutdown(wait=False, cancel_futures=True)
 
+        cpu_process_pool = getattr(self.app.state, "cpu_process_pool", None)
+        if cpu_process_pool is not None:
+            cpu_process_pool.shutdown()
+
 
-__all__ = ["StartupBootstrap"]
+__all__ = ["StartupBootstrap", "startup_warmup_tasks"]
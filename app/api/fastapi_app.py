@@ -17,12 +17,12 @@ import os
 from contextlib import asynccontextmanager
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, AsyncIterator, List
+from typing import Annotated, Any, AsyncIterator, List
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
@@ -42,9 +42,12 @@ if not _truthy_env("PROCSUITE_SKIP_DOTENV"):
             type(e).__name__,
         )
 
+from app.api.admission import AdmissionControlMiddleware
 from app.api.bootstrap import StartupBootstrap
 from app.api.ml_advisor_router import router as ml_advisor_router
+from app.api.readiness import unknown_capabilities
 from app.api.registry_payload import shape_registry_payload as _shape_registry_payload
+from app.api.routes.jobs import router as jobs_router
 from app.api.routes.legacy_coder import router as legacy_coder_router
 from app.api.routes.legacy_registry import router as legacy_registry_router
 from app.api.routes.metrics import router as metrics_router
@@ -62,7 +65,10 @@ from app.api.routes.unified_process import router as unified_process_router
 from app.api.routes.vault import router as vault_router
 from app.api.routes_registry import router as registry_extract_router
 from app.api.schemas import KnowledgeMeta
+from app.api.ui_assets import REVALIDATE_CACHE_CONTROL, file_response, vendor_asset_response
 from app.common.knowledge import knowledge_hash, knowledge_version
+from app.infra.admission import get_admission_controller
+from app.infra.warmup_graph import FAILED, READY
 
 
 # ============================================================================
@@ -83,6 +89,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Shed pipeline requests early under overload (added first so CORS headers still wrap the 503).
+app.add_middleware(AdmissionControlMiddleware)
+
 # CORS (dev-friendly defaults)
 app.add_middleware(
     CORSMiddleware,
@@ -121,8 +130,12 @@ async def _phi_redactor_headers(request: Request, call_next):
         # Access-Control-Request-Private-Network: true and expects this header.
         if request.headers.get("access-control-request-private-network", "").lower() == "true":
             resp.headers["Access-Control-Allow-Private-Network"] = "true"
-        # Avoid stale caching during rapid iteration/debugging.
-        resp.headers.setdefault("Cache-Control", "no-store")
+        # HTML entry points are never cached; everything else revalidates
+        # (ETag) unless the route set a longer policy (fingerprinted vendor assets).
+        if resp.headers.get("content-type", "").startswith("text/html"):
+            resp.headers.setdefault("Cache-Control", "no-store")
+        else:
+            resp.headers.setdefault("Cache-Control", REVALIDATE_CACHE_CONTROL)
     return resp
 
 
@@ -152,6 +165,8 @@ app.include_router(umls_router, prefix="/api")
 app.include_router(vault_router, prefix="/api")
 # Bundle process router (multi-doc ZK ingestion)
 app.include_router(process_bundle_router, prefix="/api")
+# Asynchronous /v1/process jobs (durable queue)
+app.include_router(jobs_router, prefix="/api")
 # Legacy/API support routers split from this composition root.
 app.include_router(legacy_coder_router)
 app.include_router(legacy_registry_router)
@@ -159,14 +174,18 @@ app.include_router(reporting_router)
 app.include_router(qa_router)
 
 
-def _phi_redactor_response(path: Path) -> FileResponse:
-    resp = FileResponse(path)
-    # Required for SharedArrayBuffer in modern browsers (cross-origin isolation).
-    resp.headers["Cross-Origin-Opener-Policy"] = "same-origin"
-    resp.headers["Cross-Origin-Embedder-Policy"] = "require-corp"
-    # Avoid stale client-side caching during rapid iteration/debugging.
-    resp.headers["Cache-Control"] = "no-store"
-    return resp
+def _phi_redactor_response(request: Request, path: Path) -> Response:
+    # Revalidated on every load (ETag -> 304), so edits show up immediately.
+    return file_response(
+        request,
+        path,
+        cache_control=REVALIDATE_CACHE_CONTROL,
+        # Required for SharedArrayBuffer in modern browsers (cross-origin isolation).
+        headers={
+            "Cross-Origin-Opener-Policy": "same-origin",
+            "Cross-Origin-Embedder-Policy": "require-corp",
+        },
+    )
 
 
 def _ui_variant() -> str:
@@ -256,77 +275,81 @@ def ui_index_html() -> HTMLResponse:
 
 
 @app.get("/ui/phi_redactor/app.js")
-def phi_redactor_app_js() -> FileResponse:
+def phi_redactor_app_js(request: Request) -> Response:
     if not _static_files_enabled():
         raise HTTPException(status_code=404, detail="Static files disabled")
-    return _phi_redactor_response(_phi_redactor_static_dir() / "app.js")
+    return _phi_redactor_response(request, _phi_redactor_static_dir() / "app.js")
 
 
 @app.get("/ui/phi_redactor/redactor.worker.js")
-def phi_redactor_worker_js() -> FileResponse:
+def phi_redactor_worker_js(request: Request) -> Response:
     if not _static_files_enabled():
         raise HTTPException(status_code=404, detail="Static files disabled")
-    return _phi_redactor_response(_phi_redactor_static_dir() / "redactor.worker.js")
+    return _phi_redactor_response(request, _phi_redactor_static_dir() / "redactor.worker.js")
 
 
 @app.get("/ui/redactor.worker.legacy.js")
-def phi_redactor_worker_legacy_js() -> FileResponse:
+def phi_redactor_worker_legacy_js(request: Request) -> Response:
     if not _static_files_enabled():
         raise HTTPException(status_code=404, detail="Static files disabled")
-    return _phi_redactor_response(_phi_redactor_static_dir() / "redactor.worker.legacy.js")
+    return _phi_redactor_response(request, _phi_redactor_static_dir() / "redactor.worker.legacy.js")
 
 
 @app.get("/ui/protectedVeto.legacy.js")
-def phi_redactor_protected_veto_legacy_js() -> FileResponse:
+def phi_redactor_protected_veto_legacy_js(request: Request) -> Response:
     if not _static_files_enabled():
         raise HTTPException(status_code=404, detail="Static files disabled")
-    return _phi_redactor_response(_phi_redactor_static_dir() / "protectedVeto.legacy.js")
+    return _phi_redactor_response(request, _phi_redactor_static_dir() / "protectedVeto.legacy.js")
 
 
 @app.get("/ui/transformers.min.js")
-def phi_redactor_transformers_min_js() -> FileResponse:
+def phi_redactor_transformers_min_js(request: Request) -> Response:
     if not _static_files_enabled():
         raise HTTPException(status_code=404, detail="Static files disabled")
-    return _phi_redactor_response(_phi_redactor_static_dir() / "transformers.min.js")
+    return _phi_redactor_response(request, _phi_redactor_static_dir() / "transformers.min.js")
 
 
 @app.get("/ui/phi_redactor/styles.css")
-def phi_redactor_styles_css() -> FileResponse:
+def phi_redactor_styles_css(request: Request) -> Response:
     if not _static_files_enabled():
         raise HTTPException(status_code=404, detail="Static files disabled")
-    return _phi_redactor_response(_phi_redactor_static_dir() / "styles.css")
+    return _phi_redactor_response(request, _phi_redactor_static_dir() / "styles.css")
 
 
 @app.get("/ui/phi_redactor/protectedVeto.js")
-def phi_redactor_protected_veto_js() -> FileResponse:
+def phi_redactor_protected_veto_js(request: Request) -> Response:
     if not _static_files_enabled():
         raise HTTPException(status_code=404, detail="Static files disabled")
-    return _phi_redactor_response(_phi_redactor_static_dir() / "protectedVeto.js")
+    return _phi_redactor_response(request, _phi_redactor_static_dir() / "protectedVeto.js")
 
 
 @app.get("/ui/phi_redactor/allowlist_trie.json")
-def phi_redactor_allowlist() -> FileResponse:
+def phi_redactor_allowlist(request: Request) -> Response:
     if not _static_files_enabled():
         raise HTTPException(status_code=404, detail="Static files disabled")
-    return _phi_redactor_response(_phi_redactor_static_dir() / "allowlist_trie.json")
+    return _phi_redactor_response(request, _phi_redactor_static_dir() / "allowlist_trie.json")
 
 
 @app.get("/ui/phi_redactor/vendor/{asset_path:path}")
-def phi_redactor_vendor_asset(asset_path: str) -> FileResponse:
+@app.get("/ui/vendor/{asset_path:path}")
+def phi_redactor_vendor_asset(request: Request, asset_path: str) -> Response:
+    """Vendor assets: fingerprinted names are immutable, plain names revalidate.
+
+    See ``app/api/ui_assets.py`` and ``ops/tools/build_ui_vendor_assets.py``.
+    """
     if not _static_files_enabled():
         raise HTTPException(status_code=404, detail="Static files disabled")
-    vendor_dir = _phi_redactor_static_dir() / "vendor"
-    asset = (vendor_dir / asset_path).resolve()
-    if vendor_dir not in asset.parents or not asset.exists() or not asset.is_file():
-        raise HTTPException(status_code=404, detail="Asset not found")
-    return _phi_redactor_response(asset)
+    resp = vendor_asset_response(request, _phi_redactor_static_dir() / "vendor", asset_path)
+    resp.headers["Cross-Origin-Opener-Policy"] = "same-origin"
+    resp.headers["Cross-Origin-Embedder-Policy"] = "require-corp"
+    return resp
 
 
 @app.get("/ui/phi_redactor/sw.js")
-def phi_redactor_sw() -> FileResponse:
+def phi_redactor_sw(request: Request) -> Response:
     if not _static_files_enabled():
         raise HTTPException(status_code=404, detail="Static files disabled")
-    return _phi_redactor_response(_phi_redactor_static_dir() / "sw.js")
+    return _phi_redactor_response(request, _phi_redactor_static_dir() / "sw.js")
 
 
 @app.get("/ui/phi_identifiers", include_in_schema=False)
@@ -465,21 +488,62 @@ async def health(request: Request) -> dict[str, bool]:
 
 
 @app.get("/ready")
-async def ready(request: Request) -> JSONResponse:
+async def ready(
+    request: Request, capability: Annotated[list[str] | None, Query()] = None
+) -> JSONResponse:
+    """Readiness probe.
+
+    200 once warmup has finished. With ``?capability=ner&capability=registry_ml``
+    it is 200 as soon as those capabilities are warm. While a warmup graph is
+    running (or after it ran) the body lists each capability's state and each
+    resource's load time and RSS delta. An unknown capability is a 400.
+    """
+    graph = getattr(request.app.state, "warmup", None)
+    unknown = unknown_capabilities(graph, capability or ())
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown capability: {', '.join(unknown)}")
     is_ready = bool(getattr(request.app.state, "model_ready", False))
-    if is_ready:
-        return JSONResponse(status_code=200, content={"status": "ok", "ready": True})
-
     model_error = getattr(request.app.state, "model_error", None)
-    content: dict[str, Any] = {"status": "warming", "ready": False}
+    if capability and graph is not None:
+        is_ready = all(graph.capability_state(cap) == READY for cap in capability)
+        failed = [cap for cap in capability if graph.capability_state(cap) == FAILED]
+        model_error = graph.capability_error(failed[0]) if failed else None
+
+    content: dict[str, Any] = {"status": "ok", "ready": True}
+    if not is_ready:
+        content = {"status": "error" if model_error else "warming", "ready": False}
+        if model_error:
+            content["error"] = str(model_error)
+    if graph is not None:
+        content.update(graph.snapshot())
+
+    if is_ready:
+        return JSONResponse(status_code=200, content=content)
     if model_error:
-        content["status"] = "error"
-        content["error"] = str(model_error)
         return JSONResponse(status_code=503, content=content)
-
     return JSONResponse(status_code=503, content=content, headers={"Retry-After": "10"})
 
 
+@app.get("/health/cpu_pool")
+async def cpu_pool_health(request: Request) -> JSONResponse:
+    """Ping the CPU process-pool workers (``CPU_EXECUTOR=process``).
+
+    Returns 200 when every responding worker finished its preload, 503 otherwise.
+    """
+    pool = getattr(request.app.state, "cpu_process_pool", None)
+    if pool is None:
+        return JSONResponse(status_code=200, content={"status": "disabled", "executor": "thread"})
+    report = await pool.health()
+    report["status"] = "ok" if report["ok"] else "degraded"
+    return JSONResponse(status_code=200 if report["ok"] else 503, content=report)
+
+
+@app.get("/health/admission")
+async def admission_health() -> dict[str, Any]:
+    """Admission-control state: in-flight requests, CPU backlog and the predicted wait."""
+    return get_admission_controller().snapshot()
+
+
 @app.get("/health/nlp")
 async def nlp_health() -> JSONResponse:
     """Check NLP model readiness.
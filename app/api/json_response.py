@@ -0,0 +1,128 @@
+"""Fast JSON responses for the large pipeline models.
+
+With ``response_model=...``, FastAPI dumps the returned model to a dict,
+validates that dict against the model again, dumps it once more and encodes it
+with ``json.dumps``. For a ``UnifiedProcessResponse`` carrying evidence spans
+and a V3 event log, that is about 10x the cost of serializing it directly.
+
+``ModelJSONResponse`` serializes an already-validated model once with
+pydantic-core's Rust serializer (``model_dump_json``). Routes that return it
+keep ``response_model`` for the OpenAPI schema only. pydantic-core is also
+about 4x faster than ``model_dump(mode="json")`` followed by orjson, so no
+extra JSON library is needed. ``ops/tools/bench_response_serialization.py``
+compares the paths.
+
+``fields=`` lets a client ask for only some sections of a
+``UnifiedProcessResponse``. It takes field names or the groups in
+``FIELD_GROUPS``, comma-separated (``fields=registry,codes``). The review flags
+are always included so a client cannot drop them by accident.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Mapping
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.api.schemas import UnifiedProcessResponse
+from observability.metrics import emit_metric
+
+FIELD_GROUPS: dict[str, tuple[str, ...]] = {
+    "registry": ("registry_uuid", "registry"),
+    "evidence": ("evidence", "umls_normalization"),
+    "event_log": ("registry_v3_event_log",),
+    "codes": ("cpt_codes", "suggestions"),
+    "financials": ("total_work_rvu", "estimated_payment", "per_code_billing"),
+    "review": (
+        "needs_manual_review",
+        "review_status",
+        "coder_difficulty",
+        "audit_warnings",
+        "validation_errors",
+        "missing_field_prompts",
+    ),
+    "meta": ("pipeline_mode", "kb_version", "policy_version", "processing_time_ms"),
+}
+_ALWAYS_INCLUDED = ("needs_manual_review", "review_status")
+
+FIELDS_QUERY_DESCRIPTION = (
+    "Comma-separated response sections to return (field names or groups: "
+    + ", ".join(sorted(FIELD_GROUPS))
+    + "). Review flags are always included. Default: everything."
+)
+
+
+def response_field_excludes(fields: str | None) -> set[str] | None:
+    """``UnifiedProcessResponse`` fields to leave out for a ``fields=`` value (``None`` = keep all).
+
+    Raises 400 for unknown names, before any pipeline work is done.
+    """
+    if fields is None or not fields.strip():
+        return None
+    known = set(UnifiedProcessResponse.model_fields)
+    selected: set[str] = set(_ALWAYS_INCLUDED)
+    unknown: list[str] = []
+    for name in (part.strip() for part in fields.split(",")):
+        if not name:
+            continue
+        if name in FIELD_GROUPS:
+            selected.update(FIELD_GROUPS[name])
+        elif name in known:
+            selected.add(name)
+        else:
+            unknown.append(name)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": f"Unknown fields: {', '.join(unknown)}",
+                "groups": sorted(FIELD_GROUPS),
+                "fields": sorted(known),
+            },
+        )
+    return known - selected
+
+
+class ModelJSONResponse(Response):
+    """JSON response for an already-validated model, serialized once.
+
+    Applies ``exclude_none`` like the routes' ``response_model_exclude_none``.
+    ``exclude`` takes pydantic's set/dict form (see ``response_field_excludes``).
+    ``serialize_ms`` is how long the body took to render.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        model: BaseModel,
+        *,
+        exclude: Any = None,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        route: str = "",
+    ) -> None:
+        self._exclude = exclude
+        self._route = route
+        self.serialize_ms = 0.0
+        super().__init__(content=model, status_code=status_code, headers=dict(headers or {}))
+
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        body = content.model_dump_json(exclude_none=True, exclude=self._exclude).encode("utf-8")
+        self.serialize_ms = (time.perf_counter() - started) * 1000.0
+        tags = {"route": self._route}
+        emit_metric("timing", "response_serialize_ms", self.serialize_ms, tags=tags)
+        emit_metric("observe", "response_bytes", len(body), tags=tags)
+        return body
+
+
+__all__ = [
+    "FIELDS_QUERY_DESCRIPTION",
+    "FIELD_GROUPS",
+    "ModelJSONResponse",
+    "response_field_excludes",
+]
@@ -1,5 +1,11 @@
 """Readiness gating for heavy endpoints.
 
+Startup warmup (``app.api.bootstrap``) loads resources in a dependency graph
+and reports readiness per capability. Routes gate only on the capabilities
+they need, so they are served as soon as those are warm rather than when the
+whole warmup has finished. Without a warmup graph (warmup skipped) the gates
+fall back to the single ``model_ready`` flag.
+
 This module is intentionally dependency-light to avoid import cycles with
 `app.api.fastapi_app`.
 """
@@ -7,16 +13,29 @@ This module is intentionally dependency-light to avoid import cycles with
 from __future__ import annotations
 
 import asyncio
+from typing import Awaitable, Callable, Iterable
 
 from fastapi import HTTPException, Request
 
 from app.infra.settings import get_infra_settings
+from app.infra.warmup_graph import FAILED, READY, WarmupGraph
 
 _DEFAULT_RETRY_AFTER_S = 10
 
+WARMUP_CAPABILITIES: tuple[str, ...] = ("nlp", "umls", "coding", "ner", "registry_ml", "phi_server")
+"""Capabilities the startup warmup (``app.api.bootstrap.startup_warmup_tasks``) provides."""
 
-async def require_ready(request: Request) -> None:
-    """Fail fast (503) if heavy resources are still warming up."""
+PIPELINE_CAPABILITIES: tuple[str, ...] = ("nlp", "ner", "registry_ml", "coding")
+"""What the extraction pipeline (``/api/v1/process`` and friends) needs."""
+
+
+def unknown_capabilities(graph: WarmupGraph | None, capabilities: Iterable[str]) -> list[str]:
+    """The names in ``capabilities`` that ``graph`` (or the startup warmup) does not provide."""
+    known = graph.capabilities() if graph is not None else WARMUP_CAPABILITIES
+    return [cap for cap in capabilities if cap not in known]
+
+
+async def _require_model_ready(request: Request) -> None:
     if bool(getattr(request.app.state, "model_ready", False)):
         return
 
@@ -45,4 +64,60 @@ async def require_ready(request: Request) -> None:
     )
 
 
-__all__ = ["require_ready"]
+async def _require(request: Request, capabilities: tuple[str, ...]) -> None:
+    graph = getattr(request.app.state, "warmup", None)
+    if graph is None:
+        await _require_model_ready(request)
+        return
+
+    def unready() -> list[str]:
+        return [cap for cap in capabilities if graph.capability_state(cap) != READY]
+
+    missing = unready()
+    if not missing:
+        return
+    wait_s = float(get_infra_settings().wait_for_ready_s)
+    if wait_s > 0:
+        await graph.wait_for_capabilities(missing, timeout=wait_s)
+        missing = unready()
+        if not missing:
+            return
+
+    for cap in missing:
+        if graph.capability_state(cap) == FAILED:
+            detail = f"Warmup failed: {graph.capability_error(cap)}"
+            raise HTTPException(status_code=503, detail=detail)
+    raise HTTPException(
+        status_code=503,
+        detail=f"Service warming up ({', '.join(missing)})",
+        headers={"Retry-After": str(_DEFAULT_RETRY_AFTER_S)},
+    )
+
+
+async def require_ready(request: Request) -> None:
+    """Fail fast (503) if the extraction pipeline's resources are still warming up."""
+    await _require(request, PIPELINE_CAPABILITIES)
+
+
+def require_capabilities(*capabilities: str) -> Callable[[Request], Awaitable[None]]:
+    """Dependency that fails fast (503) until the given warmup capabilities are ready.
+
+    Raises ``ValueError`` when built with a capability the warmup does not provide.
+    """
+    unknown = unknown_capabilities(None, capabilities)
+    if unknown:
+        raise ValueError(f"Unknown warmup capabilities: {', '.join(unknown)}")
+
+    async def _require_capabilities(request: Request) -> None:
+        await _require(request, capabilities)
+
+    return _require_capabilities
+
+
+__all__ = [
+    "PIPELINE_CAPABILITIES",
+    "WARMUP_CAPABILITIES",
+    "require_capabilities",
+    "require_ready",
+    "unknown_capabilities",
+]
@@ -0,0 +1,137 @@
+"""Asynchronous job endpoints (`/api/v1/jobs`).
+
+`POST /v1/jobs` stores a `/v1/process` request in the durable job queue and
+returns 202 at once. Workers (see ``app.api.services.job_worker``) run it
+through the same pipeline, and the client polls `GET /v1/jobs/{id}` for stage
+progress and the result. Queued jobs survive restarts, and a job whose worker
+dies is picked up again once its visibility timeout expires.
+
+Requires ``JOBS_ENABLED=1``. Like Registry Runs, the note is persisted, so only
+already-scrubbed notes that pass the PHI-risk gate are accepted.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import uuid
+from datetime import UTC, datetime
+
+from fastapi import APIRouter, HTTPException, Response
+
+from app.api.schemas import (
+    JobStatusResponse,
+    JobSubmitResponse,
+    UnifiedProcessRequest,
+    UnifiedProcessResponse,
+)
+from app.infra.settings import get_infra_settings
+from app.registry_store.job_queue import get_job_queue
+from app.registry_store.models import ProcessJob
+from app.registry_store.phi_gate import scan_text_for_phi_risk
+
+router = APIRouter(tags=["jobs"])
+
+
+def _enforce_jobs_enabled() -> None:
+    if not get_infra_settings().jobs_enabled:
+        raise HTTPException(status_code=503, detail="Asynchronous jobs are disabled")
+
+
+def _parse_job_id(job_id: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(job_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail="Job not found") from exc
+
+
+def _iso(value: datetime | None) -> str | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:  # SQLite hands back naive UTC timestamps
+        value = value.replace(tzinfo=UTC)
+    return value.isoformat()
+
+
+def _serialize_job(job: ProcessJob) -> JobStatusResponse:
+    result = UnifiedProcessResponse.model_validate(job.result_json) if job.result_json else None
+    return JobStatusResponse(
+        job_id=str(job.id),
+        status=job.status,
+        attempts=int(job.attempts or 0),
+        max_attempts=int(job.max_attempts or 0),
+        progress=list(job.progress_json or []),
+        result=result,
+        error=job.error,
+        status_code=job.status_code,
+        processing_time_ms=job.processing_time_ms,
+        created_at=_iso(job.created_at),
+        started_at=_iso(job.started_at),
+        finished_at=_iso(job.finished_at),
+        expires_at=_iso(job.expires_at),
+    )
+
+
+@router.post(
+    "/v1/jobs",
+    response_model=JobSubmitResponse,
+    status_code=202,
+    summary="Queue a /v1/process request and return immediately",
+)
+async def submit_job(payload: UnifiedProcessRequest, response: Response) -> JobSubmitResponse:
+    _enforce_jobs_enabled()
+    if not payload.already_scrubbed:
+        raise HTTPException(
+            status_code=400,
+            detail="Jobs persist the note; submit scrubbed text with already_scrubbed=true",
+        )
+    phi_risk_reasons = scan_text_for_phi_risk(payload.note)
+    if phi_risk_reasons:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "PHI risk detected in scrubbed text; job rejected",
+                "reasons": phi_risk_reasons,
+            },
+        )
+
+    settings = get_infra_settings()
+    queue = get_job_queue()
+    if await asyncio.to_thread(queue.depth) >= settings.jobs_max_queued:
+        raise HTTPException(
+            status_code=503,
+            detail="Job queue is full; retry later",
+            headers={"Retry-After": str(max(1, int(settings.jobs_poll_interval_s * 10)))},
+        )
+
+    note_sha256 = hashlib.sha256(payload.note.encode("utf-8")).hexdigest()
+    job = await asyncio.to_thread(
+        queue.enqueue, payload.model_dump(mode="json"), note_sha256=note_sha256
+    )
+    status_url = f"/api/v1/jobs/{job.id}"
+    response.headers["Location"] = status_url
+    return JobSubmitResponse(job_id=str(job.id), status="queued", status_url=status_url)
+
+
+@router.get("/v1/jobs/{job_id}", response_model=JobStatusResponse, response_model_exclude_none=True)
+async def get_job(job_id: str) -> JobStatusResponse:
+    _enforce_jobs_enabled()
+    job = await asyncio.to_thread(get_job_queue().get, _parse_job_id(job_id))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _serialize_job(job)
+
+
+@router.delete(
+    "/v1/jobs/{job_id}", response_model=JobStatusResponse, response_model_exclude_none=True
+)
+async def cancel_job(job_id: str) -> JobStatusResponse:
+    """Cancel a queued or running job; finished jobs are returned unchanged."""
+    _enforce_jobs_enabled()
+    job = await asyncio.to_thread(get_job_queue().cancel, _parse_job_id(job_id))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _serialize_job(job)
+
+
+__all__ = ["router"]
@@ -7,20 +7,27 @@ This endpoint is additive and intended for a client-side temporal translation fl
 
 from __future__ import annotations
 
+import asyncio
 import os
 import time
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
 from app.agents.aggregator.timeline_aggregator import BundleDocInput, aggregate_entity_ledger
 from app.agents.relation_extraction.llm_proposer import propose_relations_ml
 from app.agents.relation_extraction.shadow_mode import merge_relations_shadow_mode
 from app.api.dependencies import get_coding_service, get_registry_service
+from app.api.json_response import (
+    FIELDS_QUERY_DESCRIPTION,
+    ModelJSONResponse,
+    response_field_excludes,
+)
 from app.api.phi_dependencies import get_phi_scrubber
 from app.api.readiness import require_ready
 from app.api.schemas import (
     BundleDocResponse,
+    ParsedDocRequest,
     ProcessBundleRequest,
     ProcessBundleResponse,
     UnifiedProcessRequest,
@@ -32,6 +39,8 @@ from app.api.services.bundle_processing import (
 )
 from app.api.services.unified_pipeline import run_unified_pipeline_logic
 from app.coder.application.coding_service import CodingService
+from app.infra.deadline import request_deadline
+from app.infra.settings import get_infra_settings
 from app.registry.application.registry_service import RegistryService
 
 router = APIRouter(tags=["process"])
@@ -98,9 +107,13 @@ async def process_bundle(
     registry_service: RegistryService = _registry_service_dep,
     coding_service: CodingService = _coding_service_dep,
     phi_scrubber=_phi_scrubber_dep,
-) -> ProcessBundleResponse:
+    fields: str | None = Query(
+        default=None, description=FIELDS_QUERY_DESCRIPTION + " Applies to each document."
+    ),
+) -> Response:
     start_time = time.time()
     response.headers["X-Process-Route"] = "bundle_router"
+    result_excludes = response_field_excludes(fields)
 
     # Guardrail: reject absolute date-like strings (PHI leak) in any document.
     for doc in payload.documents:
@@ -114,52 +127,64 @@ async def process_bundle(
                 ),
             )
 
-    docs_out: list[BundleDocResponse] = []
-    for doc in sorted(payload.documents, key=lambda d: int(d.seq)):
-        doc_offset_days = extract_doc_t_offset_days(doc.text)
-        clean_text = strip_system_header(doc.text)
-        unified_req = UnifiedProcessRequest(
-            note=clean_text,
-            already_scrubbed=payload.already_scrubbed,
-            locality=payload.locality,
-            include_financials=payload.include_financials,
-            explain=payload.explain,
-            include_v3_event_log=payload.include_v3_event_log,
-        )
-        result, _, _ = await run_unified_pipeline_logic(
-            payload=unified_req,
-            request=request,
-            registry_service=registry_service,
-            coding_service=coding_service,
-            phi_scrubber=phi_scrubber,
-        )
-
-        docs_out.append(
-            BundleDocResponse(
+    # One deadline for the whole bundle; each document's pipeline run nests under it.
+    with request_deadline(get_infra_settings().request_deadline_s):
+        semaphore = asyncio.Semaphore(get_infra_settings().process_batch_concurrency)
+
+        async def _run_doc(doc: ParsedDocRequest) -> BundleDocResponse:
+            async with semaphore:
+                unified_req = UnifiedProcessRequest(
+                    note=strip_system_header(doc.text),
+                    already_scrubbed=payload.already_scrubbed,
+                    locality=payload.locality,
+                    include_financials=payload.include_financials,
+                    explain=payload.explain,
+                    include_v3_event_log=payload.include_v3_event_log,
+                )
+                result, _, _ = await run_unified_pipeline_logic(
+                    payload=unified_req,
+                    request=request,
+                    registry_service=registry_service,
+                    coding_service=coding_service,
+                    phi_scrubber=phi_scrubber,
+                )
+            return BundleDocResponse(
                 timepoint_role=doc.timepoint_role,
                 seq=doc.seq,
-                doc_t_offset_days=doc_offset_days,
+                doc_t_offset_days=extract_doc_t_offset_days(doc.text),
                 result=result,
             )
-        )
 
-    processing_time_ms = (time.time() - start_time) * 1000.0
-    ledger = aggregate_entity_ledger(
-        [
-            BundleDocInput(
-                timepoint_role=doc.timepoint_role.value,
-                seq=doc.seq,
-                doc_t_offset_days=doc.doc_t_offset_days,
-                registry=doc.result.registry,
-            )
-            for doc in docs_out
+        # Documents are independent until aggregation, so run them concurrently
+        # (bounded like /v1/process/batch); gather keeps results in seq order.
+        # The first failure fails the bundle and cancels the remaining documents.
+        tasks = [
+            asyncio.create_task(_run_doc(doc))
+            for doc in sorted(payload.documents, key=lambda d: int(d.seq))
         ]
-    )
-    confidence_threshold = float(os.getenv("RELATIONS_ML_CONFIDENCE_THRESHOLD", "0.85"))
-    ml_result = propose_relations_ml(
-        ledger=ledger,
-        relations_heuristic=ledger.link_proposals,
-    )
+        try:
+            docs_out: list[BundleDocResponse] = list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        processing_time_ms = (time.time() - start_time) * 1000.0
+        ledger = aggregate_entity_ledger(
+            [
+                BundleDocInput(
+                    timepoint_role=doc.timepoint_role.value,
+                    seq=doc.seq,
+                    doc_t_offset_days=doc.doc_t_offset_days,
+                    registry=doc.result.registry,
+                )
+                for doc in docs_out
+            ]
+        )
+        confidence_threshold = float(os.getenv("RELATIONS_ML_CONFIDENCE_THRESHOLD", "0.85"))
+        ml_result = propose_relations_ml(
+            ledger=ledger,
+            relations_heuristic=ledger.link_proposals,
+        )
     shadow = merge_relations_shadow_mode(
         relations_heuristic=ledger.link_proposals,
         relations_ml=ml_result.relations_ml,
@@ -170,7 +195,7 @@ async def process_bundle(
         "ml": ml_result.metrics,
         "merge": shadow.metrics,
     }
-    return ProcessBundleResponse(
+    bundle = ProcessBundleResponse(
         zk_patient_id=payload.zk_patient_id,
         episode_id=payload.episode_id,
         documents=docs_out,
@@ -183,6 +208,10 @@ async def process_bundle(
         relations_metrics=relations_metrics,
         processing_time_ms=processing_time_ms,
     )
+    exclude = {"documents": {"__all__": {"result": result_excludes}}} if result_excludes else None
+    return ModelJSONResponse(
+        bundle, exclude=exclude, headers=response.headers, route="process_bundle"
+    )
 
 
 __all__ = ["router"]
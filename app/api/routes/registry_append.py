@@ -18,7 +18,7 @@ from sqlalchemy.orm import Session
 from app.api.auth import AuthenticatedUser, get_current_user
 from app.api.phi_dependencies import get_phi_scrubber
 from app.api.phi_redaction import apply_phi_redaction
-from app.api.readiness import require_ready
+from app.api.readiness import PIPELINE_CAPABILITIES, require_capabilities
 from app.api.routes.registry_case import RegistryCaseResponse, _build_case_response
 from app.api.services.bundle_processing import count_date_like_strings
 from app.registry.application.case_aggregator import CaseAggregator
@@ -31,7 +31,9 @@ from app.vault.models import UserPatientVault
 router = APIRouter(tags=["registry-append"])
 logger = logging.getLogger(__name__)
 
-_ready_dep = Depends(require_ready)
+# Append scrubs the note and re-aggregates the case with ``CaseAggregator``, which
+# runs the extraction pipeline, so it waits for the same capabilities as rebuild.
+_ready_dep = Depends(require_capabilities(*PIPELINE_CAPABILITIES, "phi_server"))
 _current_user_dep = Depends(get_current_user)
 _db_dep = Depends(get_registry_store_db)
 _phi_scrubber_dep = Depends(get_phi_scrubber)
@@ -286,7 +286,6 @@ def _build_case_response(
 )
 def get_registry_case(
     registry_uuid: uuid.UUID,
-    _ready: None = _ready_dep,
     current_user: AuthenticatedUser = _current_user_dep,
     db: Session = _db_dep,
 ) -> RegistryCaseResponse:
@@ -325,7 +324,6 @@ def get_registry_case(
 def patch_registry_case(
     registry_uuid: uuid.UUID,
     payload: RegistryCasePatchRequest,
-    _ready: None = _ready_dep,
     current_user: AuthenticatedUser = _current_user_dep,
     db: Session = _db_dep,
 ) -> RegistryCaseResponse:
@@ -317,7 +317,6 @@ async def create_registry_run(
 def submit_registry_run_feedback(
     run_id: uuid.UUID,
     payload: RegistryRunFeedbackRequest,
-    _ready: None = _ready_dep,
     db: Session = _registry_store_db_dep,
 ) -> dict[str, Any]:
     _enforce_registry_runs_enabled()
@@ -349,7 +348,6 @@ def submit_registry_run_feedback(
 def upsert_registry_run_correction(
     run_id: uuid.UUID,
     payload: RegistryRunCorrectionRequest,
-    _ready: None = _ready_dep,
     db: Session = _registry_store_db_dep,
 ) -> dict[str, Any]:
     _enforce_registry_runs_enabled()
@@ -377,7 +375,6 @@ def upsert_registry_run_correction(
     summary="List registry runs (admin-lite, no auth yet)",
 )
 def list_registry_runs(
-    _ready: None = _ready_dep,
     db: Session = _registry_store_db_dep,
     limit: int = 50,
     offset: int = 0,
@@ -453,7 +450,6 @@ def list_registry_runs(
 )
 def get_registry_run(
     run_id: uuid.UUID,
-    _ready: None = _ready_dep,
     db: Session = _registry_store_db_dep,
 ) -> RegistryRunGetResponse:
     _enforce_registry_runs_enabled()
@@ -471,7 +467,6 @@ def get_registry_run(
     summary="Export registry runs as JSONL (scrubbed-only)",
 )
 def export_registry_runs(
-    _ready: None = _ready_dep,
     db: Session = _registry_store_db_dep,
     has_feedback: bool | None = None,
     has_correction: bool | None = None,
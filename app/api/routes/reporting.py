@@ -663,7 +663,6 @@ async def report_transcribe_audio(
     audio_file: UploadFile = _report_audio_file,
     source: str = _report_audio_source,
     cloud_fallback_confirmed: bool = _report_audio_cloud_fallback_confirmed,
-    _ready: None = _ready_dep,
 ) -> ReporterSpeechTranscriptionResponse:
     try:
         payload = await audio_file.read()
@@ -689,7 +688,6 @@ async def report_transcribe_audio(
 @router.post("/report/clean_seed_text", response_model=SpeechTranscriptCleanupResponse)
 async def report_clean_seed_text(
     req: SpeechTranscriptCleanupRequest,
-    _ready: None = _ready_dep,
 ) -> SpeechTranscriptCleanupResponse:
     try:
         result = clean_scrubbed_reporter_transcript(
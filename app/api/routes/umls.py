@@ -3,11 +3,26 @@ from __future__ import annotations
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
 
 from config.settings import UmlsSettings
 
 router = APIRouter(tags=["umls"])
 
+MAX_MATCH_TERMS = 1000
+
+
+class UmlsMatchRequest(BaseModel):
+    terms: list[str] = Field(..., max_length=MAX_MATCH_TERMS, description="Terms to resolve")
+    category: str | None = None
+
+
+class UmlsMatchResponse(BaseModel):
+    results: list[dict[str, Any] | None] = Field(
+        default_factory=list,
+        description="One entry per input term (same order); null when unmatched",
+    )
+
 
 def _require_store():
     settings = UmlsSettings()
@@ -26,9 +41,16 @@ def suggest(
     q: str = Query(..., min_length=1),
     category: str | None = None,
     limit: int = Query(20, ge=1, le=50),
+    fuzzy: bool = False,
 ) -> list[dict[str, Any]]:
     store = _require_store()
-    return store.suggest(q, category=category, limit=limit)
+    return store.suggest(q, category=category, limit=limit, fuzzy=fuzzy)
+
+
+@router.post("/v1/umls/match", response_model=UmlsMatchResponse)
+def match(request: UmlsMatchRequest) -> UmlsMatchResponse:
+    store = _require_store()
+    return UmlsMatchResponse(results=store.match_many(request.terms, category=request.category))
 
 
 @router.get("/v1/umls/concept/{cui}")
@@ -7,28 +7,44 @@ This module provides the `/api/v1/process` endpoint which combines:
    - deterministically derive CPT codes from the extracted `RegistryRecord`
    - optional audit/self-correction to surface omissions and review flags
 3. Response shaping for the UI (codes + evidence + review status)
+
+`/api/v1/process/batch` runs many notes through the same pipeline concurrently
+and streams one NDJSON result line per note as each completes.
 """
 
 from __future__ import annotations
 
 import logging
+import time
+from contextlib import aclosing
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from app.api.dependencies import get_coding_service, get_registry_service
+from app.api.json_response import (
+    FIELDS_QUERY_DESCRIPTION,
+    ModelJSONResponse,
+    response_field_excludes,
+)
 from app.api.phi_dependencies import get_phi_scrubber
 from app.api.readiness import require_ready
 from app.api.schemas import (
     CameraOcrCorrectionRequest,
     CameraOcrCorrectionResponse,
+    ProcessBatchItem,
+    ProcessBatchRequest,
     UnifiedProcessRequest,
     UnifiedProcessResponse,
 )
-from app.api.services.unified_pipeline import run_unified_pipeline_logic
+from app.api.services.batch_processing import iter_batch_results
+from app.api.services.unified_pipeline import record_stage_timings, run_unified_pipeline_logic
 from app.coder.application.coding_service import CodingService
 from app.common.exceptions import LLMError
 from app.infra.executors import run_cpu
+from app.infra.perf import format_server_timing
+from app.infra.settings import get_infra_settings
 from app.registry.application.registry_service import RegistryService
 from app.text_cleaning.camera_ocr_cleaner import (
     CameraOcrCleanerUnavailable,
@@ -57,17 +73,98 @@ async def unified_process(
     registry_service: RegistryService = _registry_service_dep,
     coding_service: CodingService = _coding_service_dep,
     phi_scrubber=_phi_scrubber_dep,
-) -> UnifiedProcessResponse:
-    """Run the unified extraction pipeline."""
+    fields: str | None = Query(default=None, description=FIELDS_QUERY_DESCRIPTION),
+) -> Response:
+    """Run the unified extraction pipeline.
+
+    The ``Server-Timing`` header breaks the request down by pipeline stage,
+    plus ``serialization`` and ``total``.
+    """
+    started = time.perf_counter()
     response.headers["X-Process-Route"] = "router"
-    result, _, _ = await run_unified_pipeline_logic(
+    exclude = response_field_excludes(fields)
+    result, _, meta = await run_unified_pipeline_logic(
         payload=payload,
         request=request,
         registry_service=registry_service,
         coding_service=coding_service,
         phi_scrubber=phi_scrubber,
     )
-    return result
+    if meta.get("result_cache"):
+        response.headers["X-Result-Cache"] = str(meta["result_cache"])
+    rendered = ModelJSONResponse(
+        result, exclude=exclude, headers=response.headers, route="process"
+    )
+    record_stage_timings(
+        {"serialization": rendered.serialize_ms}, pipeline_mode=result.pipeline_mode
+    )
+    timings = {
+        **(meta.get("stage_timings") or {}),
+        "serialization": rendered.serialize_ms,
+        "total": (time.perf_counter() - started) * 1000.0,
+    }
+    rendered.headers["Server-Timing"] = format_server_timing(timings)
+    return rendered
+
+
+@router.post(
+    "/v1/process/batch",
+    response_class=StreamingResponse,
+    summary="Process many notes concurrently; results stream back as NDJSON",
+)
+async def unified_process_batch(
+    payload: ProcessBatchRequest,
+    request: Request,
+    _ready: None = _ready_dep,
+    registry_service: RegistryService = _registry_service_dep,
+    coding_service: CodingService = _coding_service_dep,
+    phi_scrubber=_phi_scrubber_dep,
+) -> StreamingResponse:
+    """Run the unified pipeline for each item and stream `ProcessBatchItemResult` lines.
+
+    Lines arrive in completion order; `id` and `index` tie them back to the
+    request. Each item gets its own request deadline, and a failed item is
+    reported on its own line with the status `/v1/process` would have returned.
+    """
+    settings = get_infra_settings()
+    if len(payload.items) > settings.process_batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"Batch has {len(payload.items)} items; "
+                f"the limit is {settings.process_batch_max_items}."
+            ),
+        )
+    concurrency = settings.process_batch_concurrency
+    if payload.concurrency is not None:
+        concurrency = min(payload.concurrency, concurrency)
+
+    async def _run_item(item: ProcessBatchItem) -> UnifiedProcessResponse:
+        result, _, _ = await run_unified_pipeline_logic(
+            payload=item,
+            request=request,
+            registry_service=registry_service,
+            coding_service=coding_service,
+            phi_scrubber=phi_scrubber,
+        )
+        return result
+
+    async def _lines():
+        rows = iter_batch_results(payload.items, run_item=_run_item, concurrency=concurrency)
+        # aclosing: a client disconnect closes this generator, which must cancel unfinished items.
+        async with aclosing(rows):
+            async for row in rows:
+                yield row.model_dump_json(exclude_none=True) + "\n"
+
+    return StreamingResponse(
+        _lines(),
+        media_type="application/x-ndjson",
+        headers={
+            "X-Process-Route": "batch_router",
+            "X-Batch-Size": str(len(payload.items)),
+            "X-Batch-Concurrency": str(concurrency),
+        },
+    )
 
 
 @router.post(
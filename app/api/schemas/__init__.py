@@ -13,10 +13,15 @@ from app.api.schemas.base import (
     CoderResponse,
     CodeSuggestionSummary,
     HybridPipelineMetadata,
+    JobStatusResponse,
+    JobSubmitResponse,
     JsonPatchOperation,
     KnowledgeMeta,
     MissingFieldPrompt,
     ParsedDocRequest,
+    ProcessBatchItem,
+    ProcessBatchItemResult,
+    ProcessBatchRequest,
     ProcessBundleRequest,
     ProcessBundleResponse,
     QARunRequest,
@@ -66,8 +71,13 @@ __all__ = [
     "CoderResponse",
     "CodeSuggestionSummary",
     "HybridPipelineMetadata",
+    "JobStatusResponse",
+    "JobSubmitResponse",
     "KnowledgeMeta",
     "ParsedDocRequest",
+    "ProcessBatchItem",
+    "ProcessBatchItemResult",
+    "ProcessBatchRequest",
     "ProcessBundleRequest",
     "ProcessBundleResponse",
     "MissingFieldPrompt",
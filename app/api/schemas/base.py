@@ -472,6 +472,85 @@ class UnifiedProcessResponse(BaseModel):
     processing_time_ms: float = 0.0
 
 
+class ProcessBatchItem(UnifiedProcessRequest):
+    """One note in a `/v1/process/batch` request."""
+
+    id: str = Field(
+        ...,
+        min_length=1,
+        description="Client-provided item id, echoed on its result line.",
+    )
+
+
+class ProcessBatchRequest(BaseModel):
+    """Request schema for batch processing; results stream back as NDJSON."""
+
+    items: list[ProcessBatchItem] = Field(..., min_length=1)
+    concurrency: int | None = Field(
+        None,
+        ge=1,
+        description=(
+            "Max items processed at once; capped by the server's PROCESS_BATCH_CONCURRENCY."
+        ),
+    )
+
+    @model_validator(mode="after")
+    def _unique_ids(self) -> ProcessBatchRequest:
+        seen: set[str] = set()
+        for item in self.items:
+            if item.id in seen:
+                raise ValueError(f"duplicate item id: {item.id!r}")
+            seen.add(item.id)
+        return self
+
+
+class ProcessBatchItemResult(BaseModel):
+    """One NDJSON line of a `/v1/process/batch` response, emitted as the item completes."""
+
+    id: str
+    index: int = Field(..., description="Position of the item in the request.")
+    status_code: int = Field(..., description="HTTP status `/v1/process` would have returned.")
+    result: UnifiedProcessResponse | None = None
+    error: str | None = None
+    processing_time_ms: float = 0.0
+
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class JobSubmitResponse(BaseModel):
+    """Returned by `POST /v1/jobs` (202) once the request is durably queued."""
+
+    job_id: str
+    status: JobStatus
+    status_url: str = Field(..., description="Poll this URL for progress and the result.")
+
+
+class JobStatusResponse(BaseModel):
+    """State of one `/v1/jobs` job; `result` is set once it has succeeded."""
+
+    job_id: str
+    status: JobStatus
+    attempts: int = 0
+    max_attempts: int = 0
+    progress: list[dict[str, Any]] = Field(
+        default_factory=list,
+        description="Stage events (`queued`, `claimed`, then started/finished per pipeline stage).",
+    )
+    result: UnifiedProcessResponse | None = None
+    error: str | None = None
+    status_code: int | None = Field(
+        default=None, description="HTTP status `/v1/process` returned for the last attempt."
+    )
+    processing_time_ms: float | None = None
+    created_at: str | None = None
+    started_at: str | None = None
+    finished_at: str | None = None
+    expires_at: str | None = Field(
+        default=None, description="When the finished job and result are purged."
+    )
+
+
 class BundleDocResponse(BaseModel):
     timepoint_role: BundleTimepointRole
     seq: int
@@ -541,6 +620,11 @@ __all__ = [
     "SpeechTranscriptCleanupResponse",
     "UnifiedProcessRequest",
     "UnifiedProcessResponse",
+    "ProcessBatchItem",
+    "ProcessBatchItemResult",
+    "ProcessBatchRequest",
+    "JobStatusResponse",
+    "JobSubmitResponse",
     "BundleTimepointRole",
     "ParsedDocRequest",
     "ProcessBundleRequest",
@@ -0,0 +1,77 @@
+"""Concurrent scheduling for ``/api/v1/process/batch``.
+
+Items run through the normal single-note pipeline, at most ``concurrency`` at
+a time, so the CPU executor and the LLM limiter stay busy together. Results
+are yielded in completion order. A failed item becomes a result line with the
+status code ``/v1/process`` would have returned; it never fails the batch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+
+from fastapi import HTTPException
+
+from app.api.schemas import ProcessBatchItem, ProcessBatchItemResult, UnifiedProcessResponse
+
+logger = logging.getLogger(__name__)
+
+RunItem = Callable[[ProcessBatchItem], Awaitable[UnifiedProcessResponse]]
+
+
+async def _run_one(
+    index: int,
+    item: ProcessBatchItem,
+    run_item: RunItem,
+    semaphore: asyncio.Semaphore,
+) -> ProcessBatchItemResult:
+    async with semaphore:
+        started = time.perf_counter()
+        status_code = 200
+        result: UnifiedProcessResponse | None = None
+        error: str | None = None
+        try:
+            result = await run_item(item)
+        except HTTPException as exc:
+            status_code, error = exc.status_code, str(exc.detail)
+        except Exception as exc:  # noqa: BLE001 - one bad note must not end the stream
+            logger.error("Batch item %s failed: %s", item.id, exc, exc_info=True)
+            status_code, error = 500, f"Internal processing error ({type(exc).__name__})"
+        return ProcessBatchItemResult(
+            id=item.id,
+            index=index,
+            status_code=status_code,
+            result=result,
+            error=error,
+            processing_time_ms=(time.perf_counter() - started) * 1000.0,
+        )
+
+
+async def iter_batch_results(
+    items: Sequence[ProcessBatchItem],
+    *,
+    run_item: RunItem,
+    concurrency: int,
+) -> AsyncIterator[ProcessBatchItemResult]:
+    """Run ``run_item`` over ``items`` and yield each result as it completes.
+
+    Items start in request order. Closing the iterator (e.g. the client
+    disconnected) cancels the items that have not finished.
+    """
+    semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+    tasks = [
+        asyncio.create_task(_run_one(index, item, run_item, semaphore))
+        for index, item in enumerate(items)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+__all__ = ["RunItem", "iter_batch_results"]
@@ -0,0 +1,64 @@
+"""Pipeline tasks for the CPU process pool (``CPU_EXECUTOR=process``).
+
+``init_pipeline_worker`` preloads a worker process. Task functions take and
+return plain dicts and run on the worker's own cached services.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from fastapi import FastAPI
+
+from app.infra.executors import run_cpu_task
+from app.registry.application.registry_service import PrefetchedV3, RegistryExtractionResult
+
+logger = logging.getLogger(__name__)
+
+
+def init_pipeline_worker() -> None:
+    """Load the registry/coding services, KB, ML predictors and NLP models once per worker."""
+    from app.api.dependencies import get_coding_service, get_kb_repo, get_registry_service
+    from app.infra.nlp_warmup import should_skip_warmup, warm_heavy_resources_sync
+    from app.infra.settings import get_infra_settings
+
+    registry_service = get_registry_service()
+    registry_service._get_registry_ml_predictor()
+    _ = registry_service.registry_engine
+    get_kb_repo()
+    get_coding_service()
+    if not (get_infra_settings().skip_warmup or should_skip_warmup()):
+        warm_heavy_resources_sync()
+    logger.info("CPU pipeline worker preloaded")
+
+
+def extract_fields_task(payload: dict[str, Any]) -> dict[str, Any]:
+    from app.api.dependencies import get_registry_service
+
+    prefetch = payload.get("structurer_prefetch")
+    result = get_registry_service().extract_fields(
+        payload["note_text"],
+        structurer_prefetch=PrefetchedV3.from_payload(prefetch) if prefetch else None,
+    )
+    return result.to_payload()
+
+
+async def extract_fields_in_pool(
+    app: FastAPI,
+    note_text: str,
+    *,
+    structurer_prefetch: PrefetchedV3 | None = None,
+) -> RegistryExtractionResult:
+    """``RegistryService.extract_fields`` on a CPU pool worker.
+
+    Passed to ``aextract_fields(extract=...)``.
+    """
+    payload: dict[str, Any] = {"note_text": note_text}
+    if structurer_prefetch is not None:
+        payload["structurer_prefetch"] = structurer_prefetch.to_payload()
+    result = await run_cpu_task(app, extract_fields_task, payload)
+    return RegistryExtractionResult.from_payload(result)
+
+
+__all__ = ["extract_fields_in_pool", "extract_fields_task", "init_pipeline_worker"]
@@ -0,0 +1,252 @@
+"""Workers that drain the `/v1/jobs` queue through the `/v1/process` pipeline.
+
+``JobWorker.run`` claims jobs from the ``JobQueue`` and runs each through
+``run_unified_pipeline_logic``, so jobs share the app's CPU executor, LLM
+limiter, request deadline and result cache with synchronous requests.
+While a job runs:
+
+- pipeline stage boundaries (``app.infra.perf.mark_stage``) are recorded as
+  progress events;
+- a heartbeat saves progress and extends the lease every third of the
+  visibility timeout, or sooner when a new event arrives;
+- if the heartbeat finds the lease gone (job cancelled, or reclaimed after a
+  stall) the run is cancelled and nothing is written back.
+
+Workers run inside the API process (``JOBS_WORKERS``) or standalone
+(``ops/tools/job_worker.py``); both coordinate only through the database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+from fastapi import FastAPI, HTTPException
+from starlette.requests import Request
+
+from app.api.dependencies import get_coding_service, get_registry_service
+from app.api.schemas import UnifiedProcessRequest
+from app.api.services.unified_pipeline import run_unified_pipeline_logic
+from app.infra.perf import stage_listener
+from app.registry_store.job_queue import ClaimedJob, JobQueue
+
+logger = logging.getLogger(__name__)
+
+_PURGE_INTERVAL_S = 60.0
+
+
+def _now_iso() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def default_worker_id(index: int = 0) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+def _job_request(app: FastAPI) -> Request:
+    """A stand-in HTTP request so the pipeline finds ``app.state`` (executors, limiter)."""
+    scope = {"type": "http", "app": app, "method": "POST", "path": "/api/v1/jobs", "headers": []}
+    return Request(scope)
+
+
+def _resolve(app: FastAPI, dependency):
+    return app.dependency_overrides.get(dependency, dependency)()
+
+
+class JobWorker:
+    def __init__(
+        self,
+        app: FastAPI,
+        queue: JobQueue,
+        *,
+        worker_id: str,
+        poll_interval_s: float = 1.0,
+    ) -> None:
+        self.app = app
+        self.queue = queue
+        self.worker_id = worker_id
+        self.poll_interval_s = max(0.01, float(poll_interval_s))
+        self.heartbeat_interval_s = max(0.05, queue.visibility_timeout_s / 3.0)
+        self._last_purge = 0.0
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Process jobs until ``stop`` is set."""
+        logger.info("Job worker %s started", self.worker_id)
+        while not stop.is_set():
+            try:
+                await self._maybe_purge()
+                job = await asyncio.to_thread(self.queue.claim, self.worker_id)
+            except Exception as exc:  # noqa: BLE001 - a DB hiccup must not kill the worker
+                logger.warning("Job claim failed: %s", type(exc).__name__)
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval_s)
+                except TimeoutError:
+                    pass
+                continue
+            await self.process(job)
+        logger.info("Job worker %s stopped", self.worker_id)
+
+    async def run_once(self) -> bool:
+        """Claim and process a single job; ``False`` when the queue was empty."""
+        job = await asyncio.to_thread(self.queue.claim, self.worker_id)
+        if job is None:
+            return False
+        await self.process(job)
+        return True
+
+    async def _maybe_purge(self) -> None:
+        now = time.monotonic()
+        if now - self._last_purge < _PURGE_INTERVAL_S:
+            return
+        self._last_purge = now
+        await asyncio.to_thread(self.queue.purge_expired)
+
+    async def process(self, job: ClaimedJob) -> None:
+        loop = asyncio.get_running_loop()
+        progress: list[dict[str, Any]] = list(job.progress)
+        progress.append({"event": "claimed", "attempt": job.attempt, "at": _now_iso()})
+        changed = asyncio.Event()
+
+        def _on_stage(stage: str, event: str, elapsed_ms: float | None) -> None:
+            entry: dict[str, Any] = {
+                "event": event,
+                "stage": stage,
+                "attempt": job.attempt,
+                "at": _now_iso(),
+            }
+            if elapsed_ms is not None:
+                entry["elapsed_ms"] = round(elapsed_ms, 2)
+            progress.append(entry)
+            loop.call_soon_threadsafe(changed.set)
+
+        started = time.perf_counter()
+        run = asyncio.create_task(self._run_pipeline(job, _on_stage))
+        try:
+            while not run.done():
+                changed.clear()
+                waiter = asyncio.create_task(changed.wait())
+                await asyncio.wait(
+                    {run, waiter},
+                    timeout=self.heartbeat_interval_s,
+                    return_when="FIRST_COMPLETED",
+                )
+                waiter.cancel()
+                if run.done():
+                    break
+                if not await asyncio.to_thread(
+                    self.queue.heartbeat, job.id, self.worker_id, progress=list(progress)
+                ):
+                    logger.info("Job %s was cancelled or its lease was lost; abandoning it", job.id)
+                    run.cancel()
+                    return
+        finally:
+            if not run.done():
+                run.cancel()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        try:
+            response = run.result()
+        except asyncio.CancelledError:
+            return
+        except HTTPException as exc:
+            status = await asyncio.to_thread(
+                self.queue.fail,
+                job.id,
+                self.worker_id,
+                attempt=job.attempt,
+                error=str(exc.detail),
+                status_code=exc.status_code,
+                retryable=exc.status_code >= 500,
+                progress=progress,
+            )
+            logger.info(
+                "Job %s attempt %d failed with %d -> %s",
+                job.id,
+                job.attempt,
+                exc.status_code,
+                status,
+            )
+            return
+        except Exception as exc:  # noqa: BLE001 - unknown errors are treated as transient
+            status = await asyncio.to_thread(
+                self.queue.fail,
+                job.id,
+                self.worker_id,
+                attempt=job.attempt,
+                error=f"{type(exc).__name__}: {exc}",
+                status_code=500,
+                retryable=True,
+                progress=progress,
+            )
+            logger.warning(
+                "Job %s attempt %d raised %s -> %s",
+                job.id,
+                job.attempt,
+                type(exc).__name__,
+                status,
+            )
+            return
+
+        progress.append({"event": "succeeded", "attempt": job.attempt, "at": _now_iso()})
+        stored = await asyncio.to_thread(
+            self.queue.complete,
+            job.id,
+            self.worker_id,
+            result=response.model_dump(mode="json", exclude_none=True),
+            processing_time_ms=round(elapsed_ms, 2),
+            progress=progress,
+        )
+        if not stored:
+            logger.info("Job %s finished after losing its lease; result discarded", job.id)
+
+    async def _run_pipeline(self, job: ClaimedJob, on_stage):
+        payload = UnifiedProcessRequest.model_validate(job.request)
+        with stage_listener(on_stage):
+            response, _, _ = await run_unified_pipeline_logic(
+                payload=payload,
+                request=_job_request(self.app),
+                registry_service=_resolve(self.app, get_registry_service),
+                coding_service=_resolve(self.app, get_coding_service),
+                phi_scrubber=None,  # jobs only accept already-scrubbed notes
+            )
+        return response
+
+
+async def start_job_workers(app: FastAPI, queue: JobQueue, *, count: int, poll_interval_s: float):
+    """Start ``count`` workers; returns ``(stop_event, tasks)`` for ``stop_job_workers``."""
+    stop = asyncio.Event()
+    tasks = [
+        asyncio.create_task(
+            JobWorker(
+                app,
+                queue,
+                worker_id=default_worker_id(i),
+                poll_interval_s=poll_interval_s,
+            ).run(stop),
+            name=f"job-worker-{i}",
+        )
+        for i in range(count)
+    ]
+    return stop, tasks
+
+
+async def stop_job_workers(
+    stop: asyncio.Event, tasks: list[asyncio.Task], *, timeout_s: float = 5.0
+) -> None:
+    """Stop workers; a job still running is left leased and is redelivered after its timeout."""
+    stop.set()
+    _, pending = await asyncio.wait(tasks, timeout=timeout_s) if tasks else (set(), set())
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+__all__ = ["JobWorker", "default_worker_id", "start_job_workers", "stop_job_workers"]
@@ -0,0 +1,196 @@
+"""Idempotent result cache for ``/api/v1/process`` (``PROCESS_RESULT_CACHE=1``).
+
+UI re-submits, registry-run saves, QA reruns and reviewers reopening a case
+send the same scrubbed note again and again. With the cache on, a repeat
+returns the stored ``UnifiedProcessResponse`` without running extraction.
+
+- Only ``already_scrubbed=true`` requests are cached, so keys are only ever
+  derived from scrubbed text (and only as a SHA-256).
+- The key has two parts. ``pipeline_fingerprint()`` covers the KB hash, the
+  registry model provenance, the response/registry schema versions and the
+  environment flags that change pipeline output. The digest covers the note
+  hash and the request flags that shape the response. ``registry_uuid`` is
+  echoed back and is not part of the key.
+- A new fingerprint (KB edit, model bundle swap, flag change) makes old
+  entries unreachable, and the first write under it deletes them.
+- Only complete runs are stored (``is_cacheable``). A warning whose code
+  names an error, a fallback, a timeout, a skipped step or an unavailable
+  component (``V3_EVENT_LOG_ERROR``, ``REGISTRY_LLM_TIMEOUT_FALLBACK_TO_ENGINE``
+  after an LLM 429/5xx, ``DEADLINE_SKIPPED``...) marks a degraded response,
+  which is returned but not cached.
+- Storage is the tiered cache from ``app.infra.llm_cache`` (in-process LRU +
+  SQLite at ``PROCESS_RESULT_CACHE_PATH``), namespace ``process``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Any
+
+from app.api.schemas import UnifiedProcessRequest, UnifiedProcessResponse
+from app.common.knowledge import knowledge_hash
+from app.infra.llm_cache import LLMCacheKey, TieredLLMCache, build_tiered_cache, schema_fingerprint
+from app.infra.settings import get_infra_settings
+from app.registry.model_runtime import get_registry_model_provenance
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "process"
+
+# Environment flags that change what the pipeline returns for the same note.
+_CONFIG_ENV = (
+    "PROCSUITE_PIPELINE_MODE",
+    "PROCSUITE_FAST_MODE",
+    "REGISTRY_EXTRACTION_ENGINE",
+    "REGISTRY_SCHEMA_VERSION",
+    "REGISTRY_AUDITOR_SOURCE",
+    "REGISTRY_RUNTIME_DIR",
+    "REGISTRY_SELF_CORRECT_ENABLED",
+    "REGISTRY_SELF_CORRECT_ALLOWLIST",
+    "REGISTRY_SELF_CORRECT_MAX_ATTEMPTS",
+    "REGISTRY_LLM_FALLBACK_ON_COVERAGE_FAIL",
+    "REGISTRY_USE_STUB_LLM",
+    "STRUCTURED_EXTRACTION_ENABLED",
+    "CAMERA_OCR_FUZZY_NORMALIZE_ENABLED",
+    "CODER_REQUIRE_PHI_REVIEW",
+    "PROMPT_BUDGET_ENABLED",
+    "PROMPT_BUDGET_TOKENIZER",
+    "PROMPT_TOKEN_BUDGET_REGISTRY_EXTRACTION",
+    "PROMPT_TOKEN_BUDGET_QUOTE_REPAIR",
+    "PROMPT_TOKEN_BUDGET_JUDGE",
+    "LLM_PROVIDER",
+    "LLM_PROMPT_VERSION",
+    "OPENAI_MODEL",
+    "OPENAI_MODEL_STRUCTURER",
+    "OPENAI_OFFLINE",
+    "GEMINI_MODEL",
+    "GEMINI_OFFLINE",
+)
+
+
+# Words in a warning code (the part before ``:``) that mark a degraded run.
+_DEGRADED_WORDS = frozenset({"ERROR", "FAILED", "FALLBACK", "TIMEOUT", "SKIPPED", "UNAVAILABLE"})
+
+
+def is_cacheable(response: UnifiedProcessResponse) -> bool:
+    """Whether ``response`` is a complete run: no warning reports a degradation."""
+    for warning in response.audit_warnings:
+        code = str(warning).partition(":")[0]
+        if _DEGRADED_WORDS.intersection(re.split(r"[^A-Z]+", code.upper())):
+            return False
+    return True
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _schema_versions() -> dict[str, str]:
+    from app.registry.schema import RegistryRecord
+
+    return {
+        "response": schema_fingerprint(UnifiedProcessResponse),
+        "registry": schema_fingerprint(RegistryRecord),
+    }
+
+
+def pipeline_fingerprint() -> str:
+    """Short hash of everything besides the request that shapes a response."""
+    provenance = get_registry_model_provenance()
+    parts = {
+        "kb_hash": knowledge_hash() or "",
+        "model_backend": provenance.backend or "",
+        "model_version": provenance.version or "",
+        "schemas": _schema_versions(),
+        "env": {name: os.getenv(name, "").strip() for name in _CONFIG_ENV},
+    }
+    return _sha256(json.dumps(parts, sort_keys=True))[:16]
+
+
+def _request_digest(payload: UnifiedProcessRequest) -> str:
+    parts = {
+        "note_sha256": _sha256(payload.note),
+        "locality": payload.locality,
+        "include_financials": bool(payload.include_financials),
+        "explain": bool(payload.explain),
+        "include_v3_event_log": bool(payload.include_v3_event_log),
+        "source_type": payload.source_type,
+        "ocr_correction_applied": bool(payload.ocr_correction_applied),
+    }
+    return _sha256(json.dumps(parts, sort_keys=True))
+
+
+class ProcessResultCache:
+    def __init__(self, store: TieredLLMCache) -> None:
+        self.store = store
+        self._lock = threading.Lock()
+        self._current_fingerprint: str | None = None
+
+    def key(self, payload: UnifiedProcessRequest) -> LLMCacheKey:
+        return LLMCacheKey(
+            namespace=NAMESPACE,
+            prompt_version=pipeline_fingerprint(),
+            digest=_request_digest(payload),
+        )
+
+    def get(self, key: LLMCacheKey) -> tuple[UnifiedProcessResponse, dict[str, Any]] | None:
+        raw = self.store.get(key)
+        if raw is None:
+            return None
+        try:
+            data = json.loads(raw)
+            response = UnifiedProcessResponse.model_validate(data["response"])
+            return response, dict(data.get("meta") or {})
+        except Exception as exc:  # noqa: BLE001 - a bad entry is a miss, not a failed request
+            logger.warning("Ignoring unreadable process cache entry: %s", type(exc).__name__)
+            return None
+
+    def set(self, key: LLMCacheKey, response: UnifiedProcessResponse, meta: dict[str, Any]) -> bool:
+        if not is_cacheable(response):
+            return False
+        self._drop_stale(key.prompt_version)
+        value = {
+            "response": response.model_dump(mode="json", exclude_none=True),
+            "meta": {k: v for k, v in meta.items() if k != "result_cache"},
+        }
+        self.store.set(key, json.dumps(value, default=str))
+        return True
+
+    def _drop_stale(self, fingerprint: str) -> None:
+        with self._lock:
+            if self._current_fingerprint == fingerprint:
+                return
+            self._current_fingerprint = fingerprint
+        self.store.invalidate(NAMESPACE, keep_prompt_version=fingerprint)
+
+
+@lru_cache(maxsize=1)
+def get_process_result_cache() -> ProcessResultCache | None:
+    """The shared cache, or ``None`` unless ``PROCESS_RESULT_CACHE`` is set."""
+    settings = get_infra_settings()
+    if not settings.enable_process_result_cache:
+        return None
+    max_bytes = int(settings.process_result_cache_max_mb * 1024 * 1024)
+    store = build_tiered_cache(
+        memory_max_entries=256,
+        memory_max_bytes=max(1, max_bytes // 8),
+        disk_path=settings.process_result_cache_path or None,
+        disk_max_bytes=max_bytes,
+        ttl_s=settings.process_result_cache_ttl_s,
+    )
+    return ProcessResultCache(store)
+
+
+__all__ = [
+    "ProcessResultCache",
+    "get_process_result_cache",
+    "is_cacheable",
+    "pipeline_fingerprint",
+]
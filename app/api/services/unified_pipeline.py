@@ -7,16 +7,20 @@ This is used by:
 
 from __future__ import annotations
 
+import functools
+import inspect
 import logging
+import math
 import os
 import re
 import time
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 import httpx
 from fastapi import HTTPException, Request
 
 from app.api.adapters.response_adapter import build_v3_evidence_payload
+from app.api.dependencies import get_registry_service
 from app.api.phi_redaction import apply_phi_redaction
 from app.api.schemas import (
     CodeSuggestionSummary,
@@ -24,12 +28,20 @@ from app.api.schemas import (
     UnifiedProcessRequest,
     UnifiedProcessResponse,
 )
+from app.api.services.cpu_tasks import extract_fields_in_pool
+from app.api.services.result_cache import get_process_result_cache
 from app.coder.application.coding_service import CodingService
 from app.coder.phi_gating import is_phi_review_required
 from app.common.exceptions import LLMError
 from app.common.knowledge import knowledge_hash, knowledge_version
+from app.infra.deadline import DeadlineExceededError, budget_skip_warning, request_deadline
 from app.infra.executors import run_cpu
+from app.infra.llm_limiter import LLMOverloadedError
+from app.infra.perf import StageTimer, mark_stage, stage_listener
+from app.infra.settings import get_infra_settings
+from app.infra.single_flight import get_single_flight
 from app.registry.application.registry_service import RegistryExtractionResult, RegistryService
+from observability.metrics import emit_metric
 
 logger = logging.getLogger(__name__)
 
@@ -82,10 +94,89 @@ async def run_unified_pipeline_logic(
 ) -> tuple[UnifiedProcessResponse, str, dict[str, Any]]:
     """Run the unified extraction-first pipeline.
 
+    Runs under the request deadline (``REQUEST_DEADLINE_S``); optional stages
+    are skipped with a ``DEADLINE_SKIPPED`` warning when time runs short.
+
+    With ``PROCESS_RESULT_CACHE`` on, already-scrubbed requests are answered
+    from the result cache when possible, and identical concurrent requests
+    share one pipeline run. ``metadata["result_cache"]`` is then ``hit`` or
+    ``miss``.
+
+    ``metadata["stage_timings"]`` holds the milliseconds this call spent in
+    each pipeline stage (see ``app.infra.perf.mark_stage``); they are also
+    recorded in the ``pipeline_stage_ms`` histogram.
+
     Returns:
         (response_model, scrubbed_note_text_used, metadata)
     """
 
+    async def _run() -> tuple[UnifiedProcessResponse, str, dict[str, Any]]:
+        return await _run_unified_pipeline(
+            payload=payload,
+            request=request,
+            registry_service=registry_service,
+            coding_service=coding_service,
+            phi_scrubber=phi_scrubber,
+        )
+
+    timer = StageTimer()
+    with stage_listener(timer), request_deadline(get_infra_settings().request_deadline_s):
+        response, note_text, meta = await _run_cached(payload, request, _run)
+    meta = dict(meta, stage_timings={stage: round(ms, 2) for stage, ms in timer.timings.items()})
+    record_stage_timings(timer.timings, pipeline_mode=response.pipeline_mode)
+    return response, note_text, meta
+
+
+def record_stage_timings(timings: dict[str, float], *, pipeline_mode: str) -> None:
+    """Record stage durations (ms) in the ``pipeline_stage_ms`` histogram.
+
+    Labels are the stage name and pipeline mode only, never note content.
+    """
+    for stage, elapsed_ms in timings.items():
+        tags = {"stage": stage, "pipeline_mode": pipeline_mode}
+        emit_metric("timing", "pipeline_stage_ms", elapsed_ms, tags=tags)
+
+
+async def _run_cached(
+    payload: UnifiedProcessRequest,
+    request: Request,
+    run: Callable[[], Awaitable[tuple[UnifiedProcessResponse, str, dict[str, Any]]]],
+) -> tuple[UnifiedProcessResponse, str, dict[str, Any]]:
+    """``run()``, or the process result cache / single-flight in front of it."""
+    cache = get_process_result_cache() if payload.already_scrubbed else None
+    if cache is None:
+        return await run()
+
+    mark_stage("result_cache")
+    key = cache.key(payload)
+    if "no-cache" not in (request.headers.get("cache-control") or "").lower():
+        hit = cache.get(key)
+        if hit is not None:
+            response, meta = hit
+            meta["result_cache"] = "hit"
+            response = response.model_copy(update={"registry_uuid": payload.registry_uuid})
+            return response, payload.note, meta
+
+    async def _run_and_store() -> tuple[UnifiedProcessResponse, str, dict[str, Any]]:
+        result = await run()
+        cache.set(key, result[0], result[2])
+        return result
+
+    response, note_text, meta = await get_single_flight().ado(
+        key.storage_key, _run_and_store, group="process_result"
+    )
+    meta = dict(meta, result_cache="miss", registry_uuid=payload.registry_uuid)
+    return response.model_copy(update={"registry_uuid": payload.registry_uuid}), note_text, meta
+
+
+async def _run_unified_pipeline(
+    *,
+    payload: UnifiedProcessRequest,
+    request: Request,
+    registry_service: RegistryService,
+    coding_service: CodingService,
+    phi_scrubber,
+) -> tuple[UnifiedProcessResponse, str, dict[str, Any]]:
     start_time = time.time()
 
     # 1) PHI Redaction (if not already scrubbed)
@@ -100,6 +191,7 @@ async def run_unified_pipeline_logic(
     if payload.already_scrubbed:
         note_text = payload.note
     else:
+        mark_stage("phi_redaction")
         redaction = apply_phi_redaction(payload.note, phi_scrubber)
         note_text = redaction.text
         redaction_was_scrubbed = bool(redaction.was_scrubbed)
@@ -114,6 +206,7 @@ async def run_unified_pipeline_logic(
         and isinstance(note_text, str)
         and note_text.strip()
     ):
+        mark_stage("ocr_normalization")
         try:
             normalized_text, fuzzy_warnings, fuzzy_meta = apply_camera_ocr_fuzzy_normalization(
                 note_text
@@ -127,10 +220,24 @@ async def run_unified_pipeline_logic(
             )
 
     # 2) Run Registry Extraction (includes CPT coding via Hybrid Orchestrator)
+    mark_stage("extraction")
     try:
-        result: RegistryExtractionResult = await run_cpu(
-            request.app, registry_service.extract_fields, note_text
-        )
+        result: RegistryExtractionResult
+        if inspect.iscoroutinefunction(getattr(registry_service, "aextract_fields", None)):
+            pool_kwargs: dict[str, Any] = {}
+            # The pool workers run their own copy of the shared service, so only
+            # offload when the request uses that service (not an override).
+            if getattr(request.app.state, "cpu_process_pool", None) is not None and (
+                registry_service is get_registry_service()
+            ):
+                pool_kwargs["extract"] = functools.partial(extract_fields_in_pool, request.app)
+            result = await registry_service.aextract_fields(
+                note_text,
+                run_cpu=functools.partial(run_cpu, request.app),
+                **pool_kwargs,
+            )
+        else:
+            result = await run_cpu(request.app, registry_service.extract_fields, note_text)
     except httpx.HTTPStatusError as exc:
         if exc.response is not None and exc.response.status_code == 429:
             retry_after = exc.response.headers.get("Retry-After") or "10"
@@ -140,6 +247,14 @@ async def run_unified_pipeline_logic(
                 headers={"Retry-After": str(retry_after)},
             ) from exc
         raise
+    except DeadlineExceededError as exc:
+        raise HTTPException(status_code=504, detail=f"Request deadline exceeded: {exc}") from exc
+    except LLMOverloadedError as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="LLM capacity exhausted; retry later",
+            headers={"Retry-After": str(max(1, math.ceil(exc.retry_after_s or 10)))},
+        ) from exc
     except LLMError as exc:
         if "429" in str(exc):
             raise HTTPException(
@@ -155,6 +270,7 @@ async def run_unified_pipeline_logic(
         logger.error("Unified process failed: %s", exc, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal processing error") from exc
 
+    mark_stage("coding")
     from app.coder.domain_rules.registry_to_cpt.coding_rules import derive_all_codes_with_meta
     from app.registry.schema import RegistryRecord
 
@@ -226,6 +342,7 @@ async def run_unified_pipeline_logic(
     per_code_billing: list[dict[str, Any]] = []
 
     if payload.include_financials and codes:
+        mark_stage("financials")
         from app.api.services.financials import calculate_financials
         from config.settings import CoderSettings
 
@@ -281,6 +398,9 @@ async def run_unified_pipeline_logic(
 
     # Optional event-log V3 payload (raw procedures[] list).
     if payload.include_v3_event_log:
+        v3_event_log_warning = budget_skip_warning("v3_event_log")
+    if payload.include_v3_event_log and not v3_event_log_warning:
+        mark_stage("v3_event_log")
         try:
             from app.registry.pipelines.v3_pipeline import run_v3_extraction
 
@@ -294,6 +414,7 @@ async def run_unified_pipeline_logic(
     if v3_event_log_warning:
         all_warnings.append(v3_event_log_warning)
 
+    mark_stage("response")
     evidence_payload = build_v3_evidence_payload(record=record, codes=codes)
     if payload.explain is False and not evidence_payload:
         evidence_payload = {}
@@ -325,15 +446,15 @@ async def run_unified_pipeline_logic(
 
             store = get_ip_umls_store()
             dumped = record.model_dump(exclude_none=True)
-            out: dict[str, Any] = {}
+            anatomy_terms: list[tuple[str, str]] = []
 
             clinical = dumped.get("clinical_context") or {}
             if isinstance(clinical, dict):
                 lesion_location = clinical.get("lesion_location")
                 if isinstance(lesion_location, str) and lesion_location.strip():
-                    match = store.match(lesion_location, category="anatomy")
-                    if match:
-                        out["/registry/clinical_context/lesion_location"] = match
+                    anatomy_terms.append(
+                        ("/registry/clinical_context/lesion_location", lesion_location)
+                    )
 
             granular = dumped.get("granular_data") or {}
             if isinstance(granular, dict):
@@ -342,24 +463,23 @@ async def run_unified_pipeline_logic(
                     for idx, target in enumerate(nav_targets[:10]):
                         if not isinstance(target, dict):
                             continue
+                        pointer = f"/registry/granular_data/navigation_targets/{idx}"
                         segment = target.get("target_segment")
                         if isinstance(segment, str) and segment.strip():
-                            match = store.match(segment, category="anatomy")
-                            if match:
-                                out[
-                                    f"/registry/granular_data/navigation_targets/{idx}/target_segment"
-                                ] = match
+                            anatomy_terms.append((f"{pointer}/target_segment", segment))
                         location_text = target.get("target_location_text")
                         if (
                             isinstance(location_text, str)
                             and location_text.strip()
                             and len(location_text) <= 80
                         ):
-                            match = store.match(location_text, category="anatomy")
-                            if match:
-                                out[
-                                    f"/registry/granular_data/navigation_targets/{idx}/target_location_text"
-                                ] = match
+                            anatomy_terms.append((f"{pointer}/target_location_text", location_text))
+
+            out: dict[str, Any] = {}
+            matches = store.match_many([text for _, text in anatomy_terms], category="anatomy")
+            for (pointer, _), match in zip(anatomy_terms, matches, strict=True):
+                if match:
+                    out[pointer] = match
 
             umls_normalization = out or None
     except Exception:
@@ -412,7 +532,8 @@ async def run_unified_pipeline_logic(
         "camera_ocr_fuzzy_meta": camera_ocr_fuzzy_meta,
     }
 
+    mark_stage(None)
     return response_model, note_text, meta
 
 
-__all__ = ["run_unified_pipeline_logic"]
+__all__ = ["record_stage_timings", "run_unified_pipeline_logic"]
@@ -0,0 +1,345 @@
+"""Cache-friendly delivery of the UI's static and vendor assets.
+
+The vendor trees (``ui/static/*/vendor``: transformers.js, the ONNX PHI
+model, Whisper, Tesseract, pdf.js) are 10-20 MB. They used to be served with
+``Cache-Control: no-store``, so every page load downloaded them again.
+
+``build_asset_manifest`` is the build step (``ops/tools/build_ui_vendor_assets.py``).
+It writes ``asset-manifest.json`` with a content hash for each vendor file.
+Next to each compressible file it writes ``.br`` (when the optional
+``brotli`` package is installed) and ``.gz`` copies.
+
+``vendor_asset_response`` then serves:
+
+- fingerprinted names from the manifest (``pdfjs/pdf.<hash>.mjs``) with
+  ``immutable`` long-lived caching;
+- plain names with ``no-cache`` and the content hash as a strong ETag, so a
+  reload costs a ``304`` instead of the download (the model loaders build
+  these URLs at runtime, so they cannot carry the hash);
+- the precompressed copy the client accepts, and byte ranges of the
+  uncompressed file.
+
+Files that changed since the manifest was built fall back to plain serving
+(stat-based ETag, no precompressed copy); their fingerprinted names 404.
+Only HTML entry points stay ``no-store``.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "asset-manifest.json"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# (Content-Encoding, file suffix), in server preference order.
+ENCODINGS: tuple[tuple[str, str], ...] = (("br", ".br"), ("gzip", ".gz"))
+_INCOMPRESSIBLE_SUFFIXES = frozenset(
+    {".br", ".gz", ".zip", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".woff2"}
+)
+_MIN_COMPRESS_BYTES = 1024
+_MIN_SAVING = 0.1  # keep a compressed copy only if it is at least 10% smaller
+_HASH_CHARS = 16
+
+
+@dataclass(frozen=True)
+class AssetEntry:
+    """One vendor file as recorded in the manifest."""
+
+    path: str
+    hash: str
+    size: int
+    mtime_ns: int
+    fingerprinted: str
+    encodings: tuple[str, ...] = ()
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.hash}"'
+
+    def is_current(self, file_path: Path) -> bool:
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+
+def fingerprinted_name(path: str, digest: str) -> str:
+    """``pdfjs/pdf.mjs`` -> ``pdfjs/pdf.<digest>.mjs``."""
+    head, _, name = path.rpartition("/")
+    stem, dot, suffix = name.rpartition(".")
+    name = f"{stem}.{digest}.{suffix}" if dot else f"{name}.{digest}"
+    return f"{head}/{name}" if head else name
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:_HASH_CHARS]
+
+
+def _compress(encoding: str, data: bytes) -> bytes | None:
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    try:
+        import brotli  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    return brotli.compress(data, quality=11)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _source_files(vendor_dir: Path) -> list[Path]:
+    files: list[Path] = []
+    for path in sorted(vendor_dir.rglob("*")):
+        if not path.is_file() or path.name.startswith(".") or path.name == MANIFEST_NAME:
+            continue
+        # Precompressed copies written by an earlier build.
+        if path.suffix in (".br", ".gz") and path.with_suffix("").is_file():
+            continue
+        files.append(path)
+    return files
+
+
+def _precompress(
+    path: Path, entry: dict[str, Any], previous: dict[str, Any] | None
+) -> dict[str, int]:
+    """Write ``.br``/``.gz`` copies of ``path`` worth keeping; returns encoding -> size."""
+    size = int(entry["size"])
+    if size < _MIN_COMPRESS_BYTES or path.suffix.lower() in _INCOMPRESSIBLE_SUFFIXES:
+        candidates: tuple[tuple[str, str], ...] = ()
+    else:
+        candidates = ENCODINGS
+    unchanged = previous is not None and previous.get("hash") == entry["hash"]
+    written: dict[str, int] = {}
+    data: bytes | None = None
+    for encoding, suffix in ENCODINGS:
+        sibling = path.with_name(path.name + suffix)
+        if (encoding, suffix) not in candidates:
+            sibling.unlink(missing_ok=True)
+            continue
+        if unchanged and encoding in (previous.get("encodings") or {}) and sibling.is_file():
+            written[encoding] = sibling.stat().st_size
+            continue
+        data = path.read_bytes() if data is None else data
+        compressed = _compress(encoding, data)
+        if compressed is None:
+            logger.info("brotli is not installed; skipping .br for %s", path.name)
+            sibling.unlink(missing_ok=True)
+        elif len(compressed) <= size * (1 - _MIN_SAVING):
+            _write_atomic(sibling, compressed)
+            written[encoding] = len(compressed)
+        else:
+            sibling.unlink(missing_ok=True)
+    return written
+
+
+def build_asset_manifest(vendor_dir: Path, *, precompress: bool = True) -> dict[str, Any]:
+    """Fingerprint (and optionally precompress) every file under ``vendor_dir``.
+
+    Writes ``vendor_dir/asset-manifest.json`` and returns it. Files whose hash
+    did not change keep their existing compressed copies.
+    """
+    manifest_path = vendor_dir / MANIFEST_NAME
+    try:
+        previous = json.loads(manifest_path.read_text(encoding="utf-8")).get("assets", {})
+    except (OSError, ValueError):
+        previous = {}
+    assets: dict[str, Any] = {}
+    for path in _source_files(vendor_dir):
+        rel = path.relative_to(vendor_dir).as_posix()
+        stat = path.stat()
+        digest = _file_digest(path)
+        entry: dict[str, Any] = {
+            "hash": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "fingerprinted": fingerprinted_name(rel, digest),
+        }
+        entry["encodings"] = _precompress(path, entry, previous.get(rel)) if precompress else {}
+        assets[rel] = entry
+    manifest = {"version": 1, "assets": assets}
+    _write_atomic(manifest_path, json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"))
+    return manifest
+
+
+class VendorAssets:
+    """The manifest of one vendor directory, reloaded when the file changes."""
+
+    def __init__(self, vendor_dir: Path) -> None:
+        self.vendor_dir = vendor_dir
+        self._lock = threading.Lock()
+        self._loaded_mtime_ns: int | None = None
+        self._by_path: dict[str, AssetEntry] = {}
+        self._by_fingerprint: dict[str, AssetEntry] = {}
+
+    def _refresh(self) -> None:
+        try:
+            mtime_ns = (self.vendor_dir / MANIFEST_NAME).stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns == self._loaded_mtime_ns:
+            return
+        by_path: dict[str, AssetEntry] = {}
+        if mtime_ns is not None:
+            try:
+                raw = json.loads((self.vendor_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+                for rel, item in (raw.get("assets") or {}).items():
+                    stored = item.get("encodings") or {}
+                    by_path[rel] = AssetEntry(
+                        path=rel,
+                        hash=str(item["hash"]),
+                        size=int(item["size"]),
+                        mtime_ns=int(item["mtime_ns"]),
+                        fingerprinted=str(item["fingerprinted"]),
+                        encodings=tuple(enc for enc, _ in ENCODINGS if enc in stored),
+                    )
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                logger.warning(
+                    "Ignoring unreadable %s in %s: %s", MANIFEST_NAME, self.vendor_dir, exc
+                )
+                by_path = {}
+        self._by_path = by_path
+        self._by_fingerprint = {entry.fingerprinted: entry for entry in by_path.values()}
+        self._loaded_mtime_ns = mtime_ns
+
+    def resolve(self, asset_path: str) -> tuple[str, AssetEntry | None, bool]:
+        """``(logical path, manifest entry, requested by fingerprinted name)``."""
+        with self._lock:
+            self._refresh()
+            if asset_path in self._by_fingerprint:
+                entry = self._by_fingerprint[asset_path]
+                return entry.path, entry, True
+            return asset_path, self._by_path.get(asset_path), False
+
+
+_vendor_assets: dict[Path, VendorAssets] = {}
+_vendor_assets_lock = threading.Lock()
+
+
+def get_vendor_assets(vendor_dir: Path) -> VendorAssets:
+    with _vendor_assets_lock:
+        if vendor_dir not in _vendor_assets:
+            _vendor_assets[vendor_dir] = VendorAssets(vendor_dir)
+        return _vendor_assets[vendor_dir]
+
+
+def _etag_matches(if_none_match: str | None, etags: set[str]) -> bool:
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") in etags:
+            return True
+    return False
+
+
+def _negotiate(accept_encoding: str, available: tuple[str, ...]) -> str | None:
+    accepted: set[str] = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    return next((enc for enc in available if enc in accepted), None)
+
+
+def file_response(
+    request: Request,
+    path: Path,
+    *,
+    cache_control: str,
+    etag: str | None = None,
+    encodings: tuple[str, ...] = (),
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """``FileResponse`` with conditional GET (``304``) and precompressed copies.
+
+    ``etag`` defaults to Starlette's stat-based tag. Byte-range requests are
+    answered from the uncompressed file (``FileResponse`` handles ``Range``).
+    """
+    stat = path.stat()
+    if etag is None:
+        etag_base = f"{stat.st_mtime}-{stat.st_size}"
+        etag = f'"{hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"'
+    base_headers = dict(headers or {}, **{"Cache-Control": cache_control})
+    if encodings:
+        base_headers["Vary"] = "Accept-Encoding"
+
+    encoding = None
+    if encodings and "range" not in request.headers:
+        encoding = _negotiate(request.headers.get("accept-encoding", ""), encodings)
+    sibling = path.with_name(path.name + dict(ENCODINGS)[encoding]) if encoding else None
+    if sibling is not None and not sibling.is_file():
+        encoding, sibling = None, None
+    # A compressed copy is a different representation, so it gets its own ETag.
+    response_etag = f'{etag[:-1]}-{encoding}"' if encoding else etag
+    if _etag_matches(request.headers.get("if-none-match"), {response_etag}):
+        return Response(status_code=304, headers=dict(base_headers, ETag=response_etag))
+
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if sibling is not None:
+        return FileResponse(
+            sibling,
+            media_type=media_type,
+            headers=dict(base_headers, **{"ETag": response_etag, "Content-Encoding": encoding}),
+        )
+    return FileResponse(path, media_type=media_type, headers=dict(base_headers, ETag=etag))
+
+
+def vendor_asset_response(request: Request, vendor_dir: Path, asset_path: str) -> Response:
+    """Serve ``asset_path`` from ``vendor_dir`` (plain or fingerprinted name)."""
+    logical, entry, fingerprinted = get_vendor_assets(vendor_dir).resolve(asset_path)
+    vendor_root = vendor_dir.resolve()
+    asset = (vendor_root / logical).resolve()
+    if vendor_root not in asset.parents or not asset.is_file():
+        raise HTTPException(status_code=404, detail="Asset not found")
+    if entry is not None and not entry.is_current(asset):
+        entry = None
+    if fingerprinted and entry is None:
+        # The file changed since the manifest was built; this hash no longer exists.
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return file_response(
+        request,
+        asset,
+        cache_control=IMMUTABLE_CACHE_CONTROL if fingerprinted else REVALIDATE_CACHE_CONTROL,
+        etag=entry.etag if entry else None,
+        encodings=entry.encodings if entry else (),
+    )
+
+
+__all__ = [
+    "AssetEntry",
+    "ENCODINGS",
+    "IMMUTABLE_CACHE_CONTROL",
+    "MANIFEST_NAME",
+    "REVALIDATE_CACHE_CONTROL",
+    "VendorAssets",
+    "build_asset_manifest",
+    "file_response",
+    "fingerprinted_name",
+    "get_vendor_assets",
+    "vendor_asset_response",
+]
@@ -30,8 +30,8 @@ from dataclasses import dataclass
 from typing import Optional
 
 from observability.logging_config import get_logger
-from app.infra.cache import get_llm_memory_cache
-from app.infra.llm_control import backoff_seconds, llm_slot, make_llm_cache_key
+from app.infra.llm_cache import LLMCacheKey, get_llm_cache, llm_cache_key
+from app.infra.llm_control import backoff_seconds, llm_slot
 from app.infra.settings import get_infra_settings
 
 logger = get_logger("llm_advisor")
@@ -202,26 +202,27 @@ Return ONLY the JSON array, no other text.
         settings = get_infra_settings()
         deadline = time.monotonic() + float(settings.llm_timeout_s)
 
-        cache_key: str | None = None
+        cache_key: LLMCacheKey | None = None
         if settings.enable_llm_cache:
             prompt_version = (os.getenv("LLM_PROMPT_VERSION") or "default").strip() or "default"
-            cache_key = make_llm_cache_key(
+            cache_key = llm_cache_key(
+                task="coder_advisor",
                 model=self.model_name,
                 prompt=prompt,
                 prompt_version=prompt_version,
             )
-            cached = get_llm_memory_cache().get(cache_key)
+            cached = get_llm_cache().get(cache_key)
             if isinstance(cached, str) and cached:
                 return self._parse_response(cached)
 
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                with llm_slot():
+                with llm_slot("generativelanguage.googleapis.com", self.model_name):
                     response = client.generate_content(prompt)  # type: ignore
                 response_text = response.text
                 if cache_key is not None and response_text:
-                    get_llm_memory_cache().set(cache_key, response_text, ttl_s=3600)
+                    get_llm_cache().set(cache_key, response_text)
                 return self._parse_response(response_text)
             except Exception as e:  # noqa: BLE001
                 if attempt >= max_retries - 1 or time.monotonic() >= deadline:
@@ -282,26 +283,27 @@ Return ONLY the JSON array, no other text.
         settings = get_infra_settings()
         deadline = time.monotonic() + float(settings.llm_timeout_s)
 
-        cache_key: str | None = None
+        cache_key: LLMCacheKey | None = None
         if settings.enable_llm_cache:
             prompt_version = (os.getenv("LLM_PROMPT_VERSION") or "default").strip() or "default"
-            cache_key = make_llm_cache_key(
+            cache_key = llm_cache_key(
+                task="coder_advisor",
                 model=self.model_name,
                 prompt=prompt,
                 prompt_version=prompt_version,
             )
-            cached = get_llm_memory_cache().get(cache_key)
+            cached = get_llm_cache().get(cache_key)
             if isinstance(cached, str) and cached:
                 return self._parse_response(cached)
 
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                with llm_slot():
+                with llm_slot("generativelanguage.googleapis.com", self.model_name):
                     response = client.generate_content(prompt)  # type: ignore
                 response_text = response.text
                 if cache_key is not None and response_text:
-                    get_llm_memory_cache().set(cache_key, response_text, ttl_s=3600)
+                    get_llm_cache().set(cache_key, response_text)
                 return self._parse_response(response_text)
             except Exception as e:  # noqa: BLE001
                 if attempt >= max_retries - 1 or time.monotonic() >= deadline:
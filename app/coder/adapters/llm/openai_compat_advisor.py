@@ -3,30 +3,29 @@
 Implements the same interface as GeminiAdvisorAdapter but uses an OpenAI-protocol
 backend selected via environment variables.
 
-Performance optimization: Uses a persistent httpx client with connection pooling
+Performance optimization: Uses the shared pooled httpx client (app.infra.http_transport)
 to avoid TCP handshake + TLS negotiation overhead on each request (~100-300ms savings).
 """
 
 from __future__ import annotations
 
-import atexit
 import json
 import os
 import re
-import threading
 import time
 from typing import Any
+from urllib.parse import urlsplit
 
 import httpx
 
 from observability.logging_config import get_logger
 from app.common.model_capabilities import filter_payload_for_model
 from app.common.llm import _resolve_openai_timeout
-from app.infra.cache import get_llm_memory_cache
+from app.infra.http_transport import get_http_client
+from app.infra.llm_cache import LLMCacheKey, get_llm_cache, llm_cache_key
 from app.infra.llm_control import (
     backoff_seconds,
     llm_slot,
-    make_llm_cache_key,
     parse_retry_after_seconds,
 )
 from app.infra.settings import get_infra_settings
@@ -36,79 +35,12 @@ from .gemini_advisor import LLMAdvisorPort, LLMCodeSuggestion
 logger = get_logger("llm_advisor")
 
 
-# Module-level persistent client for connection pooling
-# This avoids TCP handshake + TLS negotiation on each request
-_client_lock = threading.Lock()
-_persistent_client: httpx.Client | None = None
-_client_base_url: str | None = None
-_client_api_key: str | None = None
-
-
 def _get_persistent_client(base_url: str, api_key: str) -> httpx.Client:
-    """Get or create a persistent httpx client with connection pooling.
+    """Pooled client for ``base_url`` from the shared LLM transport registry.
 
-    Thread-safe lazy initialization. Client is reused across all requests
-    to the same base URL, avoiding expensive TCP/TLS setup per request.
+    Auth travels in per-request headers, so one pool per origin serves every key.
     """
-    global _persistent_client, _client_base_url, _client_api_key
-
-    with _client_lock:
-        # Check if we need to create a new client (first call or config changed)
-        if (
-            _persistent_client is None
-            or _client_base_url != base_url
-            or _client_api_key != api_key
-        ):
-            # Close existing client if config changed
-            if _persistent_client is not None:
-                try:
-                    _persistent_client.close()
-                except Exception:
-                    pass
-
-            # Create new persistent client with connection pooling
-            _persistent_client = httpx.Client(
-                # Use connection pooling with keep-alive
-                limits=httpx.Limits(
-                    max_keepalive_connections=5,
-                    max_connections=10,
-                    keepalive_expiry=30.0,  # Keep connections alive for 30 seconds
-                ),
-                # Default timeout (can be overridden per-request)
-                timeout=httpx.Timeout(
-                    connect=10.0,
-                    read=180.0,  # Registry extraction can be slow
-                    write=10.0,
-                    pool=10.0,
-                ),
-                # Stick with HTTP/1.1 - HTTP/2 can cause issues with some API providers
-                http2=False,
-            )
-            _client_base_url = base_url
-            _client_api_key = api_key
-            logger.info(
-                "Created persistent HTTP client for OpenAI API",
-                extra={"base_url": base_url},
-            )
-
-        return _persistent_client
-
-
-def _cleanup_persistent_client() -> None:
-    """Clean up the persistent client on module unload."""
-    global _persistent_client
-    with _client_lock:
-        if _persistent_client is not None:
-            try:
-                _persistent_client.close()
-                logger.debug("Closed persistent HTTP client")
-            except Exception:
-                pass
-            _persistent_client = None
-
-
-# Register cleanup on interpreter shutdown
-atexit.register(_cleanup_persistent_client)
+    return get_http_client(base_url)
 
 
 def _truthy_env(name: str) -> bool:
@@ -394,15 +326,16 @@ Return ONLY the JSON array, no other text.
         model_name = self._resolve_model()
         deadline = time.monotonic() + float(settings.llm_timeout_s)
 
-        cache_key: str | None = None
+        cache_key: LLMCacheKey | None = None
         if settings.enable_llm_cache:
             prompt_version = (os.getenv("LLM_PROMPT_VERSION") or "default").strip() or "default"
-            cache_key = make_llm_cache_key(
+            cache_key = llm_cache_key(
+                task="coder_advisor",
                 model=model_name,
                 prompt=prompt,
                 prompt_version=prompt_version,
             )
-            cached = get_llm_memory_cache().get(cache_key)
+            cached = get_llm_cache().get(cache_key)
             if isinstance(cached, str) and cached:
                 return cached
 
@@ -425,8 +358,9 @@ Return ONLY the JSON array, no other text.
         data: dict[str, Any] = {}
 
         for attempt in range(5):
-            with llm_slot():
+            with llm_slot(urlsplit(url).hostname or "openai", str(attempt_payload.get("model", ""))) as slot:
                 response = client.post(url, headers=headers, json=attempt_payload, timeout=timeout)
+                slot.record_response(response)
             if response.status_code < 400:
                 data = response.json()
                 break
@@ -482,7 +416,7 @@ Return ONLY the JSON array, no other text.
         content = msg.get("content", "") if isinstance(msg, dict) else ""
         content = content or ""
         if cache_key is not None and content:
-            get_llm_memory_cache().set(cache_key, content, ttl_s=3600)
+            get_llm_cache().set(cache_key, content)
         return content
 
     def _offline_suggestions(self) -> list[LLMCodeSuggestion]:
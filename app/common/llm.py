@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import atexit
 import json
 import os
@@ -9,7 +10,7 @@ import random
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Protocol, TypeVar
+from typing import Any, Callable, Protocol, TypeVar
 
 import httpx
 from dotenv import load_dotenv
@@ -29,17 +30,22 @@ from app.common.openai_responses import (
     is_fallback_enabled,
     build_responses_payload,
     parse_responses_text,
+    apost_responses,
     post_responses,
     ResponsesEndpointNotFound,
 )
-from app.infra.cache import get_llm_memory_cache
+from app.infra.deadline import cap_deadline
+from app.infra.http_transport import get_async_http_client, get_http_client
+from app.infra.llm_cache import LLMCacheKey, get_llm_cache, llm_cache_key, schema_fingerprint
 from app.infra.llm_control import (
     backoff_seconds,
-    llm_slot,
-    make_llm_cache_key,
     parse_retry_after_seconds,
 )
 from app.infra.settings import get_infra_settings
+from app.infra.single_flight import get_single_flight
+from app.llm.exchange import Exchange, Post, Sleep, arun_exchange, run_exchange
+from app.llm.json_stream import JSONStreamEvent, replay_json_events, section_validator
+from app.llm.streaming import StreamAbortedError, StreamCollector, gemini_delta, openai_chat_delta
 
 logger = get_logger("common.llm")
 
@@ -464,6 +470,11 @@ class LLMInterface(Protocol):
         ...
 
 
+class AsyncLLMInterface(LLMInterface, Protocol):
+    async def agenerate(self, prompt: str, **kwargs: Any) -> str:
+        ...
+
+
 class OpenAILLM:
     """OpenAI client supporting both Responses API and Chat Completions.
 
@@ -535,32 +546,31 @@ class OpenAILLM:
         if _truthy_env("OPENAI_OFFLINE") or not self.api_key:
             return "{}"
 
-        settings = get_infra_settings()
-        prompt_version = str(
-            kwargs.pop("prompt_version", "") or os.getenv("LLM_PROMPT_VERSION") or "default"
-        ).strip() or "default"
-
-        cache_key: str | None = None
-        if settings.enable_llm_cache:
-            temperature = kwargs.get("temperature")
-            cacheable = temperature is None or float(temperature) == 0.0
-            if cacheable:
-                cache_key = make_llm_cache_key(
-                    model=self.model,
-                    prompt=prompt,
-                    prompt_version=prompt_version,
-                )
-                cached = get_llm_memory_cache().get(cache_key)
-                if isinstance(cached, str) and cached:
-                    return cached
-
         task_key = task if task is not None else self.task
-        primary_api = get_primary_api()
+        request_key, cached = self._cache_lookup(prompt, kwargs, task=task_key)
+        if cached is not None:
+            return cached
+        if request_key is None:
+            return self._call(prompt, task_key, kwargs, request_key=None)
+        # Identical concurrent requests share one upstream call.
+        return get_single_flight().do(
+            request_key.storage_key,
+            lambda: self._call(prompt, task_key, kwargs, request_key=request_key),
+            group=request_key.namespace,
+        )
+
+    def _call(
+        self,
+        prompt: str,
+        task_key: str | None,
+        kwargs: dict[str, Any],
+        *,
+        request_key: LLMCacheKey | None,
+    ) -> str:
         started = time.monotonic()
-        usage: dict[str, Any] | None = None
 
         # Use Responses API for first-party OpenAI when configured
-        if primary_api == "responses" and self._is_openai_endpoint():
+        if get_primary_api() == "responses" and self._is_openai_endpoint():
             try:
                 response_text, usage = self._generate_via_responses(prompt, task=task_key, **kwargs)
             except ResponsesEndpointNotFound:
@@ -577,8 +587,151 @@ class OpenAILLM:
             # Use Chat Completions for compat endpoints or when configured
             response_text, usage = self._generate_via_chat(prompt, task=task_key, **kwargs)
 
-        if cache_key is not None and response_text:
-            get_llm_memory_cache().set(cache_key, response_text, ttl_s=3600)
+        return self._finish(response_text, usage, request_key=request_key, started=started)
+
+    async def agenerate(
+        self,
+        prompt: str,
+        response_schema: dict | None = None,
+        *,
+        task: str | None = None,
+        **kwargs,
+    ) -> str:
+        """Async ``generate``: awaits the HTTP call on the running event loop."""
+        if _truthy_env("OPENAI_OFFLINE") or not self.api_key:
+            return "{}"
+
+        task_key = task if task is not None else self.task
+        request_key, cached = self._cache_lookup(prompt, kwargs, task=task_key)
+        if cached is not None:
+            return cached
+        if request_key is None:
+            return await self._acall(prompt, task_key, kwargs, request_key=None)
+        return await get_single_flight().ado(
+            request_key.storage_key,
+            lambda: self._acall(prompt, task_key, kwargs, request_key=request_key),
+            group=request_key.namespace,
+        )
+
+    async def _acall(
+        self,
+        prompt: str,
+        task_key: str | None,
+        kwargs: dict[str, Any],
+        *,
+        request_key: LLMCacheKey | None,
+    ) -> str:
+        started = time.monotonic()
+
+        if get_primary_api() == "responses" and self._is_openai_endpoint():
+            try:
+                response_text, usage = await self._agenerate_via_responses(prompt, task=task_key, **kwargs)
+            except ResponsesEndpointNotFound:
+                if is_fallback_enabled():
+                    logger.info(
+                        "Responses API not available; falling back to Chat Completions model=%s",
+                        self.model,
+                    )
+                    response_text, usage = await self._agenerate_via_chat(prompt, task=task_key, **kwargs)
+                else:
+                    raise
+        else:
+            response_text, usage = await self._agenerate_via_chat(prompt, task=task_key, **kwargs)
+
+        return self._finish(response_text, usage, request_key=request_key, started=started)
+
+    def generate_stream(
+        self,
+        prompt: str,
+        *,
+        on_event: Callable[[JSONStreamEvent], None] | None = None,
+        task: str | None = None,
+        **kwargs,
+    ) -> str:
+        """Streamed ``generate`` (Chat Completions): ``on_event`` gets each completed JSON section.
+
+        Cache hits replay their events. Not coalesced by single-flight, since
+        followers would not see the events.
+        """
+        if _truthy_env("OPENAI_OFFLINE") or not self.api_key:
+            return "{}"
+        task_key = task if task is not None else self.task
+        request_key, cached = self._cache_lookup(prompt, kwargs, task=task_key)
+        if cached is not None:
+            if on_event is not None:
+                replay_json_events(cached, on_event)
+            return cached
+        started = time.monotonic()
+        collector = StreamCollector(openai_chat_delta, on_event=on_event, provider="openai")
+        response_text, usage = self._generate_via_chat(prompt, task=task_key, collector=collector, **kwargs)
+        return self._finish(response_text, usage, request_key=request_key, started=started)
+
+    async def agenerate_stream(
+        self,
+        prompt: str,
+        *,
+        on_event: Callable[[JSONStreamEvent], None] | None = None,
+        task: str | None = None,
+        **kwargs,
+    ) -> str:
+        """Async ``generate_stream``; ``on_event`` runs on the event loop."""
+        if _truthy_env("OPENAI_OFFLINE") or not self.api_key:
+            return "{}"
+        task_key = task if task is not None else self.task
+        request_key, cached = self._cache_lookup(prompt, kwargs, task=task_key)
+        if cached is not None:
+            if on_event is not None:
+                replay_json_events(cached, on_event)
+            return cached
+        started = time.monotonic()
+        collector = StreamCollector(openai_chat_delta, on_event=on_event, provider="openai")
+        response_text, usage = await self._agenerate_via_chat(prompt, task=task_key, collector=collector, **kwargs)
+        return self._finish(response_text, usage, request_key=request_key, started=started)
+
+    def _cache_lookup(
+        self,
+        prompt: str,
+        kwargs: dict[str, Any],
+        *,
+        task: str | None,
+    ) -> tuple[LLMCacheKey | None, str | None]:
+        """Return ``(request_key, cached_text)``; pops ``prompt_version``/``schema_version`` from kwargs.
+
+        ``request_key`` is ``None`` for non-deterministic calls (temperature > 0),
+        which are neither cached nor coalesced.
+        """
+        prompt_version = str(
+            kwargs.pop("prompt_version", "") or os.getenv("LLM_PROMPT_VERSION") or "default"
+        ).strip() or "default"
+        schema_version = str(kwargs.pop("schema_version", "") or "")
+
+        temperature = kwargs.get("temperature")
+        if temperature is not None and float(temperature) != 0.0:
+            return None, None
+        request_key = llm_cache_key(
+            task=task,
+            model=self.model,
+            prompt=prompt,
+            prompt_version=prompt_version,
+            schema_version=schema_version,
+        )
+        if not get_infra_settings().enable_llm_cache:
+            return request_key, None
+        cached = get_llm_cache().get(request_key)
+        if isinstance(cached, str) and cached:
+            return request_key, cached
+        return request_key, None
+
+    def _finish(
+        self,
+        response_text: str,
+        usage: dict[str, Any] | None,
+        *,
+        request_key: LLMCacheKey | None,
+        started: float,
+    ) -> str:
+        if request_key is not None and response_text and get_infra_settings().enable_llm_cache:
+            get_llm_cache().set(request_key, response_text)
 
         # Best-effort usage reporting (tokens are present only when upstream includes them)
         if isinstance(usage, dict):
@@ -606,18 +759,7 @@ class OpenAILLM:
 
         return response_text
 
-    def _generate_via_responses(
-        self,
-        prompt: str,
-        *,
-        task: str | None = None,
-        **kwargs,
-    ) -> tuple[str, dict[str, Any]]:
-        """Generate using Responses API (POST /v1/responses)."""
-        url = f"{self.base_url}/v1/responses"
-        headers = self._get_headers()
-        timeout = self._get_timeout(task)
-
+    def _responses_payload(self, prompt: str, *, task: str | None, **kwargs) -> dict[str, Any]:
         # Build extra params from kwargs (capability-filtered later)
         extra: dict[str, Any] = {}
         for float_key in ("temperature", "top_p"):
@@ -636,29 +778,43 @@ class OpenAILLM:
         )
 
         # Apply capability filtering for responses API
-        payload = filter_payload_for_model(payload, self.model, api_style="responses")
+        return filter_payload_for_model(payload, self.model, api_style="responses")
+
+    def _parse_responses_result(self, resp_json: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        text = parse_responses_text(resp_json)
+        usage: dict[str, Any] = {"api": "responses"}
+        usage_raw = resp_json.get("usage") if isinstance(resp_json, dict) else None
+        if isinstance(usage_raw, dict):
+            usage["input_tokens"] = int(usage_raw.get("input_tokens") or 0)
+            input_details = usage_raw.get("input_tokens_details")
+            if isinstance(input_details, dict):
+                usage["cached_input_tokens"] = int(input_details.get("cached_tokens") or 0)
+            usage["output_tokens"] = int(usage_raw.get("output_tokens") or 0)
+            usage["total_tokens"] = int(
+                usage_raw.get("total_tokens") or (usage["input_tokens"] + usage["output_tokens"])
+            )
+        return text, usage
+
+    def _generate_via_responses(
+        self,
+        prompt: str,
+        *,
+        task: str | None = None,
+        **kwargs,
+    ) -> tuple[str, dict[str, Any]]:
+        """Generate using Responses API (POST /v1/responses)."""
+        url = f"{self.base_url}/v1/responses"
+        payload = self._responses_payload(prompt, task=task, **kwargs)
 
         try:
             resp_json = post_responses(
                 url=url,
-                headers=headers,
+                headers=self._get_headers(),
                 payload=payload,
-                timeout=timeout,
+                timeout=self._get_timeout(task),
                 model=self.model,
             )
-            text = parse_responses_text(resp_json)
-            usage: dict[str, Any] = {"api": "responses"}
-            usage_raw = resp_json.get("usage") if isinstance(resp_json, dict) else None
-            if isinstance(usage_raw, dict):
-                usage["input_tokens"] = int(usage_raw.get("input_tokens") or 0)
-                input_details = usage_raw.get("input_tokens_details")
-                if isinstance(input_details, dict):
-                    usage["cached_input_tokens"] = int(input_details.get("cached_tokens") or 0)
-                usage["output_tokens"] = int(usage_raw.get("output_tokens") or 0)
-                usage["total_tokens"] = int(
-                    usage_raw.get("total_tokens") or (usage["input_tokens"] + usage["output_tokens"])
-                )
-            return text, usage
+            return self._parse_responses_result(resp_json)
         except ResponsesEndpointNotFound:
             raise
         except LLMError:
@@ -666,18 +822,33 @@ class OpenAILLM:
         except Exception as exc:
             raise LLMError(f"Unexpected error in Responses API (model={self.model}): {exc}") from exc
 
-    def _generate_via_chat(
+    async def _agenerate_via_responses(
         self,
         prompt: str,
         *,
         task: str | None = None,
         **kwargs,
     ) -> tuple[str, dict[str, Any]]:
-        """Generate using Chat Completions API (POST /v1/chat/completions)."""
-        url = f"{self.base_url}/v1/chat/completions"
-        headers = self._get_headers()
-        timeout = self._get_timeout(task)
+        url = f"{self.base_url}/v1/responses"
+        payload = self._responses_payload(prompt, task=task, **kwargs)
+
+        try:
+            resp_json = await apost_responses(
+                url=url,
+                headers=self._get_headers(),
+                payload=payload,
+                timeout=self._get_timeout(task),
+                model=self.model,
+            )
+            return self._parse_responses_result(resp_json)
+        except ResponsesEndpointNotFound:
+            raise
+        except LLMError:
+            raise
+        except Exception as exc:
+            raise LLMError(f"Unexpected error in Responses API (model={self.model}): {exc}") from exc
 
+    def _chat_payload(self, prompt: str, *, stream: bool = False, **kwargs) -> dict[str, Any]:
         wants_json = True
         outgoing_prompt = _prepend_json_object_instruction(prompt) if is_gpt5(self.model) and wants_json else prompt
 
@@ -702,97 +873,132 @@ class OpenAILLM:
         for raw_key in ("tools", "tool_choice", "parallel_tool_calls"):
             if raw_key in kwargs and kwargs[raw_key] is not None:
                 payload[raw_key] = kwargs[raw_key]
+        if stream:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
 
-        payload = filter_payload_for_model(payload, self.model, api_style="chat")
+        return filter_payload_for_model(payload, self.model, api_style="chat")
 
+    def _chat_exchange(
+        self,
+        url: str,
+        payload: dict[str, Any],
+        collector: StreamCollector | None = None,
+    ) -> Exchange[tuple[str, dict[str, Any]]]:
+        """Chat Completions retry loop (see ``app.llm.exchange``); streams into ``collector`` when given."""
         removed_on_retry: list[str] = []
+        deadline = cap_deadline(time.monotonic() + float(get_infra_settings().llm_timeout_s))
+        attempt_payload = payload
+        did_retry_timeout = False
+        did_retry_unsupported = False
 
-        try:
-            deadline = time.monotonic() + float(get_infra_settings().llm_timeout_s)
-            with httpx.Client(timeout=timeout) as client:
-                attempt_payload = payload
-                did_retry_timeout = False
-                did_retry_unsupported = False
-
-                for attempt in range(3):
-                    try:
-                        with llm_slot():
-                            response = client.post(url, headers=headers, json=attempt_payload)
-                    except (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.RemoteProtocolError, httpx.TransportError) as exc:
-                        if not did_retry_timeout:
-                            did_retry_timeout = True
-                            backoff = random.uniform(0.8, 1.5)
-                            logger.warning(
-                                "Chat Completions API transient transport error; retrying once endpoint=%s model=%s",
-                                url,
-                                self.model,
-                            )
-                            time.sleep(backoff)
-                            continue
-                        raise LLMError(
-                            f"Chat Completions transport error after retry (model={self.model}): {type(exc).__name__}"
-                        ) from exc
-
-                    if response.status_code < 400:
-                        data = response.json()
-                        choices = data.get("choices", [])
-                        if not choices:
-                            raise LLMError("No choices returned from Chat Completions API")
-                        content = choices[0].get("message", {}).get("content", "")
-                        usage: dict[str, Any] = {"api": "chat"}
-                        usage_raw = data.get("usage") if isinstance(data, dict) else None
-                        if isinstance(usage_raw, dict):
-                            usage["input_tokens"] = int(usage_raw.get("prompt_tokens") or 0)
-                            usage["output_tokens"] = int(usage_raw.get("completion_tokens") or 0)
-                            usage["total_tokens"] = int(
-                                usage_raw.get("total_tokens") or (usage["input_tokens"] + usage["output_tokens"])
-                            )
-                        return content, usage
-
-                    message, error_type, error_param = _openai_error_details(response)
-                    request_id = _openai_request_id(response)
-                    request_id_suffix = f" request_id={request_id}" if request_id else ""
+        for attempt in range(3):
+            try:
+                if collector is None:
+                    response = yield Post(attempt_payload)
+                else:
+                    collector.reset()
+                    response = yield Post(attempt_payload, stream=collector.feed_line)
+            except (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.RemoteProtocolError, httpx.TransportError) as exc:
+                if not did_retry_timeout:
+                    did_retry_timeout = True
+                    backoff = random.uniform(0.8, 1.5)
                     logger.warning(
-                        "Chat Completions API error status=%s endpoint=%s model=%s%s",
-                        response.status_code,
+                        "Chat Completions API transient transport error; retrying once endpoint=%s model=%s",
                         url,
                         self.model,
-                        request_id_suffix,
                     )
-
-                    if response.status_code == 429 or 500 <= response.status_code <= 599:
-                        if attempt < 2 and time.monotonic() < deadline:
-                            retry_after = parse_retry_after_seconds(response.headers)
-                            sleep_s = retry_after if retry_after is not None else backoff_seconds(attempt)
-                            remaining = max(0.0, deadline - time.monotonic())
-                            if remaining > 0:
-                                time.sleep(min(sleep_s, remaining))
-                                continue
-
-                    should_retry = (
-                        not did_retry_unsupported
-                        and response.status_code == 400
-                        and _looks_like_unsupported_parameter_error(
-                            message=message, error_type=error_type, error_param=error_param
-                        )
-                    )
-                    if should_retry:
-                        retry_payload, removed_on_retry = _build_unsupported_param_retry_payload(
-                            attempt_payload,
-                            message=message,
-                            error_param=error_param,
-                        )
-                        if removed_on_retry:
-                            attempt_payload = retry_payload
-                            did_retry_unsupported = True
-                            continue
-
-                    removed_summary = ", ".join(removed_on_retry) if removed_on_retry else "none"
-                    raise LLMError(
-                        f"Chat Completions request failed (status={response.status_code}, model={self.model}, "
-                        f"removed_on_retry={removed_summary}): {message}"
+                    yield Sleep(backoff)
+                    continue
+                raise LLMError(
+                    f"Chat Completions transport error after retry (model={self.model}): {type(exc).__name__}"
+                ) from exc
+
+            if response.status_code < 400 and collector is not None:
+                return collector.finish(), collector.usage or {"api": "chat"}
+            if response.status_code < 400:
+                data = response.json()
+                choices = data.get("choices", [])
+                if not choices:
+                    raise LLMError("No choices returned from Chat Completions API")
+                content = choices[0].get("message", {}).get("content", "")
+                usage: dict[str, Any] = {"api": "chat"}
+                usage_raw = data.get("usage") if isinstance(data, dict) else None
+                if isinstance(usage_raw, dict):
+                    usage["input_tokens"] = int(usage_raw.get("prompt_tokens") or 0)
+                    usage["output_tokens"] = int(usage_raw.get("completion_tokens") or 0)
+                    usage["total_tokens"] = int(
+                        usage_raw.get("total_tokens") or (usage["input_tokens"] + usage["output_tokens"])
                     )
+                return content, usage
+
+            message, error_type, error_param = _openai_error_details(response)
+            request_id = _openai_request_id(response)
+            request_id_suffix = f" request_id={request_id}" if request_id else ""
+            logger.warning(
+                "Chat Completions API error status=%s endpoint=%s model=%s%s",
+                response.status_code,
+                url,
+                self.model,
+                request_id_suffix,
+            )
+
+            if response.status_code == 429 or 500 <= response.status_code <= 599:
+                if attempt < 2 and time.monotonic() < deadline:
+                    retry_after = parse_retry_after_seconds(response.headers)
+                    sleep_s = retry_after if retry_after is not None else backoff_seconds(attempt)
+                    remaining = max(0.0, deadline - time.monotonic())
+                    if remaining > 0:
+                        yield Sleep(min(sleep_s, remaining))
+                        continue
+
+            should_retry = (
+                not did_retry_unsupported
+                and response.status_code == 400
+                and _looks_like_unsupported_parameter_error(
+                    message=message, error_type=error_type, error_param=error_param
+                )
+            )
+            if should_retry:
+                retry_payload, removed_on_retry = _build_unsupported_param_retry_payload(
+                    attempt_payload,
+                    message=message,
+                    error_param=error_param,
+                )
+                if removed_on_retry:
+                    attempt_payload = retry_payload
+                    did_retry_unsupported = True
+                    continue
+
+            removed_summary = ", ".join(removed_on_retry) if removed_on_retry else "none"
+            raise LLMError(
+                f"Chat Completions request failed (status={response.status_code}, model={self.model}, "
+                f"removed_on_retry={removed_summary}): {message}"
+            )
+
+        # Should not reach here
+        raise LLMError(f"Chat Completions request failed after all attempts (model={self.model})")
 
+    def _generate_via_chat(
+        self,
+        prompt: str,
+        *,
+        task: str | None = None,
+        collector: StreamCollector | None = None,
+        **kwargs,
+    ) -> tuple[str, dict[str, Any]]:
+        """Generate using Chat Completions API (POST /v1/chat/completions)."""
+        url = f"{self.base_url}/v1/chat/completions"
+        payload = self._chat_payload(prompt, stream=collector is not None, **kwargs)
+
+        try:
+            return run_exchange(
+                self._chat_exchange(url, payload, collector),
+                client=get_http_client(url),
+                url=url,
+                headers=self._get_headers(),
+                timeout=self._get_timeout(task),
+            )
         except httpx.RequestError as exc:
             raise LLMError(f"Network error contacting Chat Completions API (model={self.model}): {exc}") from exc
         except Exception as exc:
@@ -800,8 +1006,31 @@ class OpenAILLM:
                 raise
             raise LLMError(f"Unexpected error in Chat Completions (model={self.model}): {exc}") from exc
 
-        # Should not reach here
-        raise LLMError(f"Chat Completions request failed after all attempts (model={self.model})")
+    async def _agenerate_via_chat(
+        self,
+        prompt: str,
+        *,
+        task: str | None = None,
+        collector: StreamCollector | None = None,
+        **kwargs,
+    ) -> tuple[str, dict[str, Any]]:
+        url = f"{self.base_url}/v1/chat/completions"
+        payload = self._chat_payload(prompt, stream=collector is not None, **kwargs)
+
+        try:
+            return await arun_exchange(
+                self._chat_exchange(url, payload, collector),
+                client=get_async_http_client(url),
+                url=url,
+                headers=self._get_headers(),
+                timeout=self._get_timeout(task),
+            )
+        except httpx.RequestError as exc:
+            raise LLMError(f"Network error contacting Chat Completions API (model={self.model}): {exc}") from exc
+        except Exception as exc:
+            if isinstance(exc, LLMError):
+                raise
+            raise LLMError(f"Unexpected error in Chat Completions (model={self.model}): {exc}") from exc
 
 
 class GeminiLLM:
@@ -820,7 +1049,9 @@ class GeminiLLM:
     ) -> None:
         self.api_key = api_key
         self.model = model or os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite")
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
+        self.base_url = (
+            os.getenv("GEMINI_BASE_URL") or "https://generativelanguage.googleapis.com/v1beta/models"
+        ).strip().rstrip("/")
         
         # Determine authentication method
         if use_oauth is None:
@@ -883,25 +1114,198 @@ class GeminiLLM:
         task: str | None = None,
         prompt_version: str | None = None,
     ) -> str:
-        settings = get_infra_settings()
-        deadline = time.monotonic() + float(settings.llm_timeout_s)
+        prepared = self._prepare(
+            prompt,
+            response_schema,
+            temperature=temperature,
+            task=task,
+            prompt_version=prompt_version,
+        )
+        if isinstance(prepared, str):
+            return prepared
+        url, headers, payload, request_key = prepared
 
-        prompt_version_value = str(prompt_version or os.getenv("LLM_PROMPT_VERSION") or "default").strip() or "default"
-        cache_key: str | None = None
-        if settings.enable_llm_cache:
-            cacheable = temperature is None or float(temperature) == 0.0
-            if cacheable:
-                cache_key = make_llm_cache_key(
-                    model=self.model,
-                    prompt=prompt,
-                    prompt_version=prompt_version_value,
+        def _call() -> str:
+            try:
+                return run_exchange(
+                    self._exchange(payload, max_retries=max_retries, request_key=request_key),
+                    client=get_http_client(url),
+                    url=url,
+                    headers=headers,
+                    timeout=self._timeout(),
                 )
-                cached = get_llm_memory_cache().get(cache_key)
+            except Exception as e:
+                logger.error(f"Unexpected error in GeminiLLM: {e}")
+                return "{}"
+
+        if request_key is None:
+            return _call()
+        return get_single_flight().do(request_key.storage_key, _call, group=request_key.namespace)
+
+    async def agenerate(
+        self,
+        prompt: str,
+        response_schema: dict | None = None,
+        max_retries: int = 3,
+        *,
+        temperature: float | None = None,
+        task: str | None = None,
+        prompt_version: str | None = None,
+    ) -> str:
+        """Async ``generate``: awaits the HTTP call on the running event loop."""
+        prepared = self._prepare(
+            prompt,
+            response_schema,
+            temperature=temperature,
+            task=task,
+            prompt_version=prompt_version,
+        )
+        if isinstance(prepared, str):
+            return prepared
+        url, headers, payload, request_key = prepared
+
+        async def _call() -> str:
+            try:
+                return await arun_exchange(
+                    self._exchange(payload, max_retries=max_retries, request_key=request_key),
+                    client=get_async_http_client(url),
+                    url=url,
+                    headers=headers,
+                    timeout=self._timeout(),
+                )
+            except Exception as e:
+                logger.error(f"Unexpected error in GeminiLLM: {e}")
+                return "{}"
+
+        if request_key is None:
+            return await _call()
+        return await get_single_flight().ado(request_key.storage_key, _call, group=request_key.namespace)
+
+    def generate_stream(
+        self,
+        prompt: str,
+        response_schema: dict | None = None,
+        max_retries: int = 3,
+        *,
+        on_event: Callable[[JSONStreamEvent], None] | None = None,
+        temperature: float | None = None,
+        task: str | None = None,
+        prompt_version: str | None = None,
+    ) -> str:
+        """Streamed ``generate``: ``on_event`` gets each completed JSON section.
+
+        Cache hits replay their events; ``StreamAbortedError`` (truncation, a
+        section rejected by ``on_event``) propagates instead of becoming ``"{}"``.
+        """
+        prepared = self._prepare(
+            prompt,
+            response_schema,
+            temperature=temperature,
+            task=task,
+            prompt_version=prompt_version,
+            stream=True,
+        )
+        if isinstance(prepared, str):
+            if on_event is not None:
+                replay_json_events(prepared, on_event)
+            return prepared
+        url, headers, payload, request_key = prepared
+        collector = StreamCollector(gemini_delta, on_event=on_event, provider="gemini")
+        try:
+            return run_exchange(
+                self._exchange(payload, max_retries=max_retries, request_key=request_key, collector=collector),
+                client=get_http_client(url),
+                url=url,
+                headers=headers,
+                timeout=self._timeout(),
+            )
+        except StreamAbortedError:
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error in GeminiLLM: {e}")
+            return "{}"
+
+    async def agenerate_stream(
+        self,
+        prompt: str,
+        response_schema: dict | None = None,
+        max_retries: int = 3,
+        *,
+        on_event: Callable[[JSONStreamEvent], None] | None = None,
+        temperature: float | None = None,
+        task: str | None = None,
+        prompt_version: str | None = None,
+    ) -> str:
+        """Async ``generate_stream``; ``on_event`` runs on the event loop."""
+        prepared = self._prepare(
+            prompt,
+            response_schema,
+            temperature=temperature,
+            task=task,
+            prompt_version=prompt_version,
+            stream=True,
+        )
+        if isinstance(prepared, str):
+            if on_event is not None:
+                replay_json_events(prepared, on_event)
+            return prepared
+        url, headers, payload, request_key = prepared
+        collector = StreamCollector(gemini_delta, on_event=on_event, provider="gemini")
+        try:
+            return await arun_exchange(
+                self._exchange(payload, max_retries=max_retries, request_key=request_key, collector=collector),
+                client=get_async_http_client(url),
+                url=url,
+                headers=headers,
+                timeout=self._timeout(),
+            )
+        except StreamAbortedError:
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error in GeminiLLM: {e}")
+            return "{}"
+
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=10.0,
+            read=float(get_infra_settings().llm_timeout_s),
+            write=30.0,
+            pool=10.0,
+        )
+
+    def _prepare(
+        self,
+        prompt: str,
+        response_schema: dict | None,
+        *,
+        temperature: float | None,
+        task: str | None,
+        prompt_version: str | None,
+        stream: bool = False,
+    ) -> str | tuple[str, dict[str, str], dict[str, Any], LLMCacheKey | None]:
+        """Return a final text (cache hit / no credentials) or ``(url, headers, payload, request_key)``.
+
+        ``request_key`` (cache + single-flight key) is ``None`` for non-deterministic calls.
+        ``stream`` targets ``:streamGenerateContent`` with SSE framing.
+        """
+        prompt_version_value = str(prompt_version or os.getenv("LLM_PROMPT_VERSION") or "default").strip() or "default"
+        request_key: LLMCacheKey | None = None
+        if temperature is None or float(temperature) == 0.0:
+            request_key = llm_cache_key(
+                task=task,
+                model=self.model,
+                prompt=prompt,
+                prompt_version=prompt_version_value,
+                schema_version=schema_fingerprint(response_schema),
+            )
+            if get_infra_settings().enable_llm_cache:
+                cached = get_llm_cache().get(request_key)
                 if isinstance(cached, str) and cached:
                     return cached
 
+        method = "streamGenerateContent?alt=sse" if stream else "generateContent"
         if self.use_oauth:
-            url = f"{self.base_url}/{self.model}:generateContent"
+            url = f"{self.base_url}/{self.model}:{method}"
             access_token = self._get_access_token()
             headers = {
                 "Content-Type": "application/json",
@@ -911,7 +1315,8 @@ class GeminiLLM:
             if not self.api_key:
                  logger.error("Attempted to generate without API key or OAuth.")
                  return "{}"
-            url = f"{self.base_url}/{self.model}:generateContent?key={self.api_key}"
+            separator = "&" if stream else "?"
+            url = f"{self.base_url}/{self.model}:{method}{separator}key={self.api_key}"
             headers = {"Content-Type": "application/json"}
 
         generation_config: dict[str, Any] = {"response_mime_type": "application/json"}
@@ -924,31 +1329,40 @@ class GeminiLLM:
             "contents": [{"parts": [{"text": prompt}]}],
             "generationConfig": generation_config
         }
+        return url, headers, payload, request_key
 
-        # Retry logic with exponential backoff
+    def _exchange(
+        self,
+        payload: dict[str, Any],
+        *,
+        max_retries: int,
+        request_key: LLMCacheKey | None,
+        collector: StreamCollector | None = None,
+    ) -> Exchange[str]:
+        """Gemini retry loop with exponential backoff (see ``app.llm.exchange``)."""
+        deadline = cap_deadline(time.monotonic() + float(get_infra_settings().llm_timeout_s))
         last_error = None
         for attempt in range(max_retries):
             try:
-                timeout = httpx.Timeout(
-                    connect=10.0,
-                    read=float(settings.llm_timeout_s),
-                    write=30.0,
-                    pool=10.0,
-                )
-                with httpx.Client(timeout=timeout) as client:
-                    with llm_slot():
-                        response = client.post(url, headers=headers, json=payload)
-
-                    if response.status_code >= 400:
-                        if response.status_code == 429 or response.status_code >= 500:
-                            raise httpx.HTTPStatusError(
-                                f"Transient HTTP {response.status_code}",
-                                request=response.request,
-                                response=response,
-                            )
-                        logger.error("Gemini API HTTP error status=%s", response.status_code)
-                        return "{}"
+                if collector is None:
+                    response = yield Post(payload)
+                else:
+                    collector.reset()
+                    response = yield Post(payload, stream=collector.feed_line)
+
+                if response.status_code >= 400:
+                    if response.status_code == 429 or response.status_code >= 500:
+                        raise httpx.HTTPStatusError(
+                            f"Transient HTTP {response.status_code}",
+                            request=response.request,
+                            response=response,
+                        )
+                    logger.error("Gemini API HTTP error status=%s", response.status_code)
+                    return "{}"
 
+                if collector is not None:
+                    text = collector.finish()
+                else:
                     data = response.json()
 
                     # Extract text from response structure
@@ -959,9 +1373,9 @@ class GeminiLLM:
                         return "{}"
 
                     text = candidates[0].get("content", {}).get("parts", [{}])[0].get("text", "")
-                    if cache_key is not None and text:
-                        get_llm_memory_cache().set(cache_key, text, ttl_s=3600)
-                    return text
+                if request_key is not None and text and get_infra_settings().enable_llm_cache:
+                    get_llm_cache().set(request_key, text)
+                return text
             except httpx.RequestError as e:
                 last_error = e
                 logger.warning("Gemini API transport error attempt=%s error=%s", attempt + 1, type(e).__name__)
@@ -969,6 +1383,8 @@ class GeminiLLM:
                 last_error = e
                 status_code = getattr(e.response, "status_code", None)
                 logger.warning("Gemini API transient HTTP error attempt=%s status=%s", attempt + 1, status_code)
+            except StreamAbortedError:
+                raise
             except Exception as e:
                 logger.error(f"Unexpected error in GeminiLLM: {e}")
                 return "{}"
@@ -983,7 +1399,7 @@ class GeminiLLM:
             sleep_s = retry_after if retry_after is not None else backoff_seconds(attempt)
             remaining = max(0.0, deadline - time.monotonic())
             if remaining > 0:
-                time.sleep(min(sleep_s, remaining))
+                yield Sleep(min(sleep_s, remaining))
 
         # All retries exhausted
         logger.error(f"All {max_retries} retries exhausted. Last error: {last_error}")
@@ -1016,6 +1432,9 @@ class DeterministicStubLLM:
             self._warned = True
         return json.dumps(self.payload)
 
+    async def agenerate(self, prompt: str, **kwargs: Any) -> str:
+        return self.generate(prompt, **kwargs)
+
 TModel = TypeVar("TModel", bound=BaseModel)
 
 
@@ -1081,19 +1500,50 @@ class LLMService:
         user_prompt: str,
         response_model: type[TModel],
         temperature: float = 0.0,
+        on_event: Callable[[JSONStreamEvent], None] | None = None,
     ) -> TModel:
+        """Generate and validate ``response_model``.
+
+        With ``LLM_STREAMING`` enabled and a streaming client, each completed
+        top-level section is validated as it arrives (a bad section aborts the
+        call with ``StreamAbortedError``) and then passed to ``on_event``.
+        """
         prompt = f"{system_prompt.strip()}\n\n{user_prompt.strip()}\n"
 
         # Prefer prompt-only enforcement for now; Gemini response_schema requires a
         # provider-specific schema shape (see LLMDetailedExtractor for conversion).
-        raw = self._generate(prompt, temperature=temperature)
-        cleaned = _strip_markdown_code_fences(raw)
+        if self._streams():
+            raw = self._llm.generate_stream(  # type: ignore[attr-defined]
+                prompt, on_event=section_validator(response_model, on_event), **self._kwargs(temperature)
+            )
+        else:
+            raw = self._generate(prompt, temperature=temperature)
+        return _parse_json_response(raw, response_model)
 
-        if cleaned.strip() in {"null", "None", ""}:
-            raise ValueError("LLM returned null/empty response")
+    async def agenerate_json(
+        self,
+        *,
+        system_prompt: str,
+        user_prompt: str,
+        response_model: type[TModel],
+        temperature: float = 0.0,
+        on_event: Callable[[JSONStreamEvent], None] | None = None,
+    ) -> TModel:
+        """Async ``generate_json``; clients without ``agenerate`` run in a worker thread."""
+        prompt = f"{system_prompt.strip()}\n\n{user_prompt.strip()}\n"
+        if self._streams():
+            raw = await self._llm.agenerate_stream(  # type: ignore[attr-defined]
+                prompt, on_event=section_validator(response_model, on_event), **self._kwargs(temperature)
+            )
+        else:
+            raw = await self._agenerate(prompt, temperature=temperature)
+        return _parse_json_response(raw, response_model)
+
+    def _streams(self) -> bool:
+        return get_infra_settings().llm_streaming and hasattr(self._llm, "generate_stream")
 
-        data = json.loads(cleaned)
-        return response_model.model_validate(data)
+    def _kwargs(self, temperature: float) -> dict[str, Any]:
+        return {"temperature": temperature} if isinstance(self._llm, GeminiLLM) else {}
 
     def _generate(self, prompt: str, *, temperature: float) -> str:
         llm = self._llm
@@ -1101,6 +1551,25 @@ class LLMService:
             return llm.generate(prompt, temperature=temperature)
         return llm.generate(prompt)
 
+    async def _agenerate(self, prompt: str, *, temperature: float) -> str:
+        llm = self._llm
+        agenerate = getattr(llm, "agenerate", None)
+        if agenerate is None:
+            return await asyncio.to_thread(self._generate, prompt, temperature=temperature)
+        if isinstance(llm, GeminiLLM):
+            return await agenerate(prompt, temperature=temperature)
+        return await agenerate(prompt)
+
+
+def _parse_json_response(raw: str, response_model: type[TModel]) -> TModel:
+    cleaned = _strip_markdown_code_fences(raw)
+
+    if cleaned.strip() in {"null", "None", ""}:
+        raise ValueError("LLM returned null/empty response")
+
+    data = json.loads(cleaned)
+    return response_model.model_validate(data)
+
 
 def _strip_markdown_code_fences(text: str) -> str:
     if not text:
@@ -1115,4 +1584,11 @@ def _strip_markdown_code_fences(text: str) -> str:
     return cleaned.strip()
 
 
-__all__ = ["LLMInterface", "GeminiLLM", "OpenAILLM", "DeterministicStubLLM", "LLMService"]
+__all__ = [
+    "AsyncLLMInterface",
+    "LLMInterface",
+    "GeminiLLM",
+    "OpenAILLM",
+    "DeterministicStubLLM",
+    "LLMService",
+]
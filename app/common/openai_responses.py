@@ -19,8 +19,10 @@ import httpx
 from app.common.logger import get_logger
 from app.common.exceptions import LLMError
 from app.common.model_capabilities import filter_payload_for_model, is_gpt5
-from app.infra.llm_control import backoff_seconds, llm_slot, parse_retry_after_seconds
+from app.infra.http_transport import get_async_http_client, get_http_client
+from app.infra.llm_control import backoff_seconds, parse_retry_after_seconds
 from app.infra.settings import get_infra_settings
+from app.llm.exchange import Exchange, Post, Sleep, arun_exchange, run_exchange
 
 logger = get_logger("common.openai_responses")
 
@@ -392,6 +394,34 @@ def post_responses(
         LLMError: On failure after retries
         ResponsesEndpointNotFound: If endpoint returns 404 (for fallback)
     """
+    return run_exchange(
+        _responses_exchange(url, payload, model=model),
+        client=get_http_client(url),
+        url=url,
+        headers=headers,
+        timeout=timeout,
+    )
+
+
+async def apost_responses(
+    url: str,
+    headers: dict[str, str],
+    payload: dict[str, Any],
+    *,
+    timeout: httpx.Timeout,
+    model: str,
+) -> dict[str, Any]:
+    """Async ``post_responses`` (same retry policy, awaited on the event loop)."""
+    return await arun_exchange(
+        _responses_exchange(url, payload, model=model),
+        client=get_async_http_client(url),
+        url=url,
+        headers=headers,
+        timeout=timeout,
+    )
+
+
+def _responses_exchange(url: str, payload: dict[str, Any], *, model: str) -> Exchange[dict[str, Any]]:
     removed_on_retry: list[str] = []
     did_retry_timeout = False
     did_retry_unsupported = False
@@ -400,86 +430,84 @@ def post_responses(
 
     deadline = time.monotonic() + float(get_infra_settings().llm_timeout_s)
 
-    with httpx.Client(timeout=timeout) as client:
-        for attempt in range(3):  # Max attempts
-            try:
-                with llm_slot():
-                    response = client.post(url, headers=headers, json=attempt_payload)
-            except (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.RemoteProtocolError, httpx.TransportError) as exc:
-                if not did_retry_timeout:
-                    did_retry_timeout = True
-                    backoff = random.uniform(0.8, 1.5)
-                    logger.warning(
-                        "Responses API transient transport error; retrying once endpoint=%s model=%s",
-                        url,
-                        model,
-                    )
-                    time.sleep(backoff)
-                    continue
-                raise LLMError(
-                    f"Responses API transport error after retry (model={model}): {type(exc).__name__}"
-                ) from exc
-
-            if response.status_code < 400:
-                resp_json = response.json()
-                logger.debug(
-                    "Responses API success status=%s keys=%s",
-                    response.status_code,
-                    list(resp_json.keys()) if isinstance(resp_json, dict) else type(resp_json).__name__,
+    for attempt in range(3):  # Max attempts
+        try:
+            response = yield Post(attempt_payload)
+        except (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.RemoteProtocolError, httpx.TransportError) as exc:
+            if not did_retry_timeout:
+                did_retry_timeout = True
+                backoff = random.uniform(0.8, 1.5)
+                logger.warning(
+                    "Responses API transient transport error; retrying once endpoint=%s model=%s",
+                    url,
+                    model,
                 )
-                return resp_json
-
-            message, error_type, error_param = _openai_error_details(response)
-            request_id = _openai_request_id(response)
-            request_id_suffix = f" request_id={request_id}" if request_id else ""
+                yield Sleep(backoff)
+                continue
+            raise LLMError(
+                f"Responses API transport error after retry (model={model}): {type(exc).__name__}"
+            ) from exc
 
-            logger.warning(
-                "Responses API error status=%s endpoint=%s model=%s%s",
+        if response.status_code < 400:
+            resp_json = response.json()
+            logger.debug(
+                "Responses API success status=%s keys=%s",
                 response.status_code,
-                url,
-                model,
-                request_id_suffix,
+                list(resp_json.keys()) if isinstance(resp_json, dict) else type(resp_json).__name__,
             )
+            return resp_json
+
+        message, error_type, error_param = _openai_error_details(response)
+        request_id = _openai_request_id(response)
+        request_id_suffix = f" request_id={request_id}" if request_id else ""
+
+        logger.warning(
+            "Responses API error status=%s endpoint=%s model=%s%s",
+            response.status_code,
+            url,
+            model,
+            request_id_suffix,
+        )
 
-            # Check for endpoint not found (for fallback)
-            if _looks_like_endpoint_not_found(response.status_code, message):
-                raise ResponsesEndpointNotFound(
-                    f"Responses endpoint not available (status={response.status_code}, model={model})"
-                )
-
-            if response.status_code == 429 or 500 <= response.status_code <= 599:
-                if attempt < 2 and time.monotonic() < deadline:
-                    retry_after = parse_retry_after_seconds(response.headers)
-                    sleep_s = retry_after if retry_after is not None else backoff_seconds(attempt)
-                    remaining = max(0.0, deadline - time.monotonic())
-                    if remaining > 0:
-                        time.sleep(min(sleep_s, remaining))
-                        continue
-
-            # Try retry on unsupported param
-            should_retry = (
-                not did_retry_unsupported
-                and response.status_code == 400
-                and _looks_like_unsupported_parameter_error(
-                    message=message, error_type=error_type, error_param=error_param
-                )
+        # Check for endpoint not found (for fallback)
+        if _looks_like_endpoint_not_found(response.status_code, message):
+            raise ResponsesEndpointNotFound(
+                f"Responses endpoint not available (status={response.status_code}, model={model})"
             )
-            if should_retry:
-                retry_payload, removed_on_retry = _build_responses_retry_payload(
-                    attempt_payload,
-                    message=message,
-                    error_param=error_param,
-                )
-                if removed_on_retry:
-                    attempt_payload = retry_payload
-                    did_retry_unsupported = True
+
+        if response.status_code == 429 or 500 <= response.status_code <= 599:
+            if attempt < 2 and time.monotonic() < deadline:
+                retry_after = parse_retry_after_seconds(response.headers)
+                sleep_s = retry_after if retry_after is not None else backoff_seconds(attempt)
+                remaining = max(0.0, deadline - time.monotonic())
+                if remaining > 0:
+                    yield Sleep(min(sleep_s, remaining))
                     continue
 
-            removed_summary = ", ".join(removed_on_retry) if removed_on_retry else "none"
-            raise LLMError(
-                f"Responses API request failed (status={response.status_code}, model={model}, "
-                f"removed_on_retry={removed_summary}): {message}"
+        # Try retry on unsupported param
+        should_retry = (
+            not did_retry_unsupported
+            and response.status_code == 400
+            and _looks_like_unsupported_parameter_error(
+                message=message, error_type=error_type, error_param=error_param
             )
+        )
+        if should_retry:
+            retry_payload, removed_on_retry = _build_responses_retry_payload(
+                attempt_payload,
+                message=message,
+                error_param=error_param,
+            )
+            if removed_on_retry:
+                attempt_payload = retry_payload
+                did_retry_unsupported = True
+                continue
+
+        removed_summary = ", ".join(removed_on_retry) if removed_on_retry else "none"
+        raise LLMError(
+            f"Responses API request failed (status={response.status_code}, model={model}, "
+            f"removed_on_retry={removed_summary}): {message}"
+        )
 
     # Should not reach here, but safety
     raise LLMError(f"Responses API request failed after all attempts (model={model})")
@@ -497,6 +525,7 @@ __all__ = [
     "build_responses_payload",
     "parse_responses_text",
     "parse_responses_json_object",
+    "apost_responses",
     "post_responses",
     "ResponsesEndpointNotFound",
 ]
@@ -0,0 +1,184 @@
+"""Admission control: shed expensive requests early instead of queueing them.
+
+Under a burst, ``run_cpu`` work piles up in the executor and LLM calls queue on
+the limiter, so every request slows down before any of them fails. The
+controller estimates how long a new request would wait before it gets served
+and turns it away (503 + ``Retry-After``) once that estimate exceeds the
+budget for its priority class.
+
+The estimate is the larger of:
+
+- **request backlog**: admitted requests beyond the pipeline's concurrency
+  (``PROCESS_BATCH_CONCURRENCY``), times the recent request latency;
+- **resource backlog**: CPU tasks queued behind ``CPU_WORKERS``, times the
+  recent CPU task latency, plus the longest LLM limiter queue wait.
+
+Latencies are EWMAs, so with no history (cold start) nothing is shed.
+Priority classes:
+
+- ``critical``: health, metrics, UI and everything cheap; never shed.
+- ``standard``: single-note pipeline routes; shed past ``ADMISSION_MAX_WAIT_S``.
+- ``bulk``: batch and bundle routes; shed past ``ADMISSION_BULK_MAX_WAIT_S``
+  (lower), so bulk traffic backs off before interactive traffic does.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Generator, Literal, TypeVar
+
+from app.infra.settings import get_infra_settings
+
+R = TypeVar("R")
+
+Priority = Literal["critical", "standard", "bulk"]
+
+_EWMA_ALPHA = 0.2
+_MAX_RETRY_AFTER_S = 120
+
+
+def _ewma(current: float | None, sample: float) -> float:
+    return sample if current is None else current + _EWMA_ALPHA * (sample - current)
+
+
+@dataclass(frozen=True)
+class AdmissionDecision:
+    admitted: bool
+    predicted_wait_s: float
+    retry_after_s: int = 0
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        *,
+        cpu_workers: int,
+        request_capacity: int,
+        max_wait_s: float,
+        bulk_max_wait_s: float,
+        llm_stats: Callable[[], dict[str, dict[str, Any]]] | None = None,
+    ) -> None:
+        self.cpu_workers = max(1, int(cpu_workers))
+        self.request_capacity = max(1, int(request_capacity))
+        self.budgets: dict[str, float] = {"standard": float(max_wait_s), "bulk": float(bulk_max_wait_s)}
+        self._llm_stats = llm_stats
+        self._lock = threading.Lock()
+        self.cpu_pending = 0
+        self.in_flight = 0
+        self._cpu_latency_s: float | None = None
+        self._request_latency_s: float | None = None
+
+    # -- CPU executor --------------------------------------------------------
+
+    @contextmanager
+    def cpu_pending_task(self) -> Generator[None, None, None]:
+        """Count a task from submission to the executor until it returns."""
+        with self._lock:
+            self.cpu_pending += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.cpu_pending -= 1
+
+    def timed_cpu(self, fn: Callable[..., R]) -> Callable[..., R]:
+        """Wrap ``fn`` so its run time (excluding queue wait) feeds the CPU latency estimate."""
+
+        @functools.wraps(fn)
+        def _run(*args: Any, **kwargs: Any) -> R:
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record_cpu_latency(time.perf_counter() - started)
+
+        return _run
+
+    def record_cpu_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._cpu_latency_s = _ewma(self._cpu_latency_s, seconds)
+
+    # -- requests ------------------------------------------------------------
+
+    def _llm_wait_s(self) -> float:
+        if self._llm_stats is None:
+            return 0.0
+        worst = 0.0
+        for stats in self._llm_stats().values():
+            latency = stats.get("latency_ewma_s") or 0.0
+            limit = max(1.0, float(stats.get("limit") or 1.0))
+            wait = float(stats.get("blocked_for_s") or 0.0) + stats.get("queue_depth", 0) / limit * latency
+            worst = max(worst, wait)
+        return worst
+
+    def predicted_wait_s(self) -> float:
+        """Estimated wait before a newly admitted request gets served."""
+        with self._lock:
+            cpu_queued = max(0, self.cpu_pending - self.cpu_workers)
+            cpu_wait = cpu_queued / self.cpu_workers * (self._cpu_latency_s or 0.0)
+            queued = max(0, self.in_flight + 1 - self.request_capacity)
+            request_wait = queued / self.request_capacity * (self._request_latency_s or 0.0)
+        return max(request_wait, cpu_wait + self._llm_wait_s())
+
+    def try_admit(self, priority: Priority) -> AdmissionDecision:
+        """Admit (and count) the request, or reject it with a ``Retry-After``."""
+        if priority == "critical":
+            return AdmissionDecision(admitted=True, predicted_wait_s=0.0)
+        predicted = self.predicted_wait_s()
+        if predicted > self.budgets.get(priority, self.budgets["standard"]):
+            retry_after = min(_MAX_RETRY_AFTER_S, max(1, math.ceil(predicted)))
+            return AdmissionDecision(admitted=False, predicted_wait_s=predicted, retry_after_s=retry_after)
+        with self._lock:
+            self.in_flight += 1
+        return AdmissionDecision(admitted=True, predicted_wait_s=predicted)
+
+    def release(self, priority: Priority, *, elapsed_s: float, ok: bool) -> None:
+        """Finish an admitted request; successful ``standard`` requests update the latency estimate."""
+        if priority == "critical":
+            return
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            if ok and priority == "standard":
+                self._request_latency_s = _ewma(self._request_latency_s, elapsed_s)
+
+    def snapshot(self) -> dict[str, Any]:
+        predicted = self.predicted_wait_s()
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "request_capacity": self.request_capacity,
+                "request_latency_ewma_s": _round(self._request_latency_s),
+                "cpu_pending": self.cpu_pending,
+                "cpu_workers": self.cpu_workers,
+                "cpu_latency_ewma_s": _round(self._cpu_latency_s),
+                "llm_wait_s": round(self._llm_wait_s(), 3),
+                "predicted_wait_s": round(predicted, 3),
+                "budgets_s": dict(self.budgets),
+            }
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 3) if value is not None else None
+
+
+@lru_cache(maxsize=1)
+def get_admission_controller() -> AdmissionController:
+    from app.infra.llm_limiter import limiter_stats
+
+    settings = get_infra_settings()
+    return AdmissionController(
+        cpu_workers=settings.cpu_workers,
+        request_capacity=settings.process_batch_concurrency,
+        max_wait_s=settings.admission_max_wait_s,
+        bulk_max_wait_s=settings.admission_bulk_max_wait_s,
+        llm_stats=limiter_stats,
+    )
+
+
+__all__ = ["AdmissionController", "AdmissionDecision", "Priority", "get_admission_controller"]
@@ -82,17 +82,34 @@ class RedisCache:
             return raw
 
     def set(self, key: str, value: Any, *, ttl_s: float | None = None) -> None:
-        ttl_seconds = int(ttl_s) if ttl_s is not None and ttl_s > 0 else None
         payload: bytes
         try:
             payload = json.dumps(value).encode("utf-8")
         except TypeError:
             payload = str(value).encode("utf-8")
+        self.set_bytes(key, payload, ttl_s=ttl_s)
+
+    def get_bytes(self, key: str) -> bytes | None:
+        raw = self._client.get(key)
+        return bytes(raw) if raw is not None else None
+
+    def set_bytes(self, key: str, payload: bytes, *, ttl_s: float | None = None) -> None:
+        ttl_seconds = int(ttl_s) if ttl_s is not None and ttl_s > 0 else None
         if ttl_seconds is not None:
             self._client.setex(key, ttl_seconds, payload)
         else:
             self._client.set(key, payload)
 
+    def delete_matching(self, pattern: str, *, keep_prefix: str | None = None) -> int:
+        """Delete keys matching a glob ``pattern`` (except those under ``keep_prefix``)."""
+        removed = 0
+        for raw_key in self._client.scan_iter(match=pattern):
+            key = raw_key.decode("utf-8") if isinstance(raw_key, bytes) else str(raw_key)
+            if keep_prefix is not None and key.startswith(keep_prefix):
+                continue
+            removed += int(self._client.delete(raw_key) or 0)
+        return removed
+
 
 _llm_memory_cache = MemoryCache(max_size=1024)
 _ml_memory_cache = MemoryCache(max_size=2048)
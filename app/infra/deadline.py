@@ -0,0 +1,137 @@
+"""Request-level deadline carried through the pipeline in a context variable.
+
+``request_deadline(seconds)`` bounds everything that runs inside it: the
+stages of ``run_unified_pipeline_logic``, work handed to ``run_cpu`` (which
+copies the context into the worker thread) and every LLM call made through
+``app.llm.exchange``. Each stage still has its own timeout; the request
+deadline only tightens it:
+
+- LLM posts get their HTTP timeouts capped to the remaining time, and
+  backoff sleeps are cut short. A call started after the deadline raises
+  ``DeadlineExceededError``.
+- Optional stages (self-correction, V3 quote repair, V3 event log,
+  relations ML) call ``budget_skip_warning`` and skip themselves with a
+  ``DEADLINE_SKIPPED`` warning when less than ``REQUEST_DEADLINE_OPTIONAL_MIN_S``
+  remains.
+
+Without an active deadline (``REQUEST_DEADLINE_S=0``) every helper is a no-op.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+import httpx
+
+from app.common.exceptions import LLMError
+from app.infra.settings import get_infra_settings
+from observability.metrics import emit_metric
+
+_deadline: ContextVar[float | None] = ContextVar("procsuite_request_deadline", default=None)
+
+
+class DeadlineExceededError(LLMError):
+    """The request-level deadline passed before the work could run."""
+
+
+@contextmanager
+def request_deadline(seconds: float | None) -> Iterator[float | None]:
+    """Run the block under a deadline ``seconds`` from now (``None``/``<= 0``: unchanged).
+
+    Nested deadlines can only tighten the enclosing one. Yields the absolute
+    ``time.monotonic()`` deadline in effect, or ``None``.
+    """
+    current = _deadline.get()
+    if seconds is None or float(seconds) <= 0:
+        yield current
+        return
+    at = time.monotonic() + float(seconds)
+    if current is not None:
+        at = min(at, current)
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        _deadline.reset(token)
+
+
+def deadline_at() -> float | None:
+    """Absolute ``time.monotonic()`` deadline of the current request, if any."""
+    return _deadline.get()
+
+
+def remaining_s() -> float | None:
+    """Seconds left before the request deadline (``None`` = unbounded, never negative)."""
+    at = _deadline.get()
+    if at is None:
+        return None
+    return max(0.0, at - time.monotonic())
+
+
+def check_deadline(stage: str) -> None:
+    """Raise ``DeadlineExceededError`` if the request deadline has passed."""
+    remaining = remaining_s()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceededError(f"Request deadline exceeded before {stage}")
+
+
+def cap_deadline(deadline: float) -> float:
+    """``deadline`` (monotonic) tightened to the request deadline."""
+    at = _deadline.get()
+    return deadline if at is None else min(deadline, at)
+
+
+def cap_seconds(seconds: float) -> float:
+    """``seconds`` tightened to the time left before the request deadline."""
+    remaining = remaining_s()
+    return seconds if remaining is None else min(seconds, remaining)
+
+
+def cap_timeout(timeout: httpx.Timeout, *, stage: str = "LLM call") -> httpx.Timeout:
+    """Cap each phase of ``timeout`` to the remaining time; raise if none is left."""
+    remaining = remaining_s()
+    if remaining is None:
+        return timeout
+    check_deadline(stage)
+
+    def _cap(value: float | None) -> float:
+        return remaining if value is None else min(float(value), remaining)
+
+    return httpx.Timeout(
+        connect=_cap(timeout.connect),
+        read=_cap(timeout.read),
+        write=_cap(timeout.write),
+        pool=_cap(timeout.pool),
+    )
+
+
+def budget_skip_warning(stage: str, *, min_s: float | None = None) -> str | None:
+    """Warning to emit when an optional ``stage`` should be skipped for lack of time.
+
+    ``None`` means run the stage: no deadline, or at least ``min_s`` (default
+    ``REQUEST_DEADLINE_OPTIONAL_MIN_S``) seconds remain.
+    """
+    remaining = remaining_s()
+    if remaining is None:
+        return None
+    needed = float(get_infra_settings().request_deadline_optional_min_s if min_s is None else min_s)
+    if remaining >= needed:
+        return None
+    emit_metric("incr", "request_deadline_stage_skipped", tags={"stage": stage})
+    return f"DEADLINE_SKIPPED: {stage} (remaining={remaining:.1f}s < {needed:.1f}s)"
+
+
+__all__ = [
+    "DeadlineExceededError",
+    "budget_skip_warning",
+    "cap_deadline",
+    "cap_seconds",
+    "cap_timeout",
+    "check_deadline",
+    "deadline_at",
+    "remaining_s",
+    "request_deadline",
+]
@@ -3,20 +3,52 @@
 from __future__ import annotations
 
 import asyncio
+import contextvars
 import functools
+import time
 from typing import Any, Callable, TypeVar
 
 from fastapi import FastAPI
 
+from app.infra.admission import get_admission_controller
+
 R = TypeVar("R")
 
 
 async def run_cpu(app: FastAPI, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
-    """Run a blocking function in the app's CPU executor."""
+    """Run a blocking function in the app's CPU executor.
+
+    The caller's context (e.g. the request deadline) is copied into the worker.
+    Queue depth and run time feed admission control (``app.infra.admission``).
+    """
     loop = asyncio.get_running_loop()
     executor = getattr(app.state, "cpu_executor", None)
-    bound = functools.partial(fn, *args, **kwargs)
-    return await loop.run_in_executor(executor, bound)
-
-
-__all__ = ["run_cpu"]
+    admission = get_admission_controller()
+    bound = functools.partial(contextvars.copy_context().run, admission.timed_cpu(fn), *args, **kwargs)
+    with admission.cpu_pending_task():
+        return await loop.run_in_executor(executor, bound)
+
+
+async def run_cpu_task(
+    app: FastAPI,
+    task: Callable[[dict[str, Any]], dict[str, Any]],
+    payload: dict[str, Any],
+) -> dict[str, Any]:
+    """Run a dict-in/dict-out task in the CPU process pool, or the thread executor without one.
+
+    ``task`` must be a module-level function (it is pickled by reference).
+    In the pool, the measured run time includes the hand-off to the worker.
+    """
+    pool = getattr(app.state, "cpu_process_pool", None)
+    if pool is not None:
+        admission = get_admission_controller()
+        with admission.cpu_pending_task():
+            started = time.perf_counter()
+            try:
+                return await pool.run(task, payload)
+            finally:
+                admission.record_cpu_latency(time.perf_counter() - started)
+    return await run_cpu(app, task, payload)
+
+
+__all__ = ["run_cpu", "run_cpu_task"]
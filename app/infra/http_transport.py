@@ -0,0 +1,248 @@
+"""Process-wide pooled HTTP clients for outbound LLM calls.
+
+Every LLM call site used to open a fresh ``httpx.Client`` per call (Gemini:
+per retry attempt), paying a TCP + TLS handshake each time. This module keeps
+one client per origin (``scheme://host:port``) so connections are reused
+across calls, threads and request handlers.
+
+- Bounded keep-alive pools (``LLM_HTTP_MAX_CONNECTIONS``,
+  ``LLM_HTTP_MAX_KEEPALIVE``, ``LLM_HTTP_KEEPALIVE_S``).
+- HTTP/2 when the optional ``h2`` package is importable and ``LLM_HTTP2`` is
+  not disabled.
+- Fork safety: a child process never reuses sockets inherited from its
+  parent; the registry is dropped after ``fork()`` and lazily rebuilt.
+- Reuse metrics: each request is counted as riding a ``new`` or ``reused``
+  connection (httpcore trace events), exposed via ``transport_stats()`` and
+  the ``llm_http_requests`` counter of the metrics client.
+
+Timeouts stay per call (``client.post(..., timeout=...)``); the client-level
+timeout is only a default.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+from collections import defaultdict
+from typing import Any
+
+import httpx
+
+from app.infra.settings import get_infra_settings
+from observability.metrics import emit_metric
+
+_logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pid = os.getpid()
+_sync_clients: dict[str, httpx.Client] = {}
+# Async clients are bound to the event loop that first used them. Keyed weakly
+# on the loop, so a finished loop's clients are dropped with it and a new loop
+# can never be handed a client bound to a dead one.
+_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]
+] = weakref.WeakKeyDictionary()
+_stats: dict[str, dict[str, int]] = defaultdict(lambda: {"requests": 0, "new_connections": 0, "clients": 0})
+
+
+def origin_of(url: str) -> str:
+    """``scheme://host[:port]`` for a URL (the pool key)."""
+    parsed = httpx.URL(url)
+    port = f":{parsed.port}" if parsed.port else ""
+    return f"{parsed.scheme}://{parsed.host}{port}"
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _limits() -> httpx.Limits:
+    settings = get_infra_settings()
+    return httpx.Limits(
+        max_connections=settings.llm_http_max_connections,
+        max_keepalive_connections=settings.llm_http_max_keepalive,
+        keepalive_expiry=settings.llm_http_keepalive_s,
+    )
+
+
+def _default_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=10.0,
+        read=float(get_infra_settings().llm_timeout_s),
+        write=30.0,
+        pool=30.0,
+    )
+
+
+def _use_http2() -> bool:
+    return get_infra_settings().llm_http2 and http2_available()
+
+
+def _record(origin: str, new_connection: bool) -> None:
+    with _lock:
+        entry = _stats[origin]
+        entry["requests"] += 1
+        if new_connection:
+            entry["new_connections"] += 1
+    emit_metric(
+        "incr",
+        "llm_http_requests",
+        tags={"origin": origin, "connection": "new" if new_connection else "reused"},
+    )
+
+
+class _ConnectionTracer:
+    """httpcore ``trace`` callback noting whether a request opened a socket."""
+
+    __slots__ = ("origin", "new_connection")
+
+    def __init__(self, origin: str) -> None:
+        self.origin = origin
+        self.new_connection = False
+
+    def __call__(self, event: str, info: dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.complete":
+            self.new_connection = True
+
+
+class _AsyncConnectionTracer(_ConnectionTracer):
+    async def __call__(self, event: str, info: dict[str, Any]) -> None:  # type: ignore[override]
+        if event == "connection.connect_tcp.complete":
+            self.new_connection = True
+
+
+def _sync_hooks(origin: str) -> dict[str, list[Any]]:
+    def _on_request(request: httpx.Request) -> None:
+        request.extensions.setdefault("trace", _ConnectionTracer(origin))
+
+    def _on_response(response: httpx.Response) -> None:
+        tracer = response.request.extensions.get("trace")
+        _record(origin, isinstance(tracer, _ConnectionTracer) and tracer.new_connection)
+
+    return {"request": [_on_request], "response": [_on_response]}
+
+
+def _async_hooks(origin: str) -> dict[str, list[Any]]:
+    async def _on_request(request: httpx.Request) -> None:
+        request.extensions.setdefault("trace", _AsyncConnectionTracer(origin))
+
+    async def _on_response(response: httpx.Response) -> None:
+        tracer = response.request.extensions.get("trace")
+        _record(origin, isinstance(tracer, _ConnectionTracer) and tracer.new_connection)
+
+    return {"request": [_on_request], "response": [_on_response]}
+
+
+def _check_fork() -> None:
+    """Drop clients inherited across ``fork()`` (caller holds ``_lock``)."""
+    global _pid
+    if os.getpid() != _pid:
+        # The parent still owns these sockets; abandon rather than close them.
+        _sync_clients.clear()
+        _async_clients.clear()
+        _stats.clear()
+        _pid = os.getpid()
+
+
+def get_http_client(url: str) -> httpx.Client:
+    """Shared pooled client for the origin of ``url`` (thread-safe)."""
+    origin = origin_of(url)
+    with _lock:
+        _check_fork()
+        client = _sync_clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.Client(
+                http2=_use_http2(),
+                limits=_limits(),
+                timeout=_default_timeout(),
+                event_hooks=_sync_hooks(origin),
+            )
+            _sync_clients[origin] = client
+            _stats[origin]["clients"] += 1
+            _logger.info("Created pooled HTTP client origin=%s http2=%s", origin, _use_http2())
+        return client
+
+
+def get_async_http_client(url: str) -> httpx.AsyncClient:
+    """Shared pooled async client for ``url``'s origin on the running event loop."""
+    origin = origin_of(url)
+    loop = asyncio.get_running_loop()
+    with _lock:
+        _check_fork()
+        clients = _async_clients.get(loop)
+        if clients is None:
+            clients = _async_clients[loop] = {}
+        client = clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=_use_http2(),
+                limits=_limits(),
+                timeout=_default_timeout(),
+                event_hooks=_async_hooks(origin),
+            )
+            clients[origin] = client
+            _stats[origin]["clients"] += 1
+        return client
+
+
+def transport_stats() -> dict[str, dict[str, int]]:
+    """Per-origin counters: clients created, requests, new vs reused connections."""
+    with _lock:
+        return {
+            origin: {**entry, "reused_connections": entry["requests"] - entry["new_connections"]}
+            for origin, entry in _stats.items()
+        }
+
+
+def close_http_clients() -> None:
+    """Close sync clients and forget all pooled clients (shutdown / tests)."""
+    with _lock:
+        clients = list(_sync_clients.values())
+        _sync_clients.clear()
+        _async_clients.clear()
+        _stats.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:  # noqa: BLE001
+            pass
+
+
+async def aclose_http_clients() -> None:
+    """Close async clients owned by the running event loop."""
+    with _lock:
+        clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        try:
+            await client.aclose()
+        except Exception:  # noqa: BLE001
+            pass
+
+
+def _reset_after_fork() -> None:
+    global _lock
+    # A thread in the parent may have held the lock at fork time.
+    _lock = threading.Lock()
+    _check_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+atexit.register(close_http_clients)
+
+
+__all__ = [
+    "aclose_http_clients",
+    "close_http_clients",
+    "get_async_http_client",
+    "get_http_client",
+    "http2_available",
+    "origin_of",
+    "transport_stats",
+]
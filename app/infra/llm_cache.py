@@ -0,0 +1,468 @@
+"""Tiered cache for LLM responses (memory → SQLite on disk → optional Redis).
+
+Golden-set evals, rebuilds and QA reruns send the same prompts over and over;
+this cache lets them replay responses instead of paying for new calls.
+
+- Keys come from ``make_llm_cache_key`` (model + prompt version + prompt +
+  schema version) and live in a per-task namespace:
+  ``llm:<namespace>:<prompt_version>:<digest>``. Keys are hashes; raw note
+  text is never stored in a key.
+- Tiers: a byte- and entry-bounded in-process LRU, a local SQLite file
+  (``LLM_CACHE_PATH``, size-bounded with least-recently-used eviction), and
+  Redis when ``ENABLE_REDIS_CACHE`` + ``REDIS_URL`` are set. Hits in a lower
+  tier are promoted to the tiers above it.
+- Values are zlib-compressed on disk and in Redis.
+- ``invalidate(namespace, keep_prompt_version=...)`` drops a namespace, or
+  every entry written under an older prompt version.
+- Hit/miss counters per tier and bytes read/written are kept in ``stats()``
+  and emitted as ``llm_cache_lookups`` / ``llm_cache_bytes`` metrics.
+
+The persistent tiers are only built when ``ENABLE_LLM_CACHE`` is set; the
+memory tier always exists.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from app.infra.cache import RedisCache
+from app.infra.llm_control import make_llm_cache_key
+from app.infra.settings import get_infra_settings
+from observability.metrics import emit_metric
+
+logger = logging.getLogger(__name__)
+
+_SAFE_SEGMENT_RE = re.compile(r"[^A-Za-z0-9_.\-]+")
+
+
+def _segment(value: str | None, default: str) -> str:
+    cleaned = _SAFE_SEGMENT_RE.sub("_", (value or "").strip())[:64]
+    return cleaned or default
+
+
+@dataclass(frozen=True)
+class LLMCacheKey:
+    namespace: str
+    prompt_version: str
+    digest: str
+
+    @property
+    def storage_key(self) -> str:
+        return f"llm:{self.namespace}:{self.prompt_version}:{self.digest}"
+
+
+def llm_cache_key(
+    *,
+    task: str | None,
+    model: str,
+    prompt: str,
+    prompt_version: str | None = None,
+    schema_version: str | None = None,
+) -> LLMCacheKey:
+    """Cache key for one LLM call; ``task`` selects the namespace."""
+    version = _segment(prompt_version, "default")
+    digest = make_llm_cache_key(
+        model=model,
+        prompt=prompt,
+        prompt_version=version,
+        schema_version=schema_version or "",
+    )
+    return LLMCacheKey(namespace=_segment(task, "default"), prompt_version=version, digest=digest)
+
+
+def schema_fingerprint(schema: Any) -> str:
+    """Short stable hash of a JSON schema / response model (for ``schema_version``)."""
+    if schema is None:
+        return ""
+    if hasattr(schema, "model_json_schema"):
+        schema = schema.model_json_schema()
+    encoded = json.dumps(schema, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _compress(value: str) -> bytes:
+    return zlib.compress(value.encode("utf-8"), 6)
+
+
+def _decompress(payload: bytes) -> str:
+    return zlib.decompress(payload).decode("utf-8")
+
+
+class _MemoryTier:
+    """LRU bounded by entry count and total characters stored."""
+
+    def __init__(self, *, max_entries: int, max_bytes: int) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._max_bytes = max(1, int(max_bytes))
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[str, tuple[str, float | None]]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                self._drop(key)
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, *, ttl_s: float | None) -> None:
+        expires_at = time.time() + ttl_s if ttl_s else None
+        with self._lock:
+            self._drop(key)
+            self._items[key] = (value, expires_at)
+            self._bytes += len(value)
+            while self._items and (len(self._items) > self._max_entries or self._bytes > self._max_bytes):
+                oldest = next(iter(self._items))
+                self._drop(oldest)
+
+    def _drop(self, key: str) -> None:
+        item = self._items.pop(key, None)
+        if item is not None:
+            self._bytes -= len(item[0])
+
+    def delete_prefix(self, prefix: str, *, keep_prefix: str | None = None) -> int:
+        with self._lock:
+            doomed = [
+                k for k in self._items if k.startswith(prefix) and not (keep_prefix and k.startswith(keep_prefix))
+            ]
+            for key in doomed:
+                self._drop(key)
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def size(self) -> tuple[int, int]:
+        with self._lock:
+            return len(self._items), self._bytes
+
+
+class SqliteLLMCache:
+    """Local on-disk tier: one SQLite file, compressed values, LRU eviction by bytes."""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            key TEXT PRIMARY KEY,
+            namespace TEXT NOT NULL,
+            prompt_version TEXT NOT NULL,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            accessed_at REAL NOT NULL,
+            expires_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS llm_cache_ns ON llm_cache(namespace, prompt_version);
+        CREATE INDEX IF NOT EXISTS llm_cache_lru ON llm_cache(accessed_at);
+    """
+
+    def __init__(self, path: str | Path, *, max_bytes: int) -> None:
+        self.path = Path(path)
+        self._max_bytes = max(1, int(max_bytes))
+        self._lock = threading.Lock()
+        self._pid = -1
+        self._conn: sqlite3.Connection | None = None
+        self._bytes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Reopen after fork(): SQLite connections must not cross processes.
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self._SCHEMA)
+            self._bytes = int(conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0])
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> bytes | None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._delete_where("key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return bytes(value)
+
+    def set(self, key: LLMCacheKey, payload: bytes, *, ttl_s: float | None) -> None:
+        now = time.time()
+        expires_at = now + ttl_s if ttl_s else None
+        with self._lock:
+            conn = self._connection()
+            old = conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key.storage_key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, namespace, prompt_version, value, size, created_at, accessed_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key.storage_key, key.namespace, key.prompt_version, payload, len(payload), now, now, expires_at),
+            )
+            self._bytes += len(payload) - (int(old[0]) if old else 0)
+            if self._bytes > self._max_bytes:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired rows, then least recently used rows down to 90% of the budget."""
+        self._delete_where("expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        target = int(self._max_bytes * 0.9)
+        conn = self._connection()
+        while self._bytes > target:
+            rows = conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at, rowid LIMIT 256").fetchall()
+            if not rows:
+                self._bytes = 0
+                break
+            doomed: list[str] = []
+            for row_key, size in rows:
+                if self._bytes <= target:
+                    break
+                doomed.append(row_key)
+                self._bytes -= int(size)
+            conn.executemany("DELETE FROM llm_cache WHERE key = ?", [(k,) for k in doomed])
+
+    def _delete_where(self, clause: str, params: tuple[Any, ...]) -> int:
+        conn = self._connection()
+        removed = conn.execute(f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache WHERE {clause}", params).fetchone()
+        conn.execute(f"DELETE FROM llm_cache WHERE {clause}", params)
+        self._bytes -= int(removed[1])
+        return int(removed[0])
+
+    def invalidate(self, namespace: str, *, keep_prompt_version: str | None = None) -> int:
+        with self._lock:
+            if keep_prompt_version is None:
+                return self._delete_where("namespace = ?", (namespace,))
+            return self._delete_where("namespace = ? AND prompt_version != ?", (namespace, keep_prompt_version))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM llm_cache")
+            self._bytes = 0
+
+    def namespaces(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache GROUP BY namespace"
+            ).fetchall()
+        return {ns: {"entries": int(count), "bytes": int(size)} for ns, count, size in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+class TieredLLMCache:
+    """Read-through across tiers; writes go to every tier."""
+
+    def __init__(
+        self,
+        *,
+        memory: _MemoryTier,
+        disk: SqliteLLMCache | None = None,
+        redis: RedisCache | None = None,
+        ttl_s: float | None = None,
+    ) -> None:
+        self.memory = memory
+        self.disk = disk
+        self.redis = redis
+        self.ttl_s = ttl_s
+        self._stats_lock = threading.Lock()
+        self._stats: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"hits_memory": 0, "hits_disk": 0, "hits_redis": 0, "misses": 0, "bytes_read": 0, "bytes_written": 0}
+        )
+
+    @property
+    def tiers(self) -> list[str]:
+        names = ["memory"]
+        if self.disk is not None:
+            names.append("disk")
+        if self.redis is not None:
+            names.append("redis")
+        return names
+
+    def get(self, key: LLMCacheKey) -> str | None:
+        storage_key = key.storage_key
+        value = self.memory.get(storage_key)
+        if value is not None:
+            self._count(key.namespace, "memory", hit=True)
+            return value
+
+        if self.disk is not None:
+            payload = self._safe("disk get", self.disk.get, storage_key)
+            if payload is not None:
+                value = _decompress(payload)
+                self.memory.set(storage_key, value, ttl_s=self.ttl_s)
+                self._count(key.namespace, "disk", hit=True, nbytes=len(payload))
+                return value
+
+        if self.redis is not None:
+            payload = self._safe("redis get", self.redis.get_bytes, storage_key)
+            if payload is not None:
+                value = _decompress(payload)
+                self.memory.set(storage_key, value, ttl_s=self.ttl_s)
+                if self.disk is not None:
+                    self._safe("disk set", self.disk.set, key, payload, ttl_s=self.ttl_s)
+                self._count(key.namespace, "redis", hit=True, nbytes=len(payload))
+                return value
+
+        self._count(key.namespace, "none", hit=False)
+        return None
+
+    def set(self, key: LLMCacheKey, value: str) -> None:
+        if not value:
+            return
+        self.memory.set(key.storage_key, value, ttl_s=self.ttl_s)
+        if self.disk is None and self.redis is None:
+            return
+        payload = _compress(value)
+        written = 0
+        if self.disk is not None:
+            if self._safe("disk set", self.disk.set, key, payload, ttl_s=self.ttl_s, default=False) is not False:
+                written += len(payload)
+        if self.redis is not None:
+            stored = self._safe(
+                "redis set", self.redis.set_bytes, key.storage_key, payload, ttl_s=self.ttl_s, default=False
+            )
+            if stored is not False:
+                written += len(payload)
+        with self._stats_lock:
+            self._stats[key.namespace]["bytes_written"] += written
+        emit_metric(
+            "incr", "llm_cache_bytes", written, tags={"namespace": key.namespace, "direction": "write"}
+        )
+
+    def invalidate(self, namespace: str, *, keep_prompt_version: str | None = None) -> int:
+        """Drop a namespace, or only entries not written under ``keep_prompt_version``."""
+        namespace = _segment(namespace, "default")
+        keep = _segment(keep_prompt_version, "default") if keep_prompt_version is not None else None
+        prefix = f"llm:{namespace}:"
+        keep_prefix = f"{prefix}{keep}:" if keep is not None else None
+        removed = self.memory.delete_prefix(prefix, keep_prefix=keep_prefix)
+        if self.disk is not None:
+            removed += self._safe("disk invalidate", self.disk.invalidate, namespace, keep_prompt_version=keep, default=0)
+        if self.redis is not None:
+            removed += self._safe(
+                "redis invalidate", self.redis.delete_matching, f"{prefix}*", keep_prefix=keep_prefix, default=0
+            )
+        logger.info("Invalidated LLM cache namespace=%s keep_prompt_version=%s removed=%d", namespace, keep, removed)
+        return removed
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self._safe("disk clear", self.disk.clear)
+        with self._stats_lock:
+            self._stats.clear()
+
+    def stats(self) -> dict[str, Any]:
+        entries, memory_bytes = self.memory.size()
+        with self._stats_lock:
+            namespaces = {ns: dict(counts) for ns, counts in self._stats.items()}
+        for counts in namespaces.values():
+            hits = counts["hits_memory"] + counts["hits_disk"] + counts["hits_redis"]
+            lookups = hits + counts["misses"]
+            counts["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        out: dict[str, Any] = {
+            "tiers": self.tiers,
+            "memory": {"entries": entries, "bytes": memory_bytes},
+            "namespaces": namespaces,
+        }
+        if self.disk is not None:
+            out["disk"] = self._safe("disk stats", self.disk.namespaces, default={})
+        return out
+
+    def _count(self, namespace: str, tier: str, *, hit: bool, nbytes: int = 0) -> None:
+        with self._stats_lock:
+            counts = self._stats[namespace]
+            if hit:
+                counts[f"hits_{tier}"] += 1
+                counts["bytes_read"] += nbytes
+            else:
+                counts["misses"] += 1
+        emit_metric(
+            "incr",
+            "llm_cache_lookups",
+            tags={"namespace": namespace, "tier": tier, "result": "hit" if hit else "miss"},
+        )
+        if nbytes:
+            emit_metric("incr", "llm_cache_bytes", nbytes, tags={"namespace": namespace, "direction": "read"})
+
+    @staticmethod
+    def _safe(what: str, fn: Any, *args: Any, default: Any = None, **kwargs: Any) -> Any:
+        """A broken persistent tier degrades to ``default``; it never fails the LLM call."""
+        try:
+            return fn(*args, **kwargs)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("LLM cache %s failed: %s", what, type(exc).__name__)
+            return default
+
+
+def build_tiered_cache(
+    *,
+    memory_max_entries: int,
+    memory_max_bytes: int,
+    disk_path: str | None = None,
+    disk_max_bytes: int = 0,
+    redis_url: str | None = None,
+    ttl_s: float | None = None,
+) -> TieredLLMCache:
+    """Assemble a tiered cache; omitted ``disk_path``/``redis_url`` leave that tier out."""
+    disk = SqliteLLMCache(disk_path, max_bytes=disk_max_bytes) if disk_path else None
+    redis: RedisCache | None = None
+    if redis_url:
+        try:
+            redis = RedisCache(redis_url)
+        except RuntimeError as exc:
+            logger.warning("Redis cache tier disabled: %s", exc)
+    memory = _MemoryTier(max_entries=memory_max_entries, max_bytes=memory_max_bytes)
+    return TieredLLMCache(memory=memory, disk=disk, redis=redis, ttl_s=ttl_s)
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> TieredLLMCache:
+    settings = get_infra_settings()
+    enabled = settings.enable_llm_cache
+    return build_tiered_cache(
+        memory_max_entries=settings.llm_cache_memory_max_entries,
+        memory_max_bytes=int(settings.llm_cache_memory_max_mb * 1024 * 1024),
+        disk_path=settings.llm_cache_path if enabled else None,
+        disk_max_bytes=int(settings.llm_cache_disk_max_mb * 1024 * 1024),
+        redis_url=settings.redis_url if enabled and settings.enable_redis_cache else None,
+        ttl_s=settings.llm_cache_ttl_s,
+    )
+
+
+__all__ = [
+    "LLMCacheKey",
+    "SqliteLLMCache",
+    "TieredLLMCache",
+    "build_tiered_cache",
+    "get_llm_cache",
+    "llm_cache_key",
+    "schema_fingerprint",
+]
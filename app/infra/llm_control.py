@@ -4,33 +4,79 @@ from __future__ import annotations
 
 import hashlib
 import random
-import threading
 import time
-from contextlib import contextmanager
-from functools import lru_cache
-from typing import Mapping
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Mapping
 
+from app.infra.deadline import DeadlineExceededError, cap_deadline, remaining_s
+from app.infra.llm_limiter import LLMOverloadedError, LLMSlot, get_llm_limiter
 from app.infra.settings import get_infra_settings
 
 
-@lru_cache(maxsize=1)
-def get_llm_semaphore() -> threading.BoundedSemaphore:
-    return threading.BoundedSemaphore(value=get_infra_settings().llm_concurrency)
+def _queue_deadline() -> float:
+    """Queue deadline: ``LLM_QUEUE_TIMEOUT_S`` from now, capped to the request deadline."""
+    return cap_deadline(time.monotonic() + float(get_infra_settings().llm_queue_timeout_s))
+
+
+def _deadline_error(exc: LLMOverloadedError) -> Exception:
+    remaining = remaining_s()
+    if remaining is not None and remaining <= 0:
+        return DeadlineExceededError(f"Request deadline exceeded while queued for an LLM slot: {exc}")
+    return exc
 
 
 @contextmanager
-def llm_slot() -> None:
-    """Global concurrency gate for LLM requests (thread-safe)."""
-    sem = get_llm_semaphore()
-    sem.acquire()
+def llm_slot(provider: str = "default", model: str = "default") -> Iterator[LLMSlot]:
+    """Concurrency gate for one LLM request (thread-safe, adaptive per provider/model).
+
+    Raises ``LLMOverloadedError`` if no slot frees up before the queue deadline
+    (``DeadlineExceededError`` when the request deadline ran out first).
+    Report the upstream result via ``slot.record_response``/``record_error``;
+    otherwise a clean exit counts as a success.
+    """
+    limiter = get_llm_limiter(provider, model)
+    try:
+        limiter.acquire(deadline=_queue_deadline())
+    except LLMOverloadedError as exc:
+        error = _deadline_error(exc)
+        if error is exc:
+            raise
+        raise error from exc
+    slot = LLMSlot(limiter)
+    try:
+        yield slot
+    except BaseException as exc:
+        slot.close(exc)
+        raise
+    else:
+        slot.close()
+
+
+@asynccontextmanager
+async def allm_slot(provider: str = "default", model: str = "default") -> AsyncIterator[LLMSlot]:
+    """Async ``llm_slot``: waits on the event loop, not a thread; shares the same limiter."""
+    limiter = get_llm_limiter(provider, model)
+    try:
+        await limiter.aacquire(deadline=_queue_deadline())
+    except LLMOverloadedError as exc:
+        error = _deadline_error(exc)
+        if error is exc:
+            raise
+        raise error from exc
+    slot = LLMSlot(limiter)
     try:
-        yield
-    finally:
-        sem.release()
+        yield slot
+    except BaseException as exc:
+        slot.close(exc)
+        raise
+    else:
+        slot.close()
 
 
-def make_llm_cache_key(*, model: str, prompt: str, prompt_version: str) -> str:
+def make_llm_cache_key(*, model: str, prompt: str, prompt_version: str, schema_version: str = "") -> str:
     payload = f"{model}\n{prompt_version}\n{prompt}"
+    if schema_version:
+        payload = f"{payload}\n{schema_version}"
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
@@ -57,8 +103,8 @@ def within_deadline(deadline: float) -> bool:
 
 
 __all__ = [
+    "allm_slot",
     "backoff_seconds",
-    "get_llm_semaphore",
     "llm_slot",
     "make_llm_cache_key",
     "parse_retry_after_seconds",
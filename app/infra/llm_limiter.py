@@ -0,0 +1,353 @@
+"""Adaptive (AIMD) concurrency limiter for outbound LLM calls.
+
+One limiter per ``(provider, model)``, used by both thread and event-loop callers
+(``llm_control.llm_slot`` / ``allm_slot``):
+
+- Starts at ``LLM_CONCURRENCY``. A call that succeeds within
+  ``LLM_LATENCY_TARGET_S`` raises the limit by ``1/limit`` (about +1 per
+  window of calls). A slow call or a timeout cuts it by 10%, and a 429/5xx
+  cuts it in half. Cuts happen at most once per cooldown, so a burst of 429s
+  is one signal. The limit stays within ``[LLM_CONCURRENCY_MIN,
+  LLM_CONCURRENCY_MAX]``.
+- ``Retry-After`` on a 429/5xx pauses every model of that provider until it
+  expires.
+- Waiters queue FIFO up to ``LLM_QUEUE_MAX``. A call is rejected with
+  ``LLMOverloadedError`` when the queue is full, when its deadline expires in
+  the queue, or when the estimated wait already exceeds the deadline.
+- The current limit, in-flight count and queue depth are reported by
+  ``limiter_stats()`` and the ``llm_limiter_*`` metrics.
+
+``LLM_ADAPTIVE=0`` pins the limit at ``LLM_CONCURRENCY`` (the old fixed
+semaphore) while keeping the queue bounds and ``Retry-After`` handling.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from app.common.exceptions import LLMError
+from app.infra.settings import get_infra_settings
+from observability.metrics import emit_metric
+
+_DECREASE_COOLDOWN_S = 1.0
+_EWMA_ALPHA = 0.2
+
+
+class LLMOverloadedError(LLMError):
+    """An LLM call was rejected locally (queue full / deadline) before going upstream."""
+
+    def __init__(self, message: str, *, retry_after_s: float | None = None) -> None:
+        self.retry_after_s = retry_after_s
+        super().__init__(message)
+
+
+@dataclass
+class _ProviderState:
+    blocked_until: float = 0.0
+
+
+@dataclass(eq=False)
+class _Waiter:
+    event: threading.Event | None = None
+    loop: asyncio.AbstractEventLoop | None = None
+    future: asyncio.Future | None = None
+    granted: bool = False
+
+    def wake(self) -> None:
+        if self.event is not None:
+            self.event.set()
+        elif self.loop is not None and self.future is not None:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+@dataclass
+class AdaptiveLimiter:
+    provider: str
+    model: str
+    limit: float
+    min_limit: int
+    max_limit: int
+    latency_target_s: float
+    max_queue: int
+    adaptive: bool
+    _provider_state: _ProviderState = field(default_factory=_ProviderState)
+    in_flight: int = 0
+    _queue: deque = field(default_factory=deque)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _last_decrease: float = 0.0
+    _latency_ewma: float | None = None
+    _timer: threading.Timer | None = None
+
+    # -- admission -----------------------------------------------------------
+
+    def _try_acquire(self, now: float) -> bool:
+        """Caller holds ``_lock``."""
+        if self._queue or now < self._provider_state.blocked_until:
+            return False
+        if self.in_flight < self._capacity():
+            self.in_flight += 1
+            return True
+        return False
+
+    def _capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    def _enqueue(self, waiter: _Waiter, deadline: float | None, now: float) -> None:
+        """Caller holds ``_lock``; raises when the wait cannot succeed."""
+        if len(self._queue) >= self.max_queue:
+            self._reject("queue_full")
+        if deadline is not None:
+            remaining = deadline - now
+            blocked_for = max(0.0, self._provider_state.blocked_until - now)
+            expected = blocked_for
+            if self._latency_ewma is not None:
+                expected += (len(self._queue) + 1) / self._capacity() * self._latency_ewma
+            if remaining <= 0 or expected > remaining:
+                self._reject("deadline", retry_after_s=max(1.0, expected))
+        self._queue.append(waiter)
+        self._schedule_wakeup(now)
+
+    def _reject(self, reason: str, *, retry_after_s: float | None = None) -> None:
+        emit_metric("incr", "llm_limiter_rejected", tags=self._tags(reason=reason))
+        raise LLMOverloadedError(
+            f"LLM {self.provider}/{self.model} overloaded ({reason})",
+            retry_after_s=retry_after_s or max(1.0, self._provider_state.blocked_until - time.monotonic()),
+        )
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Drop a timed-out/cancelled waiter; returns True if it had already been granted."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            try:
+                self._queue.remove(waiter)
+            except ValueError:
+                pass
+            self._observe()
+            return False
+
+    def acquire(self, *, deadline: float | None = None) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._try_acquire(now):
+                self._observe()
+                return
+            waiter = _Waiter(event=threading.Event())
+            self._enqueue(waiter, deadline, now)
+            self._observe()
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if waiter.event.wait(timeout) or self._abandon(waiter):
+            return
+        self._reject("deadline")
+
+    async def aacquire(self, *, deadline: float | None = None) -> None:
+        now = time.monotonic()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_acquire(now):
+                self._observe()
+                return
+            waiter = _Waiter(loop=loop, future=loop.create_future())
+            self._enqueue(waiter, deadline, now)
+            self._observe()
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+            return
+        except asyncio.TimeoutError:
+            if self._abandon(waiter):
+                return
+            self._reject("deadline")
+        except asyncio.CancelledError:
+            if self._abandon(waiter):
+                self.release(None)
+            raise
+
+    # -- feedback ------------------------------------------------------------
+
+    def release(self, outcome: str | None, *, latency_s: float = 0.0, retry_after_s: float | None = None) -> None:
+        """Return a slot. ``outcome``: ``ok``, ``slow``, ``overload`` or ``None`` (no signal)."""
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            if outcome in {"ok", "slow"} and latency_s > 0:
+                self._latency_ewma = (
+                    latency_s
+                    if self._latency_ewma is None
+                    else (1 - _EWMA_ALPHA) * self._latency_ewma + _EWMA_ALPHA * latency_s
+                )
+            if outcome == "overload" and retry_after_s:
+                state = self._provider_state
+                state.blocked_until = max(state.blocked_until, now + retry_after_s)
+            if self.adaptive:
+                self._adjust(outcome, latency_s, now)
+            self._dispatch(now)
+            self._observe()
+
+    def _adjust(self, outcome: str | None, latency_s: float, now: float) -> None:
+        if outcome == "ok" and latency_s <= self.latency_target_s:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / max(1.0, self.limit))
+            return
+        if outcome not in {"ok", "slow", "overload"} or now - self._last_decrease < _DECREASE_COOLDOWN_S:
+            return
+        factor = 0.5 if outcome == "overload" else 0.9
+        self.limit = max(float(self.min_limit), self.limit * factor)
+        self._last_decrease = now
+
+    def _dispatch(self, now: float) -> None:
+        """Grant queued waiters while capacity allows (caller holds ``_lock``)."""
+        if now < self._provider_state.blocked_until:
+            self._schedule_wakeup(now)
+            return
+        while self._queue and self.in_flight < self._capacity():
+            waiter = self._queue.popleft()
+            waiter.granted = True
+            self.in_flight += 1
+            waiter.wake()
+
+    def _schedule_wakeup(self, now: float) -> None:
+        """Re-dispatch when a provider-wide Retry-After pause ends (caller holds ``_lock``)."""
+        delay = self._provider_state.blocked_until - now
+        if delay <= 0 or (self._timer is not None and self._timer.is_alive()):
+            return
+        self._timer = threading.Timer(delay + 0.001, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            self._dispatch(time.monotonic())
+            self._observe()
+
+    # -- reporting -----------------------------------------------------------
+
+    def _tags(self, **extra: str) -> dict[str, str]:
+        return {"provider": self.provider, "model": self.model, **extra}
+
+    def _observe(self) -> None:
+        emit_metric("observe", "llm_limiter_limit", self.limit, tags=self._tags())
+        emit_metric("observe", "llm_limiter_queue_depth", len(self._queue), tags=self._tags())
+        emit_metric("observe", "llm_limiter_in_flight", self.in_flight, tags=self._tags())
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "queue_depth": len(self._queue),
+                "latency_ewma_s": round(self._latency_ewma, 3) if self._latency_ewma is not None else None,
+                "blocked_for_s": round(max(0.0, self._provider_state.blocked_until - time.monotonic()), 3),
+            }
+
+
+class LLMSlot:
+    """Held LLM slot; report the upstream outcome with ``record_*`` before exit."""
+
+    __slots__ = ("limiter", "started", "recorded", "outcome", "latency_s", "retry_after_s")
+
+    def __init__(self, limiter: AdaptiveLimiter) -> None:
+        self.limiter = limiter
+        self.started = time.monotonic()
+        self.recorded = False
+        self.outcome: str | None = None
+        self.latency_s = 0.0
+        self.retry_after_s: float | None = None
+
+    def record_response(self, response: httpx.Response) -> None:
+        from app.infra.llm_control import parse_retry_after_seconds
+
+        self.recorded = True
+        self.latency_s = time.monotonic() - self.started
+        status = response.status_code
+        if status == 429 or status >= 500:
+            self.outcome = "overload"
+            self.retry_after_s = parse_retry_after_seconds(response.headers)
+        elif status < 400:
+            self.outcome = "ok" if self.latency_s <= self.limiter.latency_target_s else "slow"
+        else:
+            self.outcome = None
+
+    def record_error(self, exc: BaseException) -> None:
+        self.recorded = True
+        self.latency_s = time.monotonic() - self.started
+        if isinstance(exc, httpx.HTTPStatusError) and exc.response is not None:
+            self.record_response(exc.response)
+        elif isinstance(exc, httpx.TimeoutException):
+            self.outcome = "slow"
+        else:
+            self.outcome = None
+
+    def record_success(self) -> None:
+        self.recorded = True
+        self.latency_s = time.monotonic() - self.started
+        self.outcome = "ok" if self.latency_s <= self.limiter.latency_target_s else "slow"
+
+    def close(self, exc: BaseException | None = None) -> None:
+        if not self.recorded:
+            if exc is None:
+                self.record_success()
+            else:
+                self.record_error(exc)
+        self.limiter.release(self.outcome, latency_s=self.latency_s, retry_after_s=self.retry_after_s)
+
+
+_registry_lock = threading.Lock()
+_limiters: dict[tuple[str, str], AdaptiveLimiter] = {}
+_providers: dict[str, _ProviderState] = {}
+
+
+def get_llm_limiter(provider: str = "default", model: str = "default") -> AdaptiveLimiter:
+    key = (provider or "default", model or "default")
+    with _registry_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            settings = get_infra_settings()
+            limiter = AdaptiveLimiter(
+                provider=key[0],
+                model=key[1],
+                limit=float(settings.llm_concurrency),
+                min_limit=settings.llm_concurrency_min,
+                max_limit=settings.llm_concurrency_max,
+                latency_target_s=settings.llm_latency_target_s,
+                max_queue=settings.llm_queue_max,
+                adaptive=settings.llm_adaptive,
+                _provider_state=_providers.setdefault(key[0], _ProviderState()),
+            )
+            _limiters[key] = limiter
+        return limiter
+
+
+def limiter_stats() -> dict[str, dict[str, Any]]:
+    with _registry_lock:
+        limiters = list(_limiters.values())
+    return {f"{lim.provider}/{lim.model}": lim.snapshot() for lim in limiters}
+
+
+def reset_llm_limiters() -> None:
+    """Forget all limiters (tests / settings reload)."""
+    with _registry_lock:
+        _limiters.clear()
+        _providers.clear()
+
+
+__all__ = [
+    "AdaptiveLimiter",
+    "LLMOverloadedError",
+    "LLMSlot",
+    "get_llm_limiter",
+    "limiter_stats",
+    "reset_llm_limiters",
+]
@@ -28,6 +28,8 @@ from functools import lru_cache
 from typing import Any
 import warnings
 
+from app.infra.warmup_graph import WarmupGraph, WarmupTask
+
 _logger = logging.getLogger(__name__)
 
 # Global flag to track NLP warmup status (useful for degraded mode)
@@ -111,26 +113,19 @@ def get_sectionizer() -> Any:
         return None
 
 
-def _do_heavy_warmup() -> None:
-    """Perform the actual heavy NLP warmup (synchronous helper).
-
-    This loads spaCy models, sectionizer, and UMLS linker to ensure
-    they're ready for first requests.
-    """
-    global _nlp_warmup_successful
-
-    _logger.info("Warming up heavy NLP resources...")
-
-    # Load spaCy model (used by proc_nlp and app.common.umls_linking)
+def _warm_spacy_model() -> None:
     nlp = get_spacy_model()
     if nlp:
         # Warm up the pipeline with a small text to ensure all components are ready
         _ = nlp("Warmup text for pipeline initialization.")
 
-    # Initialize sectionizer (uses medspaCy)
+
+def _warm_sectionizer() -> None:
     _ = get_sectionizer()
 
-    # UMLS warmup: backend-aware (default: distilled, no spaCy/scispaCy required).
+
+def _warm_umls() -> None:
+    """UMLS warmup: backend-aware (default: distilled, no spaCy/scispaCy required)."""
     try:
         from config.settings import UmlsSettings
 
@@ -141,28 +136,56 @@ def _do_heavy_warmup() -> None:
     if not umls_settings or not umls_settings.enable_linker:
         _logger.info("UMLS warmup skipped (linker disabled)")
     elif (umls_settings.linker_backend or "distilled").strip().lower() == "scispacy":
-        try:
-            from proc_nlp.umls_linker import _load_model
-
-            model_name = os.getenv("PROCSUITE_SPACY_MODEL", "en_core_sci_sm")
-            _logger.info("Warming up scispaCy UMLS linker with model: %s", model_name)
-            _load_model(model_name)
-            _logger.info("scispaCy UMLS linker warmed up successfully")
-        except Exception as exc:
-            _logger.warning("scispaCy UMLS linker warmup skipped: %s", exc)
+        from proc_nlp.umls_linker import _load_model
+
+        model_name = os.getenv("PROCSUITE_SPACY_MODEL", "en_core_sci_sm")
+        _logger.info("Warming up scispaCy UMLS linker with model: %s", model_name)
+        _load_model(model_name)
+        _logger.info("scispaCy UMLS linker warmed up successfully")
     else:
-        try:
-            from app.umls.ip_umls_store import get_ip_umls_store
+        from app.umls.ip_umls_store import get_ip_umls_store
 
-            _ = get_ip_umls_store()
-            _logger.info("Distilled UMLS store warmed up successfully")
-        except Exception as exc:
-            _logger.warning("Distilled UMLS store warmup skipped: %s", exc)
+        # The suggestion index is built on the first suggest call, not here:
+        # building it eagerly in every worker defeats sharing the compiled map.
+        get_ip_umls_store()
+        _logger.info("Distilled UMLS store warmed up successfully")
 
-    _logger.info("Heavy NLP resources warmed up successfully")
+
+def _mark_nlp_warmed() -> None:
+    global _nlp_warmup_successful
     _nlp_warmup_successful = True
 
 
+def nlp_warmup_tasks() -> list[WarmupTask]:
+    """Warmup tasks for the NLP resources (see ``app.infra.warmup_graph``).
+
+    spaCy, the sectionizer and UMLS load concurrently. UMLS is best-effort:
+    when it fails the ``umls`` capability is unavailable but warmup succeeds.
+    """
+    return [
+        WarmupTask("spacy", _warm_spacy_model, capabilities=("nlp",)),
+        WarmupTask("sectionizer", _warm_sectionizer, capabilities=("nlp",)),
+        WarmupTask("umls", _warm_umls, capabilities=("umls",), required=False),
+        WarmupTask("nlp_warmup", _mark_nlp_warmed, requires=("spacy", "sectionizer"), capabilities=("nlp",)),
+    ]
+
+
+def _do_heavy_warmup() -> None:
+    """Perform the actual heavy NLP warmup (synchronous helper).
+
+    This loads spaCy models, sectionizer, and UMLS linker (concurrently) to
+    ensure they're ready for first requests.
+    """
+    _logger.info("Warming up heavy NLP resources...")
+    graph = WarmupGraph(nlp_warmup_tasks(), max_workers=3)
+    try:
+        if not graph.run():
+            raise RuntimeError(graph.error or "NLP warmup failed")
+    finally:
+        graph.shutdown()
+    _logger.info("Heavy NLP resources warmed up successfully")
+
+
 async def warm_heavy_resources() -> None:
     """Preload heavy NLP models (async wrapper for startup hook).
 
@@ -210,5 +233,6 @@ __all__ = [
     "is_nlp_warmed",
     "get_spacy_model",
     "get_sectionizer",
+    "nlp_warmup_tasks",
     "reset_warmup_state",
 ]
@@ -1,12 +1,27 @@
-"""Lightweight performance helpers."""
+"""Lightweight performance helpers.
+
+``timed`` logs how long a block took. ``mark_stage`` reports pipeline stage
+boundaries to whoever is listening for the current run (``stage_listener``):
+each call finishes the open stage and starts the next one. Listeners travel in
+a context variable, so they follow the run into ``run_cpu`` worker threads,
+and ``mark_stage`` is a no-op when nobody is listening. ``StageTimer`` is the
+listener behind the per-request stage breakdown (``Server-Timing`` and the
+``pipeline_stage_ms`` histogram).
+
+Context variables do not cross process boundaries. Work sent to another
+process records its ``mark_stage`` calls there (``stage_recorder``), and the
+caller replays them into its own listeners (``replay_stages``).
+"""
 
 from __future__ import annotations
 
 import logging
+import threading
 import time
 from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Any, Generator
+from typing import Any, Callable, Generator, Mapping
 
 logger = logging.getLogger(__name__)
 
@@ -33,4 +48,134 @@ def timed(name: str, *, extra: dict[str, Any] | None = None) -> Generator[Timing
             logger.debug("%s elapsed_ms=%.2f", name, timing.elapsed_ms, extra=extra or {})
 
 
-__all__ = ["Timing", "timed"]
+StageListener = Callable[[str, str, float | None], None]
+"""Called as ``(stage, event, elapsed_ms)``; ``event`` is ``started`` or ``finished``."""
+
+
+class _StageTrack:
+    def __init__(self, listener: StageListener) -> None:
+        self.listener = listener
+        self.current: str | None = None
+        self.started = 0.0
+
+    def mark(self, name: str | None, now: float | None = None) -> None:
+        if now is None:
+            now = time.perf_counter()
+        if self.current is not None:
+            self._emit(self.current, "finished", (now - self.started) * 1000.0)
+        self.current, self.started = name, now
+        if name is not None:
+            self._emit(name, "started", None)
+
+    def _emit(self, stage: str, event: str, elapsed_ms: float | None) -> None:
+        try:
+            self.listener(stage, event, elapsed_ms)
+        except Exception:  # noqa: BLE001 - observers must never break the pipeline
+            logger.debug("Stage listener failed for %s/%s", stage, event, exc_info=True)
+
+
+_stage_tracks: ContextVar[tuple[_StageTrack, ...]] = ContextVar("pipeline_stage_tracks", default=())
+
+
+@contextmanager
+def stage_listener(listener: StageListener) -> Generator[None, None, None]:
+    """Send the stage boundaries marked inside this block to ``listener``."""
+    track = _StageTrack(listener)
+    token = _stage_tracks.set(_stage_tracks.get() + (track,))
+    try:
+        yield
+    finally:
+        track.mark(None)
+        _stage_tracks.reset(token)
+
+
+def mark_stage(name: str | None) -> None:
+    """Finish the current pipeline stage and start ``name`` (``None`` only finishes)."""
+    for track in _stage_tracks.get():
+        track.mark(name)
+
+
+# (stage name or None, seconds before the end of the recorded block)
+StageMark = tuple[str | None, float]
+
+
+class _MarkRecorder(_StageTrack):
+    def __init__(self) -> None:
+        super().__init__(lambda stage, event, elapsed_ms: None)
+        self.marks: list[tuple[str | None, float]] = []
+
+    def mark(self, name: str | None, now: float | None = None) -> None:
+        self.marks.append((name, time.perf_counter() if now is None else now))
+
+
+def stages_observed() -> bool:
+    """Whether anyone is listening for stage boundaries in the current run."""
+    return bool(_stage_tracks.get())
+
+
+@contextmanager
+def stage_recorder() -> Generator[list[StageMark], None, None]:
+    """Record the ``mark_stage`` calls made inside this block.
+
+    The yielded list is filled when the block exits, with times relative to
+    the exit so they can be replayed on another process's clock.
+    """
+    recorder = _MarkRecorder()
+    token = _stage_tracks.set(_stage_tracks.get() + (recorder,))
+    marks: list[StageMark] = []
+    try:
+        yield marks
+    finally:
+        _stage_tracks.reset(token)
+        ended = time.perf_counter()
+        marks.extend((name, ended - at) for name, at in recorder.marks)
+
+
+def replay_stages(marks: list[StageMark]) -> None:
+    """Apply marks from ``stage_recorder`` to the current listeners, as if made here.
+
+    The recorded block is taken to have ended just now; the stage open at the
+    end of it stays open, as it would have if the work had run in-process.
+    """
+    now = time.perf_counter()
+    for track in _stage_tracks.get():
+        for name, before_end in marks:
+            track.mark(name, now=max(track.started, now - before_end))
+
+
+class StageTimer:
+    """Stage listener that adds up the time spent in each stage.
+
+    A stage marked more than once (e.g. ``postprocess``) is summed; ``timings``
+    keeps first-seen order.
+    """
+
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, stage: str, event: str, elapsed_ms: float | None) -> None:
+        if event != "finished" or elapsed_ms is None:
+            return
+        with self._lock:
+            self.timings[stage] = self.timings.get(stage, 0.0) + elapsed_ms
+
+
+def format_server_timing(timings: Mapping[str, float]) -> str:
+    """``Server-Timing`` header value (``name;dur=ms``) for stage durations in ms."""
+    return ", ".join(f"{name};dur={elapsed_ms:.1f}" for name, elapsed_ms in timings.items())
+
+
+__all__ = [
+    "StageListener",
+    "StageMark",
+    "StageTimer",
+    "Timing",
+    "format_server_timing",
+    "mark_stage",
+    "replay_stages",
+    "stage_listener",
+    "stage_recorder",
+    "stages_observed",
+    "timed",
+]
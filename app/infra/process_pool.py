@@ -0,0 +1,172 @@
+"""Process pool for GIL-bound pipeline stages (``CPU_EXECUTOR=process``).
+
+Regex-heavy deterministic extraction, Pydantic validation and CPT derivation
+hold the GIL, so extra threads in ``app.state.cpu_executor`` add no
+throughput. ``CpuProcessPool`` runs those stages in ``CPU_WORKERS`` spawned
+processes instead, so one API process can use every core.
+
+- Each worker runs ``initializer`` once at start-up. The pipeline's
+  initializer (``app.api.services.cpu_tasks.init_pipeline_worker``) preloads
+  the services, the KB and the ONNX sessions, so requests never pay for them.
+- Tasks are module-level functions that take and return plain dicts, which
+  keeps pickling cheap and avoids sending dynamic Pydantic classes.
+- The caller's request deadline (``app.infra.deadline``) is re-established in
+  the worker. When the caller is listening for pipeline stages
+  (``app.infra.perf``), the worker records its ``mark_stage`` calls and the
+  caller replays them, so ``Server-Timing`` and job progress keep the
+  extraction sub-stages.
+- Workers are replaced after ``CPU_WORKER_MAX_TASKS`` tasks to bound memory
+  growth.
+- A pool broken by a crashed worker is rebuilt and the task is retried once.
+
+``health()`` pings the workers and reports their pids, initializer status and
+task counts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from typing import Any, Callable
+
+from app.infra.deadline import remaining_s, request_deadline
+from app.infra.perf import StageMark, replay_stages, stage_recorder, stages_observed
+from observability.metrics import emit_metric
+
+logger = logging.getLogger(__name__)
+
+Payload = dict[str, Any]
+CpuTask = Callable[[Payload], Payload]
+
+# Per-process worker state (only meaningful inside a pool worker).
+_worker_state: dict[str, Any] = {}
+
+
+def _init_worker(initializer: Callable[[], None] | None) -> None:
+    _worker_state.update({"pid": os.getpid(), "started_at": time.time(), "tasks": 0, "ready": False})
+    started = time.perf_counter()
+    try:
+        if initializer is not None:
+            initializer()
+    except Exception as exc:  # noqa: BLE001 - the worker still serves tasks, loading lazily
+        _worker_state["error"] = f"{type(exc).__name__}: {exc}"
+        logger.error("CPU worker %s initializer failed: %s", os.getpid(), exc, exc_info=True)
+    else:
+        _worker_state["ready"] = True
+    _worker_state["init_s"] = round(time.perf_counter() - started, 3)
+
+
+def _call(
+    task: CpuTask, payload: Payload, deadline_s: float | None, record_stages: bool
+) -> tuple[Payload, list[StageMark]]:
+    _worker_state["tasks"] = int(_worker_state.get("tasks", 0)) + 1
+    recorder = stage_recorder() if record_stages else nullcontext([])
+    with request_deadline(deadline_s), recorder as stage_marks:
+        result = task(payload)
+    return result, stage_marks
+
+
+def _ping(linger_s: float) -> dict[str, Any]:
+    # Linger so concurrent pings land on different workers.
+    time.sleep(linger_s)
+    return dict(_worker_state, pid=os.getpid())
+
+
+class CpuProcessPool:
+    def __init__(
+        self,
+        workers: int,
+        *,
+        initializer: Callable[[], None] | None = None,
+        max_tasks_per_child: int = 0,
+    ) -> None:
+        self.workers = max(1, int(workers))
+        self.max_tasks_per_child = max(0, int(max_tasks_per_child))
+        self.restarts = 0
+        self._initializer = initializer
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: workers must not inherit the parent's threads, event loop or
+        # open HTTP clients, and ``max_tasks_per_child`` requires it.
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._initializer,),
+            max_tasks_per_child=self.max_tasks_per_child or None,
+        )
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not broken:
+                return  # another caller already replaced it
+            self.restarts += 1
+            logger.error("CPU process pool broken; starting a new pool (restart #%d)", self.restarts)
+            emit_metric("incr", "cpu_pool_restarts")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+
+    async def run(self, task: CpuTask, payload: Payload) -> Payload:
+        """Run ``task(payload)`` in a worker; one retry if the pool broke underneath it."""
+        loop = asyncio.get_running_loop()
+        record_stages = stages_observed()
+        for attempt in range(2):
+            executor = self._executor
+            try:
+                result, stage_marks = await loop.run_in_executor(
+                    executor, _call, task, payload, remaining_s(), record_stages
+                )
+            except BrokenProcessPool:
+                self._restart(executor)
+                if attempt:
+                    raise
+            else:
+                replay_stages(stage_marks)
+                return result
+        raise AssertionError("unreachable")
+
+    def start(self) -> None:
+        """Spawn every worker now (running the initializer) instead of on first use."""
+        for _ in range(self.workers):
+            self._executor.submit(_ping, 0.2)
+
+    async def health(self, *, timeout_s: float = 5.0) -> dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        pings = [loop.run_in_executor(self._executor, _ping, 0.05) for _ in range(self.workers)]
+        done, pending = await asyncio.wait(pings, timeout=timeout_s)
+        for future in pending:
+            future.cancel()
+        seen: dict[int, dict[str, Any]] = {}
+        errors = 0
+        for future in done:
+            if future.exception() is not None:
+                errors += 1
+                continue
+            state = future.result()
+            seen[int(state["pid"])] = state
+        ready = sum(1 for state in seen.values() if state.get("ready"))
+        return {
+            "ok": bool(seen) and not errors and ready == len(seen),
+            "workers": self.workers,
+            "responding": len(seen),
+            "ready": ready,
+            "timed_out": len(pending),
+            "restarts": self.restarts,
+            "max_tasks_per_child": self.max_tasks_per_child,
+            "processes": sorted(seen.values(), key=lambda state: state["pid"]),
+        }
+
+    def shutdown(self, *, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+__all__ = ["CpuProcessPool", "CpuTask", "Payload"]
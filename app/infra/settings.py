@@ -60,16 +60,61 @@ class InfraSettings:
     skip_warmup: bool
     background_warmup: bool
     wait_for_ready_s: float
+    warmup_workers: int
 
     cpu_workers: int
+    cpu_executor: str
+    cpu_worker_max_tasks: int
 
     llm_concurrency: int
     llm_timeout_s: float
+    llm_streaming: bool
+
+    llm_adaptive: bool
+    llm_concurrency_min: int
+    llm_concurrency_max: int
+    llm_latency_target_s: float
+    llm_queue_max: int
+    llm_queue_timeout_s: float
+
+    request_deadline_s: float
+    request_deadline_optional_min_s: float
+
+    process_batch_max_items: int
+    process_batch_concurrency: int
+
+    admission_control: bool
+    admission_max_wait_s: float
+    admission_bulk_max_wait_s: float
+
+    llm_http_max_connections: int
+    llm_http_max_keepalive: int
+    llm_http_keepalive_s: float
+    llm_http2: bool
 
     enable_redis_cache: bool
     enable_llm_cache: bool
     enable_ml_cache: bool
 
+    llm_cache_memory_max_entries: int
+    llm_cache_memory_max_mb: float
+    llm_cache_path: str | None
+    llm_cache_disk_max_mb: float
+    llm_cache_ttl_s: float
+
+    enable_process_result_cache: bool
+    process_result_cache_path: str
+    process_result_cache_max_mb: float
+    process_result_cache_ttl_s: float
+
+    jobs_enabled: bool
+    jobs_workers: int
+    jobs_visibility_timeout_s: float
+    jobs_max_attempts: int
+    jobs_result_ttl_s: float
+    jobs_poll_interval_s: float
+    jobs_max_queued: int
+
     redis_url: str | None
 
     @staticmethod
@@ -80,28 +125,175 @@ class InfraSettings:
         background_warmup = True if background_warmup_raw is None else _truthy(background_warmup_raw)
 
         wait_for_ready_s = _get_float("WAIT_FOR_READY_S", "PROCSUITE_WAIT_FOR_READY_S", default=0.0)
+        warmup_workers = max(1, _get_int("WARMUP_WORKERS", "PROCSUITE_WARMUP_WORKERS", default=4))
 
         cpu_workers = max(1, _get_int("CPU_WORKERS", "PROCSUITE_CPU_WORKERS", default=1))
+        cpu_executor = (_env_first("CPU_EXECUTOR", "PROCSUITE_CPU_EXECUTOR") or "thread").strip().lower()
+        if cpu_executor not in {"thread", "process"}:
+            cpu_executor = "thread"
+        cpu_worker_max_tasks = max(
+            0, _get_int("CPU_WORKER_MAX_TASKS", "PROCSUITE_CPU_WORKER_MAX_TASKS", default=500)
+        )
 
         llm_concurrency = max(1, _get_int("LLM_CONCURRENCY", "PROCSUITE_LLM_CONCURRENCY", default=2))
         llm_timeout_s = _get_float("LLM_TIMEOUT_S", "PROCSUITE_LLM_TIMEOUT_S", default=120.0)
+        llm_streaming = _truthy(_env_first("LLM_STREAMING", "PROCSUITE_LLM_STREAMING"))
+
+        llm_adaptive_raw = _env_first("LLM_ADAPTIVE", "PROCSUITE_LLM_ADAPTIVE")
+        llm_adaptive = True if llm_adaptive_raw is None else _truthy(llm_adaptive_raw)
+        llm_concurrency_min = max(1, _get_int("LLM_CONCURRENCY_MIN", "PROCSUITE_LLM_CONCURRENCY_MIN", default=1))
+        llm_concurrency_max = max(
+            llm_concurrency,
+            _get_int("LLM_CONCURRENCY_MAX", "PROCSUITE_LLM_CONCURRENCY_MAX", default=max(16, llm_concurrency)),
+        )
+        llm_concurrency_min = min(llm_concurrency_min, llm_concurrency)
+        llm_latency_target_s = _get_float("LLM_LATENCY_TARGET_S", "PROCSUITE_LLM_LATENCY_TARGET_S", default=30.0)
+        llm_queue_max = max(0, _get_int("LLM_QUEUE_MAX", "PROCSUITE_LLM_QUEUE_MAX", default=64))
+        llm_queue_timeout_s = _get_float("LLM_QUEUE_TIMEOUT_S", "PROCSUITE_LLM_QUEUE_TIMEOUT_S", default=60.0)
+
+        request_deadline_s = max(0.0, _get_float("REQUEST_DEADLINE_S", "PROCSUITE_REQUEST_DEADLINE_S", default=0.0))
+        request_deadline_optional_min_s = max(
+            0.0,
+            _get_float(
+                "REQUEST_DEADLINE_OPTIONAL_MIN_S", "PROCSUITE_REQUEST_DEADLINE_OPTIONAL_MIN_S", default=10.0
+            ),
+        )
+
+        process_batch_max_items = max(
+            1, _get_int("PROCESS_BATCH_MAX_ITEMS", "PROCSUITE_PROCESS_BATCH_MAX_ITEMS", default=256)
+        )
+        # 0 = enough items in flight to keep both the CPU workers and the LLM limiter busy.
+        process_batch_concurrency = max(
+            0, _get_int("PROCESS_BATCH_CONCURRENCY", "PROCSUITE_PROCESS_BATCH_CONCURRENCY", default=0)
+        ) or (cpu_workers + llm_concurrency)
+
+        admission_raw = _env_first("ADMISSION_CONTROL", "PROCSUITE_ADMISSION_CONTROL")
+        admission_control = True if admission_raw is None else _truthy(admission_raw)
+        # Default budget: half the request deadline when one is set (a request that waits longer
+        # would likely miss it anyway), otherwise 30s.
+        admission_max_wait_s = max(
+            0.0,
+            _get_float(
+                "ADMISSION_MAX_WAIT_S",
+                "PROCSUITE_ADMISSION_MAX_WAIT_S",
+                default=request_deadline_s / 2 if request_deadline_s > 0 else 30.0,
+            ),
+        )
+        admission_bulk_max_wait_s = max(
+            0.0,
+            _get_float(
+                "ADMISSION_BULK_MAX_WAIT_S", "PROCSUITE_ADMISSION_BULK_MAX_WAIT_S", default=admission_max_wait_s / 2
+            ),
+        )
+
+        llm_http_max_connections = max(
+            1, _get_int("LLM_HTTP_MAX_CONNECTIONS", "PROCSUITE_LLM_HTTP_MAX_CONNECTIONS", default=20)
+        )
+        llm_http_max_keepalive = max(
+            0, _get_int("LLM_HTTP_MAX_KEEPALIVE", "PROCSUITE_LLM_HTTP_MAX_KEEPALIVE", default=10)
+        )
+        llm_http_keepalive_s = _get_float("LLM_HTTP_KEEPALIVE_S", "PROCSUITE_LLM_HTTP_KEEPALIVE_S", default=30.0)
+        llm_http2_raw = _env_first("LLM_HTTP2", "PROCSUITE_LLM_HTTP2")
+        llm_http2 = True if llm_http2_raw is None else _truthy(llm_http2_raw)
 
         enable_redis_cache = _truthy(_env_first("ENABLE_REDIS_CACHE", "PROCSUITE_ENABLE_REDIS_CACHE"))
         enable_llm_cache = _truthy(_env_first("ENABLE_LLM_CACHE", "PROCSUITE_ENABLE_LLM_CACHE"))
         enable_ml_cache = _truthy(_env_first("ENABLE_ML_CACHE", "PROCSUITE_ENABLE_ML_CACHE"))
 
+        llm_cache_memory_max_entries = max(
+            1, _get_int("LLM_CACHE_MEMORY_MAX_ENTRIES", "PROCSUITE_LLM_CACHE_MEMORY_MAX_ENTRIES", default=1024)
+        )
+        llm_cache_memory_max_mb = _get_float(
+            "LLM_CACHE_MEMORY_MAX_MB", "PROCSUITE_LLM_CACHE_MEMORY_MAX_MB", default=64.0
+        )
+        llm_cache_path_raw = _env_first("LLM_CACHE_PATH", "PROCSUITE_LLM_CACHE_PATH")
+        if llm_cache_path_raw is None:
+            llm_cache_path: str | None = "/tmp/procsuite/llm_cache.sqlite3"
+        elif llm_cache_path_raw.strip().lower() in {"0", "off", "none", "false"}:
+            llm_cache_path = None
+        else:
+            llm_cache_path = llm_cache_path_raw.strip()
+        llm_cache_disk_max_mb = _get_float("LLM_CACHE_DISK_MAX_MB", "PROCSUITE_LLM_CACHE_DISK_MAX_MB", default=512.0)
+        llm_cache_ttl_s = _get_float("LLM_CACHE_TTL_S", "PROCSUITE_LLM_CACHE_TTL_S", default=30 * 24 * 3600.0)
+
+        enable_process_result_cache = _truthy(
+            _env_first("PROCESS_RESULT_CACHE", "PROCSUITE_PROCESS_RESULT_CACHE")
+        )
+        process_result_cache_path = (
+            _env_first("PROCESS_RESULT_CACHE_PATH", "PROCSUITE_PROCESS_RESULT_CACHE_PATH")
+            or "/tmp/procsuite/process_cache.sqlite3"
+        ).strip()
+        process_result_cache_max_mb = _get_float(
+            "PROCESS_RESULT_CACHE_MAX_MB", "PROCSUITE_PROCESS_RESULT_CACHE_MAX_MB", default=256.0
+        )
+        process_result_cache_ttl_s = _get_float(
+            "PROCESS_RESULT_CACHE_TTL_S", "PROCSUITE_PROCESS_RESULT_CACHE_TTL_S", default=7 * 24 * 3600.0
+        )
+
+        jobs_enabled = _truthy(_env_first("JOBS_ENABLED", "PROCSUITE_JOBS_ENABLED"))
+        # 0 = this process only enqueues; ops/tools/job_worker.py processes the queue.
+        jobs_workers = max(0, _get_int("JOBS_WORKERS", "PROCSUITE_JOBS_WORKERS", default=1))
+        jobs_visibility_timeout_s = max(
+            5.0, _get_float("JOBS_VISIBILITY_TIMEOUT_S", "PROCSUITE_JOBS_VISIBILITY_TIMEOUT_S", default=300.0)
+        )
+        jobs_max_attempts = max(1, _get_int("JOBS_MAX_ATTEMPTS", "PROCSUITE_JOBS_MAX_ATTEMPTS", default=3))
+        jobs_result_ttl_s = max(
+            0.0, _get_float("JOBS_RESULT_TTL_S", "PROCSUITE_JOBS_RESULT_TTL_S", default=24 * 3600.0)
+        )
+        jobs_poll_interval_s = max(
+            0.05, _get_float("JOBS_POLL_INTERVAL_S", "PROCSUITE_JOBS_POLL_INTERVAL_S", default=1.0)
+        )
+        jobs_max_queued = max(1, _get_int("JOBS_MAX_QUEUED", "PROCSUITE_JOBS_MAX_QUEUED", default=10000))
+
         redis_url = _env_first("REDIS_URL", "UPSTASH_REDIS_REST_URL", "UPSTASH_REDIS_URL")
 
         return InfraSettings(
             skip_warmup=skip_warmup,
             background_warmup=background_warmup,
             wait_for_ready_s=wait_for_ready_s,
+            warmup_workers=warmup_workers,
             cpu_workers=cpu_workers,
+            cpu_executor=cpu_executor,
+            cpu_worker_max_tasks=cpu_worker_max_tasks,
             llm_concurrency=llm_concurrency,
             llm_timeout_s=llm_timeout_s,
+            llm_streaming=llm_streaming,
+            llm_adaptive=llm_adaptive,
+            llm_concurrency_min=llm_concurrency_min,
+            llm_concurrency_max=llm_concurrency_max,
+            llm_latency_target_s=llm_latency_target_s,
+            llm_queue_max=llm_queue_max,
+            llm_queue_timeout_s=llm_queue_timeout_s,
+            request_deadline_s=request_deadline_s,
+            request_deadline_optional_min_s=request_deadline_optional_min_s,
+            process_batch_max_items=process_batch_max_items,
+            process_batch_concurrency=process_batch_concurrency,
+            admission_control=admission_control,
+            admission_max_wait_s=admission_max_wait_s,
+            admission_bulk_max_wait_s=admission_bulk_max_wait_s,
+            llm_http_max_connections=llm_http_max_connections,
+            llm_http_max_keepalive=llm_http_max_keepalive,
+            llm_http_keepalive_s=llm_http_keepalive_s,
+            llm_http2=llm_http2,
             enable_redis_cache=enable_redis_cache,
             enable_llm_cache=enable_llm_cache,
             enable_ml_cache=enable_ml_cache,
+            llm_cache_memory_max_entries=llm_cache_memory_max_entries,
+            llm_cache_memory_max_mb=llm_cache_memory_max_mb,
+            llm_cache_path=llm_cache_path,
+            llm_cache_disk_max_mb=llm_cache_disk_max_mb,
+            llm_cache_ttl_s=llm_cache_ttl_s,
+            enable_process_result_cache=enable_process_result_cache,
+            process_result_cache_path=process_result_cache_path,
+            process_result_cache_max_mb=process_result_cache_max_mb,
+            process_result_cache_ttl_s=process_result_cache_ttl_s,
+            jobs_enabled=jobs_enabled,
+            jobs_workers=jobs_workers,
+            jobs_visibility_timeout_s=jobs_visibility_timeout_s,
+            jobs_max_attempts=jobs_max_attempts,
+            jobs_result_ttl_s=jobs_result_ttl_s,
+            jobs_poll_interval_s=jobs_poll_interval_s,
+            jobs_max_queued=jobs_max_queued,
             redis_url=redis_url,
         )
 
@@ -0,0 +1,170 @@
+"""Single-flight deduplication of identical in-flight LLM requests.
+
+When the UI double-submits or several reviewers open the same case, identical
+prompts would otherwise go upstream concurrently; the response cache only
+helps once the first call has finished. ``SingleFlight`` lets the first
+caller for a key (the leader) make the call while concurrent callers with the
+same key wait for it and share its result or exception.
+
+Sync (thread) and async (event loop) callers share one registry: flights are
+``concurrent.futures.Future`` objects, which threads wait on directly and
+coroutines await via ``asyncio.wrap_future``. A follower whose async leader
+was cancelled retries the flight instead of inheriting the cancellation.
+
+Failures that belong to the leader's request rather than to the call are not
+shared either: when the leader runs out of its own request deadline
+(``DeadlineExceededError``) or is turned away by the LLM limiter
+(``LLMOverloadedError``), directly or as the cause of the raised error,
+followers retry the flight, one of them as the new leader. A follower waits
+no longer than its own request deadline (``app.infra.deadline.remaining_s``).
+
+Coalesced calls are counted in ``stats()`` and the ``llm_single_flight``
+metric (``role=leader|coalesced``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from collections import defaultdict
+from typing import Awaitable, Callable, TypeVar
+
+from app.infra.deadline import DeadlineExceededError, remaining_s
+from app.infra.llm_limiter import LLMOverloadedError
+from observability.metrics import emit_metric
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+# Failures scoped to the leader's own request; followers retry instead.
+_REQUEST_SCOPED_ERRORS: tuple[type[BaseException], ...] = (
+    DeadlineExceededError,
+    LLMOverloadedError,
+)
+
+
+class _RetryFlight(Exception):
+    """The leader's failure does not apply to followers; they retry the flight."""
+
+
+def _is_request_scoped(exc: BaseException) -> bool:
+    """``exc`` or an exception it was raised from is scoped to the leader's request."""
+    seen: set[int] = set()
+    current: BaseException | None = exc
+    while current is not None and id(current) not in seen:
+        if isinstance(current, _REQUEST_SCOPED_ERRORS):
+            return True
+        seen.add(id(current))
+        current = current.__cause__
+    return False
+
+
+def _follower_timeout(group: str) -> DeadlineExceededError:
+    return DeadlineExceededError(f"Request deadline exceeded waiting for a coalesced {group} call")
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[str, concurrent.futures.Future] = {}
+        self._stats: dict[str, dict[str, int]] = defaultdict(lambda: {"leaders": 0, "coalesced": 0})
+
+    def _join(self, key: str, group: str) -> tuple[concurrent.futures.Future, bool]:
+        """Return ``(future, is_leader)`` for ``key``."""
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                self._stats[group]["coalesced"] += 1
+                is_leader = False
+            else:
+                future = concurrent.futures.Future()
+                self._flights[key] = future
+                self._stats[group]["leaders"] += 1
+                is_leader = True
+        emit_metric(
+            "incr",
+            "llm_single_flight",
+            tags={"namespace": group, "role": "leader" if is_leader else "coalesced"},
+        )
+        return future, is_leader
+
+    def _land(self, key: str, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+
+    def do(self, key: str, fn: Callable[[], T], *, group: str = "default") -> T:
+        """Run ``fn`` once for all concurrent callers with the same ``key``."""
+        while True:
+            future, is_leader = self._join(key, group)
+            if not is_leader:
+                try:
+                    return future.result(timeout=remaining_s())
+                except _RetryFlight:
+                    continue
+                except TimeoutError:
+                    if future.done():  # the leader's own TimeoutError
+                        raise
+                    raise _follower_timeout(group) from None
+            try:
+                result = fn()
+            except BaseException as exc:
+                future.set_exception(_RetryFlight() if _is_request_scoped(exc) else exc)
+                raise
+            else:
+                future.set_result(result)
+                return result
+            finally:
+                self._land(key, future)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]], *, group: str = "default") -> T:
+        """Async ``do``; the leader's coroutine runs in the caller's task."""
+        while True:
+            future, is_leader = self._join(key, group)
+            if not is_leader:
+                try:
+                    # shield: a cancelled or timed-out follower must not cancel the flight.
+                    return await asyncio.wait_for(
+                        asyncio.shield(asyncio.wrap_future(future)), timeout=remaining_s()
+                    )
+                except _RetryFlight:
+                    continue
+                except TimeoutError:
+                    if future.done():  # the leader's own TimeoutError
+                        raise
+                    raise _follower_timeout(group) from None
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                future.set_exception(_RetryFlight())
+                raise
+            except BaseException as exc:
+                future.set_exception(_RetryFlight() if _is_request_scoped(exc) else exc)
+                raise
+            else:
+                future.set_result(result)
+                return result
+            finally:
+                self._land(key, future)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {group: dict(counts) for group, counts in self._stats.items()}
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    return _single_flight
+
+
+__all__ = ["SingleFlight", "get_single_flight"]
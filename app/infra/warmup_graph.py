@@ -0,0 +1,357 @@
+"""Dependency-aware parallel warmup.
+
+A ``WarmupGraph`` loads startup resources (models, indexes, services) in a
+thread pool. Each ``WarmupTask`` starts as soon as the tasks it ``requires``
+are ready, so independent resources load concurrently and a cold start is
+bounded by the slowest chain rather than the sum. A task whose required
+dependency failed is skipped; a best-effort dependency (``required=False``)
+only orders the work.
+
+Tasks declare the capabilities they provide (``registry_ml``, ``ner``, ...).
+A capability is ready once every task providing it is ready; routes gate on
+capabilities (``app.api.readiness.require_capabilities``) instead of waiting
+for the whole warmup. Asking about a capability no task provides is a
+``KeyError``, so a misspelt name cannot pass as ready.
+
+Per resource, the graph records its state, load time and the change in process
+RSS while it loaded. Loads overlap, so the RSS delta is approximate: memory
+allocated by a concurrent load is counted against every task that was running.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from observability.metrics import emit_metric
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+SKIPPED = "skipped"
+_TERMINAL = frozenset({READY, FAILED, SKIPPED})
+
+
+@dataclass(frozen=True)
+class WarmupTask:
+    """One resource to load.
+
+    ``required=False`` marks a best-effort resource: its failure is reported
+    (and its capabilities are unavailable) but does not fail the warmup, and
+    tasks that require it still run.
+    """
+
+    name: str
+    fn: Callable[[], Any]
+    requires: tuple[str, ...] = ()
+    capabilities: tuple[str, ...] = ()
+    required: bool = True
+
+
+@dataclass
+class ResourceStatus:
+    name: str
+    state: str = PENDING
+    load_ms: float | None = None
+    rss_delta_mb: float | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"state": self.state}
+        if self.load_ms is not None:
+            out["load_ms"] = round(self.load_ms, 1)
+        if self.rss_delta_mb is not None:
+            out["rss_delta_mb"] = round(self.rss_delta_mb, 1)
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+def _rss_mb() -> float | None:
+    """Current resident set size in MB (Linux ``/proc``; peak RSS elsewhere)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        import sys
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except Exception:  # noqa: BLE001
+        return None
+
+
+class WarmupGraph:
+    """Run ``WarmupTask``s in dependency order on a thread pool."""
+
+    def __init__(self, tasks: Iterable[WarmupTask], *, max_workers: int = 4) -> None:
+        self._tasks: dict[str, WarmupTask] = {}
+        for task in tasks:
+            if task.name in self._tasks:
+                raise ValueError(f"Duplicate warmup task: {task.name}")
+            self._tasks[task.name] = task
+        for task in self._tasks.values():
+            unknown = [dep for dep in task.requires if dep not in self._tasks]
+            if unknown:
+                raise ValueError(f"Warmup task {task.name!r} requires unknown task(s): {', '.join(unknown)}")
+        self._check_acyclic()
+
+        self._max_workers = max(1, int(max_workers))
+        self._lock = threading.Lock()
+        self._status = {name: ResourceStatus(name) for name in self._tasks}
+        self._done = threading.Event()
+        self._waiters: list[tuple[tuple[str, ...], asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self._started_at: float | None = None
+        self._elapsed_ms: float | None = None
+        if not self._tasks:
+            self._done.set()
+
+    def _check_acyclic(self) -> None:
+        visiting: set[str] = set()
+        visited: set[str] = set()
+
+        def visit(name: str, path: tuple[str, ...]) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Warmup dependency cycle: {' -> '.join((*path, name))}")
+            visiting.add(name)
+            for dep in self._tasks[name].requires:
+                visit(dep, (*path, name))
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self._tasks:
+            visit(name, ())
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start loading in the background; returns immediately."""
+        with self._lock:
+            if self._started_at is not None:
+                return
+            self._started_at = time.perf_counter()
+            if not self._tasks:
+                self._elapsed_ms = 0.0
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="warmup")
+            runnable = self._runnable_locked()
+        for name in runnable:
+            self._executor.submit(self._run_task, name)
+
+    def run(self, timeout: float | None = None) -> bool:
+        """Load everything and block until done; returns ``ok``."""
+        self.start()
+        self._done.wait(timeout)
+        return self.ok
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until every task has finished (or ``timeout``); returns whether it finished."""
+        return self._done.wait(timeout)
+
+    def shutdown(self) -> None:
+        executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _runnable_locked(self) -> list[str]:
+        runnable = []
+        for name, task in self._tasks.items():
+            status = self._status[name]
+            if status.state != PENDING:
+                continue
+            if all(self._dependency_settled_locked(dep) for dep in task.requires):
+                status.state = LOADING
+                runnable.append(name)
+        return runnable
+
+    def _dependency_settled_locked(self, dep: str) -> bool:
+        state = self._status[dep].state
+        return state == READY or (state in _TERMINAL and not self._tasks[dep].required)
+
+    def _run_task(self, name: str) -> None:
+        task = self._tasks[name]
+        rss_before = _rss_mb()
+        started = time.perf_counter()
+        error: str | None = None
+        try:
+            task.fn()
+        except Exception as exc:  # noqa: BLE001
+            error = f"{type(exc).__name__}: {exc}"
+            log = logger.error if task.required else logger.warning
+            log("Warmup of %s failed: %s", name, error, exc_info=task.required)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        rss_after = _rss_mb()
+
+        with self._lock:
+            status = self._status[name]
+            status.load_ms = elapsed_ms
+            if rss_before is not None and rss_after is not None:
+                status.rss_delta_mb = rss_after - rss_before
+            status.state = FAILED if error else READY
+            status.error = error
+            if error and task.required:
+                self._skip_dependents_locked(name)
+            runnable = self._runnable_locked()
+            if all(s.state in _TERMINAL for s in self._status.values()):
+                self._elapsed_ms = (time.perf_counter() - (self._started_at or started)) * 1000.0
+                self._done.set()
+            self._notify_waiters_locked()
+        if error is None:
+            logger.info("Warmed up %s in %.0f ms", name, elapsed_ms)
+        ok = str(error is None).lower()
+        emit_metric("observe", "warmup_resource_ms", elapsed_ms, tags={"resource": name, "ok": ok})
+        if status.rss_delta_mb is not None:
+            emit_metric("observe", "warmup_resource_rss_mb", status.rss_delta_mb, tags={"resource": name})
+
+        executor = self._executor
+        for next_name in runnable:
+            if executor is not None:
+                try:
+                    executor.submit(self._run_task, next_name)
+                except RuntimeError:  # executor shut down
+                    return
+
+    def _skip_dependents_locked(self, failed: str) -> None:
+        for name, task in self._tasks.items():
+            status = self._status[name]
+            if status.state == PENDING and failed in task.requires:
+                status.state = SKIPPED
+                status.error = f"requires {failed}"
+                self._skip_dependents_locked(name)
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def ok(self) -> bool:
+        """True once every required task is ready."""
+        with self._lock:
+            return self._done.is_set() and all(
+                self._status[name].state == READY for name, task in self._tasks.items() if task.required
+            )
+
+    @property
+    def error(self) -> str | None:
+        """Summary of required tasks that failed or were skipped, if any."""
+        with self._lock:
+            failures = [
+                f"{name}: {self._status[name].error}"
+                for name, task in self._tasks.items()
+                if task.required and self._status[name].state in (FAILED, SKIPPED)
+            ]
+        return "; ".join(failures) or None
+
+    def capabilities(self) -> list[str]:
+        return sorted({cap for task in self._tasks.values() for cap in task.capabilities})
+
+    def capability_state(self, capability: str) -> str:
+        """State of ``capability``; ``KeyError`` if no task provides it."""
+        with self._lock:
+            return self._capability_state_locked(capability)
+
+    def _capability_state_locked(self, capability: str) -> str:
+        states = [self._status[name].state for name, task in self._tasks.items() if capability in task.capabilities]
+        if not states:
+            raise KeyError(f"no warmup task provides capability {capability!r}")
+        if all(state == READY for state in states):
+            return READY
+        if any(state in (FAILED, SKIPPED) for state in states):
+            return FAILED
+        if any(state in (LOADING, READY) for state in states):
+            return LOADING
+        return PENDING
+
+    def capability_error(self, capability: str) -> str | None:
+        with self._lock:
+            for name, task in self._tasks.items():
+                status = self._status[name]
+                if capability in task.capabilities and status.state in (FAILED, SKIPPED):
+                    return f"{name}: {status.error}"
+        return None
+
+    def snapshot(self) -> dict[str, Any]:
+        """Per-capability state and per-resource load time / memory, for ``/ready``."""
+        with self._lock:
+            elapsed_ms = self._elapsed_ms
+            if elapsed_ms is None and self._started_at is not None:
+                elapsed_ms = (time.perf_counter() - self._started_at) * 1000.0
+            return {
+                "capabilities": {cap: self._capability_state_locked(cap) for cap in self.capabilities()},
+                "resources": {name: status.as_dict() for name, status in self._status.items()},
+                "elapsed_ms": round(elapsed_ms, 1) if elapsed_ms is not None else None,
+            }
+
+    # ------------------------------------------------------------------
+    # Async waiting (request path)
+    # ------------------------------------------------------------------
+
+    def _settled_locked(self, capabilities: tuple[str, ...]) -> bool:
+        return all(self._capability_state_locked(cap) in (READY, FAILED) for cap in capabilities)
+
+    async def wait_for_capabilities(self, capabilities: Iterable[str], timeout: float) -> None:
+        """Wait up to ``timeout`` seconds until each capability is ready or failed."""
+        caps = tuple(capabilities)
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        with self._lock:
+            if self._settled_locked(caps):
+                return
+            waiter = (caps, loop, future)
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(future, timeout=timeout)
+        except TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def _notify_waiters_locked(self) -> None:
+        for caps, loop, future in list(self._waiters):
+            if self._settled_locked(caps):
+                self._waiters.remove((caps, loop, future))
+                try:
+                    loop.call_soon_threadsafe(_resolve, future)
+                except RuntimeError:  # loop closed
+                    pass
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+__all__ = [
+    "FAILED",
+    "LOADING",
+    "PENDING",
+    "READY",
+    "SKIPPED",
+    "ResourceStatus",
+    "WarmupGraph",
+    "WarmupTask",
+]
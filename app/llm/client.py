@@ -3,7 +3,7 @@
 This module is provider-agnostic and can be used to wrap outbound calls with:
 - an asyncio semaphore for concurrency limiting
 - exponential backoff with jitter on 429 / transient 5xx
-- a hard time budget (`LLM_TIMEOUT_S`)
+- a hard time budget (`LLM_TIMEOUT_S`, capped to the request deadline)
 """
 
 from __future__ import annotations
@@ -16,6 +16,7 @@ from typing import Any, Mapping
 
 import httpx
 
+from app.infra.deadline import cap_deadline
 from app.infra.llm_control import backoff_seconds, parse_retry_after_seconds
 from app.infra.settings import get_infra_settings
 
@@ -37,7 +38,7 @@ async def post_json_with_retries(
 ) -> httpx.Response:
     policy = policy or RetryPolicy()
     settings = get_infra_settings()
-    deadline = time.monotonic() + float(settings.llm_timeout_s)
+    deadline = cap_deadline(time.monotonic() + float(settings.llm_timeout_s))
 
     last_exc: Exception | None = None
     attempt = 0
@@ -0,0 +1,159 @@
+"""Transport-agnostic request/retry loops for LLM providers.
+
+Provider retry logic (unsupported-parameter retries, 429/5xx backoff, one
+transport retry, response parsing) is written once as a generator that
+*describes* the I/O it needs:
+
+- ``yield Post(payload)`` sends the payload and receives the
+  ``httpx.Response``; a transport failure is raised at the ``yield``.
+  ``Post(payload, stream=consume)`` streams the response instead: each body
+  line of a successful (< 400) response is passed to ``consume`` as it
+  arrives, and the (consumed) response is sent back once the stream ends.
+  Error responses are read in full, as for a plain ``Post``.
+- ``yield Sleep(seconds)`` waits before the next attempt.
+- ``return value`` ends the exchange.
+
+``run_exchange`` drives it with a blocking ``httpx.Client`` (worker threads,
+CLIs), ``arun_exchange`` with an ``httpx.AsyncClient`` on the event loop, so
+the sync and async LLM paths cannot drift apart.
+
+Each post holds a slot of the adaptive limiter for its provider (URL host) and
+model, and reports the response status/latency back to it. A local
+``LLMOverloadedError`` (queue full / deadline) is not thrown into the exchange:
+it propagates to the caller without touching the upstream.
+
+Under a request deadline (``app.infra.deadline``) each post's timeout is capped
+to the time left and backoff sleeps are shortened; a post that would start
+after the deadline raises ``DeadlineExceededError`` to the caller instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Generator, Mapping, TypeVar, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.infra.deadline import cap_seconds, cap_timeout
+from app.infra.llm_control import allm_slot, llm_slot
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Post:
+    payload: Any
+    stream: Callable[[str], None] | None = None
+
+
+@dataclass(frozen=True)
+class Sleep:
+    seconds: float
+
+
+Exchange = Generator[Union[Post, Sleep], Any, T]
+
+
+def _limiter_key(url: str, payload: Any) -> tuple[str, str]:
+    """``(provider, model)`` for the limiter: URL host + payload model (Gemini: URL path)."""
+    parts = urlsplit(url)
+    model = payload.get("model") if isinstance(payload, Mapping) else None
+    if not model and "models/" in parts.path:
+        model = parts.path.split("models/", 1)[1].split(":", 1)[0]
+    return parts.hostname or "default", str(model or "default")
+
+
+def _post(
+    client: httpx.Client, url: str, headers: Mapping[str, str], step: Post, timeout: httpx.Timeout
+) -> httpx.Response:
+    if step.stream is None:
+        return client.post(url, headers=dict(headers), json=step.payload, timeout=timeout)
+    with client.stream("POST", url, headers=dict(headers), json=step.payload, timeout=timeout) as response:
+        if response.status_code >= 400:
+            response.read()
+        else:
+            for line in response.iter_lines():
+                step.stream(line)
+    return response
+
+
+async def _apost(
+    client: httpx.AsyncClient, url: str, headers: Mapping[str, str], step: Post, timeout: httpx.Timeout
+) -> httpx.Response:
+    if step.stream is None:
+        return await client.post(url, headers=dict(headers), json=step.payload, timeout=timeout)
+    async with client.stream("POST", url, headers=dict(headers), json=step.payload, timeout=timeout) as response:
+        if response.status_code >= 400:
+            await response.aread()
+        else:
+            async for line in response.aiter_lines():
+                step.stream(line)
+    return response
+
+
+def run_exchange(
+    exchange: Exchange[T],
+    *,
+    client: httpx.Client,
+    url: str,
+    headers: Mapping[str, str],
+    timeout: httpx.Timeout,
+) -> T:
+    """Drive an exchange with blocking I/O (gated by ``llm_slot``)."""
+    step = next(exchange)
+    while True:
+        try:
+            if isinstance(step, Sleep):
+                time.sleep(cap_seconds(step.seconds))
+                step = exchange.send(None)
+                continue
+            step_timeout = cap_timeout(timeout)
+            error: Exception | None = None
+            with llm_slot(*_limiter_key(url, step.payload)) as slot:
+                try:
+                    response = _post(client, url, headers, step, step_timeout)
+                except Exception as exc:  # noqa: BLE001 - the exchange decides what is retryable
+                    slot.record_error(exc)
+                    error = exc
+                else:
+                    slot.record_response(response)
+            step = exchange.throw(error) if error is not None else exchange.send(response)
+        except StopIteration as stop:
+            return stop.value
+
+
+async def arun_exchange(
+    exchange: Exchange[T],
+    *,
+    client: httpx.AsyncClient,
+    url: str,
+    headers: Mapping[str, str],
+    timeout: httpx.Timeout,
+) -> T:
+    """Drive an exchange on the running event loop (gated by ``allm_slot``)."""
+    step = next(exchange)
+    while True:
+        try:
+            if isinstance(step, Sleep):
+                await asyncio.sleep(cap_seconds(step.seconds))
+                step = exchange.send(None)
+                continue
+            step_timeout = cap_timeout(timeout)
+            error: Exception | None = None
+            async with allm_slot(*_limiter_key(url, step.payload)) as slot:
+                try:
+                    response = await _apost(client, url, headers, step, step_timeout)
+                except Exception as exc:  # noqa: BLE001
+                    slot.record_error(exc)
+                    error = exc
+                else:
+                    slot.record_response(response)
+            step = exchange.throw(error) if error is not None else exchange.send(response)
+        except StopIteration as stop:
+            return stop.value
+
+
+__all__ = ["Exchange", "Post", "Sleep", "arun_exchange", "run_exchange"]
@@ -0,0 +1,215 @@
+"""Incremental parsing of a streamed JSON object.
+
+``IncrementalJSONParser`` is fed the text of a JSON object as it streams in
+and reports each value as soon as its closing character arrives:
+
+- every top-level member, path ``(key,)``
+- every element of a top-level array, path ``(key, index)``, so a long
+  ``procedures`` list yields one event per procedure instead of one at the end
+
+Events let callers validate sections and start deterministic work (evidence
+anchoring, UI updates) before the completion finishes. ``close()`` returns the
+whole document and raises ``IncompleteJSONError`` when the stream stopped
+mid-object, e.g. at the output-token limit.
+
+``section_validator`` checks events against a Pydantic response model so a
+malformed section fails the call while the model is still generating.
+"""
+
+from __future__ import annotations
+
+import json
+import types
+import typing
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable
+
+from pydantic import BaseModel, TypeAdapter
+
+JSONPath = tuple[Any, ...]
+
+
+class IncompleteJSONError(ValueError):
+    """The stream ended before the JSON object was closed."""
+
+
+@dataclass(frozen=True)
+class JSONStreamEvent:
+    path: JSONPath
+    value: Any
+
+
+class IncrementalJSONParser:
+    """Feed chunks of one JSON object; collect completed members/array items."""
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._done = False
+        self._member_start = 0
+        self._member_emitted = False
+        self._key: str | None = None
+        self._item_start = 0
+        self._item_emitted = False
+        self._item_index = 0
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def complete(self) -> bool:
+        return self._done
+
+    def feed(self, chunk: str) -> list[JSONStreamEvent]:
+        if not chunk or self._done:
+            self._text += chunk or ""
+            return []
+        self._text += chunk
+        events: list[JSONStreamEvent] = []
+        text = self._text
+        while self._pos < len(text):
+            i = self._pos
+            ch = text[i]
+            self._pos += 1
+            if not self._started:
+                # Skip markdown fences / prose before the object.
+                if ch == "{":
+                    self._started = True
+                    self._stack.append("{")
+                    self._member_start = i + 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._stack.append(ch)
+                if ch == "[" and len(self._stack) == 2:
+                    self._item_start = i + 1
+                    self._item_emitted = False
+                    self._item_index = 0
+            elif ch in "}]":
+                if len(self._stack) == 2 and ch == "]":
+                    self._emit_item(text[self._item_start : i], events)
+                self._stack.pop()
+                if not self._stack:
+                    self._emit_member(text[self._member_start : i], events)
+                    self._done = True
+                    break
+                # A container value just closed: report it now, not at the next comma.
+                if len(self._stack) == 2 and self._stack[-1] == "[":
+                    self._emit_item(text[self._item_start : i + 1], events)
+                elif len(self._stack) == 1:
+                    self._emit_member(text[self._member_start : i + 1], events)
+            elif ch == ":" and len(self._stack) == 1 and self._key is None:
+                self._key = json.loads(text[self._member_start : i])
+            elif ch == ",":
+                if len(self._stack) == 1:
+                    self._emit_member(text[self._member_start : i], events)
+                    self._member_start = i + 1
+                    self._member_emitted = False
+                    self._key = None
+                elif len(self._stack) == 2 and self._stack[-1] == "[":
+                    self._emit_item(text[self._item_start : i], events)
+                    self._item_start = i + 1
+                    self._item_emitted = False
+        return events
+
+    def _emit_member(self, member: str, events: list[JSONStreamEvent]) -> None:
+        if not self._member_emitted and member.strip():
+            (key, value), = json.loads("{" + member + "}").items()
+            events.append(JSONStreamEvent((key,), value))
+        self._member_emitted = True
+
+    def _emit_item(self, item: str, events: list[JSONStreamEvent]) -> None:
+        if not self._item_emitted and item.strip():
+            events.append(JSONStreamEvent((self._key, self._item_index), json.loads(item)))
+            self._item_index += 1
+        self._item_emitted = True
+
+    def close(self) -> Any:
+        """Return the parsed object; ``IncompleteJSONError`` if it never closed."""
+        if not self._done:
+            raise IncompleteJSONError(
+                f"JSON stream ended inside the object (depth={len(self._stack)}, chars={len(self._text)})"
+            )
+        start = self._text.index("{")
+        return json.loads(self._text[start : self._pos])
+
+
+def replay_json_events(text: str, on_event: Callable[[JSONStreamEvent], None]) -> None:
+    """Emit the events a streamed ``text`` would have produced (cache hits, coalesced calls)."""
+    parser = IncrementalJSONParser()
+    for event in parser.feed(text):
+        on_event(event)
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType) and len(args) == 1:
+        return args[0]
+    return annotation
+
+
+@lru_cache(maxsize=256)
+def _adapter_for(model: type[BaseModel], key: str, item: bool) -> TypeAdapter | None:
+    field = model.model_fields.get(key)
+    if field is None:
+        field = next((f for f in model.model_fields.values() if f.alias == key), None)
+    if field is None or field.annotation is None:
+        return None
+    annotation = _unwrap_optional(field.annotation)
+    if item:
+        if typing.get_origin(annotation) is not list or not typing.get_args(annotation):
+            return None
+        annotation = typing.get_args(annotation)[0]
+    return TypeAdapter(annotation)
+
+
+def section_validator(
+    model: type[BaseModel],
+    on_event: Callable[[JSONStreamEvent], None] | None = None,
+) -> Callable[[JSONStreamEvent], None]:
+    """Return a callback that validates each event against ``model``'s field types.
+
+    Top-level members are checked against their field annotation and array
+    items against the list item type; unknown keys are left to the final
+    ``model_validate``. Raises ``pydantic.ValidationError`` on a bad section;
+    valid events are then passed on to ``on_event``.
+    """
+
+    def _validate(event: JSONStreamEvent) -> None:
+        key = event.path[0]
+        if isinstance(key, str):
+            adapter = None
+            if len(event.path) > 1:
+                adapter = _adapter_for(model, key, True)
+            elif not isinstance(event.value, list):  # list items were already checked one by one
+                adapter = _adapter_for(model, key, False)
+            if adapter is not None:
+                adapter.validate_python(event.value)
+        if on_event is not None:
+            on_event(event)
+
+    return _validate
+
+
+__all__ = [
+    "IncompleteJSONError",
+    "IncrementalJSONParser",
+    "JSONStreamEvent",
+    "replay_json_events",
+    "section_validator",
+]
@@ -0,0 +1,166 @@
+"""Server-sent-event collection for streamed LLM completions.
+
+``StreamCollector`` consumes the SSE lines of one streamed completion
+(``Post(payload, stream=collector.feed_line)`` in ``app.llm.exchange``),
+accumulates the text deltas, feeds them to an ``IncrementalJSONParser`` and
+calls ``on_event`` for every completed JSON section. Provider framing is
+handled by the delta extractors:
+
+- ``openai_chat_delta``: Chat Completions ``stream=true`` chunks
+- ``gemini_delta``: ``:streamGenerateContent?alt=sse`` chunks
+
+A completion cut off at the output-token limit raises ``LLMTruncatedError``
+as soon as the provider reports the finish reason, instead of surfacing later
+as a JSON parse failure. An exception raised by ``on_event`` (e.g. a section
+failing validation) aborts the stream as ``StreamAbortedError``.
+
+Time to first event and total stream time are emitted as
+``llm_stream_first_event_ms`` / ``llm_stream_total_ms``.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Callable
+
+from app.common.exceptions import LLMError
+from app.llm.json_stream import IncrementalJSONParser, JSONStreamEvent
+from observability.metrics import emit_metric
+
+# (text delta, finish reason, usage) from one decoded SSE ``data:`` payload.
+Delta = tuple[str, str | None, dict[str, Any] | None]
+
+_TRUNCATED_FINISH_REASONS = {"length", "max_tokens", "MAX_TOKENS"}
+
+
+class StreamAbortedError(LLMError):
+    """A streamed completion was abandoned before it finished."""
+
+
+class LLMTruncatedError(StreamAbortedError):
+    """The completion stopped at the output-token limit."""
+
+
+def openai_chat_delta(data: dict[str, Any]) -> Delta:
+    text = ""
+    finish: str | None = None
+    for choice in data.get("choices") or []:
+        delta = choice.get("delta") or {}
+        text += delta.get("content") or ""
+        finish = choice.get("finish_reason") or finish
+    usage_raw = data.get("usage")
+    usage = None
+    if isinstance(usage_raw, dict):
+        input_tokens = int(usage_raw.get("prompt_tokens") or 0)
+        output_tokens = int(usage_raw.get("completion_tokens") or 0)
+        usage = {
+            "api": "chat",
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": int(usage_raw.get("total_tokens") or (input_tokens + output_tokens)),
+        }
+    return text, finish, usage
+
+
+def gemini_delta(data: dict[str, Any]) -> Delta:
+    text = ""
+    finish: str | None = None
+    for candidate in data.get("candidates") or []:
+        for part in (candidate.get("content") or {}).get("parts") or []:
+            text += part.get("text") or ""
+        finish = candidate.get("finishReason") or finish
+    return text, finish, None
+
+
+class StreamCollector:
+    def __init__(
+        self,
+        extract: Callable[[dict[str, Any]], Delta],
+        *,
+        on_event: Callable[[JSONStreamEvent], None] | None = None,
+        provider: str = "llm",
+    ) -> None:
+        self._extract = extract
+        self._on_event = on_event
+        self.provider = provider
+        self.reset()
+
+    def reset(self) -> None:
+        """Start over (a retried attempt re-streams from the beginning; events may repeat)."""
+        self._parts: list[str] = []
+        self._parser: IncrementalJSONParser | None = IncrementalJSONParser()
+        self.finish_reason: str | None = None
+        self.usage: dict[str, Any] | None = None
+        self.events = 0
+        self.started = time.monotonic()
+        self.first_event_s: float | None = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def feed_line(self, line: str) -> None:
+        line = line.strip()
+        if not line.startswith("data:"):
+            return  # blank separators, ``event:``/``id:`` fields, comments
+        body = line[5:].strip()
+        if not body or body == "[DONE]":
+            return
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return
+        text, finish, usage = self._extract(data)
+        if usage:
+            self.usage = usage
+        if text:
+            self._parts.append(text)
+            events: list[JSONStreamEvent] = []
+            if self._parser is not None:
+                try:
+                    events = self._parser.feed(text)
+                except ValueError:
+                    self._parser = None  # malformed JSON; the caller's final parse reports it
+            for event in events:
+                self._dispatch(event)
+        if finish:
+            self.finish_reason = finish
+            if finish in _TRUNCATED_FINISH_REASONS:
+                emit_metric("incr", "llm_stream_truncated", tags={"provider": self.provider})
+                raise LLMTruncatedError(
+                    f"{self.provider} completion truncated at the output-token limit "
+                    f"after {len(self.text)} chars ({self.events} complete sections)"
+                )
+
+    def _dispatch(self, event: JSONStreamEvent) -> None:
+        self.events += 1
+        if self.first_event_s is None:
+            self.first_event_s = time.monotonic() - self.started
+            emit_metric(
+                "observe",
+                "llm_stream_first_event_ms",
+                self.first_event_s * 1000.0,
+                tags={"provider": self.provider},
+            )
+        if self._on_event is None:
+            return
+        try:
+            self._on_event(event)
+        except Exception as exc:  # noqa: BLE001 - surfaced to the caller as an LLM failure
+            raise StreamAbortedError(f"{self.provider} stream aborted at {event.path!r}: {exc}") from exc
+
+    def finish(self) -> str:
+        """Return the full text once the stream has ended."""
+        elapsed_ms = (time.monotonic() - self.started) * 1000.0
+        emit_metric("observe", "llm_stream_total_ms", elapsed_ms, tags={"provider": self.provider})
+        return self.text
+
+
+__all__ = [
+    "LLMTruncatedError",
+    "StreamAbortedError",
+    "StreamCollector",
+    "gemini_delta",
+    "openai_chat_delta",
+]
@@ -9,20 +9,22 @@ This application-layer service orchestrates:
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
 import re
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime, date, timezone
 from pathlib import Path
-from typing import Any, Literal, TYPE_CHECKING
+from typing import Any, Awaitable, Callable, Literal, TYPE_CHECKING
 
 import os
 from pydantic import BaseModel, ValidationError
 
 from app.common.exceptions import RegistryError
 from app.common.logger import get_logger
+from app.infra.perf import mark_stage
 from app.registry.adapters.schema_registry import (
     RegistrySchemaRegistry,
     get_schema_registry,
@@ -51,6 +53,7 @@ from app.registry.schema import RegistryRecord
 from app.registry.schema_granular import derive_procedures_from_granular
 from app.registry.processing.masking import mask_extraction_noise
 from app.registry.audit.audit_types import AuditCompareReport, AuditPrediction
+from observability.metrics import emit_metric
 
 logger = get_logger("registry_service")
 from proc_schemas.coding import FinalCode, CodingResult
@@ -73,6 +76,8 @@ from app.extraction.postprocessing.clinical_guardrails import ClinicalGuardrails
 
 
 if TYPE_CHECKING:
+    from app.registry.pipelines.v3_pipeline import CpuRunner
+    from app.registry.schema.ip_v3_extraction import IPRegistryV3 as V3ExtractionRecord
     from app.registry.self_correction.types import SelfCorrectionMetadata
 
 
@@ -221,6 +226,276 @@ def _apply_granular_up_propagation(record: RegistryRecord) -> tuple[RegistryReco
     return RegistryRecord(**record_data), granular_warnings
 
 
+def _env_flag(name: str, default: str = "0") -> bool:
+    return os.getenv(name, default).strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+def _propose_corrections_concurrently(
+    requests: list[tuple[str, str]],
+    *,
+    note_text: str,
+    record: RegistryRecord,
+    focused_procedure_text: str | None,
+) -> dict[str, tuple[Any, dict[str, Any] | None]]:
+    """Run self-correction judge calls for ``(cpt, discrepancy)`` pairs in parallel.
+
+    Returns ``{cpt: (proposal, prompt_budget_report)}``. Each call gets its own
+    judge because ``last_prompt_budget`` is per instance; the adaptive LLM
+    limiter bounds how many requests reach the provider at once.
+    """
+    import contextvars
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app.registry.self_correction.judge import RegistryCorrectionJudge
+
+    if not requests:
+        return {}
+
+    def _propose(discrepancy: str) -> tuple[Any, dict[str, Any] | None]:
+        judge = RegistryCorrectionJudge()
+        proposal = judge.propose_correction(
+            note_text=note_text,
+            record=record,
+            discrepancy=discrepancy,
+            focused_procedure_text=focused_procedure_text,
+        )
+        return proposal, getattr(judge, "last_prompt_budget", None)
+
+    with ThreadPoolExecutor(max_workers=len(requests), thread_name_prefix="self-correct-judge") as pool:
+        # Each worker runs in a copy of the caller's context (request deadline).
+        futures = {
+            cpt: pool.submit(contextvars.copy_context().run, _propose, discrepancy)
+            for cpt, discrepancy in requests
+        }
+        return {cpt: future.result() for cpt, future in futures.items()}
+
+
+def _structurer_llm_configured() -> bool:
+    if _env_flag("REGISTRY_USE_STUB_LLM", "0") or _env_flag("GEMINI_OFFLINE", "0"):
+        return False
+
+    provider = os.getenv("LLM_PROVIDER", "gemini").strip().lower()
+    if provider == "openai_compat":
+        if _env_flag("OPENAI_OFFLINE", "0") or not os.getenv("OPENAI_API_KEY"):
+            return False
+        model = (os.getenv("OPENAI_MODEL_STRUCTURER") or os.getenv("OPENAI_MODEL") or "").strip()
+        return bool(model)
+
+    return bool((os.getenv("GEMINI_API_KEY") or "").strip())
+
+
+def _resolve_extraction_engine() -> str:
+    """REGISTRY_EXTRACTION_ENGINE, else agents_structurer when an LLM is configured."""
+    extraction_engine = os.getenv("REGISTRY_EXTRACTION_ENGINE", "").strip().lower()
+    if not extraction_engine:
+        structured_enabled = _env_flag("STRUCTURED_EXTRACTION_ENABLED", "1")
+        if structured_enabled and _structurer_llm_configured():
+            extraction_engine = "agents_structurer"
+        else:
+            extraction_engine = "engine"
+    return extraction_engine
+
+
+def _preprocess_note_text(raw_note_text: str, warnings: list[str], meta: dict[str, Any]) -> str:
+    """Fingerprint the document and apply vendor cleaners; appends to ``warnings``/``meta``."""
+    preprocessed_note_text = raw_note_text
+
+    # Optional vendor fingerprinting + cleanup (offset-preserving).
+    # This runs on already-extracted text (ideally already scrubbed by the client),
+    # and must not log or emit raw clinical text.
+    try:
+        from app.document_fingerprint.registry import fingerprint_document, split_pdf_fulltext
+
+        doc = split_pdf_fulltext(raw_note_text)
+        fp = fingerprint_document(raw_note_text, doc.page_texts)
+        meta["document_fingerprint"] = {
+            "vendor": fp.vendor,
+            "template_family": fp.template_family,
+            "confidence": fp.confidence,
+            "page_types": fp.page_types,
+        }
+
+        if fp.vendor != "unknown":
+            counts: dict[str, int] = {}
+            for t in (fp.page_types or []):
+                counts[t] = counts.get(t, 0) + 1
+            top_types = ", ".join(f"{k}={v}" for k, v in sorted(counts.items()))
+            warnings.append(
+                f"DOC_FINGERPRINT: vendor={fp.vendor} family={fp.template_family} "
+                f"conf={fp.confidence:.2f} pages={len(doc.pages)} {top_types}".strip()
+            )
+
+        # Only apply cleaners when the fingerprint is confident enough.
+        if fp.vendor == "endosoft" and fp.confidence >= 0.75:
+            from app.text_cleaning.endosoft_cleaner import (
+                EndoSoftCleanMeta,
+                clean_endosoft_page_with_meta,
+            )
+
+            totals = EndoSoftCleanMeta()
+            cleaned_bodies: list[str] = []
+            for body, page_type in zip(doc.page_texts, fp.page_types or [], strict=False):
+                clean_body, page_meta = clean_endosoft_page_with_meta(body, page_type)
+                cleaned_bodies.append(clean_body)
+                totals.masked_footer_lines += page_meta.masked_footer_lines
+                totals.masked_caption_lines += page_meta.masked_caption_lines
+                totals.masked_dedup_blocks += page_meta.masked_dedup_blocks
+
+            if cleaned_bodies:
+                preprocessed_note_text = doc.reassemble(cleaned_page_bodies=cleaned_bodies)
+                meta["document_cleaning"] = {
+                    "vendor": "endosoft",
+                    "masked_footer_lines": totals.masked_footer_lines,
+                    "masked_caption_lines": totals.masked_caption_lines,
+                    "masked_dedup_blocks": totals.masked_dedup_blocks,
+                }
+                warnings.append(
+                    "DOC_CLEAN: endosoft "
+                    f"footers={totals.masked_footer_lines} "
+                    f"captions={totals.masked_caption_lines} "
+                    f"dedup_blocks={totals.masked_dedup_blocks}"
+                )
+
+        elif fp.vendor == "provation" and fp.confidence >= 0.75:
+            from app.text_cleaning.provation_cleaner import clean_provation
+
+            page_meta = clean_provation(doc.page_texts, fp.page_types)
+            cleaned_bodies = [p.clean_text for p in page_meta]
+            if cleaned_bodies:
+                preprocessed_note_text = doc.reassemble(cleaned_page_bodies=cleaned_bodies)
+                sums = {
+                    "masked_boilerplate_lines": 0,
+                    "masked_caption_lines": 0,
+                    "masked_consecutive_line_dupes": 0,
+                    "masked_block_dupes": 0,
+                }
+                for p in page_meta:
+                    metrics = p.metrics or {}
+                    for k in list(sums.keys()):
+                        try:
+                            sums[k] += int(metrics.get(k, 0) or 0)
+                        except (TypeError, ValueError):
+                            continue
+                meta["document_cleaning"] = {"vendor": "provation", **sums}
+                warnings.append(
+                    "DOC_CLEAN: provation "
+                    f"boilerplate={sums['masked_boilerplate_lines']} "
+                    f"captions={sums['masked_caption_lines']} "
+                    f"line_dupes={sums['masked_consecutive_line_dupes']} "
+                    f"block_dupes={sums['masked_block_dupes']}"
+                )
+    except Exception as exc:
+        warnings.append(f"DOC_PREPROCESS_FAILED: {type(exc).__name__}")
+
+    return preprocessed_note_text
+
+
+def _note_digest(raw_note_text: str) -> str:
+    return hashlib.sha256((raw_note_text or "").encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class PreparedNote:
+    """A note after ``extract_record``'s preprocessing and masking.
+
+    ``warnings`` and ``meta`` are what ``_preprocess_note_text`` reported
+    (document fingerprint / cleaning); ``source_digest`` identifies the raw
+    note it was computed from.
+    """
+
+    source_digest: str
+    preprocessed_text: str
+    masked_text: str
+    warnings: tuple[str, ...] = ()
+    meta: dict[str, Any] = field(default_factory=dict)
+    mask_meta: dict[str, Any] = field(default_factory=dict)
+
+
+def prepare_note_text(raw_note_text: str) -> PreparedNote:
+    """Preprocess (fingerprint + vendor cleaners) and mask a note once."""
+    warnings: list[str] = []
+    meta: dict[str, Any] = {}
+    mark_stage("preprocess")
+    preprocessed = _preprocess_note_text(raw_note_text, warnings, meta)
+    mark_stage("masking")
+    masked_note_text, mask_meta = mask_extraction_noise(preprocessed)
+    return PreparedNote(
+        source_digest=_note_digest(raw_note_text),
+        preprocessed_text=preprocessed,
+        masked_text=masked_note_text,
+        warnings=tuple(warnings),
+        meta=meta,
+        mask_meta=dict(mask_meta),
+    )
+
+
+def _discard_structurer_prefetch(reason: str) -> None:
+    logger.warning("Discarding prefetched V3 extraction (%s); the structurer will call the LLM again", reason)
+    emit_metric("incr", "structurer_prefetch_discarded", tags={"reason": reason})
+
+
+@dataclass(frozen=True)
+class PrefetchedV3:
+    """A V3 structurer extraction awaited ahead of the sync pipeline.
+
+    ``prepared`` is the preprocessed/masked note the extraction was computed
+    on, reused by ``extract_record`` instead of being recomputed; ``outcome``
+    is the extraction or the exception it raised; ``meta`` holds the
+    extraction's prompt-budget report.
+    """
+
+    prepared: PreparedNote
+    outcome: V3ExtractionRecord | Exception
+    meta: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def extraction_text(self) -> str:
+        return self.prepared.masked_text
+
+    def to_payload(self) -> dict[str, Any]:
+        """Plain-dict form for handing the prefetch to a CPU worker process."""
+        prepared = {f.name: getattr(self.prepared, f.name) for f in fields(PreparedNote)}
+        payload: dict[str, Any] = {"prepared": prepared, "meta": self.meta}
+        if isinstance(self.outcome, Exception):
+            payload["error"] = self.outcome
+        else:
+            payload["outcome"] = self.outcome.model_dump(mode="json", round_trip=True)
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "PrefetchedV3":
+        from app.registry.schema.ip_v3_extraction import IPRegistryV3
+
+        outcome = payload.get("error")
+        if outcome is None:
+            outcome = IPRegistryV3.model_validate(payload["outcome"])
+        prepared = dict(payload["prepared"])
+        prepared["warnings"] = tuple(prepared.get("warnings") or ())
+        return cls(prepared=PreparedNote(**prepared), outcome=outcome, meta=payload.get("meta") or {})
+
+
+def _reuse_prefetch(
+    raw_note_text: str,
+    prefetch: PrefetchedV3 | None,
+    extraction_engine: str,
+) -> tuple[PreparedNote, PrefetchedV3 | None]:
+    """The prepared note for ``extract_record`` and the prefetch still usable for it.
+
+    The prefetch's preprocessing/masking is reused when it was computed from
+    this note; its V3 outcome only for the agents_structurer engine. Discards
+    are logged and counted (``structurer_prefetch_discarded``).
+    """
+    if prefetch is None:
+        return prepare_note_text(raw_note_text), None
+    if prefetch.prepared.source_digest != _note_digest(raw_note_text):
+        _discard_structurer_prefetch("note_mismatch")
+        return prepare_note_text(raw_note_text), None
+    if extraction_engine != "agents_structurer":
+        _discard_structurer_prefetch(f"engine={extraction_engine}")
+        return prefetch.prepared, None
+    return prefetch.prepared, prefetch
+
+
 @dataclass
 class RegistryDraftResult:
     """Result from building a draft registry entry."""
@@ -285,6 +560,26 @@ class RegistryExtractionResult:
     audit_report: AuditCompareReport | None = None
     self_correction: list["SelfCorrectionMetadata"] = field(default_factory=list)
 
+    def to_payload(self) -> dict[str, Any]:
+        """Plain-dict form for returning the result from a CPU worker process.
+
+        ``RegistryRecord`` is built dynamically and cannot be pickled, so the
+        record travels as its round-trip dump plus the ``exclude=True`` legacy
+        fields that ``model_dump`` leaves out.
+        """
+        payload = {f.name: getattr(self, f.name) for f in fields(self) if f.name != "record"}
+        record = self.record
+        record_payload = record.model_dump(round_trip=True)
+        record_payload.update(
+            {name: getattr(record, name) for name, info in type(record).model_fields.items() if info.exclude}
+        )
+        payload["record"] = record_payload
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "RegistryExtractionResult":
+        return cls(**{**payload, "record": RegistryRecord.model_validate(payload["record"])})
+
 
 class RegistryService:
     """Application service for registry export operations.
@@ -580,7 +875,13 @@ class RegistryService:
     # Hybrid-First Registry Extraction
     # -------------------------------------------------------------------------
 
-    def extract_fields(self, note_text: str, mode: str = "default") -> RegistryExtractionResult:
+    def extract_fields(
+        self,
+        note_text: str,
+        mode: str = "default",
+        *,
+        structurer_prefetch: PrefetchedV3 | None = None,
+    ) -> RegistryExtractionResult:
         """Extract registry fields using hybrid-first flow.
 
         This method orchestrates:
@@ -593,6 +894,8 @@ class RegistryService:
         Args:
             note_text: The procedure note text.
             mode: Optional override (e.g., "parallel_ner").
+            structurer_prefetch: V3 LLM extraction already awaited by
+                ``aextract_fields`` (extraction-first + agents_structurer only).
 
         Returns:
             RegistryExtractionResult with extracted record and metadata.
@@ -609,7 +912,10 @@ class RegistryService:
 
         pipeline_mode = os.getenv("PROCSUITE_PIPELINE_MODE", "current").strip().lower()
         if pipeline_mode == "extraction_first":
-            return self._extract_fields_extraction_first(note_text)
+            return self._extract_fields_extraction_first(
+                note_text,
+                structurer_prefetch=structurer_prefetch,
+            )
         allow_legacy = os.getenv("PROCSUITE_ALLOW_LEGACY_PIPELINES", "0").strip().lower() in {
             "1",
             "true",
@@ -625,6 +931,49 @@ class RegistryService:
         )
         return self._extract_fields_legacy_hybrid(masked_note_text)
 
+    async def aextract_fields(
+        self,
+        note_text: str,
+        *,
+        run_cpu: CpuRunner,
+        extract: Callable[..., Awaitable[RegistryExtractionResult]] | None = None,
+    ) -> RegistryExtractionResult:
+        """Async ``extract_fields`` for request handlers.
+
+        In extraction-first mode with the agents_structurer engine, the V3 LLM
+        extraction is awaited on the event loop (``arun_v3_extraction``) instead
+        of parking a CPU worker thread for the whole LLM round trip. Everything
+        else (preprocessing, masking, verification, CPT derivation, audit) runs
+        through ``run_cpu``, so ``CPU_WORKERS`` only sizes CPU-bound work.
+        Other modes delegate to ``extract_fields`` via ``run_cpu`` unchanged.
+
+        ``extract(note_text, structurer_prefetch=None)`` replaces the final
+        ``run_cpu(self.extract_fields, ...)`` call, e.g. to run it in the CPU
+        process pool (``app.api.services.cpu_tasks``).
+        """
+        if extract is None:
+            extract = functools.partial(run_cpu, self.extract_fields)
+        pipeline_mode = os.getenv("PROCSUITE_PIPELINE_MODE", "current").strip().lower()
+        if pipeline_mode != "extraction_first" or _resolve_extraction_engine() != "agents_structurer":
+            return await extract(note_text)
+
+        prepared = await run_cpu(prepare_note_text, note_text)
+        from app.registry.pipelines.v3_pipeline import arun_v3_extraction
+
+        mark_stage("llm_structurer")
+
+        outcome: V3ExtractionRecord | Exception
+        v3_meta: dict[str, Any] = {}
+        try:
+            outcome = await arun_v3_extraction(prepared.masked_text, run_cpu=run_cpu, meta=v3_meta)
+        except Exception as exc:  # surfaced (and downgraded to a warning) by extract_record
+            outcome = exc
+
+        return await extract(
+            note_text,
+            structurer_prefetch=PrefetchedV3(prepared=prepared, outcome=outcome, meta=v3_meta),
+        )
+
     def _extract_fields_legacy_hybrid(self, masked_note_text: str) -> RegistryExtractionResult:
         # Legacy fallback: if no hybrid orchestrator is injected, run extractor only
         if self.hybrid_orchestrator is None:
@@ -712,132 +1061,29 @@ class RegistryService:
         note_text: str,
         *,
         note_id: str | None = None,
+        structurer_prefetch: PrefetchedV3 | None = None,
     ) -> tuple[RegistryRecord, list[str], dict[str, Any]]:
         """Extract a RegistryRecord from note text without CPT hints.
 
         This is the extraction-first entrypoint for registry evidence. It must
         not seed extraction with CPT codes, ML-predicted CPT codes, or any
         SmartHybridOrchestrator output.
+
+        ``structurer_prefetch`` carries a V3 LLM extraction already awaited by
+        ``aextract_fields`` together with the preprocessed/masked note it was
+        computed on; both are reused if they were computed from this note.
         """
         warnings: list[str] = []
         meta: dict[str, Any] = {"note_id": note_id}
 
-        def _env_flag(name: str, default: str = "0") -> bool:
-            return os.getenv(name, default).strip().lower() in {"1", "true", "yes", "y", "on"}
-
-        def _structurer_llm_configured() -> bool:
-            if _env_flag("REGISTRY_USE_STUB_LLM", "0") or _env_flag("GEMINI_OFFLINE", "0"):
-                return False
-
-            provider = os.getenv("LLM_PROVIDER", "gemini").strip().lower()
-            if provider == "openai_compat":
-                if _env_flag("OPENAI_OFFLINE", "0") or not os.getenv("OPENAI_API_KEY"):
-                    return False
-                model = (os.getenv("OPENAI_MODEL_STRUCTURER") or os.getenv("OPENAI_MODEL") or "").strip()
-                return bool(model)
-
-            return bool((os.getenv("GEMINI_API_KEY") or "").strip())
-
-        extraction_engine = os.getenv("REGISTRY_EXTRACTION_ENGINE", "").strip().lower()
-        if not extraction_engine:
-            structured_enabled = _env_flag("STRUCTURED_EXTRACTION_ENABLED", "1")
-            if structured_enabled and _structurer_llm_configured():
-                extraction_engine = "agents_structurer"
-            else:
-                extraction_engine = "engine"
+        extraction_engine = _resolve_extraction_engine()
         meta["extraction_engine"] = extraction_engine
 
         raw_note_text = note_text
-        preprocessed_note_text = raw_note_text
-
-        # Optional vendor fingerprinting + cleanup (offset-preserving).
-        # This runs on already-extracted text (ideally already scrubbed by the client),
-        # and must not log or emit raw clinical text.
-        try:
-            from app.document_fingerprint.registry import fingerprint_document, split_pdf_fulltext
-
-            doc = split_pdf_fulltext(raw_note_text)
-            fp = fingerprint_document(raw_note_text, doc.page_texts)
-            meta["document_fingerprint"] = {
-                "vendor": fp.vendor,
-                "template_family": fp.template_family,
-                "confidence": fp.confidence,
-                "page_types": fp.page_types,
-            }
-
-            if fp.vendor != "unknown":
-                counts: dict[str, int] = {}
-                for t in (fp.page_types or []):
-                    counts[t] = counts.get(t, 0) + 1
-                top_types = ", ".join(f"{k}={v}" for k, v in sorted(counts.items()))
-                warnings.append(
-                    f"DOC_FINGERPRINT: vendor={fp.vendor} family={fp.template_family} "
-                    f"conf={fp.confidence:.2f} pages={len(doc.pages)} {top_types}".strip()
-                )
-
-            # Only apply cleaners when the fingerprint is confident enough.
-            if fp.vendor == "endosoft" and fp.confidence >= 0.75:
-                from app.text_cleaning.endosoft_cleaner import (
-                    EndoSoftCleanMeta,
-                    clean_endosoft_page_with_meta,
-                )
-
-                totals = EndoSoftCleanMeta()
-                cleaned_bodies: list[str] = []
-                for body, page_type in zip(doc.page_texts, fp.page_types or [], strict=False):
-                    clean_body, page_meta = clean_endosoft_page_with_meta(body, page_type)
-                    cleaned_bodies.append(clean_body)
-                    totals.masked_footer_lines += page_meta.masked_footer_lines
-                    totals.masked_caption_lines += page_meta.masked_caption_lines
-                    totals.masked_dedup_blocks += page_meta.masked_dedup_blocks
-
-                if cleaned_bodies:
-                    preprocessed_note_text = doc.reassemble(cleaned_page_bodies=cleaned_bodies)
-                    meta["document_cleaning"] = {
-                        "vendor": "endosoft",
-                        "masked_footer_lines": totals.masked_footer_lines,
-                        "masked_caption_lines": totals.masked_caption_lines,
-                        "masked_dedup_blocks": totals.masked_dedup_blocks,
-                    }
-                    warnings.append(
-                        "DOC_CLEAN: endosoft "
-                        f"footers={totals.masked_footer_lines} "
-                        f"captions={totals.masked_caption_lines} "
-                        f"dedup_blocks={totals.masked_dedup_blocks}"
-                    )
-
-            elif fp.vendor == "provation" and fp.confidence >= 0.75:
-                from app.text_cleaning.provation_cleaner import clean_provation
-
-                page_meta = clean_provation(doc.page_texts, fp.page_types)
-                cleaned_bodies = [p.clean_text for p in page_meta]
-                if cleaned_bodies:
-                    preprocessed_note_text = doc.reassemble(cleaned_page_bodies=cleaned_bodies)
-                    sums = {
-                        "masked_boilerplate_lines": 0,
-                        "masked_caption_lines": 0,
-                        "masked_consecutive_line_dupes": 0,
-                        "masked_block_dupes": 0,
-                    }
-                    for p in page_meta:
-                        metrics = p.metrics or {}
-                        for k in list(sums.keys()):
-                            try:
-                                sums[k] += int(metrics.get(k, 0) or 0)
-                            except (TypeError, ValueError):
-                                continue
-                    meta["document_cleaning"] = {"vendor": "provation", **sums}
-                    warnings.append(
-                        "DOC_CLEAN: provation "
-                        f"boilerplate={sums['masked_boilerplate_lines']} "
-                        f"captions={sums['masked_caption_lines']} "
-                        f"line_dupes={sums['masked_consecutive_line_dupes']} "
-                        f"block_dupes={sums['masked_block_dupes']}"
-                    )
-        except Exception as exc:
-            warnings.append(f"DOC_PREPROCESS_FAILED: {type(exc).__name__}")
-
-        masked_note_text, mask_meta = mask_extraction_noise(preprocessed_note_text)
+        prepared, structurer_prefetch = _reuse_prefetch(raw_note_text, structurer_prefetch, extraction_engine)
+        warnings.extend(prepared.warnings)
+        meta.update(prepared.meta)
+        masked_note_text, mask_meta = prepared.masked_text, dict(prepared.mask_meta)
         meta["masked_note_text"] = masked_note_text
         meta["masking_meta"] = mask_meta
 
@@ -952,16 +1198,26 @@ class RegistryService:
                 meta["focus_meta"] = {"status": "failed", "error": str(exc)}
                 text_for_extraction = masked_note_text
         elif extraction_engine == "agents_structurer":
+            mark_stage("llm_structurer")
             try:
                 from app.registry.extraction.structurer import structure_note_to_registry_record
 
+                prefetched_v3 = None
+                if structurer_prefetch is not None:
+                    prefetched_v3 = structurer_prefetch.outcome
+                    meta["structurer_prefetched"] = True
                 record, struct_meta = structure_note_to_registry_record(
                     masked_note_text,
                     note_id=note_id,
+                    v3=prefetched_v3,
                 )
+                if prefetched_v3 is not None:
+                    struct_meta.update(structurer_prefetch.meta)
                 meta["structurer_meta"] = struct_meta
                 meta["extraction_text"] = masked_note_text
+                warnings.extend(struct_meta.get("warnings") or [])
 
+                mark_stage("postprocess")
                 record, granular_warnings = _apply_granular_up_propagation(record)
                 warnings.extend(granular_warnings)
 
@@ -993,6 +1249,7 @@ class RegistryService:
                 meta["structurer_meta"] = {"status": "failed", "error": str(exc)}
         elif extraction_engine == "parallel_ner":
             # Parallel NER pathway: Run NER → Registry mapping → Rules + ML safety net
+            mark_stage("ner")
             try:
                 predictor = self._get_registry_ml_predictor()
                 parallel_result = self.parallel_orchestrator.process(
@@ -1022,6 +1279,7 @@ class RegistryService:
 
                 # Deterministic fallback: fill common missed procedure flags so
                 # extraction-first does not silently drop revenue when NER misses.
+                mark_stage("deterministic_seeding")
                 try:
                     import re
 
@@ -2563,6 +2821,7 @@ class RegistryService:
                 meta["extraction_text"] = masked_note_text
 
                 # Apply standard postprocessing
+                mark_stage("postprocess")
                 record, granular_warnings = _apply_granular_up_propagation(record)
                 warnings.extend(granular_warnings)
 
@@ -2599,6 +2858,7 @@ class RegistryService:
         else:
             warnings.append(f"Unknown REGISTRY_EXTRACTION_ENGINE='{extraction_engine}', using engine")
 
+        mark_stage("registry_engine")
         meta["extraction_text"] = text_for_extraction
         context: dict[str, Any] = {"schema_version": "v3"}
         if note_id:
@@ -2613,6 +2873,7 @@ class RegistryService:
                 record = record[0]  # Unpack if evidence included
         warnings.extend(engine_warnings)
 
+        mark_stage("postprocess")
         record, granular_warnings = _apply_granular_up_propagation(record)
         warnings.extend(granular_warnings)
 
@@ -2638,7 +2899,12 @@ class RegistryService:
         record = _apply_disease_burden_overrides(record)
         return record, warnings, meta
 
-    def _extract_fields_extraction_first(self, raw_note_text: str) -> RegistryExtractionResult:
+    def _extract_fields_extraction_first(
+        self,
+        raw_note_text: str,
+        *,
+        structurer_prefetch: PrefetchedV3 | None = None,
+    ) -> RegistryExtractionResult:
         """Extraction-first registry pipeline.
 
         Order (must not call orchestrator / CPT seeding):
@@ -2685,7 +2951,11 @@ class RegistryService:
             except ValueError:
                 return default
 
-        record, extraction_warnings, meta = self.extract_record(raw_note_text)
+        record, extraction_warnings, meta = self.extract_record(
+            raw_note_text,
+            structurer_prefetch=structurer_prefetch,
+        )
+        mark_stage("postprocess")
         extraction_text = meta.get("extraction_text") if isinstance(meta.get("extraction_text"), str) else None
         if isinstance(meta.get("masked_note_text"), str):
             masked_note_text = meta["masked_note_text"]
@@ -2926,6 +3196,7 @@ class RegistryService:
         if omission_warnings:
             extraction_warnings.extend(omission_warnings)
 
+        mark_stage("cpt_derivation")
         derivation = derive_registry_to_cpt(record)
         derived_codes = [c.code for c in derivation.codes]
         base_warnings = list(extraction_warnings)
@@ -2949,6 +3220,7 @@ class RegistryService:
 
         baseline_needs_manual_review = needs_manual_review
 
+        mark_stage("ml_audit")
         if auditor_source == "raw_ml":
             from app.registry.audit.raw_ml_auditor import RawMLAuditConfig
 
@@ -3212,6 +3484,14 @@ class RegistryService:
 
             self_correct_enabled = _env_flag("REGISTRY_SELF_CORRECT_ENABLED", "0")
             if self_correct_enabled and audit_report.high_conf_omissions:
+                from app.infra.deadline import budget_skip_warning
+
+                deadline_warning = budget_skip_warning("self_correction")
+                if deadline_warning:
+                    self_correct_warnings.append(deadline_warning)
+                    self_correct_enabled = False
+            if self_correct_enabled and audit_report.high_conf_omissions:
+                mark_stage("self_correction")
                 max_attempts = max(0, _env_int("REGISTRY_SELF_CORRECT_MAX_ATTEMPTS", 1))
                 bucket_by_cpt: dict[str, str | None] = {}
                 for pred in (audit_report.ml_audit_codes or []):
@@ -3241,10 +3521,9 @@ class RegistryService:
                     if extraction_text is not None and extraction_text.strip()
                     else masked_note_text
                 )
-                for pred in trigger_preds:
-                    if corrections_applied >= max_attempts:
-                        break
 
+                def _judge_request(pred: Any) -> tuple[bool, str, str, SelfCorrectionTrigger, str]:
+                    """Keyword guard + trigger + judge discrepancy text for one prediction."""
                     bucket = bucket_by_cpt.get(pred.cpt) or getattr(pred, "bucket", None) or "UNKNOWN"
                     bypass_guard = bucket in {"HEADER_EXPLICIT", "STRUCTURAL_FAILURE"}
                     guard_evidence = evidence_text
@@ -3265,13 +3544,7 @@ class RegistryService:
                         passes, reason = keyword_guard_check(
                             cpt=pred.cpt, evidence_text=guard_evidence, ml_prob=ml_prob
                         )
-                    if not passes:
-                        self_correct_warnings.append(
-                            f"SELF_CORRECT_SKIPPED: {pred.cpt}: keyword guard failed ({reason})"
-                        )
-                        continue
 
-                    derived_codes_before = list(derived_codes)
                     trigger = SelfCorrectionTrigger(
                         target_cpt=pred.cpt,
                         ml_prob=float(pred.prob),
@@ -3296,12 +3569,48 @@ class RegistryService:
                             f"RAW-ML suggests missing CPT {pred.cpt} "
                             f"(prob={float(pred.prob):.2f}, bucket={bucket})."
                         )
-                    proposal = judge.propose_correction(
+                    return passes, reason, bucket, trigger, discrepancy
+
+                # Concurrent mode: run every keyword guard up front and send all
+                # eligible judge calls at once (the adaptive LLM limiter bounds
+                # them), so the loop below waits for the slowest call rather than
+                # the sum. Patches are still applied one at a time, in priority
+                # order, under the same max_attempts cap.
+                judge_requests: dict[str, tuple[bool, str, str, SelfCorrectionTrigger, str]] = {}
+                prefetched: dict[str, tuple[Any, dict[str, Any] | None]] = {}
+                if _env_flag("REGISTRY_SELF_CORRECT_CONCURRENT", "0") and max_attempts > 0:
+                    judge_requests = {pred.cpt: _judge_request(pred) for pred in trigger_preds}
+                    prefetched = _propose_corrections_concurrently(
+                        [(cpt, request[4]) for cpt, request in judge_requests.items() if request[0]],
                         note_text=raw_note_text,
                         record=record,
-                        discrepancy=discrepancy,
                         focused_procedure_text=extraction_text,
                     )
+
+                for pred in trigger_preds:
+                    if corrections_applied >= max_attempts:
+                        break
+
+                    passes, reason, bucket, trigger, discrepancy = (
+                        judge_requests.get(pred.cpt) or _judge_request(pred)
+                    )
+                    if not passes:
+                        self_correct_warnings.append(
+                            f"SELF_CORRECT_SKIPPED: {pred.cpt}: keyword guard failed ({reason})"
+                        )
+                        continue
+
+                    derived_codes_before = list(derived_codes)
+                    if pred.cpt in prefetched:
+                        proposal, judge_prompt_budget = prefetched[pred.cpt]
+                    else:
+                        proposal = judge.propose_correction(
+                            note_text=raw_note_text,
+                            record=record,
+                            discrepancy=discrepancy,
+                            focused_procedure_text=extraction_text,
+                        )
+                        judge_prompt_budget = getattr(judge, "last_prompt_budget", None)
                     if proposal is None:
                         self_correct_warnings.append(f"SELF_CORRECT_SKIPPED: {pred.cpt}: judge returned null")
                         continue
@@ -3357,6 +3666,7 @@ class RegistryService:
                         "allowlist": allowlist_snapshot,
                         "audit_config": audit_report.config.to_dict(),
                         "judge_rationale": proposal.rationale,
+                        "judge_prompt_budget": judge_prompt_budget,
                     }
                     self_correction_meta.append(
                         SelfCorrectionMetadata(
@@ -3456,6 +3766,7 @@ class RegistryService:
         else:
             raise ValueError(f"Unknown REGISTRY_AUDITOR_SOURCE='{auditor_source}'")
 
+        mark_stage("cpt_derivation")
         if audit_report and audit_report.missing_in_derived:
             for pred in audit_report.missing_in_derived:
                 bucket = pred.bucket or "AUDIT_SET"
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from typing import Any, Mapping
 
 from rapidfuzz.fuzz import partial_ratio
 
@@ -61,7 +62,11 @@ def normalize_text(text: str) -> str:
     return collapsed
 
 
-def verify_registry(registry: IPRegistryV3, full_source_text: str) -> IPRegistryV3:
+def verify_registry(
+    registry: IPRegistryV3,
+    full_source_text: str,
+    anchors: Mapping[str, Any] | None = None,
+) -> IPRegistryV3:
     """Verify and anchor event evidence quotes against the full source note text.
 
     For each procedure event, attempt to:
@@ -72,6 +77,9 @@ def verify_registry(registry: IPRegistryV3, full_source_text: str) -> IPRegistry
        determined, clearing any pre-filled offsets to avoid misleading spans.
 
     Events whose evidence quote cannot be verified are dropped.
+
+    ``anchors`` maps stripped quotes to ``anchor_quote(full_source_text, quote)``
+    results computed earlier (e.g. while the LLM response was streaming).
     """
 
     from app.evidence.quote_anchor import anchor_quote
@@ -88,7 +96,7 @@ def verify_registry(registry: IPRegistryV3, full_source_text: str) -> IPRegistry
         if not quote_clean:
             continue
 
-        anchored = anchor_quote(full_text, quote_clean)
+        anchored = (anchors or {}).get(quote_clean) or anchor_quote(full_text, quote_clean)
         if anchored.span is not None:
             updated = event.model_copy(deep=True)
             if updated.evidence is None:
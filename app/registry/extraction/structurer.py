@@ -20,6 +20,7 @@ from typing import Any
 
 from app.common.spans import Span
 from app.registry.schema import RegistryRecord
+from app.registry.schema.ip_v3_extraction import IPRegistryV3
 
 
 def _truthy_env(name: str) -> bool:
@@ -94,7 +95,14 @@ def structure_note_to_registry_record(
     note_text: str,
     *,
     note_id: str | None = None,
+    v3: IPRegistryV3 | Exception | None = None,
 ) -> tuple[RegistryRecord, dict[str, Any]]:
+    """Project the V3 event log for ``note_text`` into a ``RegistryRecord``.
+
+    ``v3`` carries the outcome of an extraction already run for this exact
+    text (the async request path awaits the LLM on the event loop first); an
+    exception is re-raised here so fallback handling stays in one place.
+    """
     if not _llm_configured():
         raise NotImplementedError(
             "REGISTRY_EXTRACTION_ENGINE=agents_structurer unavailable (LLM not configured/offline); "
@@ -104,7 +112,11 @@ def structure_note_to_registry_record(
     from app.registry.pipelines.v3_pipeline import run_v3_extraction
     from app.registry.schema.adapters.v3_to_v2 import convert_v3_to_v2
 
-    v3 = run_v3_extraction(note_text)
+    if isinstance(v3, Exception):
+        raise v3
+    v3_meta: dict[str, Any] = {}
+    if v3 is None:
+        v3 = run_v3_extraction(note_text, meta=v3_meta)
     record = convert_v3_to_v2(v3)
 
     evidence = getattr(record, "evidence", None)
@@ -147,6 +159,7 @@ def structure_note_to_registry_record(
         "v3_event_count": len(v3.procedures),
         "v3_event_types": dict(type_counts),
     }
+    meta.update(v3_meta)
     if not note_id:
         meta.pop("note_id", None)
 
@@ -24,6 +24,7 @@ from app.common.llm import (
 )
 from app.common.logger import get_logger
 from app.common.sectionizer import Section
+from app.infra.llm_cache import LLMCacheKey, get_llm_cache, llm_cache_key
 from app.registry.prompts import build_registry_prompt
 from app.registry.slots.base import SlotResult
 from config.settings import LLMExtractionConfig
@@ -59,31 +60,44 @@ class ExtractionResult:
 
 
 class NoteHashCache:
-    """Simple in-memory cache keyed by note hash + schema name."""
+    """Extraction results keyed by note hash + schema name.
 
-    def __init__(self, max_size: int = 1000):
-        self._cache: dict[str, SlotResult] = {}
-        self._max_size = max_size
+    Backed by the shared tiered LLM cache (namespace ``llm_detailed``), so
+    results survive restarts when ``ENABLE_LLM_CACHE`` is set. Bumping
+    ``prompt_version`` (the extractor VERSION) orphans older entries.
+    """
 
-    def _make_key(self, note_hash: str, schema_name: str) -> str:
-        return f"{note_hash}:{schema_name}"
+    NAMESPACE = "llm_detailed"
 
-    def get(self, note_hash: str, schema_name: str) -> Optional[SlotResult]:
-        key = self._make_key(note_hash, schema_name)
-        return self._cache.get(key)
+    def __init__(self, *, model: str = "", prompt_version: str = "default") -> None:
+        self._model = model
+        self._prompt_version = prompt_version
 
-    def set(self, note_hash: str, schema_name: str, result: SlotResult) -> None:
-        key = self._make_key(note_hash, schema_name)
+    def _make_key(self, note_hash: str, schema_name: str) -> LLMCacheKey:
+        return llm_cache_key(
+            task=self.NAMESPACE,
+            model=self._model,
+            prompt=note_hash,
+            prompt_version=self._prompt_version,
+            schema_version=schema_name,
+        )
 
-        # Simple LRU: if at max size, remove oldest entry
-        if len(self._cache) >= self._max_size:
-            oldest_key = next(iter(self._cache))
-            del self._cache[oldest_key]
+    def get(self, note_hash: str, schema_name: str) -> Optional[SlotResult]:
+        raw = get_llm_cache().get(self._make_key(note_hash, schema_name))
+        if raw is None:
+            return None
+        try:
+            payload = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        return SlotResult(value=payload.get("value"), evidence=[], confidence=float(payload.get("confidence") or 0.0))
 
-        self._cache[key] = result
+    def set(self, note_hash: str, schema_name: str, result: SlotResult) -> None:
+        payload = json.dumps({"value": result.value, "confidence": result.confidence}, default=str)
+        get_llm_cache().set(self._make_key(note_hash, schema_name), payload)
 
     def clear(self) -> None:
-        self._cache.clear()
+        get_llm_cache().invalidate(self.NAMESPACE)
 
 
 def hash_text(text: str) -> str:
@@ -146,7 +160,10 @@ class LLMDetailedExtractor:
                         logger.info("Using Gemini LLM")
 
         self.config = config or LLMExtractionConfig()
-        self.cache = NoteHashCache()
+        self.cache = NoteHashCache(
+            model=str(getattr(self.llm, "model", "") or type(self.llm).__name__),
+            prompt_version=self.VERSION,
+        )
 
     @property
     def version(self) -> str:
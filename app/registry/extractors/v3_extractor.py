@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import copy
 import json
 import os
-from typing import Any, TYPE_CHECKING, TypeVar
+from typing import Any, Callable, TYPE_CHECKING, TypeVar
 
 import httpx
 from pydantic import BaseModel
@@ -10,12 +11,20 @@ from pydantic import BaseModel
 from app.common.exceptions import LLMError
 from app.common.model_capabilities import filter_payload_for_model, is_gpt5
 from app.common.logger import get_logger
-from app.infra.llm_control import backoff_seconds, llm_slot, parse_retry_after_seconds
+from app.infra.http_transport import get_async_http_client, get_http_client
+from app.infra.llm_cache import llm_cache_key, schema_fingerprint
+from app.infra.llm_control import backoff_seconds, parse_retry_after_seconds
+from app.infra.settings import get_infra_settings
+from app.infra.single_flight import get_single_flight
+from app.llm.exchange import Exchange, Post, Sleep, arun_exchange, run_exchange
+from app.llm.json_stream import JSONStreamEvent, section_validator
+from app.llm.streaming import StreamAbortedError, StreamCollector, openai_chat_delta
 from app.registry.schema.ip_v3_extraction import IPRegistryV3
 
 logger = get_logger("registry.v3_extractor")
 
 TModel = TypeVar("TModel", bound=BaseModel)
+EventHandler = Callable[[JSONStreamEvent], None]
 
 if TYPE_CHECKING:  # pragma: no cover
     from app.common.llm import DeterministicStubLLM, GeminiLLM, OpenAILLM
@@ -31,10 +40,18 @@ SYSTEM_PROMPT = (
     "Output JSON only."
 )
 
+REPAIR_SYSTEM_PROMPT = (
+    "You are a strict evidence quote repair system.\n"
+    "You will be given a procedure note and a JSON extraction.\n"
+    "Your ONLY job is to ensure each procedures[i].evidence.quote is copied verbatim\n"
+    "from the provided note text.\n"
+    "Do NOT change any other fields. Do NOT add/remove/reorder procedures.\n"
+    "If you cannot find a verbatim quote, set that quote to an empty string.\n"
+    "Output JSON only."
+)
 
-def extract_v3_draft(focused_text: str, *, prompt_context: dict[str, Any] | None = None) -> IPRegistryV3:
-    schema = IPRegistryV3.model_json_schema()
 
+def _draft_user_prompt(focused_text: str, schema: dict[str, Any], prompt_context: dict[str, Any] | None) -> str:
     context_block = ""
     if prompt_context:
         context_block = (
@@ -42,7 +59,7 @@ def extract_v3_draft(focused_text: str, *, prompt_context: dict[str, Any] | None
             f"{json.dumps(prompt_context, indent=2)}\n\n"
         )
 
-    user_prompt = (
+    return (
         "Extract interventional pulmonology events from the focused note text.\n\n"
         "Return ONLY valid JSON that conforms to the provided schema.\n"
         "You MUST provide a verbatim evidence_quote for every event.\n\n"
@@ -56,18 +73,62 @@ def extract_v3_draft(focused_text: str, *, prompt_context: dict[str, Any] | None
         f"Focused note text:\n{focused_text}\n"
     )
 
+
+def extract_v3_draft(
+    focused_text: str,
+    *,
+    prompt_context: dict[str, Any] | None = None,
+    on_event: EventHandler | None = None,
+) -> IPRegistryV3:
+    """Draft the V3 event log.
+
+    With ``LLM_STREAMING`` on, ``on_event`` receives each validated section
+    (``("procedures", i)`` per event) while the completion is still streaming.
+    """
+    schema = IPRegistryV3.model_json_schema()
     # Use a timeout profile appropriate for registry extraction (see `_resolve_openai_timeout`).
     llm = _resolve_llm(task="registry_extraction")
     raw = _generate_structured_json(
         llm=llm,
         system_prompt=SYSTEM_PROMPT,
-        user_prompt=user_prompt,
+        user_prompt=_draft_user_prompt(focused_text, schema, prompt_context),
+        response_model=IPRegistryV3,
+        response_json_schema=schema,
+        **({"on_event": on_event} if on_event is not None else {}),
+    )
+    return IPRegistryV3.model_validate(raw)
+
+
+async def aextract_v3_draft(
+    focused_text: str,
+    *,
+    prompt_context: dict[str, Any] | None = None,
+    on_event: EventHandler | None = None,
+) -> IPRegistryV3:
+    """Async ``extract_v3_draft``: the LLM call is awaited on the event loop."""
+    schema = IPRegistryV3.model_json_schema()
+    llm = _resolve_llm(task="registry_extraction")
+    raw = await _agenerate_structured_json(
+        llm=llm,
+        system_prompt=SYSTEM_PROMPT,
+        user_prompt=_draft_user_prompt(focused_text, schema, prompt_context),
         response_model=IPRegistryV3,
         response_json_schema=schema,
+        **({"on_event": on_event} if on_event is not None else {}),
     )
     return IPRegistryV3.model_validate(raw)
 
 
+def _repair_user_prompt(registry: IPRegistryV3, note_text: str, schema: dict[str, Any]) -> str:
+    return (
+        "Return ONLY valid JSON that conforms to the provided schema.\n\n"
+        f"Schema:\n{json.dumps(schema, indent=2)}\n\n"
+        f"Procedure note text:\n{note_text}\n\n"
+        "Existing extraction JSON (repair evidence quotes only):\n"
+        f"{registry.model_dump_json(exclude_none=True, indent=2)}\n"
+    )
+
+
 def repair_v3_evidence_quotes(
     registry: IPRegistryV3,
     *,
@@ -96,33 +157,44 @@ def repair_v3_evidence_quotes(
     if isinstance(llm, DeterministicStubLLM):
         return registry
 
-    system_prompt = (
-        "You are a strict evidence quote repair system.\n"
-        "You will be given a procedure note and a JSON extraction.\n"
-        "Your ONLY job is to ensure each procedures[i].evidence.quote is copied verbatim\n"
-        "from the provided note text.\n"
-        "Do NOT change any other fields. Do NOT add/remove/reorder procedures.\n"
-        "If you cannot find a verbatim quote, set that quote to an empty string.\n"
-        "Output JSON only."
+    repaired_raw = _generate_structured_json(
+        llm=llm,
+        system_prompt=REPAIR_SYSTEM_PROMPT,
+        user_prompt=_repair_user_prompt(registry, note_text, schema),
+        response_model=IPRegistryV3,
+        response_json_schema=schema,
     )
+    return _merge_repaired_quotes(registry, IPRegistryV3.model_validate(repaired_raw))
 
-    user_prompt = (
-        "Return ONLY valid JSON that conforms to the provided schema.\n\n"
-        f"Schema:\n{json.dumps(schema, indent=2)}\n\n"
-        f"Procedure note text:\n{note_text}\n\n"
-        "Existing extraction JSON (repair evidence quotes only):\n"
-        f"{registry.model_dump_json(exclude_none=True, indent=2)}\n"
-    )
 
-    repaired_raw = _generate_structured_json(
+async def arepair_v3_evidence_quotes(
+    registry: IPRegistryV3,
+    *,
+    note_text: str,
+) -> IPRegistryV3:
+    """Async ``repair_v3_evidence_quotes``."""
+    if not registry.procedures:
+        return registry
+
+    schema = IPRegistryV3.model_json_schema()
+    llm = _resolve_llm(task="registry_extraction")
+
+    from app.common.llm import DeterministicStubLLM
+
+    if isinstance(llm, DeterministicStubLLM):
+        return registry
+
+    repaired_raw = await _agenerate_structured_json(
         llm=llm,
-        system_prompt=system_prompt,
-        user_prompt=user_prompt,
+        system_prompt=REPAIR_SYSTEM_PROMPT,
+        user_prompt=_repair_user_prompt(registry, note_text, schema),
         response_model=IPRegistryV3,
         response_json_schema=schema,
     )
-    repaired = IPRegistryV3.model_validate(repaired_raw)
+    return _merge_repaired_quotes(registry, IPRegistryV3.model_validate(repaired_raw))
+
 
+def _merge_repaired_quotes(registry: IPRegistryV3, repaired: IPRegistryV3) -> IPRegistryV3:
     by_id: dict[str, str] = {}
     for event in repaired.procedures:
         evidence = getattr(event, "evidence", None)
@@ -188,9 +260,12 @@ def _generate_structured_json(
     user_prompt: str,
     response_model: type[TModel],
     response_json_schema: dict[str, Any],
+    on_event: EventHandler | None = None,
 ) -> dict[str, Any]:
     from app.common.llm import DeterministicStubLLM, GeminiLLM, OpenAILLM
 
+    stream = _streaming_enabled()
+
     if isinstance(llm, DeterministicStubLLM):
         prompt = f"{system_prompt.strip()}\n\n{user_prompt.strip()}\n"
         return json.loads(llm.generate(prompt))
@@ -198,13 +273,24 @@ def _generate_structured_json(
     if isinstance(llm, GeminiLLM):
         prompt = f"{system_prompt.strip()}\n\n{user_prompt.strip()}\n"
         gemini_schema = _convert_json_schema_to_gemini(response_json_schema)
-        text = llm.generate(prompt, response_schema=gemini_schema, temperature=0.0)
+        if stream:
+            text = llm.generate_stream(
+                prompt,
+                response_schema=gemini_schema,
+                temperature=0.0,
+                on_event=section_validator(response_model, on_event),
+            )
+        else:
+            text = llm.generate(prompt, response_schema=gemini_schema, temperature=0.0)
         return _parse_json_model(text, response_model=response_model)
 
     # OpenAI-compatible Chat Completions JSON schema when supported; prompt-only fallback otherwise.
     if isinstance(llm, OpenAILLM) and is_gpt5(llm.model):
         prompt = f"{system_prompt.strip()}\n\n{user_prompt.strip()}\n"
-        text = llm.generate(prompt, temperature=0.0)
+        if stream:
+            text = llm.generate_stream(prompt, temperature=0.0, on_event=section_validator(response_model, on_event))
+        else:
+            text = llm.generate(prompt, temperature=0.0)
         return _parse_json_model(text, response_model=response_model)
 
     return _openai_chat_json_schema(
@@ -215,9 +301,67 @@ def _generate_structured_json(
         user_prompt=user_prompt,
         response_model=response_model,
         json_schema=response_json_schema,
+        on_event=section_validator(response_model, on_event) if stream else None,
     )
 
 
+async def _agenerate_structured_json(
+    *,
+    llm: "GeminiLLM | OpenAILLM | DeterministicStubLLM",
+    system_prompt: str,
+    user_prompt: str,
+    response_model: type[TModel],
+    response_json_schema: dict[str, Any],
+    on_event: EventHandler | None = None,
+) -> dict[str, Any]:
+    from app.common.llm import DeterministicStubLLM, GeminiLLM, OpenAILLM
+
+    stream = _streaming_enabled()
+
+    if isinstance(llm, DeterministicStubLLM):
+        prompt = f"{system_prompt.strip()}\n\n{user_prompt.strip()}\n"
+        return json.loads(llm.generate(prompt))
+
+    if isinstance(llm, GeminiLLM):
+        prompt = f"{system_prompt.strip()}\n\n{user_prompt.strip()}\n"
+        gemini_schema = _convert_json_schema_to_gemini(response_json_schema)
+        if stream:
+            text = await llm.agenerate_stream(
+                prompt,
+                response_schema=gemini_schema,
+                temperature=0.0,
+                on_event=section_validator(response_model, on_event),
+            )
+        else:
+            text = await llm.agenerate(prompt, response_schema=gemini_schema, temperature=0.0)
+        return _parse_json_model(text, response_model=response_model)
+
+    if isinstance(llm, OpenAILLM) and is_gpt5(llm.model):
+        prompt = f"{system_prompt.strip()}\n\n{user_prompt.strip()}\n"
+        if stream:
+            text = await llm.agenerate_stream(
+                prompt, temperature=0.0, on_event=section_validator(response_model, on_event)
+            )
+        else:
+            text = await llm.agenerate(prompt, temperature=0.0)
+        return _parse_json_model(text, response_model=response_model)
+
+    return await _aopenai_chat_json_schema(
+        base_url=llm.base_url,
+        api_key=llm.api_key,
+        model=llm.model,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        response_model=response_model,
+        json_schema=response_json_schema,
+        on_event=section_validator(response_model, on_event) if stream else None,
+    )
+
+
+def _streaming_enabled() -> bool:
+    return bool(get_infra_settings().llm_streaming)
+
+
 def _parse_json_model(text: str, *, response_model: type[TModel]) -> dict[str, Any]:
     cleaned = _strip_markdown_code_fences(text)
     if cleaned.strip() in {"", "null", "None"}:
@@ -243,7 +387,7 @@ def _strip_markdown_code_fences(text: str) -> str:
     return cleaned.strip()
 
 
-def _openai_chat_json_schema(
+def _openai_chat_request(
     *,
     base_url: str,
     api_key: str | None,
@@ -252,7 +396,7 @@ def _openai_chat_json_schema(
     user_prompt: str,
     response_model: type[TModel],
     json_schema: dict[str, Any],
-) -> dict[str, Any]:
+) -> tuple[str, dict[str, str], dict[str, Any], httpx.Timeout]:
     if not api_key:
         raise LLMError("OPENAI_API_KEY not configured")
 
@@ -287,40 +431,150 @@ def _openai_chat_json_schema(
 
     deadline_s = float(os.getenv("REGISTRY_LLM_TIMEOUT_S", "60").strip() or "60")
     deadline = httpx.Timeout(connect=10.0, read=deadline_s, write=30.0, pool=10.0)
+    return url, headers, payload, deadline
+
+
+def _flight_key(model: str, system_prompt: str, user_prompt: str, json_schema: dict[str, Any]) -> str:
+    return llm_cache_key(
+        task="registry_extraction",
+        model=model,
+        prompt=f"{system_prompt}\n\n{user_prompt}",
+        schema_version=schema_fingerprint(json_schema),
+    ).storage_key
+
 
+def _chat_json_schema_exchange(
+    payload: dict[str, Any],
+    *,
+    response_model: type[TModel],
+    collector: StreamCollector | None = None,
+) -> Exchange[dict[str, Any]]:
     last_error: Exception | None = None
-    with httpx.Client(timeout=deadline) as client:
-        for attempt in range(3):
-            try:
-                with llm_slot():
-                    resp = client.post(url, headers=headers, json=payload)
-                if resp.status_code < 400:
-                    data = resp.json()
-                    content = (data.get("choices") or [{}])[0].get("message", {}).get("content", "")
-                    return _parse_json_model(content, response_model=response_model)
-
-                if resp.status_code in {429} or 500 <= resp.status_code <= 599:
-                    retry_after = parse_retry_after_seconds(resp.headers)
-                    sleep_s = retry_after if retry_after is not None else backoff_seconds(attempt)
-                    # Best-effort backoff (no logging of PHI-bearing prompt).
-                    import time
-
-                    time.sleep(sleep_s)
-                    continue
-
-                msg = " ".join((resp.text or "").split())
-                raise LLMError(f"OpenAI chat error HTTP {resp.status_code}: {msg[:300]}")
-            except (httpx.TransportError, httpx.ReadTimeout) as exc:
-                last_error = exc
-                logger.warning("OpenAI chat transient error attempt=%s error=%s", attempt + 1, type(exc).__name__)
+    for attempt in range(3):
+        try:
+            if collector is None:
+                resp = yield Post(payload)
+            else:
+                collector.reset()
+                resp = yield Post(payload, stream=collector.feed_line)
+            if resp.status_code < 400 and collector is not None:
+                return _parse_json_model(collector.finish(), response_model=response_model)
+            if resp.status_code < 400:
+                data = resp.json()
+                content = (data.get("choices") or [{}])[0].get("message", {}).get("content", "")
+                return _parse_json_model(content, response_model=response_model)
+
+            if resp.status_code in {429} or 500 <= resp.status_code <= 599:
+                retry_after = parse_retry_after_seconds(resp.headers)
+                sleep_s = retry_after if retry_after is not None else backoff_seconds(attempt)
+                # Best-effort backoff (no logging of PHI-bearing prompt).
+                yield Sleep(sleep_s)
                 continue
-            except Exception as exc:  # noqa: BLE001
-                last_error = exc
-                break
+
+            msg = " ".join((resp.text or "").split())
+            raise LLMError(f"OpenAI chat error HTTP {resp.status_code}: {msg[:300]}")
+        except (httpx.TransportError, httpx.ReadTimeout) as exc:
+            last_error = exc
+            logger.warning("OpenAI chat transient error attempt=%s error=%s", attempt + 1, type(exc).__name__)
+            continue
+        except StreamAbortedError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            last_error = exc
+            break
 
     raise LLMError(f"OpenAI chat failed after retries: {type(last_error).__name__ if last_error else 'unknown'}")
 
 
+def _openai_chat_json_schema(
+    *,
+    base_url: str,
+    api_key: str | None,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    response_model: type[TModel],
+    json_schema: dict[str, Any],
+    on_event: EventHandler | None = None,
+) -> dict[str, Any]:
+    url, headers, payload, deadline = _openai_chat_request(
+        base_url=base_url,
+        api_key=api_key,
+        model=model,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        response_model=response_model,
+        json_schema=json_schema,
+    )
+    if on_event is not None:
+        # Streamed: every caller needs its own events, so no single-flight.
+        collector = StreamCollector(openai_chat_delta, on_event=on_event, provider="openai")
+        return run_exchange(
+            _chat_json_schema_exchange({**payload, "stream": True}, response_model=response_model, collector=collector),
+            client=get_http_client(url),
+            url=url,
+            headers=headers,
+            timeout=deadline,
+        )
+    result = get_single_flight().do(
+        _flight_key(model, system_prompt, user_prompt, json_schema),
+        lambda: run_exchange(
+            _chat_json_schema_exchange(payload, response_model=response_model),
+            client=get_http_client(url),
+            url=url,
+            headers=headers,
+            timeout=deadline,
+        ),
+        group="registry_extraction",
+    )
+    # Coalesced callers share the parsed dict; hand each one its own copy.
+    return copy.deepcopy(result)
+
+
+async def _aopenai_chat_json_schema(
+    *,
+    base_url: str,
+    api_key: str | None,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    response_model: type[TModel],
+    json_schema: dict[str, Any],
+    on_event: EventHandler | None = None,
+) -> dict[str, Any]:
+    url, headers, payload, deadline = _openai_chat_request(
+        base_url=base_url,
+        api_key=api_key,
+        model=model,
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        response_model=response_model,
+        json_schema=json_schema,
+    )
+    if on_event is not None:
+        # Streamed: every caller needs its own events, so no single-flight.
+        collector = StreamCollector(openai_chat_delta, on_event=on_event, provider="openai")
+        return await arun_exchange(
+            _chat_json_schema_exchange({**payload, "stream": True}, response_model=response_model, collector=collector),
+            client=get_async_http_client(url),
+            url=url,
+            headers=headers,
+            timeout=deadline,
+        )
+    result = await get_single_flight().ado(
+        _flight_key(model, system_prompt, user_prompt, json_schema),
+        lambda: arun_exchange(
+            _chat_json_schema_exchange(payload, response_model=response_model),
+            client=get_async_http_client(url),
+            url=url,
+            headers=headers,
+            timeout=deadline,
+        ),
+        group="registry_extraction",
+    )
+    return copy.deepcopy(result)
+
+
 def _convert_json_schema_to_gemini(json_schema: dict[str, Any]) -> dict[str, Any]:
     defs = json_schema.get("$defs", json_schema.get("definitions", {}))
 
@@ -389,4 +643,4 @@ def _convert_json_schema_to_gemini(json_schema: dict[str, Any]) -> dict[str, Any
     return gemini_schema
 
 
-__all__ = ["extract_v3_draft"]
+__all__ = ["aextract_v3_draft", "arepair_v3_evidence_quotes", "extract_v3_draft", "repair_v3_evidence_quotes"]
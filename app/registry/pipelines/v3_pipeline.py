@@ -1,33 +1,114 @@
 from __future__ import annotations
 
+import asyncio
 import os
+from typing import Any, Awaitable, Callable
 
 from app.registry.schema.ip_v3_extraction import IPRegistryV3
 
+# Runs a blocking callable off the event loop, e.g. ``functools.partial(run_cpu, app)``.
+CpuRunner = Callable[..., Awaitable[Any]]
 
-def run_v3_extraction(note_text: str) -> IPRegistryV3:
+
+def _prepare_v3_prompt(note_text: str, meta: dict[str, Any] | None = None) -> tuple[str, dict[str, Any]]:
+    """CPU stage: procedure focus + token budget + deterministic anchors for the prompt."""
     from app.registry.processing.focus import get_procedure_focus
-    from app.registry.extractors.v3_extractor import extract_v3_draft, repair_v3_evidence_quotes
+    from app.registry.processing.prompt_budget import budget_note_text
     from app.registry.deterministic.anatomy import (
         extract_deterministic_anatomy,
         extract_volume_anchors,
         to_prompt_payload,
     )
-    from app.registry.evidence.verifier import verify_registry
 
     focused = get_procedure_focus(note_text)
+    # Anchors come from the full focused text, so pruned sections still inform them.
     prompt_context = to_prompt_payload(
         anatomy=extract_deterministic_anatomy(focused),
         volumes=extract_volume_anchors(focused),
     )
-    draft = extract_v3_draft(focused, prompt_context=prompt_context)
-    final = verify_registry(draft, note_text)
+    focused, budget_meta = budget_note_text(focused, task="registry_extraction")
+    if meta is not None:
+        meta.setdefault("prompt_budget", {})["registry_extraction"] = budget_meta
+    return focused, prompt_context
+
+
+def _repair_note_text(note_text: str, meta: dict[str, Any] | None) -> str:
+    from app.registry.processing.prompt_budget import budget_note_text
+
+    budgeted, budget_meta = budget_note_text(note_text, task="quote_repair")
+    if meta is not None:
+        meta.setdefault("prompt_budget", {})["quote_repair"] = budget_meta
+    return budgeted
+
+
+def _quote_repair_enabled() -> bool:
+    return os.getenv("REGISTRY_V3_QUOTE_REPAIR_ENABLED", "1").strip().lower() in ("1", "true", "yes")
+
+
+def _quote_repair_allowed(meta: dict[str, Any] | None) -> bool:
+    """Quote repair is enabled and the request deadline leaves time for another LLM call."""
+    if not _quote_repair_enabled():
+        return False
+    from app.infra.deadline import budget_skip_warning
+
+    warning = budget_skip_warning("v3_quote_repair")
+    if warning and meta is not None:
+        meta.setdefault("warnings", []).append(warning)
+    return warning is None
+
+
+def _streaming_enabled() -> bool:
+    from app.infra.settings import get_infra_settings
+
+    return bool(get_infra_settings().llm_streaming)
+
+
+def _event_quote(event: Any) -> str | None:
+    """Stripped evidence quote of a streamed ``("procedures", i)`` event, if any."""
+    if len(event.path) != 2 or event.path[0] != "procedures" or not isinstance(event.value, dict):
+        return None
+    evidence = event.value.get("evidence")
+    quote = evidence.get("quote") if isinstance(evidence, dict) else None
+    return str(quote or "").strip() or None
+
+
+def _safe_anchor(note_text: str, quote: str) -> Any:
+    from app.evidence.quote_anchor import anchor_quote
+
+    try:
+        return anchor_quote(note_text, quote)
+    except Exception:
+        return None  # verify_registry anchors it again
+
+
+def run_v3_extraction(note_text: str, *, meta: dict[str, Any] | None = None) -> IPRegistryV3:
+    """Draft, verify and (optionally) quote-repair the V3 event log for ``note_text``.
 
-    repair_enabled = os.getenv("REGISTRY_V3_QUOTE_REPAIR_ENABLED", "1").strip().lower() in ("1", "true", "yes")
-    if repair_enabled and len(final.procedures) < len(draft.procedures):
+    ``meta``, when given, receives the prompt token-budget reports
+    (``meta["prompt_budget"][task]``). With ``LLM_STREAMING`` on, evidence
+    quotes are anchored as each procedure arrives rather than after the draft.
+    """
+    from app.registry.extractors.v3_extractor import extract_v3_draft, repair_v3_evidence_quotes
+    from app.registry.evidence.verifier import verify_registry
+
+    focused, prompt_context = _prepare_v3_prompt(note_text, meta)
+    anchors: dict[str, Any] = {}
+    on_event = None
+    if _streaming_enabled():
+        # Anchor each procedure's quote as soon as it streams in, while the
+        # model is still generating the rest of the event log.
+        def on_event(event: Any) -> None:
+            quote = _event_quote(event)
+            if quote and quote not in anchors:
+                anchors[quote] = _safe_anchor(note_text, quote)
+
+    draft = extract_v3_draft(focused, prompt_context=prompt_context, on_event=on_event)
+    final = verify_registry(draft, note_text, anchors)
+
+    if len(final.procedures) < len(draft.procedures) and _quote_repair_allowed(meta):
         try:
-            repaired = repair_v3_evidence_quotes(draft, note_text=note_text)
-            repaired_final = verify_registry(repaired, note_text)
+            repaired = repair_v3_evidence_quotes(draft, note_text=_repair_note_text(note_text, meta))
+            repaired_final = verify_registry(repaired, note_text, anchors)
             if len(repaired_final.procedures) >= len(final.procedures):
                 return repaired_final
         except Exception:
@@ -37,4 +118,51 @@ def run_v3_extraction(note_text: str) -> IPRegistryV3:
     return final
 
 
-__all__ = ["run_v3_extraction"]
+async def arun_v3_extraction(
+    note_text: str,
+    *,
+    run_cpu: CpuRunner,
+    meta: dict[str, Any] | None = None,
+) -> IPRegistryV3:
+    """Async ``run_v3_extraction``.
+
+    LLM calls (draft, optional quote repair) are awaited on the event loop;
+    focus/anchor preparation and evidence verification go through ``run_cpu``.
+    """
+    from app.registry.extractors.v3_extractor import aextract_v3_draft, arepair_v3_evidence_quotes
+    from app.registry.evidence.verifier import verify_registry
+
+    focused, prompt_context = await run_cpu(_prepare_v3_prompt, note_text, meta)
+    pending: dict[str, asyncio.Future[Any]] = {}
+    on_event = None
+    if _streaming_enabled():
+
+        def on_event(event: Any) -> None:
+            quote = _event_quote(event)
+            if quote and quote not in pending:
+                pending[quote] = asyncio.ensure_future(run_cpu(_safe_anchor, note_text, quote))
+
+    try:
+        draft = await aextract_v3_draft(focused, prompt_context=prompt_context, on_event=on_event)
+    except BaseException:
+        for future in pending.values():
+            future.cancel()
+        raise
+    results = await asyncio.gather(*pending.values()) if pending else []
+    anchors = dict(zip(pending, results))
+    final = await run_cpu(verify_registry, draft, note_text, anchors)
+
+    if len(final.procedures) < len(draft.procedures) and _quote_repair_allowed(meta):
+        try:
+            repair_text = await run_cpu(_repair_note_text, note_text, meta)
+            repaired = await arepair_v3_evidence_quotes(draft, note_text=repair_text)
+            repaired_final = await run_cpu(verify_registry, repaired, note_text, anchors)
+            if len(repaired_final.procedures) >= len(final.procedures):
+                return repaired_final
+        except Exception:
+            pass
+
+    return final
+
+
+__all__ = ["CpuRunner", "arun_v3_extraction", "run_v3_extraction"]
@@ -0,0 +1,280 @@
+"""Token-budgeted note text for LLM prompts.
+
+Long OCR notes and pasted pathology/imaging blocks otherwise go into the
+structurer, quote-repair and judge prompts in full. ``budget_note_text`` splits
+the note at its headings, ranks the sections for the task (procedure detail
+first, pasted data and boilerplate last), keeps as many as fit in the task's
+token budget, and re-joins the kept sections in their original order. Kept
+sections are verbatim slices of the input, so evidence quotes stay verifiable
+against the full note.
+
+Budgeting is off unless ``PROMPT_BUDGET_ENABLED=1``; until
+``ops/tools/eval_prompt_budget.py --run-extraction`` shows accuracy parity
+against a live LLM it stays opt-in. Budgets are per task
+(``PROMPT_TOKEN_BUDGET_<TASK>``; ``0`` disables). Tokens are counted
+with ``tiktoken`` when it is installed and a local estimate otherwise.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable
+
+from app.registry.processing.focus import _canonical_heading
+
+DEFAULT_TOKEN_BUDGETS: dict[str, int] = {
+    "registry_extraction": 6000,
+    "quote_repair": 8000,
+    "judge": 4000,
+}
+
+# Lower tier = kept first. Matched against the canonical heading, first hit wins.
+_TIERS: tuple[tuple[int, tuple[str, ...]], ...] = (
+    (
+        3,
+        (
+            "PATHOLOGY",
+            "CYTOLOGY",
+            "RADIOLOGY",
+            "IMAGING",
+            "CT CHEST",
+            "PET",
+            "LAB",
+            "MEDICATION",
+            "ALLERG",
+            "VITAL",
+            "REVIEW OF SYSTEMS",
+            "PHYSICAL EXAM",
+            "SOCIAL HISTORY",
+            "FAMILY HISTORY",
+            "CONSENT",
+            "ATTESTATION",
+            "SIGNED",
+            "SIGNATURE",
+            "DISCLAIMER",
+            "CC",
+        ),
+    ),
+    (
+        0,
+        (
+            "PROCEDURE",
+            "DESCRIPTION",
+            "TECHNIQUE",
+            "FINDINGS",
+            "AIRWAY INSPECTION",
+            "EBUS",
+            "LYMPH NODE",
+            "OPERATIVE",
+            "NAVIGATION",
+            "STENT",
+            "DILATION",
+            "PLEURA",
+            "BLVR",
+        ),
+    ),
+    (
+        1,
+        (
+            "COMPLICATION",
+            "SPECIMEN",
+            "SEDATION",
+            "ANESTHESIA",
+            "ESTIMATED BLOOD LOSS",
+            "EBL",
+            "IMPRESSION",
+            "INSTRUMENT",
+            "MONITORING",
+            "DISPOSITION",
+        ),
+    ),
+)
+_DEFAULT_TIER = 2  # indication/history/plan and unrecognized headings
+_OTHER_HEADINGS: tuple[str, ...] = (
+    "INDICATION",
+    "HISTORY",
+    "HPI",
+    "DIAGNOSIS",
+    "ASSESSMENT",
+    "PLAN",
+    "RECOMMENDATION",
+    "ATTENDING",
+    "ASSISTANT",
+    "REFERRING",
+)
+
+_HEADING_RE = re.compile(r"^[ \t]*(?P<header>[A-Za-z][A-Za-z0-9 /()&_-]{0,80}?)[ \t]*:", re.MULTILINE)
+_BLOCK_TAG_RE = re.compile(r"^[ \t]*</?(?:primary_narrative|supporting_data)>[ \t]*$", re.MULTILINE)
+_TOKEN_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+
+@dataclass(frozen=True)
+class NoteSection:
+    title: str
+    text: str
+    start: int
+    tier: int
+    tokens: int
+
+
+def _heuristic_token_count(text: str) -> int:
+    """~BPE estimate: a token per punctuation mark and per 4 characters of a word."""
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _TOKEN_PIECE_RE.findall(text))
+
+
+@lru_cache(maxsize=1)
+def _token_counter() -> tuple[str, Callable[[str], int]]:
+    mode = os.getenv("PROMPT_BUDGET_TOKENIZER", "auto").strip().lower()
+    if mode != "heuristic":
+        try:  # optional dependency
+            import tiktoken  # type: ignore
+
+            encoding = tiktoken.get_encoding("o200k_base")
+            return "tiktoken:o200k_base", lambda text: len(encoding.encode(text, disallowed_special=()))
+        except Exception:
+            pass
+    return "heuristic", _heuristic_token_count
+
+
+def count_tokens(text: str) -> int:
+    """Estimated prompt tokens for ``text``."""
+    return _token_counter()[1](text or "")
+
+
+def token_budget(task: str) -> int:
+    """Note-text token budget for ``task`` (``0`` = unbounded)."""
+    if os.getenv("PROMPT_BUDGET_ENABLED", "0").strip().lower() not in ("1", "true", "yes"):
+        return 0
+    raw = os.getenv(f"PROMPT_TOKEN_BUDGET_{task.upper()}", "").strip()
+    if raw:
+        try:
+            return max(0, int(raw))
+        except ValueError:
+            pass
+    return DEFAULT_TOKEN_BUDGETS.get(task, 0)
+
+
+def _matches(heading: str, keywords: tuple[str, ...]) -> bool:
+    return any(re.search(rf"\b{re.escape(keyword)}", heading) for keyword in keywords)
+
+
+def _section_tier(title: str) -> int:
+    heading = _canonical_heading(title)
+    for tier, keywords in _TIERS:
+        if heading and _matches(heading, keywords):
+            return tier
+    return _DEFAULT_TIER
+
+
+def _is_heading(title: str) -> bool:
+    """ALL-CAPS labels or known section names; not "Station 4R:"-style inline labels."""
+    if title.isupper():
+        return True
+    heading = _canonical_heading(title)
+    return _section_tier(title) != _DEFAULT_TIER or _matches(heading, _OTHER_HEADINGS)
+
+
+def split_note_sections(text: str) -> list[NoteSection]:
+    """Split ``text`` at line-leading headings and ``<primary_narrative>``-style tags."""
+    boundaries: list[tuple[int, str]] = [(0, "")]
+    for match in _HEADING_RE.finditer(text):
+        if _is_heading(match.group("header")):
+            boundaries.append((match.start(), match.group("header")))
+    for match in _BLOCK_TAG_RE.finditer(text):
+        boundaries.append((match.start(), "<tag>"))
+    boundaries.sort(key=lambda item: item[0])
+
+    sections: list[NoteSection] = []
+    for idx, (start, title) in enumerate(boundaries):
+        end = boundaries[idx + 1][0] if idx + 1 < len(boundaries) else len(text)
+        chunk = text[start:end]
+        if not chunk.strip():
+            continue
+        if title == "<tag>":
+            # A block tag is structure, not content: keep it on its own at no cost.
+            tag_end = text.find("\n", start) + 1
+            tag_end = end if tag_end <= 0 or tag_end > end else tag_end
+            sections.append(NoteSection(title="<tag>", text=text[start:tag_end], start=start, tier=-1, tokens=0))
+            rest = text[tag_end:end]
+            if rest.strip():
+                sections.append(
+                    NoteSection(title="", text=rest, start=tag_end, tier=_DEFAULT_TIER, tokens=count_tokens(rest))
+                )
+            continue
+        sections.append(
+            NoteSection(title=title, text=chunk, start=start, tier=_section_tier(title), tokens=count_tokens(chunk))
+        )
+    return sections
+
+
+def _truncate_to_budget(text: str, budget: int) -> str:
+    """Longest line-aligned prefix of ``text`` within ``budget`` tokens."""
+    kept: list[str] = []
+    used = 0
+    for line in text.splitlines(keepends=True):
+        cost = count_tokens(line)
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "".join(kept)
+
+
+def budget_note_text(text: str, *, task: str, budget: int | None = None) -> tuple[str, dict[str, Any]]:
+    """Return ``(text, meta)`` with ``text`` pruned to the task's token budget.
+
+    ``meta`` records the tokenizer, budget, token counts before/after and the
+    dropped sections (title, tier, tokens) so callers can surface what the
+    LLM did not see.
+    """
+    text = text or ""
+    limit = token_budget(task) if budget is None else max(0, budget)
+    tokens_before = count_tokens(text)
+    meta: dict[str, Any] = {
+        "task": task,
+        "tokenizer": _token_counter()[0],
+        "budget_tokens": limit,
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_before,
+        "dropped_sections": [],
+        "truncated": False,
+    }
+    if not limit or tokens_before <= limit:
+        return text, meta
+
+    sections = split_note_sections(text)
+    ranked = sorted(range(len(sections)), key=lambda i: (sections[i].tier, sections[i].start))
+    keep: dict[int, str] = {}
+    used = 0
+    for idx in ranked:
+        section = sections[idx]
+        if used + section.tokens <= limit:
+            keep[idx] = section.text
+            used += section.tokens
+        elif used == 0 and section.tier <= 0:
+            # The most relevant section alone exceeds the budget: keep its head.
+            keep[idx] = _truncate_to_budget(section.text, limit)
+            used = count_tokens(keep[idx])
+            meta["truncated"] = True
+        else:
+            meta["dropped_sections"].append(
+                {"title": section.title or "(untitled)", "tier": section.tier, "tokens": section.tokens}
+            )
+
+    budgeted = "".join(keep[idx] for idx in sorted(keep)).strip()
+    meta["tokens_after"] = count_tokens(budgeted)
+    return budgeted, meta
+
+
+__all__ = [
+    "DEFAULT_TOKEN_BUDGETS",
+    "NoteSection",
+    "budget_note_text",
+    "count_tokens",
+    "split_note_sections",
+    "token_budget",
+]
@@ -7,6 +7,7 @@ from typing import Any
 from pydantic import BaseModel
 
 from app.common.llm import LLMService
+from app.registry.processing.prompt_budget import budget_note_text
 from app.registry.schema import RegistryRecord
 
 
@@ -64,6 +65,7 @@ If no correction is needed, return null.
 class RegistryCorrectionJudge:
     def __init__(self, llm: LLMService | None = None) -> None:
         self.llm = llm or LLMService(task="judge")
+        self.last_prompt_budget: dict[str, Any] | None = None
 
     def propose_correction(
         self,
@@ -75,9 +77,12 @@ class RegistryCorrectionJudge:
     ) -> PatchProposal | None:
         """Ask LLM if the discrepancy warrants a correction.
 
-        Returns a PatchProposal if a fix is high-confidence, else None.
+        Returns a PatchProposal if a fix is high-confidence, else None. The raw
+        note is pruned to the ``judge`` token budget; the report of the last
+        call is kept in ``last_prompt_budget``.
         """
         system_prompt = JUDGE_SYSTEM_PROMPT
+        note_text, self.last_prompt_budget = budget_note_text(note_text, task="judge")
 
         focused_section = ""
         if focused_procedure_text is not None and focused_procedure_text.strip():
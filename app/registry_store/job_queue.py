@@ -0,0 +1,293 @@
+"""Durable job queue for `/v1/jobs`, stored in the registry store DB (SQLite or Postgres).
+
+Each ``ProcessJob`` row moves ``queued -> running -> succeeded | failed |
+cancelled``. Workers coordinate through the rows alone:
+
+- ``claim`` leases one job with a compare-and-set ``UPDATE`` (only one worker
+  can win a row) and sets ``lease_expires_at`` to now + visibility timeout.
+- The worker ``heartbeat``s to extend the lease and save progress. A worker
+  that dies stops heartbeating, its lease runs out, and the job is claimed
+  again. On the final attempt it is failed instead.
+- ``fail`` requeues retryable errors with exponential backoff until
+  ``max_attempts`` is used up.
+- Finished jobs keep their result until ``expires_at`` (result TTL), then
+  ``purge_expired`` deletes them.
+
+Every write is guarded by ``lease_owner``, so a worker that lost its lease
+(or whose job was cancelled) can never overwrite the row.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import Engine, and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.infra.settings import get_infra_settings
+from app.registry_store.dependencies import get_registry_store_engine
+from app.registry_store.models import ProcessJob
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({"succeeded", "failed", "cancelled"})
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: uuid.UUID
+    attempt: int
+    request: dict[str, Any]
+    progress: list[dict[str, Any]] = field(default_factory=list)
+
+
+class JobQueue:
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        visibility_timeout_s: float = 300.0,
+        max_attempts: int = 3,
+        result_ttl_s: float = 86400.0,
+        retry_backoff_s: float = 5.0,
+    ) -> None:
+        self.engine = engine
+        self.visibility_timeout_s = max(1.0, float(visibility_timeout_s))
+        self.max_attempts = max(1, int(max_attempts))
+        self.result_ttl_s = max(0.0, float(result_ttl_s))
+        self.retry_backoff_s = max(0.0, float(retry_backoff_s))
+        self._sessions = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    def _session(self) -> Session:
+        return self._sessions()
+
+    def ensure_table(self) -> None:
+        ProcessJob.__table__.create(bind=self.engine, checkfirst=True)
+
+    def enqueue(self, request: dict[str, Any], *, note_sha256: str, kind: str = "process") -> ProcessJob:
+        now = _utcnow()
+        job = ProcessJob(
+            id=uuid.uuid4(),
+            created_at=now,
+            updated_at=now,
+            status="queued",
+            kind=kind,
+            request_json=request,
+            note_sha256=note_sha256,
+            attempts=0,
+            max_attempts=self.max_attempts,
+            available_at=now,
+            progress_json=[{"event": "queued", "at": now.isoformat()}],
+        )
+        with self._session() as db:
+            db.add(job)
+            db.commit()
+        return job
+
+    def get(self, job_id: uuid.UUID) -> ProcessJob | None:
+        with self._session() as db:
+            return db.get(ProcessJob, job_id)
+
+    def depth(self) -> int:
+        """Jobs waiting for a worker."""
+        with self._session() as db:
+            return int(db.scalar(select(func.count()).select_from(ProcessJob).where(ProcessJob.status == "queued")))
+
+    def claim(self, worker_id: str) -> ClaimedJob | None:
+        """Lease the oldest available job, or return ``None`` when there is none."""
+        now = _utcnow()
+        expired = and_(ProcessJob.status == "running", ProcessJob.lease_expires_at < now)
+        with self._session() as db:
+            # A lease that ran out on the last allowed attempt fails the job instead of redelivering it.
+            db.execute(
+                update(ProcessJob)
+                .where(expired, ProcessJob.attempts >= ProcessJob.max_attempts)
+                .values(
+                    status="failed",
+                    error="Visibility timeout expired on the final attempt",
+                    status_code=504,
+                    lease_owner=None,
+                    finished_at=now,
+                    expires_at=now + timedelta(seconds=self.result_ttl_s),
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            claimable = or_(and_(ProcessJob.status == "queued", ProcessJob.available_at <= now), expired)
+            candidates = db.scalars(
+                select(ProcessJob.id).where(claimable).order_by(ProcessJob.created_at).limit(8)
+            ).all()
+            for job_id in candidates:
+                won = db.execute(
+                    update(ProcessJob)
+                    .where(ProcessJob.id == job_id, claimable)
+                    .values(
+                        status="running",
+                        lease_owner=worker_id,
+                        lease_expires_at=now + timedelta(seconds=self.visibility_timeout_s),
+                        attempts=ProcessJob.attempts + 1,
+                        started_at=func.coalesce(ProcessJob.started_at, now),
+                        updated_at=now,
+                    )
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                if won == 1:
+                    db.commit()
+                    job = db.get(ProcessJob, job_id)
+                    assert job is not None
+                    return ClaimedJob(
+                        id=job.id,
+                        attempt=int(job.attempts),
+                        request=dict(job.request_json or {}),
+                        progress=list(job.progress_json or []),
+                    )
+            db.commit()
+        return None
+
+    def _owned_update(self, job_id: uuid.UUID, worker_id: str, **values: Any) -> bool:
+        values.setdefault("updated_at", _utcnow())
+        with self._session() as db:
+            changed = db.execute(
+                update(ProcessJob)
+                .where(
+                    ProcessJob.id == job_id,
+                    ProcessJob.status == "running",
+                    ProcessJob.lease_owner == worker_id,
+                )
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+        return changed == 1
+
+    def heartbeat(
+        self, job_id: uuid.UUID, worker_id: str, *, progress: list[dict[str, Any]] | None = None
+    ) -> bool:
+        """Extend the lease (and save progress); ``False`` means the worker must stop."""
+        values: dict[str, Any] = {
+            "lease_expires_at": _utcnow() + timedelta(seconds=self.visibility_timeout_s)
+        }
+        if progress is not None:
+            values["progress_json"] = progress
+        return self._owned_update(job_id, worker_id, **values)
+
+    def complete(
+        self,
+        job_id: uuid.UUID,
+        worker_id: str,
+        *,
+        result: dict[str, Any],
+        processing_time_ms: float,
+        progress: list[dict[str, Any]],
+    ) -> bool:
+        now = _utcnow()
+        return self._owned_update(
+            job_id,
+            worker_id,
+            status="succeeded",
+            result_json=result,
+            status_code=200,
+            error=None,
+            processing_time_ms=processing_time_ms,
+            progress_json=progress,
+            lease_owner=None,
+            finished_at=now,
+            expires_at=now + timedelta(seconds=self.result_ttl_s),
+        )
+
+    def fail(
+        self,
+        job_id: uuid.UUID,
+        worker_id: str,
+        *,
+        attempt: int,
+        error: str,
+        status_code: int,
+        retryable: bool,
+        progress: list[dict[str, Any]],
+    ) -> str:
+        """Requeue with backoff if retryable and attempts remain, else fail; returns the new status."""
+        now = _utcnow()
+        with self._session() as db:
+            job = db.get(ProcessJob, job_id)
+            max_attempts = int(job.max_attempts) if job is not None else self.max_attempts
+        if retryable and attempt < max_attempts:
+            delay = min(300.0, self.retry_backoff_s * (2 ** max(0, attempt - 1)))
+            moved = self._owned_update(
+                job_id,
+                worker_id,
+                status="queued",
+                error=error,
+                status_code=status_code,
+                progress_json=progress,
+                lease_owner=None,
+                lease_expires_at=None,
+                available_at=now + timedelta(seconds=delay),
+            )
+            return "queued" if moved else "lost"
+        moved = self._owned_update(
+            job_id,
+            worker_id,
+            status="failed",
+            error=error,
+            status_code=status_code,
+            progress_json=progress,
+            lease_owner=None,
+            finished_at=now,
+            expires_at=now + timedelta(seconds=self.result_ttl_s),
+        )
+        return "failed" if moved else "lost"
+
+    def cancel(self, job_id: uuid.UUID) -> ProcessJob | None:
+        """Cancel a job that has not finished; a running worker notices on its next heartbeat."""
+        now = _utcnow()
+        with self._session() as db:
+            db.execute(
+                update(ProcessJob)
+                .where(ProcessJob.id == job_id, ProcessJob.status.in_(["queued", "running"]))
+                .values(
+                    status="cancelled",
+                    lease_owner=None,
+                    finished_at=now,
+                    expires_at=now + timedelta(seconds=self.result_ttl_s),
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            return db.get(ProcessJob, job_id)
+
+    def purge_expired(self) -> int:
+        """Delete finished jobs whose result TTL has passed."""
+        with self._session() as db:
+            removed = db.execute(
+                delete(ProcessJob)
+                .where(ProcessJob.status.in_(list(TERMINAL_STATUSES)), ProcessJob.expires_at < _utcnow())
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+        if removed:
+            logger.info("Purged %d expired jobs", removed)
+        return int(removed or 0)
+
+
+def get_job_queue() -> JobQueue:
+    """A queue on the registry store DB, configured from the ``JOBS_*`` settings."""
+    settings = get_infra_settings()
+    return JobQueue(
+        get_registry_store_engine(),
+        visibility_timeout_s=settings.jobs_visibility_timeout_s,
+        max_attempts=settings.jobs_max_attempts,
+        result_ttl_s=settings.jobs_result_ttl_s,
+    )
+
+
+__all__ = ["ClaimedJob", "JobQueue", "TERMINAL_STATUSES", "get_job_queue"]
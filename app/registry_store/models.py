@@ -8,7 +8,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Float, Index, Integer, String, Text
 
 from app.phi.db import Base, JSONType, UUIDType
 
@@ -114,4 +114,39 @@ class RegistryCaseRecord(Base):
     )
 
 
-__all__ = ["RegistryRun", "RegistryAppendedDocument", "RegistryCaseRecord"]
+class ProcessJob(Base):
+    """One queued `/v1/jobs` extraction (see ``app.registry_store.job_queue``)."""
+
+    __tablename__ = "process_jobs"
+    __table_args__ = (Index("ix_process_jobs_status_available_at", "status", "available_at"),)
+
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
+    created_at = Column(DateTime(timezone=True), default=_utcnow, nullable=False, index=True)
+    updated_at = Column(DateTime(timezone=True), default=_utcnow, onupdate=_utcnow, nullable=False)
+
+    # queued -> running -> succeeded | failed | cancelled
+    status = Column(String(16), nullable=False, default="queued")
+    kind = Column(String(32), nullable=False, default="process")
+
+    # NOTE: MUST be scrubbed-only text (request_json carries the note).
+    request_json = Column(JSONType, nullable=False)
+    note_sha256 = Column(String(64), nullable=False, index=True)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    available_at = Column(DateTime(timezone=True), default=_utcnow, nullable=False)
+    lease_owner = Column(String(255), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+    progress_json = Column(JSONType, nullable=False, default=list)
+    result_json = Column(JSONType, nullable=True)
+    error = Column(Text, nullable=True)
+    status_code = Column(Integer, nullable=True)
+    processing_time_ms = Column(Float, nullable=True)
+
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
+
+
+__all__ = ["RegistryRun", "RegistryAppendedDocument", "RegistryCaseRecord", "ProcessJob"]
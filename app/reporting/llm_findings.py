@@ -28,6 +28,9 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from app.common.spans import Span, dedupe_spans
 from app.common.llm import OpenAILLM, _resolve_openai_model
+from app.infra.settings import get_infra_settings
+from app.llm.json_stream import section_validator
+from app.llm.streaming import StreamAbortedError
 from app.ner.inference import NEREntity, NERExtractionResult
 from app.ner.entity_types import normalize_lobe, normalize_station
 from app.registry.ner_mapping.entity_to_registry import NERToRegistryMapper
@@ -270,7 +273,14 @@ def _resolve_openai_llm() -> OpenAILLM:
 def extract_reporter_findings_v1(masked_prompt_text: str, *, llm: OpenAILLM | None = None) -> ReporterFindingsV1:
     llm = llm or _resolve_openai_llm()
     prompt = _build_findings_prompt(masked_prompt_text)
-    raw = llm.generate(prompt, task="structurer")
+    if get_infra_settings().llm_streaming and hasattr(llm, "generate_stream"):
+        # Streamed: a malformed finding fails the call as soon as it arrives.
+        try:
+            raw = llm.generate_stream(prompt, task="structurer", on_event=section_validator(ReporterFindingsV1))
+        except StreamAbortedError as exc:
+            raise ReporterFindingsParseError(f"LLM stream aborted: {exc}") from exc
+    else:
+        raw = llm.generate(prompt, task="structurer")
     cleaned = _strip_markdown_code_fences(raw)
     try:
         data = json.loads(cleaned)
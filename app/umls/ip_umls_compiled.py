@@ -0,0 +1,578 @@
+"""Compiled, memory-mapped representation of the distilled IP-UMLS map.
+
+The JSON map (``ip_umls_map.json``) is convenient to build and diff, but
+``json.load`` plus the strict/loose/sorted indexes in ``DistilledUmlsStore``
+cost every worker several seconds and tens of MB of private RSS. This module
+compiles the same indexes into one flat binary file that is opened with
+``mmap`` instead: startup is a header read, and the pages live in the OS page
+cache where all workers share them.
+
+File layout (all integers native-endian ``uint32``/``uint64``; every section
+is 8-byte aligned):
+
+- header: magic, format version, byte order, counts and a section table of
+  ``(offset, length)`` pairs
+- ``meta``: small JSON blob (``meta``, ``semtype_legend``, category names,
+  source fingerprint)
+- strict/loose term tables: sorted UTF-8 terms (offsets + blob) with CUI-id
+  postings (offsets + ids), in the same order ``DistilledUmlsStore`` builds
+- CUI table: sorted CUI strings (offsets + blob)
+- category bitsets: one ``uint32`` per CUI (bit ``i`` = ``categories[i]``)
+- concepts: one compact JSON document per CUI, decoded on demand
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, Sequence
+
+from filelock import FileLock
+
+_logger = logging.getLogger(__name__)
+
+MAGIC = b"IPUMLSC\x00"
+FORMAT_VERSION = 1
+COMPILED_SUFFIX = ".umlsbin"
+
+# Section order in the header table. Appending is backwards compatible only
+# together with a FORMAT_VERSION bump.
+_SECTIONS = (
+    "meta",
+    "strict_term_offsets",
+    "strict_term_blob",
+    "strict_posting_offsets",
+    "strict_postings",
+    "loose_term_offsets",
+    "loose_term_blob",
+    "loose_posting_offsets",
+    "loose_postings",
+    "cui_offsets",
+    "cui_blob",
+    "category_bits",
+    "concept_offsets",
+    "concept_blob",
+)
+
+# magic, version, byteorder flag, n_strict, n_loose, n_cuis, n_categories
+_HEADER_FMT = "=8sIIIIII"
+_SECTION_FMT = "=QQ"
+_HEADER_SIZE = struct.calcsize(_HEADER_FMT) + struct.calcsize(_SECTION_FMT) * len(_SECTIONS)
+_BYTEORDER_LITTLE = 1
+_BYTEORDER_BIG = 2
+_MAX_CATEGORIES = 32
+
+
+def _native_byteorder_flag() -> int:
+    return _BYTEORDER_LITTLE if sys.byteorder == "little" else _BYTEORDER_BIG
+
+
+def _align(value: int, boundary: int = 8) -> int:
+    return (value + boundary - 1) // boundary * boundary
+
+
+def _string_table(values: Sequence[str]) -> tuple[bytes, bytes]:
+    offsets = array("I", [0])
+    blob = bytearray()
+    for value in values:
+        blob.extend(value.encode("utf-8"))
+        offsets.append(len(blob))
+    return offsets.tobytes(), bytes(blob)
+
+
+def _postings_table(postings: Sequence[Sequence[int]]) -> tuple[bytes, bytes]:
+    offsets = array("I", [0])
+    ids = array("I")
+    for entry in postings:
+        ids.extend(entry)
+        offsets.append(len(ids))
+    return offsets.tobytes(), ids.tobytes()
+
+
+def source_fingerprint(path: Path) -> str:
+    """Cheap identity of a JSON source file (path, size, mtime) without reading it."""
+    resolved = path.resolve()
+    stat = resolved.stat()
+    raw = f"{resolved}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def compile_ip_umls_payload(payload: dict[str, Any], *, source_sha256: str | None = None) -> bytes:
+    """Compile a distilled UMLS JSON payload into the binary format.
+
+    Index construction is delegated to ``DistilledUmlsStore`` so that strict
+    and loose term normalization, CUI ordering and de-duplication stay
+    byte-for-byte identical between the JSON and compiled backends.
+    """
+    from app.umls.ip_umls_store import DistilledUmlsStore
+
+    store = DistilledUmlsStore(payload)
+
+    cuis = sorted(store.concepts.keys())
+    cui_ids = {cui: idx for idx, cui in enumerate(cuis)}
+
+    category_names: list[str] = []
+    for cui in cuis:
+        categories = store.concepts[cui].get("categories", []) or []
+        if not isinstance(categories, list):
+            continue
+        for category in categories:
+            name = str(category)
+            if name and name not in category_names:
+                category_names.append(name)
+    category_names.sort()
+    if len(category_names) > _MAX_CATEGORIES:
+        raise ValueError(
+            f"Compiled UMLS format supports at most {_MAX_CATEGORIES} categories, got {len(category_names)}"
+        )
+    category_bit = {name: 1 << idx for idx, name in enumerate(category_names)}
+
+    category_bits = array("I")
+    concept_docs: list[str] = []
+    for cui in cuis:
+        concept = store.concepts[cui]
+        bits = 0
+        categories = concept.get("categories", []) or []
+        if isinstance(categories, list):
+            for category in categories:
+                bits |= category_bit.get(str(category), 0)
+        category_bits.append(bits)
+        concept_docs.append(json.dumps(concept, ensure_ascii=False, separators=(",", ":")))
+
+    def _term_sections(index: dict[str, list[str]]) -> tuple[bytes, bytes, bytes, bytes]:
+        terms = sorted(index.keys())
+        postings = [[cui_ids[cui] for cui in index[term] if cui in cui_ids] for term in terms]
+        term_offsets, term_blob = _string_table(terms)
+        posting_offsets, posting_ids = _postings_table(postings)
+        return term_offsets, term_blob, posting_offsets, posting_ids
+
+    strict_sections = _term_sections(store.term_index_strict)
+    loose_sections = _term_sections(store.term_index_loose)
+    cui_offsets, cui_blob = _string_table(cuis)
+    concept_offsets, concept_blob = _string_table(concept_docs)
+
+    meta_doc = {
+        "meta": store.meta,
+        "semtype_legend": store.semtype_legend,
+        "categories": category_names,
+        "source_sha256": source_sha256,
+    }
+    meta_blob = json.dumps(meta_doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    sections: dict[str, bytes] = {
+        "meta": meta_blob,
+        "strict_term_offsets": strict_sections[0],
+        "strict_term_blob": strict_sections[1],
+        "strict_posting_offsets": strict_sections[2],
+        "strict_postings": strict_sections[3],
+        "loose_term_offsets": loose_sections[0],
+        "loose_term_blob": loose_sections[1],
+        "loose_posting_offsets": loose_sections[2],
+        "loose_postings": loose_sections[3],
+        "cui_offsets": cui_offsets,
+        "cui_blob": cui_blob,
+        "category_bits": category_bits.tobytes(),
+        "concept_offsets": concept_offsets,
+        "concept_blob": concept_blob,
+    }
+
+    body = bytearray()
+    table: list[tuple[int, int]] = []
+    cursor = _align(_HEADER_SIZE)
+    for name in _SECTIONS:
+        data = sections[name]
+        start = _align(cursor)
+        body.extend(b"\x00" * (start - cursor))
+        body.extend(data)
+        table.append((start, len(data)))
+        cursor = start + len(data)
+
+    header = struct.pack(
+        _HEADER_FMT,
+        MAGIC,
+        FORMAT_VERSION,
+        _native_byteorder_flag(),
+        len(store.term_index_strict),
+        len(store.term_index_loose),
+        len(cuis),
+        len(category_names),
+    )
+    for offset, length in table:
+        header += struct.pack(_SECTION_FMT, offset, length)
+    header += b"\x00" * (_align(_HEADER_SIZE) - len(header))
+    return bytes(header) + bytes(body)
+
+
+def write_compiled_ip_umls_map(json_path: Path, dest_path: Path) -> Path:
+    """Compile ``json_path`` into ``dest_path`` atomically (tmp file + rename)."""
+    raw = json_path.read_bytes()
+    payload = json.loads(raw.decode("utf-8"))
+    if not isinstance(payload, dict):
+        raise ValueError(f"UMLS map payload must be a JSON object: {json_path}")
+    compiled = compile_ip_umls_payload(payload, source_sha256=hashlib.sha256(raw).hexdigest())
+
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{dest_path.name}.",
+        suffix=".tmp",
+        dir=str(dest_path.parent),
+    )
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(compiled)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, dest_path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return dest_path
+
+
+class _StringTable:
+    """Random access into an (offsets, blob) pair of mmap'd sections."""
+
+    __slots__ = ("_offsets", "_blob")
+
+    def __init__(self, offsets: memoryview, blob: memoryview) -> None:
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 1, 0)
+
+    def raw(self, idx: int) -> bytes:
+        return bytes(self._blob[self._offsets[idx] : self._offsets[idx + 1]])
+
+    def get(self, idx: int) -> str:
+        return self.raw(idx).decode("utf-8")
+
+    def bisect_left(self, key: bytes) -> int:
+        # UTF-8 byte order matches code point order, so the Python-sorted
+        # term list can be searched without decoding.
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.raw(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, key: str) -> int:
+        encoded = key.encode("utf-8")
+        idx = self.bisect_left(encoded)
+        if idx < len(self) and self.raw(idx) == encoded:
+            return idx
+        return -1
+
+
+class CompiledTermIndex(Mapping[str, list[str]]):
+    """Read-only ``term -> [CUI, ...]`` mapping over a compiled term table."""
+
+    def __init__(self, terms: _StringTable, posting_offsets: memoryview, postings: memoryview, cuis: _StringTable) -> None:
+        self._terms = terms
+        self._posting_offsets = posting_offsets
+        self._postings = postings
+        self._cuis = cuis
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __iter__(self) -> Iterator[str]:
+        for idx in range(len(self._terms)):
+            yield self._terms.get(idx)
+
+    def __getitem__(self, term: str) -> list[str]:
+        idx = self._terms.find(term) if isinstance(term, str) else -1
+        if idx < 0:
+            raise KeyError(term)
+        return self.cuis_at(idx)
+
+    def __contains__(self, term: object) -> bool:
+        return isinstance(term, str) and self._terms.find(term) >= 0
+
+    def term_at(self, idx: int) -> str:
+        return self._terms.get(idx)
+
+    def find(self, term: str) -> int:
+        return self._terms.find(term)
+
+    def bisect_left(self, term: str) -> int:
+        return self._terms.bisect_left(term.encode("utf-8"))
+
+    def find_many(self, terms: Sequence[str]) -> list[int]:
+        """Resolve many terms in one ordered sweep; ``-1`` marks a miss.
+
+        Keys are probed in sorted order and each search starts where the
+        previous one ended, so the table is walked forward once.
+        """
+        out = [-1] * len(terms)
+        order = sorted(range(len(terms)), key=lambda i: terms[i].encode("utf-8"))
+        lo = 0
+        n_terms = len(self._terms)
+        for i in order:
+            key = terms[i].encode("utf-8")
+            hi = n_terms
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._terms.raw(mid) < key:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo < n_terms and self._terms.raw(lo) == key:
+                out[i] = lo
+        return out
+
+    def cui_ids_at(self, idx: int) -> Sequence[int]:
+        return self._postings[self._posting_offsets[idx] : self._posting_offsets[idx + 1]]
+
+    def cuis_at(self, idx: int) -> list[str]:
+        return [self._cuis.get(cui_id) for cui_id in self.cui_ids_at(idx)]
+
+
+class CompiledSortedTerms(Sequence[str]):
+    """Sorted strict terms as a lazily-decoded sequence (``bisect`` compatible)."""
+
+    def __init__(self, index: CompiledTermIndex) -> None:
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, idx):  # type: ignore[override]
+        if isinstance(idx, slice):
+            return [self._index.term_at(i) for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if idx < 0 or idx >= len(self):
+            raise IndexError(idx)
+        return self._index.term_at(idx)
+
+
+class CompiledConceptTable(Mapping[str, dict[str, Any]]):
+    """Read-only ``CUI -> concept dict`` mapping; documents are decoded on access."""
+
+    def __init__(self, cuis: _StringTable, concept_docs: _StringTable) -> None:
+        self._cuis = cuis
+        self._docs = concept_docs
+
+    def __len__(self) -> int:
+        return len(self._cuis)
+
+    def __iter__(self) -> Iterator[str]:
+        for idx in range(len(self._cuis)):
+            yield self._cuis.get(idx)
+
+    def __contains__(self, cui: object) -> bool:
+        return isinstance(cui, str) and self._cuis.find(cui) >= 0
+
+    def __getitem__(self, cui: str) -> dict[str, Any]:
+        idx = self._cuis.find(cui) if isinstance(cui, str) else -1
+        if idx < 0:
+            raise KeyError(cui)
+        return self.concept_at(idx)
+
+    def concept_at(self, idx: int) -> dict[str, Any]:
+        """A fresh copy of the concept; callers may mutate it without touching the cache."""
+        return _thaw(_decode_concept(self._docs.raw(idx)))
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _decode_concept(raw: bytes) -> Mapping[str, Any]:
+    """Decoded concept document, frozen because the cache shares it process-wide."""
+    value = json.loads(raw.decode("utf-8"))
+    return _freeze(value) if isinstance(value, dict) else MappingProxyType({})
+
+
+class CompiledUmlsIndex:
+    """Memory-mapped compiled IP-UMLS map."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._load()
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _load(self) -> None:
+        buf = memoryview(self._mmap)
+        if len(buf) < _HEADER_SIZE:
+            raise ValueError(f"Compiled UMLS map is truncated: {self.path}")
+        magic, version, byteorder, n_strict, n_loose, n_cuis, n_categories = struct.unpack_from(
+            _HEADER_FMT, buf, 0
+        )
+        if magic != MAGIC:
+            raise ValueError(f"Not a compiled UMLS map: {self.path}")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled UMLS map version {version}: {self.path}")
+        if byteorder != _native_byteorder_flag():
+            raise ValueError(f"Compiled UMLS map byte order does not match this host: {self.path}")
+
+        sections: dict[str, memoryview] = {}
+        cursor = struct.calcsize(_HEADER_FMT)
+        for name in _SECTIONS:
+            offset, length = struct.unpack_from(_SECTION_FMT, buf, cursor)
+            cursor += struct.calcsize(_SECTION_FMT)
+            if offset + length > len(buf):
+                raise ValueError(f"Compiled UMLS map section {name!r} out of bounds: {self.path}")
+            sections[name] = buf[offset : offset + length]
+
+        def _u32(name: str) -> memoryview:
+            return sections[name].cast("I")
+
+        meta_doc = json.loads(bytes(sections["meta"]).decode("utf-8"))
+        self.meta: dict[str, Any] | None = meta_doc.get("meta")
+        self.semtype_legend: dict[str, str] | None = meta_doc.get("semtype_legend")
+        self.source_sha256: str | None = meta_doc.get("source_sha256")
+        self.category_names: list[str] = list(meta_doc.get("categories") or [])
+        self._category_bit = {name: 1 << idx for idx, name in enumerate(self.category_names)}
+        if len(self.category_names) != n_categories:
+            raise ValueError(f"Compiled UMLS map category table is inconsistent: {self.path}")
+
+        self._cuis = _StringTable(_u32("cui_offsets"), sections["cui_blob"])
+        self._category_bits = _u32("category_bits")
+        if len(self._cuis) != n_cuis or len(self._category_bits) != n_cuis:
+            raise ValueError(f"Compiled UMLS map CUI table is inconsistent: {self.path}")
+
+        self.strict = CompiledTermIndex(
+            _StringTable(_u32("strict_term_offsets"), sections["strict_term_blob"]),
+            _u32("strict_posting_offsets"),
+            _u32("strict_postings"),
+            self._cuis,
+        )
+        self.loose = CompiledTermIndex(
+            _StringTable(_u32("loose_term_offsets"), sections["loose_term_blob"]),
+            _u32("loose_posting_offsets"),
+            _u32("loose_postings"),
+            self._cuis,
+        )
+        if len(self.strict) != n_strict or len(self.loose) != n_loose:
+            raise ValueError(f"Compiled UMLS map term tables are inconsistent: {self.path}")
+
+        self.concepts = CompiledConceptTable(
+            self._cuis, _StringTable(_u32("concept_offsets"), sections["concept_blob"])
+        )
+        self.sorted_terms = CompiledSortedTerms(self.strict)
+
+    def has_category(self, cui: str, category: str) -> bool:
+        bit = self._category_bit.get(category)
+        if bit is None:
+            return False
+        idx = self._cuis.find(cui)
+        return idx >= 0 and bool(self._category_bits[idx] & bit)
+
+
+def _compiled_is_fresh(compiled_path: Path, json_path: Path) -> bool:
+    try:
+        return compiled_path.stat().st_mtime_ns >= json_path.stat().st_mtime_ns
+    except OSError:
+        return False
+
+
+def resolve_compiled_ip_umls_map(
+    json_path: Path,
+    *,
+    compiled_path: Path | None = None,
+    cache_dir: Path | None = None,
+) -> Path | None:
+    """Locate (or build) the compiled artifact for ``json_path``.
+
+    Resolution order:
+    1. ``compiled_path`` when given explicitly.
+    2. A sibling ``<map>.umlsbin`` newer than the JSON (written by
+       ``ops/tools/build_ip_umls_map.py``).
+    3. A fingerprinted file under ``cache_dir``, compiled once under a file
+       lock so concurrent workers do not race.
+    """
+    if compiled_path is not None:
+        if not compiled_path.is_file():
+            raise FileNotFoundError(f"Compiled UMLS map not found: {compiled_path}")
+        return compiled_path
+
+    sibling = json_path.with_suffix(COMPILED_SUFFIX)
+    if sibling.is_file() and _compiled_is_fresh(sibling, json_path):
+        return sibling
+
+    if cache_dir is None:
+        return None
+
+    dest = cache_dir / f"{json_path.stem}.{source_fingerprint(json_path)}{COMPILED_SUFFIX}"
+    if dest.is_file():
+        return dest
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with FileLock(f"{dest}.lock"):
+        if not dest.is_file():
+            _logger.info("Compiling UMLS map %s -> %s", json_path, dest)
+            write_compiled_ip_umls_map(json_path, dest)
+    return dest
+
+
+@lru_cache(maxsize=4)
+def open_compiled_ip_umls_map(path: Path) -> CompiledUmlsIndex:
+    """Open (once per process) the compiled map at ``path``."""
+    return CompiledUmlsIndex(path)
+
+
+def load_compiled_for_json(
+    json_path: Path,
+    *,
+    compiled_path: Path | None = None,
+    cache_dir: Path | None = None,
+) -> CompiledUmlsIndex | None:
+    """Best-effort compiled index for ``json_path``; ``None`` means use the JSON."""
+    try:
+        resolved = resolve_compiled_ip_umls_map(json_path, compiled_path=compiled_path, cache_dir=cache_dir)
+        if resolved is None:
+            return None
+        return open_compiled_ip_umls_map(resolved.resolve())
+    except Exception as exc:  # noqa: BLE001
+        if compiled_path is not None:
+            raise
+        _logger.warning("Compiled UMLS map unavailable for %s; falling back to JSON: %s", json_path, exc)
+        return None
+
+
+__all__ = [
+    "COMPILED_SUFFIX",
+    "CompiledConceptTable",
+    "CompiledSortedTerms",
+    "CompiledTermIndex",
+    "CompiledUmlsIndex",
+    "FORMAT_VERSION",
+    "compile_ip_umls_payload",
+    "load_compiled_for_json",
+    "open_compiled_ip_umls_map",
+    "resolve_compiled_ip_umls_map",
+    "source_fingerprint",
+    "write_compiled_ip_umls_map",
+]
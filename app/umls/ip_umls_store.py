@@ -5,16 +5,21 @@ import logging
 import os
 import re
 import tempfile
-from bisect import bisect_left
+import threading
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
 from urllib.parse import urlparse
 
 from filelock import FileLock
 
+from app.umls.suggest_index import UmlsSuggestIndex
+from app.umls.term_trie import TokenTrie
 from config.settings import UmlsSettings
 
+if TYPE_CHECKING:
+    from app.umls.ip_umls_compiled import CompiledUmlsIndex
+
 
 _logger = logging.getLogger(__name__)
 
@@ -136,18 +141,50 @@ class DistilledUmlsStore:
                 if cui not in existing:
                     existing.append(cui)
 
-        self.sorted_terms: list[str] = sorted(self.term_index_strict.keys())
+        self.sorted_terms: Sequence[str] = sorted(self.term_index_strict.keys())
         self.semtype_legend: dict[str, str] | None = payload.get("semtype_legend")
         self.meta: dict[str, Any] | None = payload.get("meta")
+        self._compiled: CompiledUmlsIndex | None = None
+        self._trie: TokenTrie | None = None
+        self._suggest: UmlsSuggestIndex | None = None
+        self._index_lock = threading.Lock()
+
+    @classmethod
+    def from_compiled(cls, index: CompiledUmlsIndex) -> DistilledUmlsStore:
+        """Build a store backed by a memory-mapped compiled map (no JSON parse)."""
+        store = cls.__new__(cls)
+        store.concepts = index.concepts  # type: ignore[assignment]
+        store.term_index_strict = index.strict  # type: ignore[assignment]
+        store.term_index_loose = index.loose  # type: ignore[assignment]
+        store.sorted_terms = index.sorted_terms
+        store.semtype_legend = index.semtype_legend
+        store.meta = index.meta
+        store._compiled = index
+        store._trie = None
+        store._suggest = None
+        store._index_lock = threading.Lock()
+        return store
+
+    def _token_trie(self) -> TokenTrie:
+        if self._trie is None:
+            with self._index_lock:
+                if self._trie is None:
+                    self._trie = TokenTrie.from_terms(self.term_index_strict)
+        return self._trie
+
+    def _in_category(self, cui: str, category: str) -> bool:
+        if self._compiled is not None:
+            return self._compiled.has_category(cui, category)
+        concept: Mapping[str, Any] = self.concepts.get(cui, {})
+        categories = concept.get("categories", []) or []
+        return isinstance(categories, list) and category in categories
 
     def _choose_cui(self, cuis: list[str], category: str | None) -> str | None:
         if not cuis:
             return None
         if category:
             for candidate in cuis:
-                concept = self.concepts.get(candidate, {})
-                categories = concept.get("categories", []) or []
-                if isinstance(categories, list) and category in categories:
+                if self._in_category(candidate, category):
                     return candidate
         return cuis[0]
 
@@ -177,6 +214,16 @@ class DistilledUmlsStore:
         if not matched_term or not match_type or not cuis:
             return None
 
+        return self._build_match(raw, matched_term, match_type, cuis, category)
+
+    def _build_match(
+        self,
+        raw: str,
+        matched_term: str,
+        match_type: str,
+        cuis: list[str],
+        category: str | None,
+    ) -> dict[str, Any] | None:
         chosen_cui = self._choose_cui(cuis, category)
         if not chosen_cui:
             return None
@@ -201,7 +248,113 @@ class DistilledUmlsStore:
             "semtypes": semtypes,
         }
 
-    def suggest(self, prefix: str, category: str | None = None, limit: int = 20) -> list[dict[str, Any]]:
+    def _lookup_many(self, index: Mapping[str, list[str]], keys: list[str]) -> dict[str, list[str]]:
+        if hasattr(index, "find_many"):
+            hits: dict[str, list[str]] = {}
+            for key, idx in zip(keys, index.find_many(keys)):  # type: ignore[attr-defined]
+                if idx >= 0:
+                    hits[key] = index.cuis_at(idx)  # type: ignore[attr-defined]
+            return hits
+        return {key: list(index[key]) for key in keys if index.get(key)}
+
+    def match_many(self, terms: Sequence[str], category: str | None = None) -> list[dict[str, Any] | None]:
+        """Batch ``match()``: results are aligned to ``terms`` (``None`` for misses).
+
+        Inputs are normalized together and de-duplicated, so each distinct
+        strict/loose key is resolved once with a single pass over the index.
+        """
+        raws = [(term or "").strip() if isinstance(term, str) else "" for term in terms]
+        strict_keys = [normalize_strict(raw) if raw else "" for raw in raws]
+        unique_strict = sorted({key for key in strict_keys if key})
+        strict_hits = self._lookup_many(self.term_index_strict, unique_strict)
+
+        loose_keys: dict[str, str] = {}
+        for key in unique_strict:
+            if key not in strict_hits:
+                loose_key = normalize_loose(key)
+                if loose_key:
+                    loose_keys[key] = loose_key
+        loose_hits = self._lookup_many(self.term_index_loose, sorted(set(loose_keys.values())))
+
+        resolved: dict[str, dict[str, Any] | None] = {}
+        for key in unique_strict:
+            if key in strict_hits:
+                resolved[key] = self._build_match(key, key, "exact", strict_hits[key], category)
+                continue
+            loose_key = loose_keys.get(key)
+            if loose_key and loose_key in loose_hits:
+                resolved[key] = self._build_match(key, loose_key, "loose", loose_hits[loose_key], category)
+            else:
+                resolved[key] = None
+
+        results: list[dict[str, Any] | None] = []
+        for raw, key in zip(raws, strict_keys):
+            base = resolved.get(key) if key else None
+            if base is None:
+                results.append(None)
+            else:
+                results.append({**base, "raw_text": raw, "cuis": list(base["cuis"])})
+        return results
+
+    def link_text(self, text: str, category: str | None = None) -> list[dict[str, Any]]:
+        """Link every term occurrence in free text (leftmost-longest, exact offsets).
+
+        Each result has the same shape as ``match()`` plus ``start_char`` and
+        ``end_char`` into ``text``.
+        """
+        if not text:
+            return []
+        results: list[dict[str, Any]] = []
+        for span in self._token_trie().iter_matches(text):
+            cuis = list(self.term_index_strict.get(span.term) or [])
+            if not cuis:
+                continue
+            raw = text[span.start_char : span.end_char]
+            match = self._build_match(raw, span.term, "exact", cuis, category)
+            if match is None:
+                continue
+            match["start_char"] = span.start_char
+            match["end_char"] = span.end_char
+            results.append(match)
+        return results
+
+    def suggest_index(self) -> UmlsSuggestIndex:
+        if self._suggest is None:
+            with self._index_lock:
+                if self._suggest is None:
+                    self._suggest = UmlsSuggestIndex(self)
+        return self._suggest
+
+    def _suggestion(self, term: str, category: str | None) -> dict[str, Any] | None:
+        cuis = list(self.term_index_strict.get(term) or [])
+        chosen_cui = self._choose_cui(cuis, category)
+        if not chosen_cui:
+            return None
+        concept = self.concepts.get(chosen_cui, {}) or {}
+        categories = concept.get("categories", []) or []
+        if not isinstance(categories, list):
+            categories = []
+        if category and category not in categories:
+            return None
+        return {
+            "term": term,
+            "preferred_name": str(concept.get("preferred_name") or concept.get("name") or ""),
+            "cui": chosen_cui,
+            "categories": categories,
+        }
+
+    def suggest(
+        self,
+        prefix: str,
+        category: str | None = None,
+        limit: int = 20,
+        fuzzy: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Prefix suggestions ranked by popularity; ``fuzzy`` tops up with near misses.
+
+        Fuzzy results (typo-tolerant prefix matches) follow the exact-prefix
+        ones and carry ``match_type="fuzzy"`` and their edit ``distance``.
+        """
         raw_prefix = (prefix or "").strip()
         if not raw_prefix or limit <= 0:
             return []
@@ -210,33 +363,22 @@ class DistilledUmlsStore:
         if not prefix_norm:
             return []
 
-        start_idx = bisect_left(self.sorted_terms, prefix_norm)
+        index = self.suggest_index()
         results: list[dict[str, Any]] = []
-
-        for term in self.sorted_terms[start_idx:]:
-            if len(results) >= limit:
-                break
-            if not term.startswith(prefix_norm):
-                break
-            cuis = self.term_index_strict.get(term) or []
-            chosen_cui = self._choose_cui(cuis, category)
-            if not chosen_cui:
-                continue
-            concept = self.concepts.get(chosen_cui, {}) or {}
-            categories = concept.get("categories", []) or []
-            if not isinstance(categories, list):
-                categories = []
-            if category and category not in categories:
-                continue
-
-            results.append(
-                {
-                    "term": term,
-                    "preferred_name": str(concept.get("preferred_name") or concept.get("name") or ""),
-                    "cui": chosen_cui,
-                    "categories": categories,
-                }
-            )
+        exact_ids = index.prefix_ids(prefix_norm, category, limit)
+        for tid in exact_ids:
+            suggestion = self._suggestion(index.term(tid), category)
+            if suggestion is not None:
+                results.append(suggestion)
+
+        if fuzzy and len(results) < limit:
+            for tid, distance in index.fuzzy_ids(prefix_norm, category, limit - len(results), exclude=exact_ids):
+                suggestion = self._suggestion(index.term(tid), category)
+                if suggestion is None:
+                    continue
+                suggestion["match_type"] = "fuzzy"
+                suggestion["distance"] = distance
+                results.append(suggestion)
 
         return results
 
@@ -245,6 +387,16 @@ class DistilledUmlsStore:
 def get_ip_umls_store() -> DistilledUmlsStore:
     settings = UmlsSettings()
     path = ensure_ip_umls_map_path(settings)
+    if settings.use_compiled:
+        from app.umls.ip_umls_compiled import load_compiled_for_json
+
+        index = load_compiled_for_json(
+            path,
+            compiled_path=settings.ip_umls_compiled_path,
+            cache_dir=settings.compiled_cache_dir,
+        )
+        if index is not None:
+            return DistilledUmlsStore.from_compiled(index)
     with open(path, "r", encoding="utf-8") as f:
         payload = json.load(f)
     if not isinstance(payload, dict):
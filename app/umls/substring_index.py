@@ -0,0 +1,68 @@
+"""Trigram inverted index for "terms containing this string" queries.
+
+A query of three or more characters is narrowed to the terms that contain
+its rarest trigrams (posting lists intersected smallest-first), then each
+candidate is verified with a plain substring test. Shorter queries carry no
+trigram, so they are answered by a scan. Results are ranked by where the
+match starts, then by term length, then alphabetically.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections import defaultdict
+from typing import Iterable
+
+# Intersect at most this many posting lists; verification handles the rest.
+_MAX_INTERSECT = 3
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    def __init__(self, terms: Iterable[str]) -> None:
+        self._terms: list[str] = list(terms)
+        postings: dict[str, array] = defaultdict(lambda: array("I"))
+        for tid, term in enumerate(self._terms):
+            for gram in _trigrams(term):
+                postings[gram].append(tid)
+        self._postings: dict[str, array] = dict(postings)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _candidates(self, query: str) -> Iterable[int] | None:
+        grams = _trigrams(query)
+        if not grams:
+            return None
+        lists = sorted((self._postings.get(gram, array("I")) for gram in grams), key=len)
+        if not lists[0]:
+            return ()
+        candidates = set(lists[0])
+        for posting in lists[1:_MAX_INTERSECT]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return candidates
+
+    def search(self, query: str, limit: int = 10) -> list[str]:
+        """Terms containing ``query`` (already lowercased), best-ranked first."""
+        if limit <= 0:
+            return []
+        candidates = self._candidates(query)
+        if candidates is None:
+            candidates = range(len(self._terms))
+
+        ranked: list[tuple[int, int, str]] = []
+        for tid in candidates:
+            term = self._terms[tid]
+            pos = term.find(query)
+            if pos >= 0:
+                ranked.append((pos, len(term), term))
+        return [term for _, _, term in heapq.nsmallest(limit, ranked)]
+
+
+__all__ = ["TrigramIndex"]
@@ -0,0 +1,257 @@
+"""Category-aware prefix (and optional typo-tolerant) suggestions over the UMLS map.
+
+``DistilledUmlsStore.suggest`` used to bisect into the sorted term list and
+walk forward, resolving a CUI per term and dropping the ones outside the
+requested category. For short, popular prefixes with a category filter that
+meant scanning thousands of terms per keystroke.
+
+``UmlsSuggestIndex`` is built on the first suggest call (not at warmup) and
+precomputes, once per store:
+
+- per-category term-id lists (category -> ascending term ids, i.e. sorted
+  terms), so a prefix maps to one contiguous id range via bisect
+- a popularity rank per term (preferred names first, then concepts with
+  more synonyms, then shorter terms, then alphabetical)
+- the top ``CACHE_TOP_K`` ids for every 1-3 character prefix whose range is
+  larger than that, so the hottest keystrokes are a dict lookup
+- lazily, for ``fuzzy=True``: a positional bigram index over term prefixes
+  used to find terms within a small edit distance of the typed prefix
+
+Only integer arrays are kept. Terms are read back through the store's
+``sorted_terms`` sequence, which for a compiled map decodes from the shared
+mmap on access, so the index adds no per-term Python strings to a worker.
+"""
+
+from __future__ import annotations
+
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, Any, Iterable, Sequence
+
+from rapidfuzz.distance import Levenshtein
+
+if TYPE_CHECKING:
+    from app.umls.ip_umls_store import DistilledUmlsStore
+
+CACHED_PREFIX_LEN = 3
+CACHE_TOP_K = 50
+FUZZY_MIN_PREFIX_LEN = 4
+FUZZY_MAX_PREFIX_LEN = 12
+
+_ALL = ""  # category key for "no category filter"
+_PREFIX_CEILING = "\U0010ffff"
+
+
+def _bigrams(text: str) -> list[str]:
+    padded = "^" + text
+    return [padded[i : i + 2] for i in range(len(padded) - 1)]
+
+
+def _prefix_distance(query: str, term: str, max_distance: int) -> int | None:
+    """Smallest edit distance between ``query`` and a prefix of ``term``."""
+    best: int | None = None
+    for length in range(max(1, len(query) - max_distance), len(query) + max_distance + 1):
+        if length > len(term):
+            break
+        dist = Levenshtein.distance(query, term[:length], score_cutoff=max_distance)
+        if dist <= max_distance and (best is None or dist < best):
+            best = dist
+            if best == 0:
+                break
+    return best
+
+
+class UmlsSuggestIndex:
+    def __init__(self, store: DistilledUmlsStore) -> None:
+        self._terms: Sequence[str] = store.sorted_terms
+        n_terms = len(self._terms)
+        # Build-time only: decode each term once for the per-term passes below.
+        heads: list[str] = []
+        term_lengths = array("I")
+
+        concept_categories: dict[str, tuple[str, ...]] = {}
+        preferred_keys: dict[str, str] = {}
+        synonym_counts: Counter[str] = Counter()
+        term_categories: list[tuple[str, ...]] = []
+        term_preferred: list[bool] = []
+        term_synonyms: list[int] = []
+
+        def _concept_info(cui: str) -> tuple[tuple[str, ...], str]:
+            if cui not in concept_categories:
+                concept = store.concepts.get(cui, {}) or {}
+                categories = concept.get("categories", []) or []
+                if not isinstance(categories, list):
+                    categories = []
+                concept_categories[cui] = tuple(str(c) for c in categories)
+                name = concept.get("preferred_name") or concept.get("name") or ""
+                preferred_keys[cui] = " ".join(str(name).casefold().split())
+            return concept_categories[cui], preferred_keys[cui]
+
+        term_cuis: list[list[str]] = []
+        for term in self._terms:
+            cuis = list(store.term_index_strict.get(term) or [])
+            term_cuis.append(cuis)
+            synonym_counts.update(cuis)
+            heads.append(term[:CACHED_PREFIX_LEN])
+            term_lengths.append(len(term))
+            term_preferred.append(any(_concept_info(cui)[1] == term for cui in cuis))
+
+        for cuis in term_cuis:
+            categories: set[str] = set()
+            for cui in cuis:
+                categories.update(_concept_info(cui)[0])
+            term_categories.append(tuple(sorted(categories)))
+            term_synonyms.append(max((synonym_counts[cui] for cui in cuis), default=0))
+
+        order = sorted(
+            range(n_terms),
+            key=lambda tid: (
+                not term_preferred[tid],
+                -term_synonyms[tid],
+                term_lengths[tid],
+                tid,
+            ),
+        )
+        self._rank = array("I", bytes(4 * n_terms))
+        for position, tid in enumerate(order):
+            self._rank[tid] = position
+
+        self._category_ids: dict[str, array] = {_ALL: array("I")}
+        for tid, (cuis, categories) in enumerate(zip(term_cuis, term_categories)):
+            if not cuis:
+                continue
+            self._category_ids[_ALL].append(tid)
+            for category in categories:
+                self._category_ids.setdefault(category, array("I")).append(tid)
+        self._category_members: dict[str, frozenset[int]] = {}
+
+        self._top_cache: dict[tuple[str, str], array] = {}
+        for category, ids in self._category_ids.items():
+            for length in range(1, CACHED_PREFIX_LEN + 1):
+                self._cache_prefix_groups(category, ids, length, heads)
+
+        self._fuzzy_postings: dict[str, array] | None = None
+        self._fuzzy_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def term(self, tid: int) -> str:
+        return self._terms[tid]
+
+    def _cache_prefix_groups(
+        self, category: str, ids: array, length: int, heads: list[str]
+    ) -> None:
+        group_prefix: str | None = None
+        group: list[int] = []
+
+        def _flush() -> None:
+            if group_prefix is not None and len(group) > CACHE_TOP_K:
+                top = heapq.nsmallest(CACHE_TOP_K, group, key=self._rank.__getitem__)
+                self._top_cache[(category, group_prefix)] = array("I", top)
+
+        for tid in ids:
+            head = heads[tid]
+            if len(head) < length:
+                continue
+            prefix = head[:length]
+            if prefix != group_prefix:
+                _flush()
+                group_prefix = prefix
+                group = []
+            group.append(tid)
+        _flush()
+
+    def _range(self, ids: array, prefix: str) -> tuple[int, int]:
+        key = self._terms.__getitem__
+        lo = bisect_left(ids, prefix, key=key)
+        hi = bisect_left(ids, prefix + _PREFIX_CEILING, lo=lo, key=key)
+        return lo, hi
+
+    def prefix_ids(self, prefix: str, category: str | None, limit: int) -> list[int]:
+        """Top ``limit`` term ids starting with ``prefix``, most popular first."""
+        ids = self._category_ids.get(category or _ALL)
+        if ids is None or limit <= 0 or not prefix:
+            return []
+        if len(prefix) <= CACHED_PREFIX_LEN and limit <= CACHE_TOP_K:
+            cached = self._top_cache.get((category or _ALL, prefix))
+            if cached is not None:
+                return list(cached[:limit])
+        lo, hi = self._range(ids, prefix)
+        if hi - lo <= limit:
+            return sorted(ids[lo:hi], key=self._rank.__getitem__)
+        return heapq.nsmallest(limit, ids[lo:hi], key=self._rank.__getitem__)
+
+    def _members(self, category: str) -> frozenset[int]:
+        members = self._category_members.get(category)
+        if members is None:
+            members = frozenset(self._category_ids.get(category, ()))
+            self._category_members[category] = members
+        return members
+
+    def _fuzzy_index(self) -> dict[str, array]:
+        if self._fuzzy_postings is None:
+            with self._fuzzy_lock:
+                if self._fuzzy_postings is None:
+                    postings: dict[str, array] = defaultdict(lambda: array("I"))
+                    for tid, term in enumerate(self._terms):
+                        for gram in set(_bigrams(term[: FUZZY_MAX_PREFIX_LEN + 2])):
+                            postings[gram].append(tid)
+                    self._fuzzy_postings = dict(postings)
+        return self._fuzzy_postings
+
+    def fuzzy_ids(
+        self,
+        prefix: str,
+        category: str | None,
+        limit: int,
+        exclude: Iterable[int] = (),
+    ) -> list[tuple[int, int]]:
+        """Term ids whose prefix is within a small edit distance of ``prefix``.
+
+        Returns ``(term_id, distance)`` pairs ordered by distance, then
+        popularity. Allows one edit below 8 characters, two from 8 on.
+        """
+        query = prefix[:FUZZY_MAX_PREFIX_LEN]
+        if len(query) < FUZZY_MIN_PREFIX_LEN or limit <= 0:
+            return []
+        max_distance = 1 if len(query) < 8 else 2
+        grams = _bigrams(query)
+        # q-gram lemma: each edit destroys at most two bigrams.
+        min_shared = max(1, len(grams) - 2 * max_distance)
+
+        postings = self._fuzzy_index()
+        counts: Counter[int] = Counter()
+        for gram in set(grams):
+            counts.update(postings.get(gram, ()))
+
+        skip = set(exclude)
+        members = self._members(category) if category else None
+        hits: list[tuple[int, int, int]] = []
+        for tid, shared in counts.items():
+            if shared < min_shared or tid in skip:
+                continue
+            if members is not None and tid not in members:
+                continue
+            if members is None and tid not in self._members(_ALL):
+                continue
+            dist = _prefix_distance(query, self._terms[tid], max_distance)
+            if dist is None:
+                continue
+            hits.append((dist, self._rank[tid], tid))
+        hits.sort()
+        return [(tid, dist) for dist, _, tid in hits[:limit]]
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "terms": len(self._terms),
+            "categories": sorted(c for c in self._category_ids if c != _ALL),
+            "cached_prefixes": len(self._top_cache),
+            "fuzzy_ready": self._fuzzy_postings is not None,
+        }
+
+
+__all__ = ["CACHE_TOP_K", "CACHED_PREFIX_LEN", "UmlsSuggestIndex"]
@@ -0,0 +1,105 @@
+"""Token trie for leftmost-longest dictionary matching over clinical text.
+
+``TokenTrie`` indexes multi-word terms by their word tokens and scans a note
+in a single left-to-right pass: at each token it follows the trie as far as
+the text allows and emits the longest term ending there, then resumes after
+it. Offsets come from the tokenizer match positions, so every occurrence of a
+repeated term is reported with its own exact character span.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+# Same token shape the n-gram linker used (letters first, then letters,
+# digits or hyphens; at least two characters), applied to the original text
+# so offsets stay exact.
+_TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z0-9\-]+")
+
+# Terminal marker; the tokenizer never produces an empty token.
+_TERMINAL = ""
+
+
+def tokenize_with_spans(text: str) -> list[tuple[str, int, int]]:
+    """Return ``(lowercased_token, start_char, end_char)`` for each word token."""
+    return [(m.group(0).lower(), m.start(), m.end()) for m in _TOKEN_RE.finditer(text or "")]
+
+
+def term_tokens(term: str) -> list[str] | None:
+    """Tokens for an index term, or None when the tokenizer cannot reproduce it.
+
+    Terms containing punctuation or single-character words cannot be matched
+    token-wise; they remain reachable through exact/loose term lookup.
+    """
+    tokens = [token for token, _, _ in tokenize_with_spans(term)]
+    if not tokens or " ".join(tokens) != term:
+        return None
+    return tokens
+
+
+@dataclass(frozen=True)
+class TermSpan:
+    term: str
+    start_char: int
+    end_char: int
+    token_count: int
+
+
+class TokenTrie:
+    def __init__(self) -> None:
+        self._root: dict[str, dict] = {}
+        self.size = 0
+
+    @classmethod
+    def from_terms(cls, terms: Iterable[str]) -> TokenTrie:
+        trie = cls()
+        for term in terms:
+            trie.add(term)
+        return trie
+
+    def add(self, term: str) -> bool:
+        tokens = term_tokens(term)
+        if tokens is None:
+            return False
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _TERMINAL not in node:
+            node[_TERMINAL] = term  # type: ignore[assignment]
+            self.size += 1
+        return True
+
+    def iter_matches(self, text: str) -> Iterator[TermSpan]:
+        """Yield non-overlapping leftmost-longest matches in text order."""
+        tokens = tokenize_with_spans(text)
+        n_tokens = len(tokens)
+        i = 0
+        while i < n_tokens:
+            node = self._root
+            best_term: str | None = None
+            best_end = i
+            j = i
+            while j < n_tokens:
+                node = node.get(tokens[j][0])  # type: ignore[assignment]
+                if node is None:
+                    break
+                j += 1
+                term = node.get(_TERMINAL)
+                if term is not None:
+                    best_term = term  # type: ignore[assignment]
+                    best_end = j
+            if best_term is None:
+                i += 1
+                continue
+            yield TermSpan(
+                term=best_term,
+                start_char=tokens[i][1],
+                end_char=tokens[best_end - 1][2],
+                token_count=best_end - i,
+            )
+            i = best_end
+
+
+__all__ = ["TermSpan", "TokenTrie", "term_tokens", "tokenize_with_spans"]
@@ -81,6 +81,12 @@ class UmlsSettings(BaseSettings):
     # If true: redownload on boot even if cache exists
     force_refresh: bool = Field(default=False)
 
+    # Compiled (memory-mapped) map. When unset, a fresh sibling
+    # ``<map>.umlsbin`` is used, else one is compiled into the cache dir.
+    use_compiled: bool = Field(default=True)
+    ip_umls_compiled_path: Path | None = Field(default=None)
+    compiled_cache_dir: Path = Field(default=Path("/tmp/procsuite/umls_compiled"))
+
     model_config = {"env_prefix": "UMLS_", "extra": "ignore"}
 
     @model_validator(mode="after")
@@ -88,6 +94,9 @@ class UmlsSettings(BaseSettings):
         if self.ip_umls_map_local_path:
             self.ip_umls_map_local_path = _resolve_repo_path(self.ip_umls_map_local_path)
         self.ip_umls_map_cache_path = _resolve_repo_path(self.ip_umls_map_cache_path)
+        if self.ip_umls_compiled_path:
+            self.ip_umls_compiled_path = _resolve_repo_path(self.ip_umls_compiled_path)
+        self.compiled_cache_dir = _resolve_repo_path(self.compiled_cache_dir)
         return self
 
 
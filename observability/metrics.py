@@ -5,6 +5,7 @@ This module provides:
 - NullMetricsClient: No-op implementation (default)
 - StdoutMetricsClient: JSON output for debugging
 - RegistryMetricsClient: In-process registry with Prometheus text export
+- emit_metric: Fire-and-forget emission for hot paths (never raises)
 
 To enable Prometheus-compatible metrics:
     from observability.metrics import set_metrics_client, RegistryMetricsClient
@@ -23,7 +24,7 @@ from abc import ABC, abstractmethod
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 
 class MetricsClient(ABC):
@@ -365,3 +366,29 @@ def reset_metrics_client() -> None:
     """
     global _metrics_client
     _metrics_client = None
+
+
+def emit_metric(
+    kind: Literal["incr", "observe", "timing"],
+    name: str,
+    value: float = 1,
+    tags: dict[str, str] | None = None,
+) -> None:
+    """Emit one metric on the global client without ever raising.
+
+    For request, LLM and startup paths: a broken metrics backend must not
+    fail the work being measured. ``kind`` selects ``incr`` (``value`` is
+    the count), ``observe`` or ``timing`` (``value`` in ms).
+    """
+    if kind not in ("incr", "observe", "timing"):
+        raise ValueError(f"Unknown metric kind: {kind!r}")
+    try:
+        client = get_metrics_client()
+        if kind == "incr":
+            client.incr(name, tags=tags, value=int(value))
+        elif kind == "timing":
+            client.timing(name, float(value), tags=tags)
+        else:
+            client.observe(name, float(value), tags=tags)
+    except Exception:  # noqa: BLE001 - metrics must never break the caller
+        pass
@@ -65,6 +65,11 @@ if [[ "${REPORTER_SPEECH_VENDOR_BOOTSTRAP:-}" =~ ^(1|true|yes)$ ]]; then
   python ops/tools/bootstrap_reporter_speech_vendor_bundle.py
 fi
 
+# Fingerprint + precompress UI vendor assets (cached as immutable, served as .br/.gz).
+# Runs after the vendor bootstraps; a failure only means plain (uncompressed) serving.
+echo "[railway_start] Building UI vendor asset manifest..."
+python ops/tools/build_ui_vendor_assets.py || echo "[railway_start] WARNING: UI vendor asset build failed; serving assets uncompressed"
+
 # Optional: bootstrap registry model bundle from S3 before app starts.
 # The FastAPI lifespan validator requires a populated runtime bundle when MODEL_BACKEND=onnx.
 if [[ -n "${MODEL_BUNDLE_S3_URI_ONNX:-${MODEL_BUNDLE_S3_URI_PYTORCH:-${MODEL_BUNDLE_S3_URI:-}}}" ]]; then
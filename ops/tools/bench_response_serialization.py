@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Serialization time and size for a large ``UnifiedProcessResponse``.
+
+Compares:
+
+- ``response_model``: what FastAPI does for a route with ``response_model=``.
+  It dumps the model, validates the dict again, dumps it with ``mode="json"``
+  and encodes it with ``json.dumps`` (as ``JSONResponse.render`` does).
+- ``model_json``: ``ModelJSONResponse``, a single pydantic-core
+  ``model_dump_json``.
+- ``model_json + fields``: the same, with ``fields=`` applied
+  (``--fields``, default ``registry,codes``).
+
+The response is synthetic: 300 evidence fields with ``--spans`` spans each, a
+600-field registry and a 200-procedure V3 event log (about 270 KB at the
+default settings).
+
+Usage
+-----
+    python ops/tools/bench_response_serialization.py
+    python ops/tools/bench_response_serialization.py --spans 20 --fields registry,codes,review
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.api.json_response import ModelJSONResponse, response_field_excludes  # noqa: E402
+from app.api.schemas import UnifiedProcessResponse  # noqa: E402
+
+
+def synthetic_response(spans: int, fields: int = 300, procedures: int = 200) -> UnifiedProcessResponse:
+    span = {"text": "x" * 80, "start": 0, "end": 80, "confidence": 0.9, "source": "regex"}
+    return UnifiedProcessResponse(
+        registry={
+            f"section_{i}": {f"field_{j}": {"value": "v" * 15, "codes": [1, 2, 3]} for j in range(20)}
+            for i in range(30)
+        },
+        evidence={f"field_{i}": [dict(span, start=k) for k in range(spans)] for i in range(fields)},
+        registry_v3_event_log={"procedures": [{"method": "m" * 50, "index": i} for i in range(procedures)]},
+        cpt_codes=["31653", "31624", "31628"],
+        audit_warnings=["example warning"] * 5,
+    )
+
+
+def legacy_render(model: UnifiedProcessResponse, adapter: TypeAdapter) -> bytes:
+    validated = adapter.validate_python(model.model_dump(exclude_none=True))
+    content = adapter.dump_python(validated, mode="json", exclude_none=True)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def measure(fn: Callable[[], bytes], repeat: int) -> tuple[float, float, int]:
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(fn())
+        timings.append((time.perf_counter() - started) * 1000.0)
+    timings.sort()
+    return statistics.median(timings), timings[int(0.95 * (len(timings) - 1))], size
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spans", type=int, default=5, help="Evidence spans per field (synthetic response)")
+    parser.add_argument("--fields", default="registry,codes", help="fields= value for the filtered path")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    model = synthetic_response(args.spans)
+    adapter = TypeAdapter(UnifiedProcessResponse)
+    exclude = response_field_excludes(args.fields)
+    paths: dict[str, Callable[[], bytes]] = {
+        "response_model": lambda: legacy_render(model, adapter),
+        "model_json": lambda: ModelJSONResponse(model).body,
+        f"model_json fields={args.fields}": lambda: ModelJSONResponse(model, exclude=exclude).body,
+    }
+    print(f"{'path':<40} {'p50_ms':>8} {'p95_ms':>8} {'bytes':>10}")
+    baseline = None
+    for name, fn in paths.items():
+        p50, p95, size = measure(fn, args.repeat)
+        baseline = baseline or p50
+        print(f"{name:<40} {p50:>8.2f} {p95:>8.2f} {size:>10}  ({baseline / p50:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
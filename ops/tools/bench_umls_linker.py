@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Benchmark whole-note UMLS linking: legacy n-gram enumeration vs token trie.
+
+The legacy path is the pre-trie ``umls_link_lite`` algorithm (every 1-4-gram
+joined and looked up, spans located with ``str.find``), kept here only for
+comparison. The trie path is the current ``proc_nlp.umls_lite.umls_link_lite``.
+
+Usage
+-----
+    python ops/tools/bench_umls_linker.py
+    python ops/tools/bench_umls_linker.py --map data/knowledge/ip_umls_map.json \\
+        --notes "tests/fixtures/notes/*.txt" --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def _legacy_link(text: str, data: dict[str, Any]) -> list[tuple[str, int, int]]:
+    term_index = data.get("term_index", {})
+    tokens = re.findall(r"[a-z][a-z0-9\-]{1,}", text.lower())
+    text_lower = text.lower()
+    out: list[tuple[str, int, int]] = []
+    seen: set[str] = set()
+    for n in range(min(4, len(tokens)), 0, -1):
+        for i in range(len(tokens) - n + 1):
+            phrase = " ".join(tokens[i : i + n])
+            cuis = term_index.get(phrase)
+            if not cuis:
+                continue
+            start = text_lower.find(phrase)
+            for cui in cuis:
+                if cui in seen:
+                    continue
+                seen.add(cui)
+                out.append((cui, max(start, 0), max(start + len(phrase), 0) if start >= 0 else 0))
+    return out
+
+
+def _time_per_note(fn: Callable[[str], Any], notes: list[str], repeat: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(repeat):
+        for note in notes:
+            t0 = time.perf_counter()
+            fn(note)
+            timings.append((time.perf_counter() - t0) * 1000.0)
+    return timings
+
+
+def _summary(label: str, timings: list[float]) -> str:
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return (
+        f"{label:<8} mean={statistics.mean(timings):8.3f} ms  "
+        f"p50={statistics.median(timings):8.3f} ms  p95={p95:8.3f} ms"
+    )
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark whole-note UMLS linking on full notes.")
+    parser.add_argument(
+        "--map",
+        type=Path,
+        default=ROOT / "data" / "knowledge" / "ip_umls_map.json",
+        help="Distilled IP-UMLS JSON map (compiled sibling/cache used when available).",
+    )
+    parser.add_argument(
+        "--notes",
+        default=str(ROOT / "tests" / "fixtures" / "notes" / "*.txt"),
+        help="Glob of note text files.",
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if not args.map.exists():
+        print(f"UMLS map not found: {args.map}", file=sys.stderr)
+        return 1
+    os.environ["IP_UMLS_MAP_PATH"] = str(args.map)
+
+    from proc_nlp import umls_lite
+
+    note_paths = sorted(glob.glob(args.notes))
+    notes = [Path(p).read_text(encoding="utf-8") for p in note_paths]
+    if not notes:
+        print(f"No notes matched {args.notes}", file=sys.stderr)
+        return 1
+
+    t0 = time.perf_counter()
+    data = umls_lite._load_map()
+    load_ms = (time.perf_counter() - t0) * 1000.0
+    t0 = time.perf_counter()
+    umls_lite._get_trie(data)
+    trie_ms = (time.perf_counter() - t0) * 1000.0
+
+    def _trie(text: str) -> Any:
+        return umls_lite.umls_link_lite(text, max_concepts=10_000)
+
+    legacy_timings = _time_per_note(lambda text: _legacy_link(text, data), notes, args.repeat)
+    trie_timings = _time_per_note(_trie, notes, args.repeat)
+
+    legacy_hits = sum(len(_legacy_link(text, data)) for text in notes)
+    trie_hits = sum(len(_trie(text)) for text in notes)
+    avg_chars = statistics.mean(len(text) for text in notes)
+
+    print(f"notes={len(notes)} avg_chars={avg_chars:.0f} repeat={args.repeat}")
+    print(f"map load={load_ms:.1f} ms  trie build={trie_ms:.1f} ms")
+    print(_summary("legacy", legacy_timings) + f"  concepts={legacy_hits} (first occurrence per CUI)")
+    print(_summary("trie", trie_timings) + f"  concepts={trie_hits} (every occurrence)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Latency benchmark for /v1/umls/suggest on 1-3 character prefixes.
+
+Compares the legacy bisect-and-walk scan (kept here for reference) with the
+indexed ``DistilledUmlsStore.suggest``, with and without a category filter.
+
+Usage
+-----
+    python ops/tools/bench_umls_suggest.py --map data/knowledge/ip_umls_map.json
+    # No map at hand: generate a synthetic vocabulary of N terms
+    python ops/tools/bench_umls_suggest.py --synthetic 80000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import string
+import sys
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.umls.ip_umls_store import DistilledUmlsStore, normalize_strict  # noqa: E402
+
+
+def _legacy_suggest(store: DistilledUmlsStore, prefix: str, category: str | None, limit: int) -> list[str]:
+    prefix_norm = normalize_strict(prefix)
+    terms = store.sorted_terms
+    out: list[str] = []
+    for idx in range(bisect_left(terms, prefix_norm), len(terms)):
+        if len(out) >= limit:
+            break
+        term = terms[idx]
+        if not term.startswith(prefix_norm):
+            break
+        cui = store._choose_cui(list(store.term_index_strict.get(term) or []), category)
+        if not cui:
+            continue
+        categories = store.concepts.get(cui, {}).get("categories", []) or []
+        if category and category not in categories:
+            continue
+        out.append(term)
+    return out
+
+
+def _synthetic_payload(n_terms: int, seed: int = 7) -> dict[str, Any]:
+    rng = random.Random(seed)
+    categories = ["anatomy", "procedure", "device", "disease", "pharmacologic"]
+    weights = [0.35, 0.2, 0.05, 0.35, 0.05]
+    concepts: dict[str, Any] = {}
+    term_index: dict[str, list[str]] = {}
+    n_concepts = max(1, n_terms // 3)
+    for i in range(n_concepts):
+        cui = f"C{i:07d}"
+        concepts[cui] = {"name": f"concept {i}", "categories": rng.choices(categories, weights)}
+    for _ in range(n_terms):
+        words = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+            for _ in range(rng.randint(1, 4))
+        ]
+        term_index.setdefault(" ".join(words), []).append(f"C{rng.randrange(n_concepts):07d}")
+    return {"concepts": concepts, "term_index": term_index}
+
+
+def _percentiles(values: list[float]) -> str:
+    ordered = sorted(values)
+
+    def _pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+    return f"p50={_pct(0.5) * 1000:8.1f} us  p95={_pct(0.95) * 1000:8.1f} us  max={ordered[-1] * 1000:8.1f} us"
+
+
+def _run(fn: Callable[[str], Any], prefixes: list[str], repeat: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(repeat):
+        for prefix in prefixes:
+            t0 = time.perf_counter()
+            fn(prefix)
+            timings.append((time.perf_counter() - t0) * 1000.0)
+    return timings
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark UMLS prefix suggestions.")
+    parser.add_argument("--map", type=Path, default=ROOT / "data" / "knowledge" / "ip_umls_map.json")
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic terms instead of --map.")
+    parser.add_argument("--category", default="anatomy")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.synthetic > 0:
+        payload = _synthetic_payload(args.synthetic)
+    elif args.map.exists():
+        payload = json.loads(args.map.read_text(encoding="utf-8"))
+    else:
+        print(f"UMLS map not found: {args.map} (use --synthetic N)", file=sys.stderr)
+        return 1
+
+    store = DistilledUmlsStore(payload)
+    t0 = time.perf_counter()
+    store.suggest_index()
+    build_ms = (time.perf_counter() - t0) * 1000.0
+    print(f"terms={len(store.sorted_terms)} index build={build_ms:.1f} ms limit={args.limit}")
+
+    letters = string.ascii_lowercase
+    prefix_sets = {
+        1: list(letters),
+        2: sorted({term[:2] for term in store.sorted_terms if len(term) >= 2})[:200],
+        3: sorted({term[:3] for term in store.sorted_terms if len(term) >= 3})[:200],
+    }
+    for category in (None, args.category):
+        label = category or "(any)"
+        for length, prefixes in prefix_sets.items():
+            legacy = _run(lambda p: _legacy_suggest(store, p, category, args.limit), prefixes, args.repeat)
+            indexed = _run(lambda p: store.suggest(p, category=category, limit=args.limit), prefixes, args.repeat)
+            print(f"category={label:<10} len={length} legacy  {_percentiles(legacy)}")
+            print(f"category={label:<10} len={length} indexed {_percentiles(indexed)}")
+
+    fuzzy_prefixes = [term[:6][:-1] + "x" for term in store.sorted_terms[:: max(1, len(store.sorted_terms) // 100)]]
+    fuzzy = _run(lambda p: store.suggest(p, limit=args.limit, fuzzy=True), fuzzy_prefixes, 1)
+    print(f"fuzzy (len<=6, 1 typo)        {_percentiles(fuzzy)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -24,6 +24,9 @@ Usage
     # Verbose logging
     python ops/tools/build_ip_umls_map.py -v
 
+    # Only (re)compile the memory-mapped artifact from an existing JSON map
+    python ops/tools/build_ip_umls_map.py --compile-from data/knowledge/ip_umls_map.json
+
 Data Sources
 ------------
     ~/UMLS/2025AA/META/MRCONSO.RRF  — concept names & synonyms
@@ -36,6 +39,10 @@ Notes
     MRCONSO is ~10M lines, MRSTY ~3.7M, MRREL ~37M. This script streams
     them line-by-line so memory stays bounded. Typical run: ~2-3 min,
     output ~3-8 MB depending on options.
+
+    Alongside the JSON, a compiled ``ip_umls_map.umlsbin`` is written (sorted
+    term tables, CUI table, category bitsets). ``DistilledUmlsStore`` and
+    ``proc_nlp.umls_lite`` memory-map it instead of parsing the JSON.
 """
 
 from __future__ import annotations
@@ -732,6 +739,19 @@ def _build_output(
     }
 
 
+def _write_compiled(json_path: Path, compiled_path: Path | None) -> None:
+    """Compile *json_path* into the memory-mapped format used at runtime."""
+    repo_root = Path(__file__).resolve().parents[2]
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+    from app.umls.ip_umls_compiled import COMPILED_SUFFIX, write_compiled_ip_umls_map
+
+    dest = compiled_path or json_path.with_suffix(COMPILED_SUFFIX)
+    write_compiled_ip_umls_map(json_path, dest)
+    size_mb = dest.stat().st_size / (1024 * 1024)
+    logger.info("Wrote compiled UMLS map to %s (%.2f MB)", dest, size_mb)
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -766,6 +786,23 @@ def main() -> None:
         action="store_true",
         help="Include concept definitions from MRDEF.RRF (adds ~30%% file size).",
     )
+    parser.add_argument(
+        "--compiled-output",
+        type=Path,
+        default=None,
+        help="Compiled memory-mapped artifact path (default: <output>.umlsbin).",
+    )
+    parser.add_argument(
+        "--no-compiled",
+        action="store_true",
+        help="Skip writing the compiled memory-mapped artifact.",
+    )
+    parser.add_argument(
+        "--compile-from",
+        type=Path,
+        default=None,
+        help="Skip RRF extraction; only compile an existing JSON map into the binary format.",
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -778,6 +815,13 @@ def main() -> None:
         format="%(asctime)s [%(levelname)s] %(message)s",
     )
 
+    if args.compile_from is not None:
+        if not args.compile_from.exists():
+            logger.error("JSON map not found: %s", args.compile_from)
+            sys.exit(1)
+        _write_compiled(args.compile_from, args.compiled_output)
+        return
+
     # Validate RRF files exist
     umls_dir: Path = args.umls_dir
     required_files = ["MRCONSO.RRF", "MRSTY.RRF"]
@@ -864,6 +908,9 @@ def main() -> None:
     )
     logger.info("Category breakdown: %s", dict(output["_meta"]["category_counts"]))
 
+    if not args.no_compiled:
+        _write_compiled(args.output, args.compiled_output)
+
 
 if __name__ == "__main__":
     main()
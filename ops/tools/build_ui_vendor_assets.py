@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Fingerprint and precompress the UI vendor assets.
+
+For each vendor directory (``ui/static/phi_redactor/vendor`` and
+``ui/static/phi_redactor_classic/vendor`` by default) this writes
+``asset-manifest.json`` (content hash, size, fingerprinted name per file) and
+``.br``/``.gz`` copies of compressible files. ``.br`` needs the optional
+``brotli`` package; without it only ``.gz`` is written.
+
+Run it after the vendor bundles are in place (after
+``bootstrap_phi_redactor_vendor_bundle.py``) on the machine that serves them:
+the server ignores manifest entries for files whose size or mtime changed.
+Re-running is cheap; unchanged files keep their compressed copies.
+
+Usage
+-----
+    python ops/tools/build_ui_vendor_assets.py
+    python ops/tools/build_ui_vendor_assets.py --vendor-dir ui/static/phi_redactor/vendor --no-precompress
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.api.ui_assets import build_asset_manifest  # noqa: E402
+
+DEFAULT_VENDOR_DIRS = (
+    ROOT / "ui" / "static" / "phi_redactor" / "vendor",
+    ROOT / "ui" / "static" / "phi_redactor_classic" / "vendor",
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vendor-dir", type=Path, action="append", help="Vendor directory (repeatable)")
+    parser.add_argument("--no-precompress", action="store_true", help="Only write the manifest")
+    args = parser.parse_args(argv)
+
+    vendor_dirs = [d for d in (args.vendor_dir or DEFAULT_VENDOR_DIRS) if d.is_dir()]
+    if not vendor_dirs:
+        print("No vendor directories found; nothing to do.")
+        return 0
+    for vendor_dir in vendor_dirs:
+        started = time.perf_counter()
+        manifest = build_asset_manifest(vendor_dir, precompress=not args.no_precompress)
+        assets = manifest["assets"].values()
+        raw = sum(a["size"] for a in assets)
+        best = sum(min([a["size"], *a["encodings"].values()]) for a in assets)
+        print(
+            f"{vendor_dir}: {len(manifest['assets'])} files, {raw / 1e6:.1f} MB -> "
+            f"{best / 1e6:.1f} MB precompressed ({time.perf_counter() - started:.1f}s)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Compare prompt token counts (and optionally accuracy) with and without prompt budgeting.
+
+Token mode (default, offline): for every golden note, report the structurer
+note-text tokens before/after ``budget_note_text`` and which sections were
+dropped. Nothing is sent to an LLM.
+
+Accuracy mode (``--run-extraction``): run the extraction-first pipeline twice
+per note, with ``PROMPT_BUDGET_ENABLED=0`` and ``=1``, and compare code
+accuracy. The budget only changes LLM prompts, so run this with
+``PROCSUITE_ALLOW_ONLINE=1`` and LLM credentials; offline it exercises the
+stub LLM and both runs will match.
+
+Usage:
+    python ops/tools/eval_prompt_budget.py --input data/knowledge/golden_extractions_final
+    PROCSUITE_ALLOW_ONLINE=1 python ops/tools/eval_prompt_budget.py --run-extraction --limit 25 --output reports/prompt_budget.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.common.quality_eval import (  # noqa: E402
+    configure_offline_quality_eval_env,
+    detect_input_format,
+    evaluate_extraction_expectations,
+    iter_legacy_golden_entries,
+    load_unified_quality_corpus,
+    normalize_code,
+)
+
+if os.getenv("PROCSUITE_ALLOW_ONLINE", "").strip().lower() not in ("1", "true", "yes"):
+    configure_offline_quality_eval_env()
+
+
+def _load_cases(input_path: Path, pattern: str, limit: int) -> list[dict[str, Any]]:
+    cases: list[dict[str, Any]] = []
+    if detect_input_format(input_path) == "unified_quality_corpus":
+        for case in load_unified_quality_corpus(input_path).get("cases") or []:
+            cases.append({"id": str(case.get("id") or f"case_{len(cases) + 1}"), "note_text": case.get("note_text"), "case": case})
+    else:
+        for source_file, entry in iter_legacy_golden_entries(input_path, pattern):
+            note_text = next(
+                (entry[key] for key in ("note_text", "note", "text", "raw_text") if isinstance(entry.get(key), str)),
+                "",
+            )
+            codes = entry.get("cpt_codes") or entry.get("codes") or entry.get("expected_codes") or []
+            cases.append(
+                {
+                    "id": f"{Path(source_file).stem}:{len(cases) + 1}",
+                    "note_text": note_text,
+                    "expected_codes": sorted({normalize_code(str(code)) for code in codes if normalize_code(str(code))}),
+                }
+            )
+    cases = [case for case in cases if isinstance(case.get("note_text"), str) and case["note_text"].strip()]
+    return cases[:limit] if limit else cases
+
+
+def _token_row(note_text: str) -> dict[str, Any]:
+    from app.registry.processing.focus import get_procedure_focus
+    from app.registry.processing.prompt_budget import budget_note_text
+
+    _, meta = budget_note_text(get_procedure_focus(note_text), task="registry_extraction")
+    return {
+        "tokens_before": meta["tokens_before"],
+        "tokens_after": meta["tokens_after"],
+        "dropped_sections": [item["title"] for item in meta["dropped_sections"]],
+        "truncated": meta["truncated"],
+    }
+
+
+def _passed(case: dict[str, Any], result: Any) -> bool:
+    predicted = sorted({code for code in (normalize_code(item) for item in (result.cpt_codes or [])) if code})
+    if "case" in case:
+        report = evaluate_extraction_expectations(
+            case=case["case"],
+            record_dict=result.record.model_dump(exclude_none=False),
+            predicted_codes=predicted,
+            warnings=list(getattr(result, "warnings", []) or []),
+        )
+        return report["status"] == "passed"
+    return predicted == case["expected_codes"]
+
+
+def _run_extraction(cases: list[dict[str, Any]], rows: list[dict[str, Any]]) -> dict[str, Any]:
+    from app.registry.application.registry_service import RegistryService
+
+    service = RegistryService()
+    summary: dict[str, Any] = {}
+    for label, enabled in (("unbudgeted", "0"), ("budgeted", "1")):
+        os.environ["PROMPT_BUDGET_ENABLED"] = enabled
+        passed = 0
+        for case, row in zip(cases, rows):
+            ok = _passed(case, service.extract_fields_extraction_first(case["note_text"]))
+            row[f"passed_{label}"] = ok
+            passed += int(ok)
+        summary[f"pass_rate_{label}"] = round(passed / len(cases), 4)
+    summary["regressions"] = [row["id"] for row in rows if row["passed_unbudgeted"] and not row["passed_budgeted"]]
+    return summary
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", type=Path, default=Path("data/knowledge/golden_extractions_final"))
+    parser.add_argument("--pattern", default="golden_*.json", help="Glob for legacy golden directories.")
+    parser.add_argument("--limit", type=int, default=0, help="Max cases (0 = all).")
+    parser.add_argument("--run-extraction", action="store_true", help="Also compare accuracy with/without budgets.")
+    parser.add_argument("--output", type=Path, default=None, help="Optional JSON report path.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    cases = _load_cases(args.input, args.pattern, int(args.limit))
+    if not cases:
+        print(f"eval_prompt_budget: no cases found under {args.input}; skipping.")
+        return 0
+
+    os.environ["PROMPT_BUDGET_ENABLED"] = "1"  # report what the (opt-in) budget would drop
+    rows = [{"id": case["id"], **_token_row(case["note_text"])} for case in cases]
+    before = [row["tokens_before"] for row in rows]
+    after = [row["tokens_after"] for row in rows]
+    summary: dict[str, Any] = {
+        "cases": len(rows),
+        "tokens_before_total": sum(before),
+        "tokens_after_total": sum(after),
+        "token_reduction": round(1 - sum(after) / max(1, sum(before)), 4),
+        "tokens_before_p95": sorted(before)[int(0.95 * (len(before) - 1))],
+        "tokens_after_p95": sorted(after)[int(0.95 * (len(after) - 1))],
+        "tokens_after_median": statistics.median(after),
+        "pruned_cases": sum(1 for row in rows if row["dropped_sections"] or row["truncated"]),
+    }
+    if args.run_extraction:
+        summary.update(_run_extraction(cases, rows))
+
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"summary": summary, "per_case": rows}, indent=2) + "\n", encoding="utf-8")
+        print(f"eval_prompt_budget: wrote report to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Run `/v1/jobs` workers outside the API process.
+
+Boots the same runtime as the API (startup bootstrap: executors, LLM limiter,
+warmup), without serving HTTP, and drains the job queue in the registry store
+DB (``REGISTRY_STORE_DATABASE_URL``). Run as many copies as needed; workers
+coordinate only through the queue table. Pair with ``JOBS_WORKERS=0`` on the
+API so it only enqueues:
+
+    JOBS_ENABLED=1 JOBS_WORKERS=0 ./ops/devserver.sh &
+    REGISTRY_STORE_DATABASE_URL=postgresql://... python ops/tools/job_worker.py --workers 2
+
+SIGINT/SIGTERM stop claiming new jobs. A job still in progress keeps its lease
+and is redelivered to another worker after ``JOBS_VISIBILITY_TIMEOUT_S``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent jobs in this process (default: 1)")
+    return parser.parse_args(argv)
+
+
+async def run(workers: int) -> None:
+    from fastapi import FastAPI
+
+    from app.api.bootstrap import StartupBootstrap
+
+    app = FastAPI()
+    bootstrap = StartupBootstrap(app)
+    await bootstrap.startup()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    print(f"job_worker: {workers} worker(s) running; Ctrl-C to stop", flush=True)
+    try:
+        await stop.wait()
+    finally:
+        await bootstrap.shutdown()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.workers < 1:
+        print("job_worker: --workers must be at least 1")
+        return 1
+    # The bootstrap starts the workers from these settings.
+    os.environ["JOBS_ENABLED"] = "1"
+    os.environ["JOBS_WORKERS"] = str(args.workers)
+    asyncio.run(run(args.workers))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Inspect or invalidate the tiered LLM response cache.
+
+Uses the same settings as the app (``ENABLE_LLM_CACHE``, ``LLM_CACHE_PATH``,
+``ENABLE_REDIS_CACHE`` / ``REDIS_URL``).
+
+Usage
+-----
+    ENABLE_LLM_CACHE=1 python ops/tools/llm_cache.py stats
+    # After editing a prompt: drop entries written under older prompt versions
+    ENABLE_LLM_CACHE=1 python ops/tools/llm_cache.py invalidate registry_extraction --keep-prompt-version v7
+    ENABLE_LLM_CACHE=1 python ops/tools/llm_cache.py invalidate llm_detailed
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.infra.llm_cache import get_llm_cache  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Print tiers and per-namespace entry/byte counts")
+    invalidate = sub.add_parser("invalidate", help="Drop a namespace (task) or its stale prompt versions")
+    invalidate.add_argument("namespace")
+    invalidate.add_argument("--keep-prompt-version", default=None)
+    args = parser.parse_args(argv)
+
+    cache = get_llm_cache()
+    if args.command == "stats":
+        print(json.dumps(cache.stats(), indent=2, sort_keys=True))
+        return 0
+
+    removed = cache.invalidate(args.namespace, keep_prompt_version=args.keep_prompt_version)
+    print(json.dumps({"namespace": args.namespace, "removed": removed}))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
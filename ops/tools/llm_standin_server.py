@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""Local stand-in for the OpenAI and Gemini APIs, with simulated latency and faults.
+
+It serves the subset of each provider API that the LLM stack calls:
+
+- ``POST /v1/chat/completions`` (including ``stream=true`` SSE)
+- ``POST /v1/responses``
+- ``POST /v1beta/models/{model}:generateContent`` and ``:streamGenerateContent?alt=sse``
+
+Response text comes from canned responses in a JSONL file (``--responses``),
+one ``{"task": "...", "match": "<regex>", "response": <object or string>}``
+per line. The first ``match`` found in the prompt text wins. Without a match,
+the server returns the smallest object that satisfies the request's JSON
+schema (``response_format`` / ``response_schema``), or ``{}``.
+
+Each request waits for a latency drawn from ``--latency``:
+
+- ``fixed:MS``
+- ``uniform:LO_MS,HI_MS``
+- ``lognormal:MEDIAN_MS,SIGMA``
+
+``--rate-429`` and ``--rate-5xx`` inject failures. Injected 429 and 503
+responses carry ``Retry-After: --retry-after``. ``GET /__standin/stats``
+reports request counts per endpoint, task and status.
+
+Point the app at it with:
+
+    OPENAI_BASE_URL=http://127.0.0.1:8787 OPENAI_API_KEY=standin
+    GEMINI_BASE_URL=http://127.0.0.1:8787/v1beta/models GEMINI_API_KEY=standin
+    PROCSUITE_ALLOW_ONLINE=1 (and OPENAI_OFFLINE/GEMINI_OFFLINE unset)
+
+Usage:
+    python ops/tools/llm_standin_server.py --port 8787 --latency lognormal:1500,0.6 --rate-429 0.05
+    python ops/tools/llm_standin_server.py --responses reports/recorded_llm_responses.jsonl --latency fixed:300
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass(frozen=True)
+class Latency:
+    kind: str = "fixed"
+    a: float = 0.0
+    b: float = 0.0
+
+    @staticmethod
+    def parse(spec: str) -> "Latency":
+        """Parse ``fixed:MS`` / ``uniform:LO,HI`` / ``lognormal:MEDIAN,SIGMA`` (milliseconds)."""
+        kind, _, args = (spec or "fixed:0").partition(":")
+        values = [float(value) for value in args.split(",") if value.strip()] or [0.0]
+        kind = kind.strip().lower()
+        if kind == "fixed":
+            return Latency("fixed", values[0])
+        if kind in {"uniform", "lognormal"} and len(values) == 2:
+            return Latency(kind, values[0], values[1])
+        raise ValueError(f"bad latency spec {spec!r} (fixed:MS | uniform:LO,HI | lognormal:MEDIAN,SIGMA)")
+
+    def sample_s(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            ms = rng.uniform(self.a, self.b)
+        elif self.kind == "lognormal":
+            ms = rng.lognormvariate(math.log(max(self.a, 1e-3)), self.b)
+        else:
+            ms = self.a
+        return max(0.0, ms) / 1000.0
+
+
+@dataclass(frozen=True)
+class CannedResponse:
+    task: str
+    pattern: re.Pattern[str]
+    text: str
+
+
+@dataclass
+class StandinConfig:
+    latency: Latency = field(default_factory=Latency)
+    rate_429: float = 0.0
+    rate_5xx: float = 0.0
+    retry_after_s: float = 1.0
+    stream_chunk_chars: int = 64
+    seed: int | None = None
+    responses: list[CannedResponse] = field(default_factory=list)
+
+
+def load_responses(path: Path) -> list[CannedResponse]:
+    canned: list[CannedResponse] = []
+    for line_no, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        response = row.get("response")
+        text = response if isinstance(response, str) else json.dumps(response)
+        canned.append(
+            CannedResponse(
+                task=str(row.get("task") or f"line_{line_no}"),
+                pattern=re.compile(str(row.get("match") or ""), re.IGNORECASE | re.DOTALL),
+                text=text,
+            )
+        )
+    return canned
+
+
+def minimal_instance(schema: dict[str, Any] | None, defs: dict[str, Any] | None = None) -> Any:
+    """Smallest value satisfying a (Pydantic-style) JSON schema: required fields only."""
+    if not isinstance(schema, dict):
+        return {}
+    defs = defs if defs is not None else {**schema.get("$defs", {}), **schema.get("definitions", {})}
+    if "$ref" in schema:
+        return minimal_instance(defs.get(str(schema["$ref"]).rsplit("/", 1)[-1]), defs)
+    if "default" in schema:
+        return schema["default"]
+    if "const" in schema:
+        return schema["const"]
+    if schema.get("enum"):
+        return schema["enum"][0]
+    for key in ("anyOf", "oneOf", "allOf"):
+        options = schema.get(key)
+        if options:
+            if any(option.get("type") == "null" for option in options if isinstance(option, dict)):
+                return None
+            return minimal_instance(options[0], defs)
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = "null" if "null" in kind else kind[0]
+    if kind == "object" or "properties" in schema:
+        properties = schema.get("properties") or {}
+        return {name: minimal_instance(properties.get(name), defs) for name in schema.get("required") or []}
+    return {"array": [], "string": "", "integer": 0, "number": 0, "boolean": False, "null": None}.get(
+        str(kind), {}
+    )
+
+
+def _prompt_text(payload: dict[str, Any]) -> str:
+    parts: list[str] = []
+    for message in payload.get("messages") or []:
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(str(item.get("text") or "") for item in content if isinstance(item, dict))
+    prompt_input = payload.get("input")
+    if isinstance(prompt_input, str):
+        parts.append(prompt_input)
+    elif isinstance(prompt_input, list):
+        parts.append(json.dumps(prompt_input))
+    for content in payload.get("contents") or []:
+        parts.extend(str(part.get("text") or "") for part in content.get("parts") or [] if isinstance(part, dict))
+    return "\n".join(parts)
+
+
+def _request_schema(payload: dict[str, Any]) -> dict[str, Any] | None:
+    response_format = payload.get("response_format") or {}
+    if isinstance(response_format, dict) and isinstance(response_format.get("json_schema"), dict):
+        return response_format["json_schema"].get("schema")
+    text_format = (payload.get("text") or {}).get("format") if isinstance(payload.get("text"), dict) else None
+    if isinstance(text_format, dict) and isinstance(text_format.get("schema"), dict):
+        return text_format["schema"]
+    generation_config = payload.get("generationConfig") or {}
+    return generation_config.get("response_schema") or generation_config.get("responseSchema")
+
+
+class Standin:
+    def __init__(self, config: StandinConfig) -> None:
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.stats: Counter[str] = Counter()
+
+    def _record(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self.stats[key] += 1
+
+    def reply(self, payload: dict[str, Any]) -> tuple[str, str]:
+        """``(task, response text)`` for a request payload."""
+        prompt = _prompt_text(payload)
+        for canned in self.config.responses:
+            if canned.pattern.search(prompt):
+                return canned.task, canned.text
+        return "default", json.dumps(minimal_instance(_request_schema(payload)))
+
+    async def handle(self, endpoint: str, payload: dict[str, Any], *, stream: bool, model: str) -> Any:
+        with self._lock:
+            delay = self.config.latency.sample_s(self._rng)
+            roll = self._rng.random()
+        await asyncio.sleep(delay)
+
+        retry_after = {"Retry-After": f"{self.config.retry_after_s:g}"}
+        if roll < self.config.rate_429:
+            self._record("requests", f"endpoint:{endpoint}", "status:429")
+            return JSONResponse(
+                {"error": {"message": "stand-in rate limit", "type": "rate_limit_exceeded"}},
+                status_code=429,
+                headers=retry_after,
+            )
+        if roll < self.config.rate_429 + self.config.rate_5xx:
+            status = self._rng.choice((500, 502, 503))
+            self._record("requests", f"endpoint:{endpoint}", f"status:{status}")
+            return JSONResponse(
+                {"error": {"message": "stand-in upstream failure", "type": "server_error"}},
+                status_code=status,
+                headers=retry_after if status == 503 else None,
+            )
+
+        task, text = self.reply(payload)
+        self._record("requests", f"endpoint:{endpoint}", f"task:{task}", "status:200")
+        if endpoint == "chat":
+            if stream:
+                return _sse(self._openai_chunks(model, text, payload))
+            return _openai_chat_body(model, text)
+        if endpoint == "responses":
+            return {
+                "id": "resp_standin",
+                "object": "response",
+                "model": model,
+                "output": [{"type": "message", "content": [{"type": "output_text", "text": text}]}],
+                "usage": _usage(payload, text, input_key="input_tokens", output_key="output_tokens"),
+            }
+        if stream:
+            return _sse(self._gemini_chunks(text))
+        return {
+            "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP"}],
+            "usageMetadata": {"promptTokenCount": len(_prompt_text(payload)) // 4, "candidatesTokenCount": len(text) // 4},
+        }
+
+    def _chunks(self, text: str) -> list[str]:
+        size = max(1, int(self.config.stream_chunk_chars))
+        return [text[i : i + size] for i in range(0, len(text), size)] or [""]
+
+    def _openai_chunks(self, model: str, text: str, payload: dict[str, Any]) -> list[dict[str, Any]]:
+        chunks: list[dict[str, Any]] = [
+            {"model": model, "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}]}
+            for chunk in self._chunks(text)
+        ]
+        chunks.append({"model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            chunks.append({"model": model, "choices": [], "usage": _usage(payload, text)})
+        return chunks
+
+    def _gemini_chunks(self, text: str) -> list[dict[str, Any]]:
+        pieces = self._chunks(text)
+        return [
+            {
+                "candidates": [
+                    {
+                        "content": {"parts": [{"text": piece}], "role": "model"},
+                        **({"finishReason": "STOP"} if idx == len(pieces) - 1 else {}),
+                    }
+                ]
+            }
+            for idx, piece in enumerate(pieces)
+        ]
+
+
+def _usage(
+    payload: dict[str, Any], text: str, *, input_key: str = "prompt_tokens", output_key: str = "completion_tokens"
+) -> dict[str, int]:
+    input_tokens = len(_prompt_text(payload)) // 4
+    output_tokens = len(text) // 4
+    return {input_key: input_tokens, output_key: output_tokens, "total_tokens": input_tokens + output_tokens}
+
+
+def _openai_chat_body(model: str, text: str) -> dict[str, Any]:
+    return {
+        "id": "chatcmpl-standin",
+        "object": "chat.completion",
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(text) // 4, "total_tokens": len(text) // 4},
+    }
+
+
+def _sse(chunks: list[dict[str, Any]]) -> StreamingResponse:
+    async def _body() -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            yield f"data: {json.dumps(chunk)}\n\n".encode()
+        yield b"data: [DONE]\n\n"
+
+    return StreamingResponse(_body(), media_type="text/event-stream")
+
+
+def build_app(config: StandinConfig | None = None) -> FastAPI:
+    standin = Standin(config or StandinConfig())
+    app = FastAPI(title="LLM stand-in")
+    app.state.standin = standin
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request) -> Any:
+        payload = await request.json()
+        return await standin.handle(
+            "chat", payload, stream=bool(payload.get("stream")), model=str(payload.get("model") or "standin")
+        )
+
+    @app.post("/v1/responses")
+    async def responses(request: Request) -> Any:
+        payload = await request.json()
+        return await standin.handle("responses", payload, stream=False, model=str(payload.get("model") or "standin"))
+
+    @app.post("/v1beta/models/{model_method}")
+    async def gemini(model_method: str, request: Request) -> Any:
+        model, _, method = model_method.partition(":")
+        if method not in {"generateContent", "streamGenerateContent"}:
+            return JSONResponse({"error": {"message": f"unsupported method {method!r}"}}, status_code=404)
+        payload = await request.json()
+        return await standin.handle("gemini", payload, stream=method == "streamGenerateContent", model=model)
+
+    @app.get("/__standin/stats")
+    async def stats() -> dict[str, int]:
+        return dict(standin.stats)
+
+    return app
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--responses", type=Path, default=None, help="JSONL of canned responses (task/match/response).")
+    parser.add_argument("--latency", default="lognormal:1200,0.5", help="fixed:MS | uniform:LO,HI | lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429.")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="Fraction of requests answered with 500/502/503.")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on injected 429/503.")
+    parser.add_argument("--stream-chunk-chars", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import uvicorn
+
+    args = parse_args(argv)
+    config = StandinConfig(
+        latency=Latency.parse(args.latency),
+        rate_429=max(0.0, args.rate_429),
+        rate_5xx=max(0.0, args.rate_5xx),
+        retry_after_s=max(0.0, args.retry_after),
+        stream_chunk_chars=args.stream_chunk_chars,
+        seed=args.seed,
+        responses=load_responses(args.responses) if args.responses else [],
+    )
+    print(
+        f"llm_standin_server: http://{args.host}:{args.port} latency={args.latency} "
+        f"429={config.rate_429:g} 5xx={config.rate_5xx:g} canned={len(config.responses)}"
+    )
+    uvicorn.run(build_app(config), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
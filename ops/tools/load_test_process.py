@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Drive ``/api/v1/process`` at a target request rate and report latency and errors.
+
+The harness is open-loop: request ``i`` starts at ``i / rps`` seconds whether
+or not earlier requests have finished, so a slow server builds a queue
+instead of slowing the client down. ``--max-in-flight`` caps outstanding
+requests. Starts that would go over the cap are counted as
+``client_saturated`` and not sent.
+
+The report covers:
+
+- throughput (completed requests per second)
+- latency p50/p95/p99/max, for all responses and for 200s only
+- the mix of status codes and client-side exceptions
+- with ``--standin-url``, the upstream counts from ``llm_standin_server.py``
+
+Pair it with the stand-in server to load-test the real LLM HTTP paths (pooling,
+retries, adaptive concurrency, deadlines) without provider costs:
+
+    python ops/tools/llm_standin_server.py --port 8787 --latency lognormal:1500,0.6 --rate-429 0.05 &
+    OPENAI_BASE_URL=http://127.0.0.1:8787 OPENAI_API_KEY=standin LLM_PROVIDER=openai_compat \\
+        OPENAI_MODEL=gpt-4.1 PROCSUITE_ALLOW_ONLINE=1 ./ops/devserver.sh &
+    python ops/tools/load_test_process.py --rps 5 --duration 60 --standin-url http://127.0.0.1:8787 \\
+        --output reports/load_test.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_NOTES = ROOT / "tests" / "fixtures"
+
+
+def load_notes(path: Path) -> list[str]:
+    """Notes from a ``.txt`` file, a directory of ``.txt`` files, or JSONL with ``note``/``note_text``."""
+    if path.is_dir():
+        texts = [p.read_text(encoding="utf-8") for p in sorted(path.glob("*.txt"))]
+        return [text for text in texts if text.strip()]
+    if path.suffix == ".jsonl":
+        notes = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                row = json.loads(line)
+                note = row.get("note") or row.get("note_text") or row.get("text")
+                if isinstance(note, str) and note.strip():
+                    notes.append(note)
+        return notes
+    return [path.read_text(encoding="utf-8")]
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Linear-interpolated ``q`` percentile (0-100) of ``values``."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _latency_summary(values_ms: list[float]) -> dict[str, float | None]:
+    return {
+        "p50": _round(percentile(values_ms, 50)),
+        "p95": _round(percentile(values_ms, 95)),
+        "p99": _round(percentile(values_ms, 99)),
+        "max": _round(max(values_ms) if values_ms else None),
+    }
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 1)
+
+
+def summarize(results: list[dict[str, Any]], *, elapsed_s: float, saturated: int) -> dict[str, Any]:
+    outcomes = Counter(str(row["outcome"]) for row in results)
+    if saturated:
+        outcomes["client_saturated"] = saturated
+    all_ms = [row["latency_ms"] for row in results]
+    ok_ms = [row["latency_ms"] for row in results if row["outcome"] == 200]
+    return {
+        "sent": len(results),
+        "completed_ok": len(ok_ms),
+        "elapsed_s": round(elapsed_s, 2),
+        "throughput_rps": round(len(results) / elapsed_s, 3) if elapsed_s > 0 else 0.0,
+        "ok_rps": round(len(ok_ms) / elapsed_s, 3) if elapsed_s > 0 else 0.0,
+        "latency_ms": _latency_summary(all_ms),
+        "latency_ms_ok": _latency_summary(ok_ms),
+        "outcomes": dict(sorted(outcomes.items())),
+    }
+
+
+async def _one(client: httpx.AsyncClient, url: str, body: dict[str, Any]) -> dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        response = await client.post(url, json=body)
+        outcome: int | str = response.status_code
+    except httpx.HTTPError as exc:
+        outcome = type(exc).__name__
+    return {"outcome": outcome, "latency_ms": (time.perf_counter() - started) * 1000.0}
+
+
+async def run_load(
+    *,
+    url: str,
+    notes: list[str],
+    rps: float,
+    duration_s: float,
+    max_in_flight: int,
+    timeout_s: float,
+    already_scrubbed: bool = True,
+    extra: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    total = max(1, int(rps * duration_s))
+    results: list[dict[str, Any]] = []
+    tasks: set[asyncio.Task[None]] = set()
+    saturated = 0
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+
+    async with httpx.AsyncClient(timeout=timeout_s, limits=limits) as client:
+
+        async def _run(body: dict[str, Any]) -> None:
+            results.append(await _one(client, url, body))
+
+        started = time.perf_counter()
+        for i in range(total):
+            delay = started + i / rps - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(tasks) >= max_in_flight:
+                saturated += 1
+                continue
+            body = {"note": notes[i % len(notes)], "already_scrubbed": already_scrubbed, **(extra or {})}
+            task = asyncio.create_task(_run(body))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    summary = summarize(results, elapsed_s=elapsed, saturated=saturated)
+    summary.update({"target_rps": rps, "duration_s": duration_s, "max_in_flight": max_in_flight})
+    return summary
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000/api/v1/process")
+    parser.add_argument("--notes", type=Path, default=DEFAULT_NOTES, help="Note .txt file, directory, or JSONL.")
+    parser.add_argument("--rps", type=float, default=2.0, help="Target request starts per second.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to keep starting requests.")
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=300.0, help="Client timeout per request (seconds).")
+    parser.add_argument("--scrub", action="store_true", help="Send already_scrubbed=false (exercise PHI redaction).")
+    parser.add_argument("--include-v3-event-log", action="store_true")
+    parser.add_argument("--standin-url", default=None, help="llm_standin_server base URL to include upstream stats.")
+    parser.add_argument("--output", type=Path, default=None, help="Optional JSON report path.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    notes = load_notes(args.notes)
+    if not notes:
+        print(f"load_test_process: no notes found under {args.notes}")
+        return 1
+    if args.rps <= 0 or args.duration <= 0:
+        print("load_test_process: --rps and --duration must be positive")
+        return 1
+
+    summary = asyncio.run(
+        run_load(
+            url=args.url,
+            notes=notes,
+            rps=args.rps,
+            duration_s=args.duration,
+            max_in_flight=max(1, args.max_in_flight),
+            timeout_s=args.timeout,
+            already_scrubbed=not args.scrub,
+            extra={"include_v3_event_log": True} if args.include_v3_event_log else None,
+        )
+    )
+    if args.standin_url:
+        try:
+            summary["upstream"] = httpx.get(f"{args.standin_url.rstrip('/')}/__standin/stats", timeout=10).json()
+        except httpx.HTTPError as exc:
+            summary["upstream"] = {"error": type(exc).__name__}
+
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+        print(f"load_test_process: wrote report to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
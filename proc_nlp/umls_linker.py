@@ -131,9 +131,9 @@ def umls_link_terms(terms: Iterable[str], category: str | None = None) -> List[U
     from app.umls.ip_umls_store import get_ip_umls_store
 
     store = get_ip_umls_store()
+    term_list = [str(term) for term in terms]
     concepts: List[UmlsConcept] = []
-    for term in terms:
-        match = store.match(term, category=category)
+    for term, match in zip(term_list, store.match_many(term_list, category=category)):
         if not match:
             continue
         score = 1.0 if match.get("match_type") == "exact" else 0.95
@@ -160,7 +160,24 @@ def umls_link(text: str, allowed_semtypes: Iterable[str] | None = None) -> List[
     if backend == "scispacy":
         return _umls_link_scispacy(text, allowed_semtypes=allowed_semtypes)
 
-    return umls_link_terms([text])
+    from app.umls.ip_umls_store import get_ip_umls_store
+
+    # Free text: one leftmost-longest pass with exact offsets per occurrence.
+    # Short inputs that only resolve via loose normalization (e.g. "EBUS TBNA")
+    # still go through whole-term matching.
+    concepts = [
+        UmlsConcept(
+            cui=str(match["chosen_cui"]),
+            score=1.0,
+            semtypes=tuple(match.get("semtypes", []) or ()),
+            preferred_name=str(match.get("preferred_name") or ""),
+            text=str(match["raw_text"]),
+            start_char=int(match["start_char"]),
+            end_char=int(match["end_char"]),
+        )
+        for match in get_ip_umls_store().link_text(text or "")
+    ]
+    return concepts or umls_link_terms([text])
 
 
 __all__ = ["UmlsConcept", "umls_link", "umls_link_terms"]
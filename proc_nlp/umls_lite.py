@@ -14,7 +14,9 @@ Usage
         print(c.cui, c.preferred_name, c.score)
 
 The map file is loaded lazily on first call and cached for the process
-lifetime (~2-5 MB memory vs ~1 GB for scispaCy UMLS linker).
+lifetime (~2-5 MB memory vs ~1 GB for scispaCy UMLS linker). When a compiled
+map is available (see ``app.umls.ip_umls_compiled``) it is memory-mapped
+instead of parsed, sharing pages with ``DistilledUmlsStore`` and other workers.
 """
 
 from __future__ import annotations
@@ -22,14 +24,19 @@ from __future__ import annotations
 import json
 import logging
 import os
-import re
+import threading
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+from app.umls.substring_index import TrigramIndex
+from app.umls.term_trie import TokenTrie
 
 logger = logging.getLogger(__name__)
 
+_TRIE_LOCK = threading.Lock()
+
 # Re-export the same semantic type set used by the extraction script
 _ALLOWED_SEMTYPES: Set[str] = {
     "T061",  # Therapeutic or Preventive Procedure
@@ -66,6 +73,15 @@ def _load_map() -> Dict[str, Any]:
         logger.warning("IP UMLS map not found at %s — umls_link_lite will return empty results", path)
         return {"concepts": {}, "term_index": {}}
 
+    compiled = _load_compiled(path)
+    if compiled is not None:
+        logger.info("Using compiled IP UMLS map %s", compiled.path)
+        return {
+            "concepts": compiled.concepts,
+            "term_index": compiled.strict,
+            "semtype_legend": compiled.semtype_legend,
+        }
+
     logger.info("Loading IP UMLS map from %s", path)
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
@@ -76,22 +92,40 @@ def _load_map() -> Dict[str, Any]:
     return data
 
 
-def _tokenize(text: str) -> List[str]:
-    """Split text into lowercase word tokens."""
-    return re.findall(r"[a-z][a-z0-9\-]{1,}", text.lower())
-
-
-def _ngrams(tokens: List[str], max_n: int = 4) -> List[Tuple[str, int, int]]:
-    """Generate n-grams from tokens with approximate character spans.
-
-    Returns (ngram_text, approx_start_char, approx_end_char).
-    """
-    results = []
-    for n in range(min(max_n, len(tokens)), 0, -1):
-        for i in range(len(tokens) - n + 1):
-            phrase = " ".join(tokens[i : i + n])
-            results.append((phrase, i, i + n))
-    return results
+def _load_compiled(path: Path):
+    """Return the shared compiled index for *path*, or None to parse the JSON."""
+    try:
+        from app.umls.ip_umls_compiled import load_compiled_for_json
+        from config.settings import UmlsSettings
+
+        settings = UmlsSettings()
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("Compiled UMLS map support unavailable: %s", exc)
+        return None
+    if not settings.use_compiled:
+        return None
+    try:
+        return load_compiled_for_json(
+            path,
+            compiled_path=settings.ip_umls_compiled_path,
+            cache_dir=settings.compiled_cache_dir,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Compiled IP UMLS map unavailable; parsing JSON instead: %s", exc)
+        return None
+
+
+def _get_trie(data: Dict[str, Any]) -> TokenTrie:
+    """Token trie over the loaded term index, built once per loaded map."""
+    trie = data.get("_token_trie")
+    if trie is None:
+        with _TRIE_LOCK:
+            trie = data.get("_token_trie")
+            if trie is None:
+                trie = TokenTrie.from_terms(data.get("term_index", {}))
+                data["_token_trie"] = trie
+                logger.info("Built UMLS token trie with %d terms", trie.size)
+    return trie
 
 
 def umls_link_lite(
@@ -102,58 +136,43 @@ def umls_link_lite(
     """Return UMLS concepts matched from the pre-built IP concept map.
 
     This is a lightweight alternative to proc_nlp.umls_linker.umls_link().
-    It performs exact term-index lookup using n-grams extracted from the input.
+    It scans the input once with a token trie over the term index, taking the
+    leftmost-longest term at each position. Every occurrence is reported with
+    exact character offsets into ``text``.
 
     Parameters
     ----------
     text : str
-        Free-text clinical snippet to link.
+        Free-text clinical snippet (or full note) to link.
     allowed_semtypes : set[str] | None
         Semantic types to accept. Defaults to the standard IP set.
     max_concepts : int
-        Maximum number of concepts to return.
+        Maximum number of distinct concepts (CUIs) to return. Every
+        occurrence of a returned concept is included.
 
     Returns
     -------
     list[UmlsConcept]
-        Matched concepts sorted by descending score (longer matches score higher).
+        Matched concepts sorted by descending score (longer matches score
+        higher), in text order within equal scores.
     """
-    clean = (text or "").strip()
-    if not clean:
+    if not (text or "").strip():
         return []
 
     semtype_filter = allowed_semtypes or _ALLOWED_SEMTYPES
     data = _load_map()
-    term_index: Dict[str, List[str]] = data.get("term_index", {})
-    concepts_db: Dict[str, Dict[str, Any]] = data.get("concepts", {})
+    term_index: Mapping[str, List[str]] = data.get("term_index", {})
+    concepts_db: Mapping[str, Dict[str, Any]] = data.get("concepts", {})
 
     if not term_index:
         return []
 
-    tokens = _tokenize(clean)
-    ngrams = _ngrams(tokens)
-
-    seen_cuis: Set[str] = set()
     results: List[UmlsConcept] = []
-
-    # Try to find character positions for matched terms
-    text_lower = clean.lower()
-
-    for phrase, tok_start, tok_end in ngrams:
-        if len(results) >= max_concepts:
-            break
-
-        cuis = term_index.get(phrase)
-        if not cuis:
-            continue
-
-        # Find actual character span in the original text
-        char_start = text_lower.find(phrase)
-        char_end = char_start + len(phrase) if char_start >= 0 else -1
-
+    for span in _get_trie(data).iter_matches(text):
+        cuis = term_index.get(span.term) or []
+        # Score: longer phrase matches get higher scores
+        score = round(min(1.0, span.token_count / 4.0 + 0.5), 3)
         for cui in cuis:
-            if cui in seen_cuis:
-                continue
             concept_data = concepts_db.get(cui)
             if not concept_data:
                 continue
@@ -162,24 +181,25 @@ def umls_link_lite(
             if not concept_semtypes.intersection(semtype_filter):
                 continue
 
-            seen_cuis.add(cui)
-            # Score: longer phrase matches get higher scores
-            score = min(1.0, len(phrase.split()) / 4.0 + 0.5)
-
             results.append(
                 UmlsConcept(
                     cui=cui,
-                    score=round(score, 3),
+                    score=score,
                     semtypes=tuple(concept_data.get("semtypes", [])),
                     preferred_name=concept_data.get("name", ""),
-                    text=phrase,
-                    start_char=max(char_start, 0),
-                    end_char=max(char_end, 0),
+                    text=text[span.start_char : span.end_char],
+                    start_char=span.start_char,
+                    end_char=span.end_char,
                 )
             )
 
     results.sort(key=lambda c: c.score, reverse=True)
-    return results[:max_concepts]
+    kept: Set[str] = set()
+    for concept in results:
+        if len(kept) >= max_concepts:
+            break
+        kept.add(concept.cui)
+    return [concept for concept in results if concept.cui in kept]
 
 
 def lookup_cui(cui: str) -> Optional[Dict[str, Any]]:
@@ -191,21 +211,37 @@ def lookup_cui(cui: str) -> Optional[Dict[str, Any]]:
     return data.get("concepts", {}).get(cui)
 
 
+def _get_substring_index(data: Dict[str, Any]) -> TrigramIndex:
+    """Trigram index over the loaded term index, built once per loaded map."""
+    index = data.get("_substring_index")
+    if index is None:
+        with _TRIE_LOCK:
+            index = data.get("_substring_index")
+            if index is None:
+                index = TrigramIndex(data.get("term_index", {}))
+                data["_substring_index"] = index
+                logger.info("Built UMLS trigram index over %d terms", len(index))
+    return index
+
+
 def search_terms(query: str, limit: int = 10) -> List[Tuple[str, List[str]]]:
     """Search the term index for entries containing the query string.
 
+    Candidates come from a trigram index (built on first use) and are
+    verified by substring match; results are ranked by match position, then
+    term length.
+
     Returns list of (term, [CUI, ...]) tuples.
     """
     data = _load_map()
     term_index = data.get("term_index", {})
+    if not term_index:
+        return []
     query_lower = query.strip().lower()
-    matches = []
-    for term, cuis in term_index.items():
-        if query_lower in term:
-            matches.append((term, cuis))
-            if len(matches) >= limit:
-                break
-    return matches
+    return [
+        (term, list(term_index.get(term) or []))
+        for term in _get_substring_index(data).search(query_lower, limit=limit)
+    ]
 
 
 __all__ = ["UmlsConcept", "umls_link_lite", "lookup_cui", "search_terms"]
@@ -1,6 +1,7 @@
 import asyncio
 import os
 from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import httpx
 import pytest
@@ -13,7 +14,10 @@ os.environ.setdefault("GEMINI_OFFLINE", "1")
 os.environ.setdefault("DISABLE_STATIC_FILES", "0")
 os.environ.setdefault("PHI_SCRUBBER_MODE", "stub")
 
+from app.api.dependencies import get_registry_service
 from app.api.fastapi_app import app
+from app.api.phi_dependencies import get_phi_scrubber
+from app.registry.application.registry_service import RegistryExtractionResult, RegistryRecord
 
 
 @pytest.fixture(autouse=True)
@@ -39,6 +43,35 @@ def setup_app_state():
     app.state.model_ready = False
 
 
+@pytest.fixture
+def extraction_result():
+    """Factory for a minimal fast-path extraction result with the given CPT codes."""
+
+    def _make(*cpt_codes: str) -> RegistryExtractionResult:
+        return RegistryExtractionResult(
+            record=RegistryRecord(),
+            cpt_codes=list(cpt_codes),
+            coder_difficulty="HIGH_CONF",
+            coder_source="ml_rules_fastpath",
+            mapped_fields={},
+            needs_manual_review=False,
+        )
+
+    return _make
+
+
+@pytest.fixture
+def stub_registry_service(extraction_result):
+    """Override the registry service with a mock (returning 31653) and stub the PHI scrubber."""
+    service = MagicMock()
+    service.extract_fields.return_value = extraction_result("31653")
+    app.dependency_overrides[get_registry_service] = lambda: service
+    app.dependency_overrides[get_phi_scrubber] = lambda: MagicMock()
+    yield service
+    app.dependency_overrides.pop(get_registry_service, None)
+    app.dependency_overrides.pop(get_phi_scrubber, None)
+
+
 @pytest_asyncio.fixture
 async def api_client():
     transport = httpx.ASGITransport(app=app, raise_app_exceptions=True)
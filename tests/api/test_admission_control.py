@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.fastapi_app import app
+from app.infra.admission import get_admission_controller
+from app.infra.settings import get_infra_settings
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def overloaded(stub_registry_service):
+    get_infra_settings.cache_clear()
+    get_admission_controller.cache_clear()
+    controller = get_admission_controller()
+    controller.record_cpu_latency(5.0)
+    controller.cpu_pending = controller.cpu_workers * 20
+    yield stub_registry_service
+    get_infra_settings.cache_clear()
+    get_admission_controller.cache_clear()
+
+
+def _process():
+    return client.post("/api/v1/process", json={"note": "Scrubbed note", "already_scrubbed": True})
+
+
+def test_overload_sheds_pipeline_requests_but_not_cheap_routes(overloaded) -> None:
+    response = _process()
+
+    assert response.status_code == 503
+    assert 1 <= int(response.headers["retry-after"]) <= 120
+    assert response.headers["x-admission"].startswith("shed;class=standard")
+    overloaded.extract_fields.assert_not_called()
+
+    assert client.get("/health").status_code == 200
+    snapshot = client.get("/health/admission").json()
+    assert snapshot["predicted_wait_s"] > snapshot["budgets_s"]["standard"]
+    assert snapshot["in_flight"] == 0
+
+
+def test_admission_control_can_be_disabled(overloaded, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ADMISSION_CONTROL", "0")
+    get_infra_settings.cache_clear()
+
+    response = _process()
+
+    assert response.status_code == 200
+    overloaded.extract_fields.assert_called_once()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.fastapi_app import app
+from app.api.services.job_worker import JobWorker
+from app.infra.settings import get_infra_settings
+from app.registry_store.job_queue import get_job_queue
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def jobs_service(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, stub_registry_service):
+    monkeypatch.setenv("JOBS_ENABLED", "1")
+    monkeypatch.setenv("REGISTRY_STORE_DATABASE_URL", f"sqlite:///{tmp_path / 'jobs.db'}")
+    get_infra_settings.cache_clear()
+    get_job_queue().ensure_table()
+    yield stub_registry_service
+    get_infra_settings.cache_clear()
+
+
+def _work_one() -> bool:
+    return asyncio.run(JobWorker(app, get_job_queue(), worker_id="test-worker").run_once())
+
+
+def _submit(note: str = "Scrubbed EBUS note", **extra):
+    return client.post("/api/v1/jobs", json={"note": note, "already_scrubbed": True, **extra})
+
+
+def test_submitted_job_is_processed_with_stage_progress(jobs_service) -> None:
+    submitted = _submit()
+    assert submitted.status_code == 202
+    status_url = submitted.json()["status_url"]
+    assert submitted.headers["location"] == status_url
+    assert client.get(status_url).json()["status"] == "queued"
+
+    assert _work_one()
+    body = client.get(status_url).json()
+    assert body["status"] == "succeeded"
+    assert body["attempts"] == 1
+    assert body["result"]["cpt_codes"] == ["31653"]
+    events = [(e.get("stage"), e["event"]) for e in body["progress"]]
+    assert events[:2] == [(None, "queued"), (None, "claimed")]
+    assert ("extraction", "started") in events and ("extraction", "finished") in events
+    assert events[-1] == (None, "succeeded")
+    assert body["expires_at"] is not None
+    assert not _work_one()
+
+
+def test_failed_attempts_are_requeued_and_jobs_can_be_cancelled(jobs_service) -> None:
+    jobs_service.extract_fields.side_effect = ValueError("extraction engine misconfigured")
+
+    status_url = _submit().json()["status_url"]
+    assert _work_one()
+    body = client.get(status_url).json()
+    assert body["status"] == "queued" and body["attempts"] == 1
+    assert body["status_code"] == 503 and "misconfigured" in body["error"]
+
+    cancelled = client.delete(status_url)
+    assert cancelled.status_code == 200 and cancelled.json()["status"] == "cancelled"
+    assert not _work_one()
+    assert client.get("/api/v1/jobs/not-a-job").status_code == 404
+
+
+def test_jobs_reject_unscrubbed_notes_and_respect_the_queue_limit(
+    jobs_service, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert client.post("/api/v1/jobs", json={"note": "Raw note"}).status_code == 400
+
+    monkeypatch.setenv("JOBS_MAX_QUEUED", "1")
+    get_infra_settings.cache_clear()
+    assert _submit().status_code == 202
+    full = _submit()
+    assert full.status_code == 503 and "retry-after" in full.headers
+
+    monkeypatch.setenv("JOBS_ENABLED", "0")
+    get_infra_settings.cache_clear()
+    assert _submit().status_code == 503
+    jobs_service.extract_fields.assert_not_called()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.fastapi_app import app
+from app.api.schemas import ProcessBatchItem, UnifiedProcessResponse
+from app.api.services.batch_processing import iter_batch_results
+from app.infra.settings import get_infra_settings
+from app.registry.application.registry_service import RegistryExtractionResult
+
+client = TestClient(app)
+
+
+def _lines(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines() if line.strip()]
+
+
+def test_batch_streams_results_in_completion_order_with_per_item_errors(
+    stub_registry_service, extraction_result
+) -> None:
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def _extract(note_text: str) -> RegistryExtractionResult:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        try:
+            if note_text == "slow":
+                time.sleep(0.3)
+            if note_text == "bad":
+                raise ValueError("extraction engine misconfigured")
+            return extraction_result("31622")
+        finally:
+            with lock:
+                in_flight -= 1
+
+    stub_registry_service.extract_fields.side_effect = _extract
+    payload = {
+        "items": [
+            {"id": "a", "note": "slow", "already_scrubbed": True},
+            {"id": "b", "note": "fast", "already_scrubbed": True},
+            {"id": "c", "note": "bad", "already_scrubbed": True},
+        ],
+        "concurrency": 3,
+    }
+
+    response = client.post("/api/v1/process/batch", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = _lines(response)
+    by_id = {row["id"]: row for row in rows}
+    assert set(by_id) == {"a", "b", "c"}
+    assert rows[-1]["id"] == "a"  # the slow note finishes last
+    assert by_id["a"]["index"] == 0 and by_id["a"]["status_code"] == 200
+    assert by_id["b"]["result"]["cpt_codes"] == ["31622"]
+    assert by_id["c"]["status_code"] == 503 and "misconfigured" in by_id["c"]["error"]
+    assert "result" not in by_id["c"]
+    assert peak >= 2
+
+
+def test_batch_concurrency_one_runs_items_sequentially(
+    stub_registry_service, extraction_result
+) -> None:
+    order: list[str] = []
+    def _extract(note_text: str) -> RegistryExtractionResult:
+        order.append(note_text)
+        return extraction_result("31624")
+
+    stub_registry_service.extract_fields.side_effect = _extract
+
+    response = client.post(
+        "/api/v1/process/batch",
+        json={
+            "items": [
+                {"id": str(i), "note": f"note {i}", "already_scrubbed": True} for i in range(4)
+            ],
+            "concurrency": 1,
+        },
+    )
+
+    assert response.headers["x-batch-concurrency"] == "1"
+    assert [row["id"] for row in _lines(response)] == ["0", "1", "2", "3"]
+    assert order == ["note 0", "note 1", "note 2", "note 3"]
+
+
+def test_batch_rejects_duplicate_ids_and_oversized_batches(
+    stub_registry_service, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    duplicate = {"items": [{"id": "x", "note": "a"}, {"id": "x", "note": "b"}]}
+    assert client.post("/api/v1/process/batch", json=duplicate).status_code == 422
+
+    monkeypatch.setenv("PROCESS_BATCH_MAX_ITEMS", "2")
+    get_infra_settings.cache_clear()
+    try:
+        items = [{"id": str(i), "note": "n", "already_scrubbed": True} for i in range(3)]
+        payload = {"items": items}
+        assert client.post("/api/v1/process/batch", json=payload).status_code == 413
+    finally:
+        get_infra_settings.cache_clear()
+    stub_registry_service.extract_fields.assert_not_called()
+
+
+def test_closing_the_result_stream_cancels_unfinished_items() -> None:
+    cancelled: list[str] = []
+
+    async def _run_item(item: ProcessBatchItem) -> UnifiedProcessResponse:
+        try:
+            await asyncio.sleep(0 if item.id == "fast" else 30)
+        except asyncio.CancelledError:
+            cancelled.append(item.id)
+            raise
+        return UnifiedProcessResponse(cpt_codes=["31622"])
+
+    async def _main() -> str:
+        items = [ProcessBatchItem(id=name, note="n") for name in ("slow", "fast")]
+        rows = iter_batch_results(items, run_item=_run_item, concurrency=2)
+        first = await anext(rows)
+        await rows.aclose()
+        await asyncio.sleep(0)
+        return first.id
+
+    assert asyncio.run(_main()) == "fast"
+    assert cancelled == ["slow"]
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import threading
+import time
+from unittest.mock import MagicMock
+
 import pytest
 from httpx import AsyncClient
 
+from app.api.dependencies import get_registry_service
+from app.api.fastapi_app import app
+from app.registry.application.registry_service import RegistryExtractionResult, RegistryRecord
+
 
 @pytest.mark.asyncio
 async def test_process_bundle_rejects_absolute_dates(api_client: AsyncClient) -> None:
@@ -85,3 +93,54 @@ async def test_process_bundle_succeeds_with_relative_tokens(api_client: AsyncCli
     timeline = data.get("timeline") or {}
     assert timeline.get("doc_offsets_by_role", {}).get("INDEX_PROCEDURE") == 0
     assert timeline.get("follow_up_offsets") == [5]
+
+
+@pytest.mark.asyncio
+async def test_process_bundle_runs_documents_concurrently_in_seq_order(
+    api_client: AsyncClient,
+) -> None:
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def _extract(note_text: str) -> RegistryExtractionResult:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        # Later seqs finish first, so completion order differs from seq order.
+        time.sleep(0.4 if "first" in note_text else 0.1)
+        with lock:
+            in_flight -= 1
+        return RegistryExtractionResult(
+            record=RegistryRecord(),
+            cpt_codes=[],
+            coder_difficulty="HIGH_CONF",
+            coder_source="ml_rules_fastpath",
+            mapped_fields={},
+            needs_manual_review=False,
+        )
+
+    service = MagicMock()
+    service.extract_fields.side_effect = _extract
+    app.dependency_overrides[get_registry_service] = lambda: service
+    payload = {
+        "zk_patient_id": "zk_1",
+        "episode_id": "ep_1",
+        "documents": [
+            {"timepoint_role": "FOLLOW_UP", "seq": 3, "text": "[SYSTEM: T+30 DAYS]\nthird"},
+            {"timepoint_role": "INDEX_PROCEDURE", "seq": 1, "text": "[SYSTEM: T+0 DAYS]\nfirst"},
+            {"timepoint_role": "PATHOLOGY", "seq": 2, "text": "[SYSTEM: T+4 DAYS]\nsecond"},
+        ],
+        "already_scrubbed": True,
+    }
+    try:
+        resp = await api_client.post("/api/v1/process_bundle", json=payload)
+    finally:
+        app.dependency_overrides.pop(get_registry_service, None)
+
+    assert resp.status_code == 200
+    docs = resp.json()["documents"]
+    assert [doc["seq"] for doc in docs] == [1, 2, 3]
+    assert [doc["doc_t_offset_days"] for doc in docs] == [0, 4, 30]
+    assert peak >= 2
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.api.fastapi_app import app
+
+client = TestClient(app)
+
+
+def _process(params: dict | None = None):
+    return client.post(
+        "/api/v1/process",
+        params=params,
+        json={"note": "Scrubbed EBUS note", "already_scrubbed": True},
+    )
+
+
+def test_full_response_matches_the_response_model(stub_registry_service) -> None:
+    response = _process()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["x-process-route"] == "router"
+    body = response.json()
+    assert body["cpt_codes"] == ["31653"]
+    assert {"registry", "evidence", "kb_version", "review_status"} <= set(body)
+    assert "registry_v3_event_log" not in body  # exclude_none, as with response_model_exclude_none
+
+
+def test_fields_selects_sections_and_keeps_review_flags(stub_registry_service) -> None:
+    full = _process().json()
+    response = _process({"fields": "registry,codes"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {
+        "registry",
+        "cpt_codes",
+        "suggestions",
+        "needs_manual_review",
+        "review_status",
+    }
+    assert body["cpt_codes"] == full["cpt_codes"]
+    assert len(response.content) < len(_process().content)
+
+    unknown = _process({"fields": "registry,bogus"})
+    assert unknown.status_code == 400
+    assert "bogus" in unknown.json()["detail"]["message"]
+    assert stub_registry_service.extract_fields.call_count == 3
+
+
+def test_bundle_fields_apply_to_each_document(stub_registry_service) -> None:
+    payload = {
+        "zk_patient_id": "zk_1",
+        "episode_id": "ep_1",
+        "already_scrubbed": True,
+        "documents": [
+            {
+                "timepoint_role": "INDEX_PROCEDURE",
+                "seq": 1,
+                "text": "[SYSTEM: T+0]\nBronchoscopy performed.",
+            },
+            {
+                "timepoint_role": "PATHOLOGY",
+                "seq": 2,
+                "text": "[SYSTEM: T+3]\nPathology follow-up.",
+            },
+        ],
+    }
+
+    response = client.post("/api/v1/process_bundle", params={"fields": "codes"}, json=payload)
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["zk_patient_id"] == "zk_1"
+    for doc in body["documents"]:
+        expected = {"cpt_codes", "suggestions", "needs_manual_review", "review_status"}
+        assert set(doc["result"]) == expected
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.fastapi_app import app
+from app.api.services.result_cache import get_process_result_cache
+from app.infra.settings import get_infra_settings
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def cached_service(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, stub_registry_service, extraction_result
+):
+    monkeypatch.setenv("PROCESS_RESULT_CACHE", "1")
+    monkeypatch.setenv("PROCESS_RESULT_CACHE_PATH", str(tmp_path / "process_cache.sqlite3"))
+    get_infra_settings.cache_clear()
+    get_process_result_cache.cache_clear()
+    stub_registry_service.extract_fields.side_effect = lambda note: extraction_result("31653")
+    yield stub_registry_service
+    get_infra_settings.cache_clear()
+    get_process_result_cache.cache_clear()
+
+
+def _post(note: str, **extra):
+    headers = extra.pop("headers", None)
+    return client.post(
+        "/api/v1/process",
+        json={"note": note, "already_scrubbed": True, **extra},
+        headers=headers,
+    )
+
+
+def test_repeat_submission_is_served_from_the_cache(cached_service) -> None:
+    first = _post("Scrubbed EBUS note", registry_uuid="case-1")
+    second = _post("Scrubbed EBUS note", registry_uuid="case-2")
+
+    assert first.headers["x-result-cache"] == "miss"
+    assert second.headers["x-result-cache"] == "hit"
+    assert cached_service.extract_fields.call_count == 1
+    assert second.json()["cpt_codes"] == first.json()["cpt_codes"] == ["31653"]
+    assert second.json()["registry_uuid"] == "case-2"
+
+    # Different response flags and an explicit no-cache both run the pipeline again.
+    assert _post("Scrubbed EBUS note", include_financials=False).headers["x-result-cache"] == "miss"
+    no_cache = _post("Scrubbed EBUS note", headers={"Cache-Control": "no-cache"})
+    assert no_cache.headers["x-result-cache"] == "miss"
+    assert cached_service.extract_fields.call_count == 3
+
+
+def test_pipeline_config_change_invalidates_entries(
+    cached_service, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert _post("Scrubbed note").headers["x-result-cache"] == "miss"
+    assert _post("Scrubbed note").headers["x-result-cache"] == "hit"
+
+    monkeypatch.setenv("LLM_PROMPT_VERSION", "result-cache-test-v2")
+    assert _post("Scrubbed note").headers["x-result-cache"] == "miss"
+    # The first write under the new fingerprint dropped the stale entry.
+    namespaces = get_process_result_cache().store.stats()["disk"]
+    assert namespaces["process"]["entries"] == 1
+
+    # Prompt budgets change what the LLM sees, so they are part of the fingerprint too.
+    monkeypatch.setenv("PROMPT_BUDGET_ENABLED", "1")
+    assert _post("Scrubbed note").headers["x-result-cache"] == "miss"
+
+
+def test_runs_degraded_by_a_transient_llm_error_are_not_cached(
+    cached_service, extraction_result
+) -> None:
+    def _extract(note: str):
+        result = extraction_result("31653")
+        result.warnings = ["REGISTRY_LLM_TIMEOUT_FALLBACK_TO_ENGINE"]
+        return result
+
+    cached_service.extract_fields.side_effect = _extract
+
+    assert _post("Scrubbed note").headers["x-result-cache"] == "miss"
+    assert _post("Scrubbed note").headers["x-result-cache"] == "miss"
+    assert cached_service.extract_fields.call_count == 2
+
+
+def test_unscrubbed_requests_bypass_the_cache(cached_service) -> None:
+    response = client.post("/api/v1/process", json={"note": "Raw note", "already_scrubbed": False})
+    assert "x-result-cache" not in response.headers
+
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.fastapi_app import app
+from observability.metrics import RegistryMetricsClient, reset_metrics_client, set_metrics_client
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def metrics(stub_registry_service):  # noqa: ARG001
+    registry = RegistryMetricsClient()
+    set_metrics_client(registry)
+    yield registry
+    reset_metrics_client()
+
+
+def _server_timing(header: str) -> dict[str, float]:
+    timings = {}
+    for entry in header.split(","):
+        name, _, dur = entry.strip().partition(";dur=")
+        timings[name] = float(dur)
+    return timings
+
+
+def test_process_reports_stage_timings(metrics) -> None:
+    note = "Patient underwent EBUS-TBNA of station 7."
+    response = client.post("/api/v1/process", json={"note": note, "already_scrubbed": True})
+
+    assert response.status_code == 200
+    timings = _server_timing(response.headers["server-timing"])
+    assert {"extraction", "coding", "response", "serialization", "total"} <= set(timings)
+    assert "phi_redaction" not in timings  # already scrubbed
+    assert timings["total"] >= timings["extraction"]
+
+    histograms = metrics.export_json()["histograms"]
+    stage_labels = set(histograms["pipeline_stage_ms"])
+    assert '{pipeline_mode="extraction_first",stage="extraction"}' in stage_labels
+    assert '{pipeline_mode="extraction_first",stage="serialization"}' in stage_labels
+    assert "response_serialize_ms" in histograms
+    assert "EBUS" not in metrics.export_prometheus()
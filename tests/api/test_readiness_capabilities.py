@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.bootstrap import startup_warmup_tasks
+from app.api.fastapi_app import app
+from app.api.readiness import WARMUP_CAPABILITIES, require_capabilities
+from app.infra.warmup_graph import WarmupGraph, WarmupTask
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def warming_registry_ml(stub_registry_service):  # noqa: ARG001
+    """A warmup graph where the registry ML model is still loading and the rest is warm."""
+    release = threading.Event()
+    graph = WarmupGraph(
+        [
+            WarmupTask("registry_service", lambda: None, capabilities=("nlp", "ner", "coding")),
+            WarmupTask("registry_ml", lambda: release.wait(10), capabilities=("registry_ml",)),
+        ]
+    )
+    graph.start()
+    asyncio.run(graph.wait_for_capabilities(["ner"], timeout=5))
+    app.state.model_ready = False
+    app.state.warmup = graph
+    yield release, graph
+    release.set()
+    graph.shutdown()
+    app.state.warmup = None
+
+
+def _process():
+    return client.post(
+        "/api/v1/process", json={"note": "Scrubbed EBUS note", "already_scrubbed": True}
+    )
+
+
+def test_ready_reports_capabilities_and_resources(warming_registry_ml) -> None:  # noqa: ARG001
+    response = client.get("/ready")
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "warming"
+    assert body["capabilities"]["registry_ml"] == "loading"
+    assert set(body["resources"]) == {"registry_service", "registry_ml"}
+
+    assert client.get("/ready", params={"capability": "ner"}).status_code == 200
+    both = [("capability", "ner"), ("capability", "registry_ml")]
+    assert client.get("/ready", params=both).status_code == 503
+
+    typo = client.get("/ready", params={"capability": "registry-ml"})
+    assert typo.status_code == 400
+    assert typo.json()["detail"] == "Unknown capability: registry-ml"
+
+
+def test_capability_names_are_checked_against_the_startup_warmup() -> None:
+    provided = {cap for task in startup_warmup_tasks() for cap in task.capabilities}
+    assert provided == set(WARMUP_CAPABILITIES)
+    with pytest.raises(ValueError, match="registry-ml"):
+        require_capabilities("ner", "registry-ml")
+    assert client.get("/ready", params={"capability": "registry-ml"}).status_code == 400
+
+
+def test_pipeline_routes_wait_only_for_the_capabilities_they_need(warming_registry_ml) -> None:
+    release, graph = warming_registry_ml
+
+    warming = _process()
+    assert warming.status_code == 503
+    assert warming.json()["detail"] == "Service warming up (registry_ml)"
+    assert warming.headers["retry-after"] == "10"
+
+    release.set()
+    assert graph.wait(5)
+    response = _process()
+    assert response.status_code == 200, response.text
+    assert response.json()["cpt_codes"] == ["31653"]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 import uuid
 from datetime import UTC, datetime
 
@@ -8,6 +9,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import sessionmaker
 
 from app.api.fastapi_app import app
+from app.infra.warmup_graph import WarmupGraph, WarmupTask
 from app.phi.db import Base
 from app.registry_store.dependencies import get_registry_store_engine
 from app.registry_store.models import RegistryAppendedDocument
@@ -179,3 +181,31 @@ def test_append_accepts_legacy_document_kind_alias(client: TestClient, append_db
     assert row.document_kind == "imaging"
     assert row.event_type == "imaging"
     assert row.relative_day_offset == -7
+
+
+def test_append_waits_for_the_pipeline_like_rebuild(client: TestClient, append_db) -> None:
+    case_id = uuid.uuid4()
+    _seed_case(append_db, user_id="user_a", registry_uuid=case_id)
+    release = threading.Event()
+    graph = WarmupGraph(
+        [
+            WarmupTask(
+                "services", lambda: None, capabilities=("nlp", "ner", "coding", "phi_server")
+            ),
+            WarmupTask("registry_ml", lambda: release.wait(10), capabilities=("registry_ml",)),
+        ]
+    )
+    graph.start()
+    app.state.warmup = graph
+    try:
+        resp = client.post(
+            f"/api/v1/registry/{case_id}/append",
+            headers=_auth("user_a"),
+            json={"note": "Pathology follow-up note (scrubbed).", "already_scrubbed": True},
+        )
+        assert resp.status_code == 503
+        assert resp.json()["detail"] == "Service warming up (registry_ml)"
+    finally:
+        release.set()
+        graph.shutdown()
+        app.state.warmup = None
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 import uuid
 from datetime import UTC, datetime
 
@@ -8,6 +9,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy.orm import sessionmaker
 
 from app.api.fastapi_app import app
+from app.infra.warmup_graph import WarmupGraph, WarmupTask
 from app.phi.db import Base
 from app.registry_store.dependencies import get_registry_store_engine
 from app.registry_store.models import RegistryAppendedDocument, RegistryCaseRecord, RegistryRun
@@ -224,3 +226,32 @@ def test_registry_case_rebuild_replays_baseline_and_events(client: TestClient, c
     assert any(
         ev["event_type"] == "pathology" and not ev["is_synthetic"] for ev in payload["events"]
     )
+
+
+def test_registry_case_rebuild_waits_for_warmup_but_reads_do_not(
+    client: TestClient, case_db
+) -> None:
+    case_id = uuid.uuid4()
+    _seed_user_case(case_db, user_id="user_a", registry_uuid=case_id)
+    case_db.commit()
+
+    release = threading.Event()
+    graph = WarmupGraph(
+        [
+            WarmupTask("registry_service", lambda: None, capabilities=("nlp", "ner", "coding")),
+            WarmupTask("registry_ml", lambda: release.wait(10), capabilities=("registry_ml",)),
+        ]
+    )
+    graph.start()
+    app.state.warmup = graph
+    try:
+        assert client.get(f"/api/v1/registry/{case_id}", headers=_auth("user_a")).status_code == 200
+        rebuild = client.post(
+            f"/api/v1/registry/{case_id}/rebuild", headers=_auth("user_a"), json={}
+        )
+        assert rebuild.status_code == 503
+        assert rebuild.json()["detail"] == "Service warming up (registry_ml)"
+    finally:
+        release.set()
+        graph.shutdown()
+        app.state.warmup = None
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api.fastapi_app as fastapi_app
+from app.api.ui_assets import build_asset_manifest
+
+client = TestClient(fastapi_app.app)
+SCRIPT = "export const worker = 1;\n" * 400
+
+
+@pytest.fixture
+def static_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    (tmp_path / "vendor" / "pdfjs").mkdir(parents=True)
+    (tmp_path / "vendor" / "pdfjs" / "pdf.worker.mjs").write_text(SCRIPT, encoding="utf-8")
+    monkeypatch.setattr(fastapi_app, "_phi_redactor_static_dir", lambda: tmp_path)
+    return tmp_path
+
+
+def test_fingerprinted_assets_are_immutable_and_precompressed(static_dir: Path) -> None:
+    manifest = build_asset_manifest(static_dir / "vendor")
+    entry = manifest["assets"]["pdfjs/pdf.worker.mjs"]
+
+    resp = client.get(
+        f"/ui/phi_redactor/vendor/{entry['fingerprinted']}", headers={"accept-encoding": "gzip"}
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["etag"] == f'"{entry["hash"]}-gzip"'
+    assert resp.headers["content-type"].startswith("text/javascript")
+    assert resp.headers["cross-origin-embedder-policy"] == "require-corp"
+    assert resp.text == SCRIPT  # httpx decodes the gzip body
+    assert int(resp.headers["content-length"]) == entry["encodings"]["gzip"]
+
+    stale = client.get("/ui/phi_redactor/vendor/pdfjs/pdf.worker.0000000000000000.mjs")
+    assert stale.status_code == 404
+
+
+def test_plain_names_revalidate_and_support_ranges(static_dir: Path) -> None:
+    build_asset_manifest(static_dir / "vendor")
+
+    resp = client.get("/ui/vendor/pdfjs/pdf.worker.mjs", headers={"accept-encoding": "identity"})
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "no-cache"
+    assert "content-encoding" not in resp.headers
+
+    not_modified = client.get(
+        "/ui/vendor/pdfjs/pdf.worker.mjs",
+        headers={"accept-encoding": "identity", "if-none-match": resp.headers["etag"]},
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    partial = client.get(
+        "/ui/vendor/pdfjs/pdf.worker.mjs",
+        headers={"range": "bytes=0-5", "accept-encoding": "gzip"},
+    )
+    assert partial.status_code == 206
+    assert partial.content == SCRIPT[:6].encode()
+    assert "content-encoding" not in partial.headers
+
+
+def test_changed_files_fall_back_to_plain_serving(static_dir: Path) -> None:
+    build_asset_manifest(static_dir / "vendor")
+    worker = static_dir / "vendor" / "pdfjs" / "pdf.worker.mjs"
+    worker.write_text("export const v2 = 1;\n", encoding="utf-8")
+
+    resp = client.get(
+        "/ui/phi_redactor/vendor/pdfjs/pdf.worker.mjs", headers={"accept-encoding": "gzip"}
+    )
+
+    assert resp.status_code == 200
+    assert resp.text == "export const v2 = 1;\n"
+    assert "content-encoding" not in resp.headers
+    assert gzip.decompress(worker.with_name("pdf.worker.mjs.gz").read_bytes()) == SCRIPT.encode()
+
+
+def test_only_html_entry_points_are_no_store() -> None:
+    assert client.get("/ui/phi_redactor/").headers["cache-control"] == "no-store"
+    app_js = client.get("/ui/phi_redactor/app.js")
+    assert app_js.headers["cache-control"] == "no-cache"
+    revalidated = client.get(
+        "/ui/phi_redactor/app.js", headers={"if-none-match": app_js.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
@@ -38,3 +38,28 @@ async def test_umls_concept_looks_up_cui(api_client, monkeypatch: pytest.MonkeyP
     payload = resp.json()
     assert payload["cui"] == "C0001"
     assert payload["preferred_name"] == "Right upper lobe"
+
+
+@pytest.mark.asyncio
+async def test_umls_match_batch_aligns_results(api_client, monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.umls.ip_umls_store import get_ip_umls_store
+
+    get_ip_umls_store.cache_clear()
+    monkeypatch.setenv("UMLS_ENABLE_LINKER", "true")
+    monkeypatch.setenv("ENABLE_UMLS_LINKER", "true")
+    monkeypatch.setenv("UMLS_LINKER_BACKEND", "distilled")
+    monkeypatch.setenv("UMLS_IP_UMLS_MAP_LOCAL_PATH", "tests/fixtures/ip_umls_map.small.json")
+    monkeypatch.setenv("UMLS_IP_UMLS_MAP_S3_URI", "")
+
+    resp = await api_client.post(
+        "/api/v1/umls/match",
+        json={"terms": ["EBUS TBNA", "unknown term", "rb1", "ebus-tbna"], "category": "anatomy"},
+    )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert len(results) == 4
+    assert results[0]["chosen_cui"] == "C0002"
+    assert results[0]["match_type"] == "loose"
+    assert results[1] is None
+    assert results[2]["chosen_cui"] == "C0003"
+    assert results[3]["raw_text"] == "ebus-tbna"
@@ -327,3 +327,71 @@ def test_self_correction_evidence_must_be_in_focused_text_when_available(
         "SELF_CORRECT_SKIPPED: 32550: Quote not found verbatim in focused procedure text" in w
         for w in result.warnings
     )
+
+
+def test_self_correction_concurrent_judge_calls_apply_in_priority_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    import threading
+
+    from ml.lib.ml_coder.predictor import CaseClassification, CodePrediction, MLCoderPredictor
+    from ml.lib.ml_coder.thresholds import CaseDifficulty
+
+    monkeypatch.setenv("PROCSUITE_PIPELINE_MODE", "extraction_first")
+    monkeypatch.setenv("REGISTRY_SELF_CORRECT_ENABLED", "1")
+    monkeypatch.setenv("REGISTRY_SELF_CORRECT_CONCURRENT", "1")
+    monkeypatch.setenv("REGISTRY_SELF_CORRECT_MAX_ATTEMPTS", "2")
+    monkeypatch.setenv("REGISTRY_AUDITOR_SOURCE", "raw_ml")
+
+    preds = [CodePrediction(cpt="32554", prob=0.95), CodePrediction(cpt="32550", prob=0.99)]
+    monkeypatch.setattr(MLCoderPredictor, "__init__", lambda self, *a, **k: None)
+    monkeypatch.setattr(
+        MLCoderPredictor,
+        "classify_case",
+        lambda self, raw_note_text: CaseClassification(
+            predictions=preds, high_conf=preds, gray_zone=[], difficulty=CaseDifficulty.HIGH_CONF
+        ),
+    )
+
+    from app.registry.self_correction.judge import PatchProposal, RegistryCorrectionJudge
+
+    # Both judge calls must be in flight at once, or the barrier times out.
+    barrier = threading.Barrier(2, timeout=10)
+    patches = {
+        "32550": ("/pleural_procedures/ipc/performed", "indwelling pleural catheter"),
+        "32554": ("/pleural_procedures/thoracentesis/performed", "thoracentesis was also performed"),
+    }
+
+    def _parallel_judge(  # type: ignore[no-untyped-def]
+        self,
+        note_text: str,
+        record: RegistryRecord,
+        discrepancy: str,
+        *,
+        focused_procedure_text: str | None = None,
+    ) -> PatchProposal:
+        barrier.wait()
+        cpt = next(code for code in patches if code in discrepancy)
+        path, quote = patches[cpt]
+        return PatchProposal(
+            rationale="documented",
+            json_patch=[{"op": "add", "path": path, "value": True}],
+            evidence_quote=quote,
+        )
+
+    monkeypatch.setattr(RegistryCorrectionJudge, "propose_correction", _parallel_judge)
+
+    service = RegistryService(hybrid_orchestrator=MagicMock(), registry_engine=_StubRegistryEngine())
+    result = service.extract_fields(
+        "PROCEDURE:\n"
+        "The patient underwent insertion of an indwelling pleural catheter (PleurX).\n"
+        "Ultrasound-guided thoracentesis was also performed.\n"
+        "No complications."
+    )
+
+    # Both proposals were made against the original record; the lower-priority
+    # one is still validated against the record patched by the first.
+    assert "32550" in result.cpt_codes
+    assert [w for w in result.warnings if w.startswith(("AUTO_CORRECTED", "SELF_CORRECT_SKIPPED"))] == [
+        "AUTO_CORRECTED: 32550",
+        "SELF_CORRECT_SKIPPED: 32554: patch did not derive target CPT",
+    ]
+    assert [meta.trigger.target_cpt for meta in result.self_correction] == ["32550"]
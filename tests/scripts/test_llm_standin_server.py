@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(name, ROOT / "ops" / "tools" / f"{name}.py")
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+standin = _load("llm_standin_server")
+load_test = _load("load_test_process")
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "note_id": {"type": "string"},
+        "procedures": {"type": "array", "items": {"$ref": "#/$defs/Event"}},
+        "flag": {"anyOf": [{"type": "boolean"}, {"type": "null"}]},
+        "mode": {"enum": ["a", "b"]},
+    },
+    "required": ["note_id", "procedures", "flag", "mode"],
+    "$defs": {"Event": {"type": "object", "properties": {"type": {"type": "string"}}, "required": ["type"]}},
+}
+
+
+def test_chat_answers_canned_or_schema_minimal_json(tmp_path: Path) -> None:
+    canned = tmp_path / "responses.jsonl"
+    canned.write_text(json.dumps({"task": "judge", "match": "self-correction", "response": {"patch": None}}) + "\n")
+    app = standin.build_app(standin.StandinConfig(responses=standin.load_responses(canned)))
+    client = TestClient(app)
+
+    body = client.post(
+        "/v1/chat/completions",
+        json={"model": "m", "messages": [{"role": "user", "content": "run self-correction"}]},
+    ).json()
+    assert json.loads(body["choices"][0]["message"]["content"]) == {"patch": None}
+
+    body = client.post(
+        "/v1/chat/completions",
+        json={
+            "model": "m",
+            "messages": [{"role": "user", "content": "extract"}],
+            "response_format": {"type": "json_schema", "json_schema": {"name": "X", "schema": SCHEMA}},
+        },
+    ).json()
+    assert json.loads(body["choices"][0]["message"]["content"]) == {
+        "note_id": "",
+        "procedures": [],
+        "flag": None,
+        "mode": "a",
+    }
+    assert client.get("/__standin/stats").json()["task:judge"] == 1
+
+
+def test_injected_faults_carry_retry_after_and_streams_are_sse() -> None:
+    client = TestClient(standin.build_app(standin.StandinConfig(rate_429=1.0, retry_after_s=2.5)))
+    response = client.post("/v1/responses", json={"model": "m", "input": "x"})
+    assert response.status_code == 429 and response.headers["retry-after"] == "2.5"
+
+    client = TestClient(standin.build_app(standin.StandinConfig(stream_chunk_chars=3)))
+    response = client.post(
+        "/v1beta/models/gemini-test:streamGenerateContent?alt=sse&key=k",
+        json={"contents": [{"parts": [{"text": "x"}]}], "generationConfig": {"response_schema": SCHEMA}},
+    )
+    chunks = [json.loads(line[5:]) for line in response.text.splitlines() if line.startswith("data: {")]
+    text = "".join(part["text"] for chunk in chunks for part in chunk["candidates"][0]["content"]["parts"])
+    assert json.loads(text)["mode"] == "a"
+    assert chunks[-1]["candidates"][0]["finishReason"] == "STOP"
+
+
+def test_latency_spec_parsing() -> None:
+    assert standin.Latency.parse("fixed:250").sample_s(None) == 0.25  # type: ignore[arg-type]
+    assert standin.Latency.parse("uniform:100,200").kind == "uniform"
+    with pytest.raises(ValueError):
+        standin.Latency.parse("lognormal:100")
+
+
+def test_percentiles_and_summary() -> None:
+    assert load_test.percentile([], 50) is None
+    assert load_test.percentile([10, 20, 30, 40], 50) == 25
+    summary = load_test.summarize(
+        [{"outcome": 200, "latency_ms": 100.0}, {"outcome": 503, "latency_ms": 5.0}],
+        elapsed_s=2.0,
+        saturated=1,
+    )
+    assert summary["outcomes"] == {"200": 1, "503": 1, "client_saturated": 1}
+    assert summary["ok_rps"] == 0.5 and summary["latency_ms_ok"]["p99"] == 100.0
+
+
+def test_openai_client_retries_through_the_standin_over_http(monkeypatch: pytest.MonkeyPatch) -> None:
+    import uvicorn
+
+    from app.common.llm import OpenAILLM
+    from app.infra.http_transport import close_http_clients
+    from app.infra.settings import get_infra_settings
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = standin.StandinConfig(latency=standin.Latency.parse("fixed:20"), rate_429=0.3, retry_after_s=0, seed=0)
+    server = uvicorn.Server(uvicorn.Config(standin.build_app(config), host="127.0.0.1", port=port, log_level="error"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if server.started:
+            break
+        time.sleep(0.02)
+
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{port}")
+    monkeypatch.setenv("OPENAI_PRIMARY_API", "chat")
+    monkeypatch.setenv("LLM_HTTP2", "0")
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "0")
+    monkeypatch.delenv("OPENAI_OFFLINE", raising=False)
+    get_infra_settings.cache_clear()
+    close_http_clients()
+    try:
+        llm = OpenAILLM(api_key="standin", model="gpt-4.1", timeout_seconds=5.0)
+        outputs = [llm.generate(f"note {i}") for i in range(4)]
+        outputs.append(asyncio.run(llm.agenerate("async note")))
+        assert all(json.loads(text) == {} for text in outputs)
+        stats = TestClient(server.config.app).get("/__standin/stats").json()
+        assert stats["status:200"] == 5 and stats.get("status:429", 0) >= 1
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+        close_http_clients()
+        get_infra_settings.cache_clear()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from app.api.admission import classify_request
+from app.infra.admission import AdmissionController
+
+
+def _controller(**kwargs) -> AdmissionController:
+    defaults = {"cpu_workers": 2, "request_capacity": 4, "max_wait_s": 10.0, "bulk_max_wait_s": 5.0}
+    return AdmissionController(**{**defaults, **kwargs})
+
+
+def test_nothing_is_shed_without_latency_history() -> None:
+    controller = _controller()
+    for _ in range(50):
+        assert controller.try_admit("standard").admitted
+    assert controller.predicted_wait_s() == 0.0
+
+
+def test_cpu_backlog_sheds_bulk_before_standard() -> None:
+    controller = _controller()
+    controller.record_cpu_latency(2.0)
+    controller.cpu_pending = 8  # 6 queued behind 2 workers -> 3 rounds of 2s
+
+    assert controller.predicted_wait_s() == 6.0
+    bulk = controller.try_admit("bulk")
+    assert not bulk.admitted and bulk.retry_after_s == 6
+    assert controller.try_admit("standard").admitted
+    assert controller.try_admit("critical").admitted
+
+    controller.cpu_pending = 14
+    assert not controller.try_admit("standard").admitted
+
+
+def test_in_flight_requests_and_llm_queues_feed_the_estimate() -> None:
+    stats = {"openai/gpt": {"limit": 2.0, "queue_depth": 4, "latency_ewma_s": 3.0, "blocked_for_s": 1.0}}
+    controller = _controller(llm_stats=lambda: stats)
+    assert controller.predicted_wait_s() == 7.0  # 1s Retry-After pause + 4 waiters / 2 slots * 3s
+
+    stats.clear()
+    for _ in range(4):
+        controller.try_admit("standard")
+    controller.release("standard", elapsed_s=8.0, ok=True)
+    controller.release("standard", elapsed_s=60.0, ok=False)  # failures do not skew the latency
+    assert controller.in_flight == 2
+    for _ in range(5):
+        controller.try_admit("standard")
+    # 7 in flight + 1 new against a capacity of 4 -> one full round of 8s.
+    assert controller.predicted_wait_s() == 8.0
+
+
+def test_request_classification() -> None:
+    assert classify_request("POST", "/api/v1/process") == "standard"
+    assert classify_request("POST", "/api/v1/registry/runs") == "standard"
+    assert classify_request("POST", "/api/v1/registry/abc/append") == "standard"
+    assert classify_request("POST", "/api/v1/process/batch") == "bulk"
+    assert classify_request("POST", "/api/v1/process_bundle") == "bulk"
+    assert classify_request("POST", "/api/v1/jobs") == "critical"
+    assert classify_request("POST", "/api/v1/umls/suggest") == "critical"
+    assert classify_request("GET", "/api/v1/process") == "critical"
+    assert classify_request("GET", "/health") == "critical"
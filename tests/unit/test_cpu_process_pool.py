@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import pickle
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.infra.admission import get_admission_controller
+from app.infra.deadline import remaining_s, request_deadline
+from app.infra.perf import mark_stage, stage_listener
+from app.infra.executors import run_cpu_task
+from app.infra.process_pool import CpuProcessPool
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures"
+
+
+def _whoami(payload: dict) -> dict:
+    return {"pid": os.getpid(), "echo": payload.get("value"), "remaining_s": remaining_s()}
+
+
+def _marks_stages(payload: dict) -> dict:
+    mark_stage("parse")
+    time.sleep(0.02)
+    mark_stage("code")
+    return {}
+
+
+def _crash_once(payload: dict) -> dict:
+    marker = Path(payload["marker"])
+    if not marker.exists():
+        marker.write_text("crashed")
+        os._exit(1)
+    return {"pid": os.getpid()}
+
+
+def test_pool_runs_tasks_with_deadline_recycles_and_reports_health() -> None:
+    async def _main() -> tuple[list[dict], dict]:
+        pool = CpuProcessPool(1, max_tasks_per_child=2)
+        try:
+            with request_deadline(30):
+                results = [await pool.run(_whoami, {"value": i}) for i in range(3)]
+            return results, await pool.health(timeout_s=30)
+        finally:
+            pool.shutdown(wait=True)
+
+    results, health = asyncio.run(_main())
+    assert [row["echo"] for row in results] == [0, 1, 2]
+    assert all(row["pid"] != os.getpid() for row in results)
+    assert all(0 < row["remaining_s"] <= 30 for row in results)
+    # max_tasks_per_child=2: the third task runs in a fresh worker.
+    assert results[0]["pid"] == results[1]["pid"] != results[2]["pid"]
+    assert health["ok"] and health["responding"] == 1 and health["ready"] == 1
+
+
+def test_pool_rebuilds_after_a_worker_crash(tmp_path: Path) -> None:
+    async def _main() -> tuple[dict, int]:
+        pool = CpuProcessPool(1)
+        try:
+            result = await pool.run(_crash_once, {"marker": str(tmp_path / "crashed")})
+            return result, pool.restarts
+        finally:
+            pool.shutdown(wait=True)
+
+    result, restarts = asyncio.run(_main())
+    assert result["pid"] != os.getpid()
+    assert restarts == 1
+
+
+def test_worker_stage_marks_reach_the_callers_listeners() -> None:
+    events: list[tuple[str, str]] = []
+
+    async def _main() -> None:
+        pool = CpuProcessPool(1)
+        try:
+            with stage_listener(lambda stage, event, _ms: events.append((stage, event))):
+                mark_stage("extraction")
+                await pool.run(_marks_stages, {})
+                mark_stage("response")
+        finally:
+            pool.shutdown(wait=True)
+
+    asyncio.run(_main())
+    assert events == [
+        ("extraction", "started"),
+        ("extraction", "finished"),
+        ("parse", "started"),
+        ("parse", "finished"),
+        ("code", "started"),
+        ("code", "finished"),
+        ("response", "started"),
+        ("response", "finished"),
+    ]
+
+
+def test_pool_tasks_feed_the_admission_cpu_latency() -> None:
+    async def _main() -> dict:
+        pool = CpuProcessPool(1)
+        try:
+            app = SimpleNamespace(state=SimpleNamespace(cpu_process_pool=pool))
+            return await run_cpu_task(app, _whoami, {"value": 1})
+        finally:
+            pool.shutdown(wait=True)
+
+    get_admission_controller.cache_clear()
+    try:
+        assert asyncio.run(_main())["echo"] == 1
+        snapshot = get_admission_controller().snapshot()
+        assert snapshot["cpu_latency_ewma_s"] is not None
+    finally:
+        get_admission_controller.cache_clear()
+
+
+@pytest.mark.parametrize("fixture", ["ebus_staging_4R_7_11R.txt", "thora_bilateral.txt"])
+def test_extraction_result_round_trips_as_a_plain_payload(fixture: str) -> None:
+    from app.api.dependencies import get_registry_service
+    from app.registry.application.registry_service import RegistryExtractionResult
+
+    result = get_registry_service().extract_fields((FIXTURES / fixture).read_text(encoding="utf-8"))
+    payload = result.to_payload()
+    restored = RegistryExtractionResult.from_payload(pickle.loads(pickle.dumps(payload)))
+
+    assert restored.cpt_codes == result.cpt_codes
+    assert restored.warnings == result.warnings
+    assert restored.audit_report == result.audit_report
+    for name in type(result.record).model_fields:
+        assert getattr(restored.record, name) == getattr(result.record, name), name
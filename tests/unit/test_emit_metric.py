@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+
+from observability.metrics import (
+    NullMetricsClient,
+    RegistryMetricsClient,
+    emit_metric,
+    reset_metrics_client,
+    set_metrics_client,
+)
+
+
+class _BrokenClient(NullMetricsClient):
+    def incr(self, name, tags=None, value=1):  # noqa: ANN001
+        raise RuntimeError("backend down")
+
+
+@pytest.fixture(autouse=True)
+def _restore_client():
+    yield
+    reset_metrics_client()
+
+
+def test_emit_metric_routes_each_kind() -> None:
+    client = RegistryMetricsClient()
+    set_metrics_client(client)
+
+    emit_metric("incr", "jobs_total", 2, tags={"kind": "a"})
+    emit_metric("observe", "queue_depth", 3)
+    emit_metric("timing", "stage_ms", 12.5)
+
+    exported = client.export_json()
+    assert exported["counters"]["jobs_total"]['{kind="a"}'] == 2
+    assert "queue_depth" in exported["gauges"]
+    assert "stage_ms" in exported["histograms"]
+
+
+def test_emit_metric_never_raises_from_the_backend() -> None:
+    set_metrics_client(_BrokenClient())
+    emit_metric("incr", "jobs_total")
+
+    with pytest.raises(ValueError, match="Unknown metric kind"):
+        emit_metric("gauge", "jobs_total")  # type: ignore[arg-type]
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.infra import http_transport
+from app.infra.settings import get_infra_settings
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        body = json.dumps({"ok": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:  # noqa: ANN002
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _JsonHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("LLM_HTTP2", "0")
+    get_infra_settings.cache_clear()
+    http_transport.close_http_clients()
+    yield
+    http_transport.close_http_clients()
+    get_infra_settings.cache_clear()
+
+
+def test_origin_of_strips_path_and_default_port() -> None:
+    assert http_transport.origin_of("https://api.openai.com/v1/responses") == "https://api.openai.com"
+    assert http_transport.origin_of("http://localhost:8080/v1/chat/completions") == "http://localhost:8080"
+
+
+def test_same_origin_shares_one_client() -> None:
+    a = http_transport.get_http_client("https://api.openai.com/v1/responses")
+    b = http_transport.get_http_client("https://api.openai.com/v1/chat/completions")
+    c = http_transport.get_http_client("https://generativelanguage.googleapis.com/v1beta/models/x")
+    assert a is b
+    assert a is not c
+
+
+def test_connections_are_reused_and_counted(server_url: str) -> None:
+    client = http_transport.get_http_client(server_url)
+    for _ in range(4):
+        response = client.post(f"{server_url}/v1/chat/completions", json={"q": 1})
+        assert response.json() == {"ok": True}
+
+    stats = http_transport.transport_stats()[http_transport.origin_of(server_url)]
+    assert stats["clients"] == 1
+    assert stats["requests"] == 4
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == 3
+
+
+def test_limits_come_from_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LLM_HTTP_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("LLM_HTTP_MAX_KEEPALIVE", "3")
+    get_infra_settings.cache_clear()
+    limits = http_transport._limits()
+    assert limits.max_connections == 7
+    assert limits.max_keepalive_connections == 3
+
+
+def test_registry_is_dropped_in_forked_child(monkeypatch: pytest.MonkeyPatch) -> None:
+    parent = http_transport.get_http_client("https://api.openai.com")
+    # Simulate running in a child process: pid no longer matches.
+    monkeypatch.setattr(http_transport, "_pid", -1)
+    child = http_transport.get_http_client("https://api.openai.com")
+    assert child is not parent
+    assert not parent.is_closed
+
+
+@pytest.mark.asyncio
+async def test_async_client_reuses_connections(server_url: str) -> None:
+    client = http_transport.get_async_http_client(server_url)
+    assert http_transport.get_async_http_client(server_url) is client
+    for _ in range(3):
+        response = await client.post(f"{server_url}/x", json={})
+        assert response.status_code == 200
+    await http_transport.aclose_http_clients()
+
+    stats = http_transport.transport_stats()[http_transport.origin_of(server_url)]
+    assert stats["requests"] == 3
+    assert stats["new_connections"] == 1
+
+
+def test_async_clients_are_dropped_with_their_event_loop(server_url: str) -> None:
+    async def _get() -> None:
+        http_transport.get_async_http_client(server_url)
+
+    asyncio.run(_get())
+    gc.collect()
+    assert len(http_transport._async_clients) == 0
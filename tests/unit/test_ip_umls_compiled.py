@@ -0,0 +1,122 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.umls.ip_umls_compiled import (
+    CompiledUmlsIndex,
+    load_compiled_for_json,
+    resolve_compiled_ip_umls_map,
+    write_compiled_ip_umls_map,
+)
+from app.umls.ip_umls_store import DistilledUmlsStore
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "ip_umls_map.small.json"
+
+
+@pytest.fixture()
+def compiled_store(tmp_path: Path) -> DistilledUmlsStore:
+    dest = write_compiled_ip_umls_map(FIXTURE, tmp_path / "map.umlsbin")
+    return DistilledUmlsStore.from_compiled(CompiledUmlsIndex(dest))
+
+
+def _json_store() -> DistilledUmlsStore:
+    return DistilledUmlsStore(json.loads(FIXTURE.read_text(encoding="utf-8")))
+
+
+@pytest.mark.parametrize(
+    "term,category",
+    [
+        ("Right  upper   lobe", "anatomy"),
+        ("EBUS TBNA", None),
+        ("rb1", "anatomy"),
+        ("rb1", "device"),
+        ("rb1", None),
+        ("left lower lobe", None),
+    ],
+)
+def test_compiled_store_match_parity(compiled_store: DistilledUmlsStore, term: str, category: str | None) -> None:
+    assert compiled_store.match(term, category=category) == _json_store().match(term, category=category)
+
+
+def test_compiled_store_suggest_parity(compiled_store: DistilledUmlsStore) -> None:
+    for prefix, category in [("rb", "anatomy"), ("rb", None), ("r", "device"), ("zz", None)]:
+        expected = _json_store().suggest(prefix, category=category, limit=10)
+        assert compiled_store.suggest(prefix, category=category, limit=10) == expected
+
+
+def test_compiled_store_exposes_concepts_and_meta(compiled_store: DistilledUmlsStore) -> None:
+    assert compiled_store.concepts["C0001"]["preferred_name"] == "Right upper lobe"
+    assert "C9999" not in compiled_store.concepts
+    assert compiled_store.meta == {"version": "small-fixture"}
+    assert list(compiled_store.sorted_terms) == sorted(_json_store().sorted_terms)
+    assert compiled_store.term_index_strict["rb1"] == ["C0004", "C0003"]
+
+
+def test_compiled_suggest_index_reads_terms_from_the_map(compiled_store: DistilledUmlsStore) -> None:
+    assert compiled_store._suggest is None  # built on first use, not when the map is loaded
+    compiled_store.suggest("rb", limit=5)
+    assert compiled_store.suggest_index()._terms is compiled_store.sorted_terms
+
+
+def test_compiled_concepts_are_copies_of_the_shared_cache(compiled_store: DistilledUmlsStore) -> None:
+    match = compiled_store.match("right upper lobe")
+    match["categories"].append("mutated")
+    compiled_store.concepts["C0001"]["categories"].append("mutated")
+
+    assert "mutated" not in compiled_store.concepts["C0001"]["categories"]
+    assert compiled_store.match("right upper lobe") == _json_store().match("right upper lobe")
+
+
+def test_resolve_compiles_into_cache_once(tmp_path: Path) -> None:
+    json_path = tmp_path / "ip_umls_map.json"
+    json_path.write_bytes(FIXTURE.read_bytes())
+    cache_dir = tmp_path / "cache"
+
+    first = resolve_compiled_ip_umls_map(json_path, cache_dir=cache_dir)
+    assert first is not None and first.parent == cache_dir
+    mtime = first.stat().st_mtime_ns
+    assert resolve_compiled_ip_umls_map(json_path, cache_dir=cache_dir) == first
+    assert first.stat().st_mtime_ns == mtime
+
+
+def test_resolve_prefers_fresh_sibling(tmp_path: Path) -> None:
+    json_path = tmp_path / "ip_umls_map.json"
+    json_path.write_bytes(FIXTURE.read_bytes())
+    sibling = write_compiled_ip_umls_map(json_path, tmp_path / "ip_umls_map.umlsbin")
+
+    assert resolve_compiled_ip_umls_map(json_path, cache_dir=tmp_path / "cache") == sibling
+
+
+def test_load_compiled_falls_back_on_corrupt_artifact(tmp_path: Path) -> None:
+    json_path = tmp_path / "ip_umls_map.json"
+    json_path.write_bytes(FIXTURE.read_bytes())
+    (tmp_path / "ip_umls_map.umlsbin").write_bytes(b"not a compiled map" * 10)
+
+    assert load_compiled_for_json(json_path) is None
+
+
+def test_umls_link_lite_reads_compiled_map(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from proc_nlp import umls_lite
+
+    json_path = tmp_path / "ip_umls_map.json"
+    json_path.write_bytes(FIXTURE.read_bytes())
+    write_compiled_ip_umls_map(json_path, tmp_path / "ip_umls_map.umlsbin")
+    monkeypatch.setenv("IP_UMLS_MAP_PATH", str(json_path))
+    umls_lite._load_map.cache_clear()
+    try:
+        data = umls_lite._load_map()
+        assert not isinstance(data["term_index"], dict)
+        concepts = umls_lite.umls_link_lite("Biopsy of the right upper lobe")
+        assert [c.cui for c in concepts] == ["C0001"]
+        assert umls_lite.lookup_cui("C0002")["preferred_name"] == "EBUS-TBNA"
+    finally:
+        umls_lite._load_map.cache_clear()
+
+
+def test_compiled_store_match_many_parity(compiled_store: DistilledUmlsStore) -> None:
+    terms = ["rb10", "EBUS TBNA", "zzz", "right upper lobe", "rb1", "  ", "rb2"]
+    for category in (None, "anatomy", "device"):
+        assert compiled_store.match_many(terms, category=category) == _json_store().match_many(
+            terms, category=category
+        )
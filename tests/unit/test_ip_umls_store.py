@@ -42,3 +42,12 @@ def test_distilled_umls_store_suggest_prefix() -> None:
     assert all(r["term"].startswith("rb") for r in results)
     assert all("anatomy" in (r.get("categories") or []) for r in results)
 
+
+
+def test_distilled_umls_store_match_many_aligns_and_matches_single() -> None:
+    store = _load_fixture_store()
+    terms = ["Right  upper   lobe", "EBUS TBNA", "", "nope", "rb1", "RB1"]
+    results = store.match_many(terms, category="anatomy")
+    assert len(results) == len(terms)
+    assert results == [store.match(term, category="anatomy") for term in terms]
+    assert results[4] is not results[5]
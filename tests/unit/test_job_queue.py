@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+
+from app.registry_store.job_queue import JobQueue
+from app.registry_store.models import ProcessJob
+
+
+@pytest.fixture
+def queue(tmp_path: Path) -> JobQueue:
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    q = JobQueue(engine, visibility_timeout_s=30, max_attempts=2, result_ttl_s=60, retry_backoff_s=0)
+    q.ensure_table()
+    return q
+
+
+def _shift(queue: JobQueue, job_id, **values) -> None:
+    with Session(queue.engine) as db:
+        db.execute(update(ProcessJob).where(ProcessJob.id == job_id).values(**values))
+        db.commit()
+
+
+def _fail(queue: JobQueue, job_id, attempt: int, *, status_code: int, retryable: bool) -> str:
+    return queue.fail(
+        job_id, "w1", attempt=attempt, error="boom", status_code=status_code, retryable=retryable, progress=[]
+    )
+
+
+def _past() -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=1)
+
+
+def test_only_one_worker_claims_a_job_until_its_lease_expires(queue: JobQueue) -> None:
+    job = queue.enqueue({"note": "n", "already_scrubbed": True}, note_sha256="x")
+
+    first = queue.claim("w1")
+    assert first is not None and first.id == job.id and first.attempt == 1
+    assert queue.claim("w2") is None
+    assert queue.heartbeat(job.id, "w1", progress=[{"event": "claimed"}])
+
+    # w1 stalls: its lease runs out and w2 gets the job as attempt 2.
+    _shift(queue, job.id, lease_expires_at=_past())
+    second = queue.claim("w2")
+    assert second is not None and second.attempt == 2
+    assert not queue.heartbeat(job.id, "w1")
+    assert not queue.complete(job.id, "w1", result={}, processing_time_ms=1.0, progress=[])
+
+    assert queue.complete(job.id, "w2", result={"cpt_codes": ["31622"]}, processing_time_ms=5.0, progress=[])
+    done = queue.get(job.id)
+    assert done.status == "succeeded" and done.result_json == {"cpt_codes": ["31622"]}
+
+
+def test_retryable_failures_requeue_until_attempts_run_out(queue: JobQueue) -> None:
+    job = queue.enqueue({"note": "n"}, note_sha256="x")
+
+    claimed = queue.claim("w1")
+    assert _fail(queue, job.id, claimed.attempt, status_code=503, retryable=True) == "queued"
+    claimed = queue.claim("w1")
+    assert claimed.attempt == 2
+    assert _fail(queue, job.id, claimed.attempt, status_code=503, retryable=True) == "failed"
+    assert queue.get(job.id).status_code == 503
+
+    other = queue.enqueue({"note": "n"}, note_sha256="y")
+    claimed = queue.claim("w1")
+    assert _fail(queue, other.id, claimed.attempt, status_code=400, retryable=False) == "failed"
+
+
+def test_expired_lease_on_last_attempt_fails_and_finished_jobs_are_purged(queue: JobQueue) -> None:
+    job = queue.enqueue({"note": "n"}, note_sha256="x")
+    _shift(queue, job.id, status="running", attempts=2, lease_owner="dead", lease_expires_at=_past())
+
+    assert queue.claim("w1") is None
+    failed = queue.get(job.id)
+    assert failed.status == "failed" and failed.status_code == 504
+
+    cancelled = queue.cancel(queue.enqueue({"note": "n"}, note_sha256="y").id)
+    assert cancelled.status == "cancelled"
+    assert queue.purge_expired() == 0
+    _shift(queue, job.id, expires_at=_past())
+    assert queue.purge_expired() == 1
+    assert queue.get(job.id) is None and queue.get(cancelled.id) is not None
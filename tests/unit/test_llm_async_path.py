@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import functools
+
+import httpx
+import pytest
+from pydantic import BaseModel
+
+from app.common.llm import DeterministicStubLLM, LLMService, OpenAILLM
+from app.llm.exchange import Post, Sleep, arun_exchange, run_exchange
+from app.infra.http_transport import close_http_clients
+from app.infra.settings import get_infra_settings
+
+
+class _Echo(BaseModel):
+    ok: bool
+
+
+def _retry_once_exchange(calls: list[str]):
+    response = yield Post({"attempt": 1})
+    calls.append(f"status={response.status_code}")
+    if response.status_code == 503:
+        yield Sleep(0.0)
+        response = yield Post({"attempt": 2})
+        calls.append(f"status={response.status_code}")
+    return response.json()
+
+
+def _fake_response(status: int, payload: dict) -> httpx.Response:
+    return httpx.Response(status, request=httpx.Request("POST", "http://llm.test/x"), json=payload)
+
+
+def test_run_and_arun_exchange_share_retry_logic() -> None:
+    statuses = iter([503, 200])
+
+    class _Client:
+        def post(self, url, headers=None, json=None, **_kwargs):  # noqa: ANN001
+            status = next(statuses)
+            return _fake_response(status, {"attempt": json["attempt"]})
+
+    calls: list[str] = []
+    out = run_exchange(
+        _retry_once_exchange(calls), client=_Client(), url="http://llm.test/x", headers={}, timeout=httpx.Timeout(1.0)
+    )
+    assert out == {"attempt": 2}
+    assert calls == ["status=503", "status=200"]
+
+    async_statuses = iter([503, 200])
+
+    class _AsyncClient:
+        async def post(self, url, headers=None, json=None, **_kwargs):  # noqa: ANN001
+            return _fake_response(next(async_statuses), {"attempt": json["attempt"]})
+
+    async_calls: list[str] = []
+    out = asyncio.run(
+        arun_exchange(
+            _retry_once_exchange(async_calls),
+            client=_AsyncClient(),
+            url="http://llm.test/x",
+            headers={},
+            timeout=httpx.Timeout(1.0),
+        )
+    )
+    assert out == {"attempt": 2}
+    assert async_calls == calls
+
+
+def test_transport_errors_are_thrown_into_the_exchange() -> None:
+    def _exchange():
+        try:
+            yield Post({})
+        except httpx.ConnectError:
+            return "recovered"
+        return "unexpected"
+
+    class _Client:
+        def post(self, *args, **kwargs):  # noqa: ANN002, ANN003
+            raise httpx.ConnectError("boom")
+
+    assert (
+        run_exchange(_exchange(), client=_Client(), url="http://llm.test", headers={}, timeout=httpx.Timeout(1.0))
+        == "recovered"
+    )
+
+
+@pytest.fixture
+def _fresh_transport(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("LLM_HTTP2", "0")
+    get_infra_settings.cache_clear()
+    close_http_clients()
+    yield
+    close_http_clients()
+    get_infra_settings.cache_clear()
+
+
+@pytest.mark.usefixtures("_fresh_transport")
+def test_openai_agenerate_matches_sync_retry_behaviour(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("OPENAI_OFFLINE", raising=False)
+    monkeypatch.setenv("OPENAI_PRIMARY_API", "chat")
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "0")
+
+    llm = OpenAILLM(api_key="test-key", model="gpt-4.1", timeout_seconds=1.0)
+    sent_payloads: list[dict] = []
+
+    async def _mock_post(self, url, headers=None, json=None, **_kwargs):  # noqa: ANN001
+        sent_payloads.append(copy.deepcopy(json))
+        request = httpx.Request("POST", url)
+        if len(sent_payloads) == 1:
+            return httpx.Response(
+                400,
+                request=request,
+                json={"error": {"message": "Unsupported parameter: response_format", "param": "response_format"}},
+            )
+        return httpx.Response(200, request=request, json={"choices": [{"message": {"content": '{"ok": true}'}}]})
+
+    def _sync_post(*_args, **_kwargs):  # noqa: ANN002, ANN003
+        raise AssertionError("async path must not use the blocking client")
+
+    monkeypatch.setattr(httpx.AsyncClient, "post", _mock_post)
+    monkeypatch.setattr(httpx.Client, "post", _sync_post)
+
+    out = asyncio.run(llm.agenerate("hi"))
+    assert out == '{"ok": true}'
+    assert len(sent_payloads) == 2
+    assert "response_format" in sent_payloads[0]
+    assert "response_format" not in sent_payloads[1]
+
+
+def test_llm_service_agenerate_json_uses_stub_and_falls_back_to_thread() -> None:
+    service = LLMService(llm=DeterministicStubLLM(payload={"ok": True}))
+    result = asyncio.run(service.agenerate_json(system_prompt="s", user_prompt="u", response_model=_Echo))
+    assert result.ok is True
+
+    class _SyncOnly:
+        def generate(self, prompt: str, **_kwargs) -> str:  # noqa: ANN003
+            return '{"ok": false}'
+
+    result = asyncio.run(
+        LLMService(llm=_SyncOnly()).agenerate_json(system_prompt="s", user_prompt="u", response_model=_Echo)
+    )
+    assert result.ok is False
+
+
+def test_arun_v3_extraction_awaits_llm_and_offloads_cpu(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.registry.extractors import v3_extractor
+    from app.registry.pipelines import v3_pipeline
+    from app.registry.schema.ip_v3_extraction import IPRegistryV3
+
+    cpu_calls: list[str] = []
+
+    async def _fake_llm(**_kwargs):  # noqa: ANN003
+        return {"note_id": "n1", "source_filename": "inline", "procedures": []}
+
+    async def _run_cpu(fn, *args, **kwargs):  # noqa: ANN001, ANN002, ANN003
+        cpu_calls.append(getattr(fn, "__name__", repr(fn)))
+        return await asyncio.to_thread(functools.partial(fn, *args, **kwargs))
+
+    monkeypatch.setattr(v3_extractor, "_agenerate_structured_json", _fake_llm)
+
+    result = asyncio.run(v3_pipeline.arun_v3_extraction("Bronchoscopy performed.", run_cpu=_run_cpu))
+
+    assert isinstance(result, IPRegistryV3)
+    assert cpu_calls == ["_prepare_v3_prompt", "verify_registry"]
+
+
+def test_aextract_fields_prefetches_structurer_llm_on_the_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.registry.application import registry_service as rs
+    from app.registry.pipelines import v3_pipeline
+
+    monkeypatch.setenv("PROCSUITE_PIPELINE_MODE", "extraction_first")
+    monkeypatch.setenv("REGISTRY_EXTRACTION_ENGINE", "agents_structurer")
+
+    async def _failing_llm(note_text: str, *, run_cpu, meta=None):  # noqa: ANN001
+        raise RuntimeError("upstream down")
+
+    captured: dict = {}
+
+    def _fake_extract_fields(self, note_text: str, mode: str = "default", *, structurer_prefetch=None):  # noqa: ANN001
+        captured["note_text"] = note_text
+        captured["prefetch"] = structurer_prefetch
+        return "result"
+
+    async def _run_cpu(fn, *args, **kwargs):  # noqa: ANN001, ANN002, ANN003
+        return fn(*args, **kwargs)
+
+    monkeypatch.setattr(v3_pipeline, "arun_v3_extraction", _failing_llm)
+    monkeypatch.setattr(rs.RegistryService, "extract_fields", _fake_extract_fields)
+
+    service = rs.RegistryService.__new__(rs.RegistryService)
+    note = "PROCEDURE: Bronchoscopy with BAL of the RML."
+    assert asyncio.run(service.aextract_fields(note, run_cpu=_run_cpu)) == "result"
+
+    prefetch = captured["prefetch"]
+    assert isinstance(prefetch, rs.PrefetchedV3)
+    assert isinstance(prefetch.outcome, RuntimeError)
+    assert prefetch.prepared == rs.prepare_note_text(note)
+    assert prefetch.extraction_text == prefetch.prepared.masked_text
+
+    monkeypatch.setenv("PROCSUITE_PIPELINE_MODE", "current")
+    asyncio.run(service.aextract_fields(note, run_cpu=_run_cpu))
+    assert captured["prefetch"] is None
+
+
+def test_extract_record_reuses_the_prefetched_preparation(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.registry.application import registry_service as rs
+    from observability.metrics import RegistryMetricsClient, reset_metrics_client, set_metrics_client
+
+    note = "PROCEDURE: Bronchoscopy with BAL of the RML."
+    prefetch = rs.PrefetchedV3(prepared=rs.prepare_note_text(note), outcome=RuntimeError("x"))
+    preprocess_calls: list[str] = []
+    real_preprocess = rs._preprocess_note_text
+
+    def _counting_preprocess(raw_note_text, warnings, meta):  # noqa: ANN001
+        preprocess_calls.append(raw_note_text)
+        return real_preprocess(raw_note_text, warnings, meta)
+
+    monkeypatch.setattr(rs, "_preprocess_note_text", _counting_preprocess)
+    metrics = RegistryMetricsClient()
+    set_metrics_client(metrics)
+    try:
+        prepared, kept = rs._reuse_prefetch(note, prefetch, "agents_structurer")
+        assert prepared is prefetch.prepared and kept is prefetch
+        assert preprocess_calls == []
+
+        prepared, kept = rs._reuse_prefetch(note + " Edited.", prefetch, "agents_structurer")
+        assert kept is None and prepared.masked_text != prefetch.extraction_text
+        assert preprocess_calls == [note + " Edited."]
+
+        prepared, kept = rs._reuse_prefetch(note, prefetch, "engine")
+        assert prepared is prefetch.prepared and kept is None
+
+        discarded = metrics.export_json()["counters"]["structurer_prefetch_discarded"]
+        assert discarded == {'{reason="note_mismatch"}': 1, '{reason="engine=engine"}': 1}
+    finally:
+        reset_metrics_client()
+
+    payload = prefetch.to_payload()
+    assert rs.PrefetchedV3.from_payload(payload).prepared == prefetch.prepared
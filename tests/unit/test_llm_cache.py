@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from app.infra import llm_cache
+from app.infra.llm_cache import SqliteLLMCache, TieredLLMCache, _MemoryTier, llm_cache_key
+from app.infra.settings import get_infra_settings
+
+
+def _key(prompt: str, *, task: str = "registry_extraction", version: str = "v1", schema: str = ""):
+    return llm_cache_key(task=task, model="gpt-test", prompt=prompt, prompt_version=version, schema_version=schema)
+
+
+def _cache(tmp_path, *, disk_max_bytes: int = 1 << 20, memory_entries: int = 128) -> TieredLLMCache:
+    return TieredLLMCache(
+        memory=_MemoryTier(max_entries=memory_entries, max_bytes=1 << 20),
+        disk=SqliteLLMCache(tmp_path / "llm.sqlite3", max_bytes=disk_max_bytes),
+        ttl_s=3600,
+    )
+
+
+def test_key_includes_task_namespace_and_schema_version() -> None:
+    base = _key("prompt")
+    assert base.namespace == "registry_extraction"
+    assert base.storage_key.startswith("llm:registry_extraction:v1:")
+    assert _key("prompt", schema="abc").digest != base.digest
+    assert _key("prompt", version="v2").digest != base.digest
+    assert _key("prompt", task="judge").digest == base.digest
+    assert _key("prompt", task="judge").storage_key != base.storage_key
+
+
+def test_disk_tier_survives_a_new_process_and_promotes_to_memory(tmp_path) -> None:
+    first = _cache(tmp_path)
+    key = _key("prompt")
+    assert first.get(key) is None
+    first.set(key, '{"ok": true}' * 50)
+    first.disk.close()
+
+    second = _cache(tmp_path)
+    assert second.get(key) == '{"ok": true}' * 50
+    assert second.get(key) == '{"ok": true}' * 50
+
+    counts = second.stats()["namespaces"]["registry_extraction"]
+    assert counts["hits_disk"] == 1
+    assert counts["hits_memory"] == 1
+    assert counts["misses"] == 0
+    assert 0 < counts["bytes_read"] < len('{"ok": true}' * 50)  # compressed on disk
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path) -> None:
+    cache = _cache(tmp_path, disk_max_bytes=3000, memory_entries=1)
+    keys = [_key(f"prompt-{i}") for i in range(6)]
+    for key in keys:
+        cache.set(key, os.urandom(800).hex())  # ~900 bytes compressed
+
+    assert cache.disk._bytes <= 3000
+    survivors = [key for key in keys if cache.disk.get(key.storage_key) is not None]
+    assert keys[-1] in survivors
+    assert keys[0] not in survivors
+
+
+def test_invalidate_keeps_only_current_prompt_version(tmp_path) -> None:
+    cache = _cache(tmp_path)
+    old, new, other = _key("p", version="v1"), _key("p", version="v2"), _key("p", task="judge", version="v1")
+    for key in (old, new, other):
+        cache.set(key, "value")
+
+    removed = cache.invalidate("registry_extraction", keep_prompt_version="v2")
+
+    assert removed == 2  # memory + disk copies of the v1 entry
+    assert cache.get(old) is None
+    assert cache.get(new) == "value"
+    assert cache.get(other) == "value"
+
+
+def test_memory_tier_is_byte_bounded() -> None:
+    tier = _MemoryTier(max_entries=100, max_bytes=10)
+    tier.set("a", "12345", ttl_s=None)
+    tier.set("b", "12345", ttl_s=None)
+    tier.set("c", "12345", ttl_s=None)
+    assert tier.get("a") is None
+    assert tier.size() == (2, 10)
+
+
+def test_get_llm_cache_builds_persistent_tiers_only_when_enabled(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "cache.sqlite3"))
+    monkeypatch.delenv("ENABLE_LLM_CACHE", raising=False)
+    get_infra_settings.cache_clear()
+    llm_cache.get_llm_cache.cache_clear()
+    try:
+        assert llm_cache.get_llm_cache().tiers == ["memory"]
+
+        monkeypatch.setenv("ENABLE_LLM_CACHE", "1")
+        get_infra_settings.cache_clear()
+        llm_cache.get_llm_cache.cache_clear()
+        assert llm_cache.get_llm_cache().tiers == ["memory", "disk"]
+    finally:
+        get_infra_settings.cache_clear()
+        llm_cache.get_llm_cache.cache_clear()
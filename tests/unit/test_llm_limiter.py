@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from app.infra import llm_limiter
+from app.infra.llm_control import allm_slot, llm_slot
+from app.infra.llm_limiter import AdaptiveLimiter, LLMOverloadedError, LLMSlot, limiter_stats
+from app.infra.settings import get_infra_settings
+
+
+def _limiter(*, limit: float = 4, max_queue: int = 8, adaptive: bool = True) -> AdaptiveLimiter:
+    return AdaptiveLimiter(
+        provider="api.test",
+        model="m",
+        limit=float(limit),
+        min_limit=1,
+        max_limit=16,
+        latency_target_s=1.0,
+        max_queue=max_queue,
+        adaptive=adaptive,
+    )
+
+
+def _response(status: int, headers: dict[str, str] | None = None) -> httpx.Response:
+    return httpx.Response(status, headers=headers, request=httpx.Request("POST", "https://api.test/v1"))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiters():
+    llm_limiter.reset_llm_limiters()
+    get_infra_settings.cache_clear()
+    yield
+    llm_limiter.reset_llm_limiters()
+    get_infra_settings.cache_clear()
+
+
+def test_fast_successes_raise_the_limit_and_429_halves_it() -> None:
+    limiter = _limiter(limit=4)
+    for _ in range(8):
+        limiter.acquire()
+        limiter.release("ok", latency_s=0.1)
+    assert 5.5 < limiter.limit < 6.5
+
+    before = limiter.limit
+    limiter.acquire()
+    slot = LLMSlot(limiter)
+    slot.record_response(_response(429))
+    slot.close()
+    assert limiter.limit == pytest.approx(before / 2)
+
+    # A burst of overloads within the cooldown counts once.
+    limiter.acquire()
+    limiter.release("overload")
+    assert limiter.limit == pytest.approx(before / 2)
+
+
+def test_fixed_mode_keeps_the_configured_limit() -> None:
+    limiter = _limiter(limit=3, adaptive=False)
+    for outcome in ("ok", "ok", "overload", "slow"):
+        limiter.acquire()
+        limiter.release(outcome, latency_s=0.1)
+    assert limiter.limit == 3
+
+
+def test_retry_after_pauses_the_whole_provider() -> None:
+    first = llm_limiter.get_llm_limiter("api.test", "a")
+    other_model = llm_limiter.get_llm_limiter("api.test", "b")
+    first.acquire()
+    slot = LLMSlot(first)
+    slot.record_response(_response(429, {"Retry-After": "0.2"}))
+    slot.close()
+
+    started = time.monotonic()
+    other_model.acquire(deadline=time.monotonic() + 2)
+    assert time.monotonic() - started >= 0.15
+    other_model.release("ok", latency_s=0.01)
+
+    # A pause longer than the caller's deadline is rejected without waiting.
+    first.acquire()
+    slot = LLMSlot(first)
+    slot.record_response(_response(503, {"Retry-After": "5"}))
+    slot.close()
+    with pytest.raises(LLMOverloadedError) as excinfo:
+        first.acquire(deadline=time.monotonic() + 0.1)
+    assert excinfo.value.retry_after_s >= 4
+
+
+def test_full_queue_rejects_immediately() -> None:
+    limiter = _limiter(limit=1, max_queue=1)
+    limiter.acquire()
+    waiter = threading.Thread(target=lambda: limiter.acquire(deadline=time.monotonic() + 5))
+    waiter.start()
+    time.sleep(0.05)
+
+    with pytest.raises(LLMOverloadedError, match="queue_full"):
+        limiter.acquire(deadline=time.monotonic() + 5)
+
+    limiter.release("ok", latency_s=0.1)
+    waiter.join(2)
+    assert not waiter.is_alive()
+    assert limiter.snapshot()["in_flight"] == 1
+
+
+def test_wait_that_cannot_meet_the_deadline_is_rejected_up_front() -> None:
+    limiter = _limiter(limit=1)
+    limiter.acquire()
+    limiter.release("slow", latency_s=5.0)  # EWMA says a slot frees up every ~5s
+    limiter.acquire()
+
+    started = time.monotonic()
+    with pytest.raises(LLMOverloadedError, match="deadline"):
+        limiter.acquire(deadline=time.monotonic() + 1.0)
+    assert time.monotonic() - started < 0.5
+
+
+def test_async_slots_share_the_limiter_with_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LLM_CONCURRENCY", "2")
+    get_infra_settings.cache_clear()
+    peak = 0
+    active = 0
+
+    async def _call() -> None:
+        nonlocal peak, active
+        async with allm_slot("api.test", "m"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+
+    async def _main() -> None:
+        await asyncio.gather(*(_call() for _ in range(6)))
+
+    asyncio.run(_main())
+    assert peak == 2
+
+    with llm_slot("api.test", "m") as slot:
+        slot.record_response(_response(200))
+    stats = limiter_stats()["api.test/m"]
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["limit"] > 2
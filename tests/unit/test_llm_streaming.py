@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from app.common.llm import GeminiLLM, OpenAILLM
+from app.infra.http_transport import close_http_clients
+from app.infra.settings import get_infra_settings
+from app.llm.json_stream import IncompleteJSONError, IncrementalJSONParser, section_validator
+from app.llm.streaming import LLMTruncatedError, StreamAbortedError, StreamCollector, openai_chat_delta
+from app.registry.schema.ip_v3_extraction import IPRegistryV3
+
+DOC = {
+    "note_id": "n1",
+    "source_filename": "inline",
+    "procedures": [
+        {"event_id": "e1", "type": "bal", "evidence": {"quote": "BAL of the RML, \"60 ml\" instilled"}},
+        {"event_id": "e2", "type": "ebus_tbna", "target": {"station": "4R"}, "evidence": {"quote": "Station 4R"}},
+    ],
+    "established_tracheostomy_route": False,
+}
+
+
+def _openai_sse(text: str, *, finish: str = "stop", size: int = 7) -> bytes:
+    lines = [
+        "data: " + json.dumps({"choices": [{"delta": {"content": text[i : i + size]}, "finish_reason": None}]})
+        for i in range(0, len(text), size)
+    ]
+    lines.append("data: " + json.dumps({"choices": [{"delta": {}, "finish_reason": finish}]}))
+    lines.append("data: " + json.dumps({"choices": [], "usage": {"prompt_tokens": 5, "completion_tokens": 9}}))
+    lines.append("data: [DONE]")
+    return ("\n\n".join(lines) + "\n\n").encode()
+
+
+def _gemini_sse(text: str, *, finish: str = "STOP", size: int = 11) -> bytes:
+    chunks = [text[i : i + size] for i in range(0, len(text), size)]
+    lines = []
+    for idx, chunk in enumerate(chunks):
+        candidate: dict = {"content": {"parts": [{"text": chunk}]}}
+        if idx == len(chunks) - 1:
+            candidate["finishReason"] = finish
+        lines.append("data: " + json.dumps({"candidates": [candidate]}))
+    return ("\r\n\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+def test_parser_emits_members_and_array_items_as_they_close() -> None:
+    text = "```json\n" + json.dumps(DOC) + "\n```"
+    parser = IncrementalJSONParser()
+    seen = []
+    for ch in text:  # worst case: one character per chunk
+        seen.extend(parser.feed(ch))
+
+    assert [event.path for event in seen] == [
+        ("note_id",),
+        ("source_filename",),
+        ("procedures", 0),
+        ("procedures", 1),
+        ("procedures",),
+        ("established_tracheostomy_route",),
+    ]
+    assert seen[2].value == DOC["procedures"][0]
+    assert parser.complete and parser.close() == DOC
+
+    truncated = IncrementalJSONParser()
+    events = truncated.feed(json.dumps(DOC)[:200])
+    assert [event.path for event in events] == [("note_id",), ("source_filename",), ("procedures", 0)]
+    with pytest.raises(IncompleteJSONError):
+        truncated.close()
+
+
+def test_section_validator_rejects_a_bad_item_and_forwards_good_ones() -> None:
+    forwarded = []
+    validate = section_validator(IPRegistryV3, forwarded.append)
+    parser = IncrementalJSONParser()
+    for event in parser.feed(json.dumps(DOC)):
+        validate(event)
+    assert len(forwarded) == 6
+
+    bad = IncrementalJSONParser().feed('{"note_id": "n1", "procedures": [{"type": "bal"}')
+    validate(bad[0])
+    with pytest.raises(ValidationError):
+        validate(bad[1])
+
+
+def test_collector_detects_truncation_and_callback_failures() -> None:
+    collector = StreamCollector(openai_chat_delta, provider="openai")
+    with pytest.raises(LLMTruncatedError):
+        for line in _openai_sse(json.dumps(DOC)[:80], finish="length").decode().splitlines():
+            collector.feed_line(line)
+
+    def _reject(event):  # noqa: ANN001
+        raise ValueError(f"bad section {event.path}")
+
+    collector = StreamCollector(openai_chat_delta, on_event=_reject, provider="openai")
+    with pytest.raises(StreamAbortedError, match="note_id"):
+        for line in _openai_sse(json.dumps(DOC)).decode().splitlines():
+            collector.feed_line(line)
+
+
+@pytest.fixture
+def _streaming_env(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("LLM_HTTP2", "0")
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "0")
+    monkeypatch.setenv("LLM_STREAMING", "1")
+    monkeypatch.delenv("OPENAI_OFFLINE", raising=False)
+    get_infra_settings.cache_clear()
+    close_http_clients()
+    yield
+    close_http_clients()
+    get_infra_settings.cache_clear()
+
+
+@pytest.mark.usefixtures("_streaming_env")
+def test_openai_generate_stream_sync_and_async(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_PRIMARY_API", "chat")
+    sent: list[dict] = []
+    body = _openai_sse(json.dumps(DOC))
+
+    @contextlib.contextmanager
+    def _stream(self, method, url, headers=None, json=None, **_kwargs):  # noqa: ANN001
+        sent.append(json)
+        yield httpx.Response(200, request=httpx.Request(method, url), content=body)
+
+    @contextlib.asynccontextmanager
+    async def _astream(self, method, url, headers=None, json=None, **_kwargs):  # noqa: ANN001
+        sent.append(json)
+        yield httpx.Response(200, request=httpx.Request(method, url), content=body)
+
+    monkeypatch.setattr(httpx.Client, "stream", _stream)
+    monkeypatch.setattr(httpx.AsyncClient, "stream", _astream)
+
+    llm = OpenAILLM(api_key="test-key", model="gpt-4.1", timeout_seconds=1.0)
+    paths = []
+    out = llm.generate_stream("extract", on_event=lambda event: paths.append(event.path))
+    assert json.loads(out) == DOC
+    assert ("procedures", 1) in paths
+    assert sent[0]["stream"] is True and sent[0]["stream_options"] == {"include_usage": True}
+
+    async_paths = []
+    out = asyncio.run(llm.agenerate_stream("extract", on_event=lambda event: async_paths.append(event.path)))
+    assert json.loads(out) == DOC
+    assert async_paths == paths
+
+
+@pytest.mark.usefixtures("_streaming_env")
+def test_gemini_generate_stream_uses_sse_endpoint_and_raises_on_truncation(monkeypatch: pytest.MonkeyPatch) -> None:
+    urls: list[str] = []
+    bodies = iter([_gemini_sse(json.dumps(DOC)), _gemini_sse(json.dumps(DOC)[:120], finish="MAX_TOKENS")])
+
+    @contextlib.contextmanager
+    def _stream(self, method, url, headers=None, json=None, **_kwargs):  # noqa: ANN001
+        urls.append(url)
+        yield httpx.Response(200, request=httpx.Request(method, url), content=next(bodies))
+
+    monkeypatch.setattr(httpx.Client, "stream", _stream)
+
+    llm = GeminiLLM(api_key="test-key", model="gemini-test", use_oauth=False)
+    events = []
+    out = llm.generate_stream("extract", temperature=0.0, on_event=events.append)
+    assert json.loads(out) == DOC
+    assert len(events) == 6
+    assert urls[0].endswith("/gemini-test:streamGenerateContent?alt=sse&key=test-key")
+
+    with pytest.raises(LLMTruncatedError):
+        llm.generate_stream("extract again", temperature=0.0)
+
+
+@pytest.mark.usefixtures("_streaming_env")
+def test_run_v3_extraction_anchors_quotes_while_streaming(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.evidence import quote_anchor
+    from app.llm.json_stream import replay_json_events
+    from app.registry.extractors import v3_extractor
+    from app.registry.pipelines import v3_pipeline
+
+    note = 'PROCEDURE: BAL of the RML, "60 ml" instilled. Station 4R sampled.'
+    order: list[str] = []
+
+    def _fake_draft(focused_text, *, prompt_context=None, on_event=None):  # noqa: ANN001
+        replay_json_events(json.dumps(DOC), on_event)
+        order.append("draft_done")
+        return IPRegistryV3.model_validate(DOC)
+
+    real_anchor = quote_anchor.anchor_quote
+
+    def _anchor(note_text, quote):  # noqa: ANN001
+        order.append(f"anchor:{quote}")
+        return real_anchor(note_text, quote)
+
+    def _no_late_anchor(*_args, **_kwargs):  # noqa: ANN002, ANN003
+        raise AssertionError("quotes should already be anchored")
+
+    monkeypatch.setattr(v3_extractor, "extract_v3_draft", _fake_draft)
+    monkeypatch.setattr(v3_pipeline, "_safe_anchor", _anchor)
+    monkeypatch.setattr(quote_anchor, "anchor_quote", _no_late_anchor)
+
+    result = v3_pipeline.run_v3_extraction(note)
+
+    assert order[-1] == "draft_done"
+    assert order[:2] == ['anchor:BAL of the RML, "60 ml" instilled', "anchor:Station 4R"]
+    assert [event.evidence.start for event in result.procedures] == [
+        note.index("BAL"),
+        note.index("Station 4R"),
+    ]
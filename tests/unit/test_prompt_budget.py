@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pytest
+
+from app.registry.processing import prompt_budget
+from app.registry.processing.prompt_budget import budget_note_text, count_tokens, split_note_sections, token_budget
+
+NOTE = (
+    "INDICATION: Right upper lobe mass.\n"
+    "PROCEDURE IN DETAIL:\n"
+    "Linear EBUS was performed. Station 4R: 3 passes with 22G needle.\n"
+    "Station 7: 4 passes.\n"
+    "COMPLICATIONS: None.\n"
+    "PATHOLOGY REPORT:\n" + "Lymph node, station 4R, fine needle aspiration: adenocarcinoma. " * 40 + "\n"
+    "CT CHEST:\n" + "Spiculated right upper lobe nodule measuring 2.1 cm. " * 40 + "\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def _heuristic_tokenizer(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("PROMPT_BUDGET_TOKENIZER", "heuristic")
+    prompt_budget._token_counter.cache_clear()
+    yield
+    prompt_budget._token_counter.cache_clear()
+
+
+def test_sections_split_on_headings_not_inline_labels() -> None:
+    titles = [section.title for section in split_note_sections(NOTE)]
+    assert titles == ["INDICATION", "PROCEDURE IN DETAIL", "COMPLICATIONS", "PATHOLOGY REPORT", "CT CHEST"]
+    tiers = {section.title: section.tier for section in split_note_sections(NOTE)}
+    assert tiers["PROCEDURE IN DETAIL"] == 0
+    assert tiers["PATHOLOGY REPORT"] == tiers["CT CHEST"] == 3
+
+
+def test_budget_drops_pasted_data_first_and_keeps_sections_verbatim() -> None:
+    procedure_tokens = sum(
+        section.tokens for section in split_note_sections(NOTE) if section.tier in (0, 1, 2)
+    )
+    text, meta = budget_note_text(NOTE, task="registry_extraction", budget=procedure_tokens + 20)
+
+    assert "Station 4R: 3 passes with 22G needle.\nStation 7: 4 passes.\n" in text
+    assert "INDICATION: Right upper lobe mass." in text
+    assert "adenocarcinoma" not in text
+    assert "Spiculated" not in text
+    assert [item["title"] for item in meta["dropped_sections"]] == ["PATHOLOGY REPORT", "CT CHEST"]
+    assert meta["tokens_after"] <= meta["budget_tokens"] < meta["tokens_before"]
+    assert meta["tokenizer"] == "heuristic"
+    for line in text.splitlines():
+        assert line in NOTE
+
+
+def test_oversized_procedure_section_is_truncated_at_a_line() -> None:
+    note = "PROCEDURE:\n" + "".join(f"Step {i}: airway inspected.\n" for i in range(200))
+    text, meta = budget_note_text(note, task="judge", budget=100)
+    assert meta["truncated"] is True
+    assert 0 < count_tokens(text) <= 100
+    assert text.startswith("PROCEDURE:\nStep 0: airway inspected.")
+
+
+def test_focused_text_block_tags_are_always_kept() -> None:
+    focused = (
+        "<primary_narrative>\nPROCEDURE IN DETAIL:\nBAL of the RML.\n</primary_narrative>\n\n"
+        "<supporting_data>\nSPECIMENS:\n" + "BAL fluid for culture. " * 200 + "\n</supporting_data>"
+    )
+    text, meta = budget_note_text(focused, task="registry_extraction", budget=60)
+    assert text.startswith("<primary_narrative>\nPROCEDURE IN DETAIL:\nBAL of the RML.\n</primary_narrative>")
+    assert text.endswith("<supporting_data>\n</supporting_data>")
+    assert meta["dropped_sections"][0]["title"] == "SPECIMENS"
+
+
+def test_budgets_are_opt_in_and_come_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("PROMPT_BUDGET_ENABLED", raising=False)
+    assert token_budget("registry_extraction") == 0
+    monkeypatch.setenv("PROMPT_BUDGET_ENABLED", "1")
+    assert token_budget("registry_extraction") == prompt_budget.DEFAULT_TOKEN_BUDGETS["registry_extraction"]
+    monkeypatch.setenv("PROMPT_TOKEN_BUDGET_JUDGE", "1200")
+    assert token_budget("judge") == 1200
+    monkeypatch.setenv("PROMPT_BUDGET_ENABLED", "0")
+    assert token_budget("judge") == 0
+    text, meta = budget_note_text(NOTE, task="judge")
+    assert text == NOTE
+    assert meta["dropped_sections"] == []
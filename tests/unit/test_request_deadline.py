@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.agents.aggregator.timeline_aggregator import EntityLedger, LedgerEntity
+from app.agents.relation_extraction.llm_proposer import propose_relations_ml
+from app.infra.deadline import (
+    DeadlineExceededError,
+    budget_skip_warning,
+    cap_timeout,
+    remaining_s,
+    request_deadline,
+)
+from app.infra.executors import run_cpu
+from app.infra.settings import get_infra_settings
+from app.llm.exchange import Post, Sleep, run_exchange
+
+
+@pytest.fixture(autouse=True)
+def _settings(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("REQUEST_DEADLINE_OPTIONAL_MIN_S", "5")
+    get_infra_settings.cache_clear()
+    yield
+    get_infra_settings.cache_clear()
+
+
+def test_request_deadline_nests_by_tightening_only() -> None:
+    assert remaining_s() is None
+    with request_deadline(0):
+        assert remaining_s() is None
+    with request_deadline(30):
+        assert 29 < remaining_s() <= 30
+        with request_deadline(300):
+            assert remaining_s() <= 30
+        with request_deadline(2):
+            assert remaining_s() <= 2
+        assert remaining_s() > 2
+    assert remaining_s() is None
+
+
+def test_cap_timeout_and_skip_warning() -> None:
+    timeout = httpx.Timeout(connect=10.0, read=60.0, write=30.0, pool=10.0)
+    assert cap_timeout(timeout) is timeout
+    assert budget_skip_warning("self_correction") is None
+
+    with request_deadline(3):
+        capped = cap_timeout(timeout)
+        assert capped.read <= 3 and capped.connect <= 3
+        warning = budget_skip_warning("self_correction")
+        assert warning is not None and warning.startswith("DEADLINE_SKIPPED: self_correction")
+        assert budget_skip_warning("self_correction", min_s=1) is None
+
+    with request_deadline(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceededError):
+            cap_timeout(timeout)
+
+
+def test_run_exchange_caps_backoff_and_stops_at_the_deadline() -> None:
+    posts: list[float] = []
+
+    class _Client:
+        def post(self, url, headers=None, json=None, timeout=None):  # noqa: ANN001
+            posts.append(timeout.read)
+            return httpx.Response(503, request=httpx.Request("POST", url))
+
+    def _exchange():
+        while True:
+            yield Post({"model": "m"})
+            yield Sleep(30.0)
+
+    started = time.monotonic()
+    with request_deadline(0.2), pytest.raises(DeadlineExceededError):
+        run_exchange(
+            _exchange(),
+            client=_Client(),  # type: ignore[arg-type]
+            url="https://deadline.test/v1/chat",
+            headers={},
+            timeout=httpx.Timeout(60.0),
+        )
+    assert time.monotonic() - started < 5
+    assert len(posts) == 1 and posts[0] <= 0.2
+
+
+def test_run_cpu_propagates_the_deadline_to_the_worker() -> None:
+    async def _main() -> float | None:
+        app = SimpleNamespace(state=SimpleNamespace(cpu_executor=None))
+        with request_deadline(20):
+            return await run_cpu(app, remaining_s)  # type: ignore[arg-type]
+
+    remaining = asyncio.run(_main())
+    assert remaining is not None and 0 < remaining <= 20
+
+
+def test_relations_ml_skips_itself_when_the_budget_is_low(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("RELATIONS_ML_ENABLED", "1")
+    monkeypatch.setenv("LLM_PROVIDER", "openai_compat")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4.1")
+    monkeypatch.delenv("OPENAI_OFFLINE", raising=False)
+    monkeypatch.delenv("REGISTRY_USE_STUB_LLM", raising=False)
+    ledger = EntityLedger(
+        entities=[
+            LedgerEntity(entity_id="L1", kind="canonical_lesion", label="RUL nodule"),
+            LedgerEntity(entity_id="S1", kind="specimen", label="RUL TBBx"),
+        ]
+    )
+
+    class _NoLLM:
+        def generate_json(self, **_kwargs):  # noqa: ANN003
+            raise AssertionError("relations ML should have been skipped")
+
+    with request_deadline(1):
+        result = propose_relations_ml(ledger=ledger, llm=_NoLLM())
+    assert result.relations_ml == []
+    assert result.metrics["skipped"] == "deadline"
+    assert result.warnings[0].startswith("DEADLINE_SKIPPED: relations_ml")
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from app.common.llm import OpenAILLM
+from app.infra.deadline import DeadlineExceededError, request_deadline
+from app.infra.single_flight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call() -> None:
+    flight = SingleFlight()
+    calls = 0
+    started = threading.Event()
+    release = threading.Event()
+
+    def _upstream() -> str:
+        nonlocal calls
+        calls += 1
+        started.set()
+        release.wait(5)
+        return "shared"
+
+    results: list[str] = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", _upstream, group="t")))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", _upstream, group="t"))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert calls == 1
+    assert results == ["shared"] * 4
+    assert flight.stats() == {"t": {"leaders": 1, "coalesced": 3}}
+    assert flight.in_flight() == 0
+
+
+def test_exception_is_shared_and_next_call_runs_again() -> None:
+    flight = SingleFlight()
+    gate = threading.Event()
+    calls = 0
+
+    def _failing() -> str:
+        nonlocal calls
+        calls += 1
+        gate.wait(5)
+        raise RuntimeError("upstream 500")
+
+    errors: list[BaseException] = []
+
+    def _call() -> None:
+        try:
+            flight.do("k", _failing)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=_call) for _ in range(3)]
+    threads[0].start()
+    time.sleep(0.05)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == 1
+    assert len(errors) == 3
+    with pytest.raises(RuntimeError):
+        flight.do("k", _failing)
+    assert calls == 2
+
+
+def test_async_callers_coalesce_and_survive_leader_cancellation() -> None:
+    flight = SingleFlight()
+    calls = 0
+
+    async def _upstream() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def _main() -> list[str]:
+        results = await asyncio.gather(*(flight.ado("k", _upstream) for _ in range(5)))
+        assert calls == 1
+
+        leader = asyncio.create_task(flight.ado("k2", _upstream))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado("k2", _upstream))
+        await asyncio.sleep(0)
+        leader.cancel()
+        results.append(await follower)
+        return results
+
+    assert asyncio.run(_main()) == ["ok"] * 6
+    assert calls == 3  # k once, k2 leader (cancelled) + follower retry
+
+
+def test_leader_request_errors_are_retried_by_followers_not_shared() -> None:
+    flight = SingleFlight()
+    calls = 0
+
+    async def _upstream() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        if calls == 1:  # the leader's own deadline, surfaced as the route's error
+            try:
+                raise DeadlineExceededError("leader out of time")
+            except DeadlineExceededError as exc:
+                raise RuntimeError("504") from exc
+        return "ok"
+
+    async def _main() -> tuple[BaseException | str, str]:
+        leader = asyncio.create_task(flight.ado("k", _upstream))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado("k", _upstream))
+        leader_result = (await asyncio.gather(leader, return_exceptions=True))[0]
+        return leader_result, await follower
+
+    leader_result, follower_result = asyncio.run(_main())
+    assert isinstance(leader_result, RuntimeError)
+    assert follower_result == "ok"
+    assert calls == 2
+
+
+def test_follower_wait_is_bounded_by_its_own_deadline() -> None:
+    flight = SingleFlight()
+
+    async def _main() -> str:
+        gate = asyncio.Event()
+
+        async def _slow() -> str:
+            await gate.wait()
+            return "late"
+
+        leader = asyncio.create_task(flight.ado("k", _slow))
+        await asyncio.sleep(0)
+        with request_deadline(0.05):
+            started = time.monotonic()
+            with pytest.raises(DeadlineExceededError, match="coalesced"):
+                await flight.ado("k", _slow)
+            assert time.monotonic() - started < 1.0
+        gate.set()
+        return await leader
+
+    assert asyncio.run(_main()) == "late"
+
+    gate = threading.Event()
+    leader = threading.Thread(target=lambda: flight.do("s", lambda: gate.wait(5) and "late"))
+    leader.start()
+    time.sleep(0.05)
+    with request_deadline(0.05), pytest.raises(DeadlineExceededError):
+        flight.do("s", lambda: "unused")
+    gate.set()
+    leader.join(5)
+
+
+def test_openai_llm_coalesces_identical_concurrent_prompts(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("OPENAI_OFFLINE", raising=False)
+    monkeypatch.setenv("OPENAI_PRIMARY_API", "chat")
+    llm = OpenAILLM(api_key="test-key", model="gpt-4.1", timeout_seconds=1.0)
+    posts = 0
+
+    async def _mock_post(self, url, headers=None, json=None, **_kwargs):  # noqa: ANN001
+        nonlocal posts
+        posts += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(
+            200,
+            request=httpx.Request("POST", url),
+            json={"choices": [{"message": {"content": '{"ok": true}'}}]},
+        )
+
+    monkeypatch.setattr(httpx.AsyncClient, "post", _mock_post)
+
+    async def _main() -> list[str]:
+        same = [llm.agenerate("same prompt", task="judge") for _ in range(4)]
+        other = llm.agenerate("other prompt", task="judge")
+        return await asyncio.gather(*same, other)
+
+    assert asyncio.run(_main()) == ['{"ok": true}'] * 5
+    assert posts == 2
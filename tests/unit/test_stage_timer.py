@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.infra.perf import StageTimer, format_server_timing, mark_stage, stage_listener
+
+
+def test_stage_timer_sums_repeated_stages_in_first_seen_order() -> None:
+    timer = StageTimer()
+    with stage_listener(timer):
+        mark_stage("masking")
+        mark_stage("postprocess")
+        mark_stage("cpt_derivation")
+        mark_stage("postprocess")
+    mark_stage("ignored")  # outside the block: nobody is listening
+
+    assert list(timer.timings) == ["masking", "postprocess", "cpt_derivation"]
+    assert all(ms >= 0.0 for ms in timer.timings.values())
+
+
+def test_stage_timers_do_not_leak_between_tasks() -> None:
+    async def _run(stage: str) -> dict[str, float]:
+        timer = StageTimer()
+        with stage_listener(timer):
+            mark_stage(stage)
+            await asyncio.sleep(0)
+        return timer.timings
+
+    async def _main() -> list[dict[str, float]]:
+        return await asyncio.gather(_run("ner"), _run("llm_structurer"))
+
+    ner, structurer = asyncio.run(_main())
+    assert list(ner) == ["ner"]
+    assert list(structurer) == ["llm_structurer"]
+
+
+def test_format_server_timing() -> None:
+    header = format_server_timing({"phi_redaction": 1.234, "total": 20})
+    assert header == "phi_redaction;dur=1.2, total;dur=20.0"
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from pathlib import Path
+
+from app.api.ui_assets import MANIFEST_NAME, VendorAssets, build_asset_manifest, fingerprinted_name
+
+
+def _vendor(tmp_path: Path) -> Path:
+    vendor = tmp_path / "vendor"
+    (vendor / "pdfjs").mkdir(parents=True)
+    (vendor / "pdfjs" / "pdf.mjs").write_text("export const pdf = 1;\n" * 500, encoding="utf-8")
+    (vendor / "model.onnx").write_bytes(os.urandom(4096))  # incompressible
+    (vendor / "tiny.json").write_text("{}", encoding="utf-8")
+    return vendor
+
+
+def test_fingerprinted_name() -> None:
+    assert fingerprinted_name("pdfjs/pdf.worker.mjs", "abc") == "pdfjs/pdf.worker.abc.mjs"
+    assert fingerprinted_name("LICENSE", "abc") == "LICENSE.abc"
+
+
+def test_build_writes_manifest_and_worthwhile_compressed_copies(tmp_path: Path) -> None:
+    vendor = _vendor(tmp_path)
+
+    manifest = build_asset_manifest(vendor)
+
+    assert json.loads((vendor / MANIFEST_NAME).read_text(encoding="utf-8")) == manifest
+    pdf = manifest["assets"]["pdfjs/pdf.mjs"]
+    assert pdf["fingerprinted"] == f"pdfjs/pdf.{pdf['hash']}.mjs"
+    assert gzip.decompress((vendor / "pdfjs" / "pdf.mjs.gz").read_bytes()) == (vendor / "pdfjs" / "pdf.mjs").read_bytes()
+    assert pdf["encodings"]["gzip"] < pdf["size"]
+    assert manifest["assets"]["model.onnx"]["encodings"] == {}
+    assert manifest["assets"]["tiny.json"]["encodings"] == {}
+    assert not (vendor / "model.onnx.gz").exists()
+
+    # A rebuild does not treat the compressed copies as assets.
+    assert set(build_asset_manifest(vendor)["assets"]) == {"pdfjs/pdf.mjs", "model.onnx", "tiny.json"}
+
+
+def test_resolve_by_plain_and_fingerprinted_name(tmp_path: Path) -> None:
+    vendor = _vendor(tmp_path)
+    assets = VendorAssets(vendor)
+    assert assets.resolve("pdfjs/pdf.mjs") == ("pdfjs/pdf.mjs", None, False)
+
+    build_asset_manifest(vendor)
+    logical, entry, fingerprinted = assets.resolve("pdfjs/pdf.mjs")
+    assert entry is not None and not fingerprinted and "gzip" in entry.encodings
+    assert assets.resolve(entry.fingerprinted) == ("pdfjs/pdf.mjs", entry, True)
+    assert entry.is_current(vendor / logical)
+
+    (vendor / "pdfjs" / "pdf.mjs").write_text("changed", encoding="utf-8")
+    assert not entry.is_current(vendor / logical)
@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.umls.substring_index import TrigramIndex
+
+_TERMS = [
+    "bronchoscopy",
+    "flexible bronchoscopy",
+    "rigid bronchoscopy with dilation",
+    "bronchus",
+    "endobronchial ultrasound",
+    "lobe",
+]
+
+
+def test_trigram_search_ranks_by_position_then_length() -> None:
+    index = TrigramIndex(_TERMS)
+    assert index.search("bronchoscopy", limit=10) == [
+        "bronchoscopy",
+        "rigid bronchoscopy with dilation",
+        "flexible bronchoscopy",
+    ]
+    assert index.search("bronch", limit=2) == ["bronchus", "bronchoscopy"]
+
+
+def test_trigram_search_matches_linear_scan() -> None:
+    index = TrigramIndex(_TERMS)
+    for query in ["ob", "lob", "onch", "scopy w", "ultra", "xyz", ""]:
+        expected = sorted((t for t in _TERMS if query in t), key=lambda t: (t.find(query), len(t), t))
+        assert index.search(query, limit=50) == expected
+
+
+def test_search_terms_uses_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from proc_nlp import umls_lite
+
+    payload = {
+        "concepts": {"C1": {"name": "Bronchoscopy", "semtypes": ["T060"]}},
+        "term_index": {term: ["C1"] for term in _TERMS},
+    }
+    map_path = tmp_path / "ip_umls_map.json"
+    map_path.write_text(json.dumps(payload), encoding="utf-8")
+    monkeypatch.setenv("IP_UMLS_MAP_PATH", str(map_path))
+    monkeypatch.setenv("UMLS_COMPILED_CACHE_DIR", str(tmp_path / "cache"))
+    umls_lite._load_map.cache_clear()
+    try:
+        assert umls_lite.search_terms("  Bronchial ", limit=5) == [("endobronchial ultrasound", ["C1"])]
+        assert [term for term, _ in umls_lite.search_terms("scop", limit=2)] == [
+            "bronchoscopy",
+            "rigid bronchoscopy with dilation",
+        ]
+    finally:
+        umls_lite._load_map.cache_clear()
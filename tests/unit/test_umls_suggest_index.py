@@ -0,0 +1,65 @@
+from app.umls.ip_umls_store import DistilledUmlsStore
+from app.umls.suggest_index import CACHE_TOP_K
+
+
+def _store() -> DistilledUmlsStore:
+    concepts = {
+        "C1": {"name": "Bronchoscopy", "categories": ["procedure"], "semtypes": ["T060"]},
+        "C2": {"name": "Bronchus", "categories": ["anatomy"], "semtypes": ["T017"]},
+        "C3": {"name": "Bronchoscope", "categories": ["device"], "semtypes": ["T074"]},
+    }
+    term_index = {
+        "bronchoscopy": ["C1"],
+        "bronchoscopic examination": ["C1"],
+        "bronchoscopy, flexible": ["C1"],
+        "bronchus": ["C2"],
+        "bronchi": ["C2"],
+        "bronchoscope": ["C3"],
+    }
+    # Enough anatomy terms to exceed the cached top-k for short prefixes.
+    for i in range(CACHE_TOP_K + 20):
+        cui = f"CA{i:03d}"
+        concepts[cui] = {"name": f"Bronchial segment {i:03d}", "categories": ["anatomy"]}
+        term_index[f"bronchial segment {i:03d}"] = [cui]
+    return DistilledUmlsStore({"concepts": concepts, "term_index": term_index})
+
+
+def test_suggest_ranks_preferred_and_popular_terms_first() -> None:
+    results = _store().suggest("bronchos", limit=3)
+    # Preferred names first (C1 has more synonyms than C3), then shorter terms.
+    assert [r["term"] for r in results] == ["bronchoscopy", "bronchoscope", "bronchoscopy, flexible"]
+
+
+def test_suggest_category_filter_uses_cached_short_prefix() -> None:
+    store = _store()
+    results = store.suggest("br", category="anatomy", limit=5)
+    assert len(results) == 5
+    assert results[0]["term"] == "bronchus"
+    assert all("anatomy" in r["categories"] for r in results)
+    assert ("anatomy", "br") in store.suggest_index()._top_cache
+
+    assert [r["term"] for r in store.suggest("b", category="device", limit=5)] == ["bronchoscope"]
+    assert store.suggest("b", category="nonexistent", limit=5) == []
+
+
+def test_suggest_limit_above_cache_falls_back_to_range_scan() -> None:
+    results = _store().suggest("b", category="anatomy", limit=CACHE_TOP_K + 10)
+    assert len(results) == CACHE_TOP_K + 10
+    assert len({r["term"] for r in results}) == len(results)
+
+
+def test_suggest_fuzzy_tolerates_typos_after_exact_hits() -> None:
+    store = _store()
+    assert store.suggest("bronck", limit=5) == []
+
+    fuzzy = store.suggest("bronck", limit=5, fuzzy=True)
+    assert fuzzy
+    assert all(r["match_type"] == "fuzzy" and r["distance"] == 1 for r in fuzzy)
+    assert {"bronchoscopy", "bronchus"} <= {r["term"] for r in fuzzy}
+
+    scoped = store.suggest("bronchoscopx", category="procedure", limit=5, fuzzy=True)
+    assert [r["term"] for r in scoped] == [
+        "bronchoscopy",
+        "bronchoscopy, flexible",
+        "bronchoscopic examination",
+    ]
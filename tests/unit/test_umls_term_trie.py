@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.umls.ip_umls_store import DistilledUmlsStore
+from app.umls.term_trie import TokenTrie, term_tokens
+
+_PAYLOAD = {
+    "concepts": {
+        "C1": {"name": "Right upper lobe", "semtypes": ["T017"], "categories": ["anatomy"]},
+        "C2": {"name": "Upper lobe", "semtypes": ["T017"], "categories": ["anatomy"]},
+        "C3": {"name": "Lobe", "semtypes": ["T017"], "categories": ["anatomy"]},
+        "C4": {"name": "EBUS-TBNA", "semtypes": ["T060"], "categories": ["procedure"]},
+    },
+    "term_index": {
+        "right upper lobe": ["C1"],
+        "upper lobe": ["C2"],
+        "lobe": ["C3"],
+        "ebus-tbna": ["C4"],
+    },
+}
+
+
+def test_term_tokens_rejects_untokenizable_terms() -> None:
+    assert term_tokens("right upper lobe") == ["right", "upper", "lobe"]
+    assert term_tokens("ebus-tbna") == ["ebus-tbna"]
+    assert term_tokens("b-cell (lymphocyte)") is None
+
+
+def test_trie_is_leftmost_longest_with_exact_offsets() -> None:
+    trie = TokenTrie.from_terms(_PAYLOAD["term_index"])
+    text = "Right Upper  Lobe nodule; the upper lobe was clear. Lobe."
+    spans = list(trie.iter_matches(text))
+
+    assert [(s.term, text[s.start_char : s.end_char]) for s in spans] == [
+        ("right upper lobe", "Right Upper  Lobe"),
+        ("upper lobe", "upper lobe"),
+        ("lobe", "Lobe"),
+    ]
+    assert [s.token_count for s in spans] == [3, 2, 1]
+
+
+def test_umls_link_lite_reports_every_occurrence(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from proc_nlp import umls_lite
+
+    map_path = tmp_path / "ip_umls_map.json"
+    map_path.write_text(json.dumps(_PAYLOAD), encoding="utf-8")
+    monkeypatch.setenv("IP_UMLS_MAP_PATH", str(map_path))
+    monkeypatch.setenv("UMLS_COMPILED_CACHE_DIR", str(tmp_path / "cache"))
+    umls_lite._load_map.cache_clear()
+    try:
+        text = "EBUS-TBNA of 4R. Repeat EBUS-TBNA of 7."
+        concepts = umls_lite.umls_link_lite(text)
+        assert [(c.cui, c.start_char, c.end_char) for c in concepts] == [
+            ("C4", 0, 9),
+            ("C4", 24, 33),
+        ]
+        assert all(text[c.start_char : c.end_char] == "EBUS-TBNA" for c in concepts)
+    finally:
+        umls_lite._load_map.cache_clear()
+
+
+def test_umls_link_lite_caps_distinct_concepts_not_occurrences(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from proc_nlp import umls_lite
+
+    map_path = tmp_path / "ip_umls_map.json"
+    map_path.write_text(json.dumps(_PAYLOAD), encoding="utf-8")
+    monkeypatch.setenv("IP_UMLS_MAP_PATH", str(map_path))
+    monkeypatch.setenv("UMLS_COMPILED_CACHE_DIR", str(tmp_path / "cache"))
+    umls_lite._load_map.cache_clear()
+    try:
+        text = "EBUS-TBNA. " * 25 + "Lobe. Right upper lobe."
+        concepts = umls_lite.umls_link_lite(text)
+        assert [c.cui for c in concepts] == ["C1"] + ["C4"] * 25 + ["C3"]
+
+        capped = umls_lite.umls_link_lite(text, max_concepts=2)
+        assert [c.cui for c in capped] == ["C1"] + ["C4"] * 25
+    finally:
+        umls_lite._load_map.cache_clear()
+
+
+def test_store_link_text_matches_shape_of_match() -> None:
+    store = DistilledUmlsStore(_PAYLOAD)
+    text = "Biopsy of the right upper lobe and the upper lobe."
+    links = store.link_text(text, category="anatomy")
+
+    assert [m["chosen_cui"] for m in links] == ["C1", "C2"]
+    first = links[0]
+    assert text[first["start_char"] : first["end_char"]] == first["raw_text"] == "right upper lobe"
+    assert first["match_type"] == "exact"
+    assert set(store.match("right upper lobe") or {}) <= set(first)
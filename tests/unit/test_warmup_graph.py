@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from app.infra.warmup_graph import FAILED, LOADING, READY, SKIPPED, WarmupGraph, WarmupTask
+
+
+def test_independent_tasks_load_concurrently_and_dependents_wait() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    order: list[str] = []
+
+    def _load(name: str):
+        def _fn() -> None:
+            barrier.wait()  # deadlocks (times out) unless both loads run at once
+            order.append(name)
+
+        return _fn
+
+    graph = WarmupGraph(
+        [
+            WarmupTask("spacy", _load("spacy"), capabilities=("nlp",)),
+            WarmupTask("registry_service", _load("registry_service"), capabilities=("ner",)),
+            WarmupTask("registry_ml", lambda: order.append("registry_ml"), requires=("registry_service",)),
+        ],
+        max_workers=3,
+    )
+
+    assert graph.run(timeout=10) is True
+    assert order[-1] == "registry_ml"
+    snapshot = graph.snapshot()
+    assert snapshot["capabilities"] == {"ner": READY, "nlp": READY}
+    assert all(r["state"] == READY and r["load_ms"] >= 0 for r in snapshot["resources"].values())
+    graph.shutdown()
+
+
+def test_failures_skip_required_dependents_only() -> None:
+    ran: list[str] = []
+
+    def _boom() -> None:
+        raise RuntimeError("no model")
+
+    graph = WarmupGraph(
+        [
+            WarmupTask("bundle", _boom, required=False),
+            WarmupTask("registry_ml", lambda: ran.append("registry_ml"), requires=("bundle",), capabilities=("registry_ml",)),
+            WarmupTask("spacy", _boom, capabilities=("nlp",)),
+            WarmupTask("sectionizer", lambda: ran.append("sectionizer"), requires=("spacy",), capabilities=("nlp",)),
+        ]
+    )
+
+    assert graph.run(timeout=10) is False
+    assert ran == ["registry_ml"]  # a best-effort dependency only orders the work
+    assert graph.capability_state("registry_ml") == READY
+    assert graph.capability_state("nlp") == FAILED
+    with pytest.raises(KeyError, match="ner"):
+        graph.capability_state("ner")
+    assert graph.snapshot()["resources"]["sectionizer"] == {"state": SKIPPED, "error": "requires spacy"}
+    assert graph.error == "spacy: RuntimeError: no model; sectionizer: requires spacy"
+    graph.shutdown()
+
+
+def test_invalid_graphs_are_rejected() -> None:
+    with pytest.raises(ValueError, match="unknown"):
+        WarmupGraph([WarmupTask("a", lambda: None, requires=("missing",))])
+    with pytest.raises(ValueError, match="cycle"):
+        WarmupGraph([WarmupTask("a", lambda: None, requires=("b",)), WarmupTask("b", lambda: None, requires=("a",))])
+
+
+def test_wait_for_capabilities_returns_when_the_capability_is_ready() -> None:
+    release = threading.Event()
+    graph = WarmupGraph(
+        [
+            WarmupTask("phi_scrubber", lambda: None, capabilities=("phi_server",)),
+            WarmupTask("registry_ml", lambda: release.wait(5), capabilities=("registry_ml",)),
+        ]
+    )
+
+    async def _main() -> tuple[str, str]:
+        graph.start()
+        await graph.wait_for_capabilities(["phi_server"], timeout=5)
+        phi_state = graph.capability_state("phi_server")
+        ml_state = graph.capability_state("registry_ml")
+        release.set()
+        await graph.wait_for_capabilities(["registry_ml"], timeout=5)
+        return phi_state, ml_state
+
+    phi_state, ml_state = asyncio.run(_main())
+    assert (phi_state, ml_state) == (READY, LOADING)
+    assert graph.capability_state("registry_ml") == READY
+    graph.shutdown()